@@ -0,0 +1,83 @@
+"""
+analyze.py - 오프라인 분석 CLI (positions.db → 컬럼형 파일 → P&L 집계)
+
+사용법:
+  python analyze.py export                        # data/export 에 Arrow IPC로 전체 내보내기
+  python analyze.py export --format parquet       # Parquet (zstd)
+  python analyze.py export --since 2026-03-01     # 해당 날짜 이후 파티션만 갱신
+  python analyze.py pnl                           # 갭 티어 × 배당 구간별 P&L
+  python analyze.py pnl --by gap                  # 갭 티어별만 (odds / both)
+
+선택 의존성: pip install pyarrow numpy
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+from config import DB_PATH, EXPORT_DIR
+from core.export import FORMATS, export, load, pnl_report
+
+SEP = "=" * 65
+
+
+def cmd_export(args: argparse.Namespace) -> None:
+    t0     = time.perf_counter()
+    counts = export(args.db, args.out, args.format, args.since)
+    print(SEP)
+    for table, n in counts.items():
+        print(f"  {table:<16} {n:>10,}행")
+    print(f"  → {args.out} ({args.format}, {time.perf_counter() - t0:.2f}s)")
+    print(SEP)
+
+
+def cmd_pnl(args: argparse.Namespace) -> None:
+    t0   = time.perf_counter()
+    bets = load(args.src, "bets")
+    rows = pnl_report(bets, args.by)
+    keys = [k for k in ("gap", "odds") if rows and k in rows[0]]
+
+    print(SEP)
+    print("  " + "".join(f"{k:<12}" for k in keys)
+          + f"{'n':>5} {'승':>4} {'패':>4} {'대기':>4} {'베팅$':>9} {'P&L$':>9} {'승률':>6} {'ROI':>7}")
+    print("-" * 65)
+    for r in rows:
+        win_rate = f"{r['win_rate']:.1%}" if r["win_rate"] is not None else "-"
+        roi      = f"{r['roi']:+.1%}" if r["roi"] is not None else "-"
+        print(
+            "  " + "".join(f"{r[k]:<12}" for k in keys)
+            + f"{r['n']:>5} {r['wins']:>4} {r['losses']:>4} {r['pending']:>4} "
+            f"{r['stake']:>9.2f} {r['pnl']:>+9.2f} {win_rate:>6} {roi:>7}"
+        )
+    print(SEP)
+    print(f"  베팅 {bets.num_rows:,}건 집계 ({time.perf_counter() - t0:.3f}s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="polymoly 오프라인 분석")
+    sub    = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("export", help="DB → 날짜 파티션 컬럼 파일")
+    p.add_argument("--db", default=DB_PATH)
+    p.add_argument("--out", default=EXPORT_DIR)
+    p.add_argument("--format", choices=list(FORMATS), default="arrow")
+    p.add_argument("--since", help="YYYY-MM-DD 이후 파티션만 갱신")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("pnl", help="갭 티어 / 배당 구간별 P&L")
+    p.add_argument("--src", default=EXPORT_DIR)
+    p.add_argument("--by", choices=("gap", "odds", "both"), default="both")
+    p.set_defaults(func=cmd_pnl)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    try:
+        args.func(args)
+    except (RuntimeError, FileNotFoundError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""
+bench.py - 핫패스 성능 측정 스크립트 (네트워크 / 크레딧 소비 없음)
+
+측정 항목:
+  [sign]  주문 EIP-712 서명 비용 — 사전 서명(staging) 시 감지→제출 구간에서 절약되는 시간
+  [db]    SQLite insert / settle 처리량 + 동시 쓰기 중 읽기 지연 (호출마다 연결 vs 장기 연결+WAL)
+  [import] 진입점별 시작 시 import 시간 (-X importtime) + 무거운 의존성 로드 여부
+  [log]   폴링 사이클 1회 로그 비용 (이벤트 루프 스레드 기준) — 동기 핸들러 + f-string vs 큐 + 지연 포맷
+
+사용법:
+  python bench.py              # 전체 측정
+  python bench.py sign         # 항목 지정
+  python bench.py > bench_output.txt
+"""
+
+import asyncio
+import sqlite3
+import statistics
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+SEP = "=" * 65
+SUB = "-" * 65
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def info(msg: str) -> None: print(f"  ℹ️  {msg}")
+
+
+def report(label: str, samples_ms: list[float]) -> None:
+    """샘플(ms) 분포 출력: 평균 / p50 / p95 / 최대."""
+    s = sorted(samples_ms)
+    p95 = s[min(len(s) - 1, int(len(s) * 0.95))]
+    print(
+        f"  {label:<30} n={len(s):>6}  mean={statistics.fmean(s):>8.3f}ms  "
+        f"p50={statistics.median(s):>8.3f}ms  p95={p95:>8.3f}ms  max={s[-1]:>8.3f}ms"
+    )
+
+
+# ── [sign] 주문 서명 vs 사전 서명 ───────────────────────────
+
+def bench_sign(n: int = 200) -> None:
+    """오프라인 서명 비용 측정 (임시 키 — 실제 주문 없음).
+
+    Executor._place_order 즉시 서명 경로 = create_market_order(서명) + post_order
+    사전 서명 경로                      = OrderStager.take() + post_order
+    두 경로의 차이(서명 시간)가 감지→제출 지연 절감분.
+    """
+    import os
+
+    from py_clob_client.client import ClobClient
+    from py_clob_client.clob_types import CreateOrderOptions, MarketOrderArgs
+    from py_clob_client.order_builder.constants import BUY
+
+    from config import CLOB_HOST, CHAIN_ID
+    from core.staging import OrderStager
+
+    header("[sign] EIP-712 주문 서명 vs 사전 서명 take()")
+
+    client  = ClobClient(CLOB_HOST, chain_id=CHAIN_ID, key="0x" + os.urandom(32).hex())
+    options = CreateOrderOptions(tick_size="0.01", neg_risk=False)
+    token   = "7" * 77
+
+    sign_ms = []
+    for _ in range(n):
+        args = MarketOrderArgs(token_id=token, amount=10.0, side=BUY, price=0.42)
+        t0 = time.perf_counter()
+        client.builder.create_market_order(args, options)
+        sign_ms.append((time.perf_counter() - t0) * 1000)
+
+    class _Offline:
+        """주문 옵션 고정 + 로컬 서명 (네트워크 없음)."""
+        def get_tick_size(self, token_id): return "0.01"
+        def get_neg_risk(self, token_id):  return False
+        def create_market_order(self, args, opts):
+            return client.builder.create_market_order(args, options)
+
+    async def staged() -> list[float]:
+        stager = OrderStager()
+        stager.bind(_Offline())
+        until   = time.time() + 3600
+        samples = []
+        for _ in range(n):
+            stager.stage(token, 0.58, 0.42, until)    # 갭 0.16 → 첫 티어 $10
+            await stager.wait(token)
+            t0 = time.perf_counter()
+            order = stager.take(token, 10.0, 0.42, "0.01")
+            samples.append((time.perf_counter() - t0) * 1000)
+            assert order is not None, "사전 서명 주문 없음"
+        return samples
+
+    take_ms = asyncio.run(staged())
+
+    report("즉시 서명 (create_market_order)", sign_ms)
+    report("사전 서명 take()", take_ms)
+    ok(f"감지→제출 절감: 주문당 약 {statistics.median(sign_ms) - statistics.median(take_ms):.2f}ms")
+
+
+# ── [db] SQLite 처리량 / 읽기 지연 ──────────────────────────
+
+def _bet_kwargs(i: int) -> dict:
+    return dict(
+        game_id=f"g{i}", event_title=f"Team{i} vs. Team{i + 1}", token_id=f"tok{i}",
+        buy_label="YES", favorite_team=f"Team{i}", pinnacle_odds=1.4,
+        pinnacle_prob=0.714, poly_price=0.45, gap_size=0.26, bet_usdc=20.0,
+        order_id=f"0x{i:064x}", commence_time="2026-01-01T00:00:00+00:00",
+    )
+
+
+class _LegacyDB:
+    """비교 기준: 호출마다 새 연결 + 기본 저널링 (기존 core/db.py 방식)."""
+
+    def __init__(self, path: str):
+        from core.db import DB
+        DB(path).close()    # 스키마만 생성
+        self._path = path
+        with sqlite3.connect(path) as conn:
+            conn.execute("PRAGMA journal_mode=DELETE")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def insert_bet(self, **kw) -> int:
+        with self._connect() as conn:
+            cols = ", ".join(kw)
+            cur = conn.execute(
+                f"INSERT INTO bets ({cols}, bet_at) VALUES ({', '.join('?' * len(kw))}, ?)",
+                (*kw.values(), "2026-01-01T00:00:00+00:00"),
+            )
+        return cur.lastrowid
+
+    def settle_bet(self, bet_id: int, outcome: str, pnl_usdc: float) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE bets SET outcome=?, pnl_usdc=?, settled_at=? WHERE id=?",
+                (outcome, pnl_usdc, "2026-01-02T00:00:00+00:00", bet_id),
+            )
+            conn.execute(
+                "INSERT INTO results (bet_id, order_id, outcome, pnl_usdc, settled_at) "
+                "SELECT id, order_id, ?, ?, ? FROM bets WHERE id=?",
+                (outcome, pnl_usdc, "2026-01-02T00:00:00+00:00", bet_id),
+            )
+
+    def get_pending_bets(self) -> list[dict]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM bets WHERE outcome='pending' ORDER BY bet_at"
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+
+def _run_db(label: str, db, n: int) -> None:
+    from config import MAX_POSITIONS
+
+    t0 = time.perf_counter()
+    ids = [db.insert_bet(**_bet_kwargs(i)) for i in range(n)]
+    ins = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for i, bet_id in enumerate(ids[:-MAX_POSITIONS]):
+        db.settle_bet(bet_id, "win" if i % 3 else "loss", 5.0)
+    stl = time.perf_counter() - t0
+    settled = n - MAX_POSITIONS
+    print(f"  {label:<22} insert {n / ins:>8.0f}/s   settle {settled / stl:>8.0f}/s")
+
+    # 백그라운드 쓰기(삽입 + 정산 반복) 중 보유 포지션 읽기 지연
+    stop = threading.Event()
+
+    def writer() -> None:
+        i = n
+        while not stop.is_set():
+            db.settle_bet(db.insert_bet(**_bet_kwargs(i)), "win", 5.0)
+            i += 1
+
+    th = threading.Thread(target=writer)
+    th.start()
+    read_ms = []
+    for _ in range(200):
+        t0 = time.perf_counter()
+        db.get_pending_bets()
+        read_ms.append((time.perf_counter() - t0) * 1000)
+    stop.set()
+    th.join()
+    report(f"{label} 읽기(동시 쓰기)", read_ms)
+
+
+def bench_db(n: int = 2000) -> None:
+    """임시 DB 파일로 측정 (data/positions.db 미사용)."""
+    import logging
+
+    from core.db import DB
+
+    logging.getLogger("core.db").setLevel(logging.WARNING)
+
+    header("[db] SQLite insert / settle 처리량 + 동시 쓰기 중 읽기 지연")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _run_db("호출마다 연결", _LegacyDB(f"{tmp}/legacy.db"), n)
+        db = DB(f"{tmp}/wal.db")
+        _run_db("장기 연결 + WAL", db, n)
+        db.close()
+
+
+# ── [import] 시작 시 import 시간 ─────────────────────────────
+
+# 진입점 / 도구별 import 대상
+IMPORT_TARGETS = {
+    "main.py":        "main",
+    "supervisor.py":  "supervisor",
+    "analyze.py":     "analyze",
+    "주문 SDK":       "py_clob_client.client",
+}
+# 주문 경로에서만 필요한 무거운 의존성 (진입점 import 시 로드되면 안 됨)
+HEAVY_MODULES = ("py_clob_client", "eth_account", "web3", "pyarrow", "numpy")
+
+
+def _importtime(module: str) -> tuple[float, list[tuple[int, str]], list[str]]:
+    """새 인터프리터에서 import → (총 ms, [(누적 us, 직접 import 모듈)], 로드된 무거운 의존성)."""
+    code = (
+        f"import sys; import {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True,
+    )
+    total, children, pending = 0, [], []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, raw = line[len("import time:"):].split("|")
+        depth = (len(raw) - len(raw.lstrip()) - 1) // 2    # 이름 앞 들여쓰기 = import 깊이
+        name  = raw.strip()
+        if depth == 1:
+            pending.append((int(cumulative), name))
+        elif depth == 0:                                   # 자식이 부모보다 먼저 출력됨
+            if name == module:
+                total, children = int(cumulative), pending
+            pending = []
+    heavy = [m for m in proc.stdout.strip().split(",") if m]
+    return total / 1000, sorted(children, reverse=True), heavy
+
+
+def bench_import(runs: int = 3, top_n: int = 6) -> None:
+    """진입점별 import 시간 (runs회 중 최소값) + 직접 import 모듈 상위 top_n 개."""
+    header("[import] 진입점 import 시간 (python -X importtime)")
+
+    for label, module in IMPORT_TARGETS.items():
+        total, children, heavy = min((_importtime(module) for _ in range(runs)), key=lambda r: r[0])
+        print(f"\n  {label:<14} {module:<24} {total:>8.1f}ms")
+        for us, name in children[:top_n]:
+            print(f"    {name:<36} {us / 1000:>8.1f}ms")
+        if module.startswith("py_clob_client"):
+            continue
+        if heavy:
+            info(f"무거운 의존성 로드됨: {', '.join(heavy)}")
+        else:
+            ok("무거운 의존성 미로드 (주문 경로에서 지연 import)")
+
+
+# ── [log] 로깅 비용 ──────────────────────────────────────────
+
+def _log_cycle_eager(log: logging.Logger, games: list) -> None:
+    """변경 전 호출 형태: 비활성 DEBUG 도 f-string / str() 를 먼저 만듦."""
+    for g in games:
+        hrs = g.hours_until_start()
+        log.debug(f"[scanner] 마감 ({hrs:.1f}h): {g.home_team} vs {g.away_team}")
+        log.debug(str(g))
+        log.info(str(g))
+
+
+def _log_cycle_lazy(log: logging.Logger, games: list) -> None:
+    """변경 후 호출 형태: % 인자 + 구조화 필드 (포맷은 기록 스레드)."""
+    for g in games:
+        hrs = g.hours_until_start()
+        extra = {"stage": "scan", "game_id": g.game_id}
+        log.debug("[scanner] 마감 (%.1fh): %s vs %s", hrs, g.home_team, g.away_team, extra=extra)
+        log.debug("%s", g, extra=extra)
+        log.info("%s", g, extra=extra)
+
+
+def bench_log(n_games: int = 300, cycles: int = 30) -> None:
+    """사이클당 경기 n_games 개 (DEBUG 2줄 비활성 + INFO 1줄) 로그 — 호출 스레드 소요 시간.
+
+    동기:  RotatingFileHandler / 콘솔을 호출 스레드에서 직접 기록 (기존 setup_logging)
+    큐:    core/logsetup.py — 호출 스레드는 큐 적재만, 기록은 QueueListener 스레드
+    콘솔 출력은 /dev/null 로 (측정 출력 보호).
+    """
+    from datetime import datetime, timedelta, timezone
+
+    from core.logsetup import build_handlers, start_listener
+    from core.odds_fetcher import PinnacleGame
+
+    header(f"[log] 사이클당 로그 비용 ({n_games}경기 × {cycles}회, INFO 레벨)")
+    now   = datetime.now(timezone.utc)
+    games = [
+        PinnacleGame(f"g{i}", "Miami Heat", "Philadelphia 76ers", now + timedelta(hours=i % 30), 1.4, 3.1)
+        for i in range(n_games)
+    ]
+
+    log = logging.getLogger("bench.log")
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    results: dict[str, float] = {}
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        def handlers(json_lines: bool = False) -> list[logging.Handler]:
+            return build_handlers(f"{tmp}/bot.log", f"{tmp}/error.log", json_lines, devnull)
+
+        cases = [
+            ("동기 + f-string (변경 전)",   _log_cycle_eager, False, False),
+            ("동기 + 지연 포맷",            _log_cycle_lazy,  False, False),
+            ("큐 + 지연 포맷 (변경 후)",     _log_cycle_lazy,  True,  False),
+            ("큐 + 지연 포맷 + JSON lines",  _log_cycle_lazy,  True,  True),
+        ]
+        for label, cycle, queued, json_lines in cases:
+            hs = handlers(json_lines)
+            listener = start_listener(log, hs) if queued else None
+            if listener is None:
+                for h in hs:
+                    log.addHandler(h)
+            samples = []
+            for _ in range(cycles):
+                t0 = time.perf_counter()
+                cycle(log, games)
+                samples.append((time.perf_counter() - t0) * 1000)
+            t0 = time.perf_counter()
+            if listener is not None:
+                listener.stop()                          # 남은 레코드 기록 (호출 스레드 밖 작업량)
+            drain_ms = (time.perf_counter() - t0) * 1000
+            for h in list(log.handlers):
+                log.removeHandler(h)
+            for h in hs:
+                h.close()
+            report(label, samples)
+            if listener is not None:
+                print(f"  {'':<30} 기록 스레드 잔여 처리 {drain_ms:.1f}ms (호출 스레드 대기 없음)")
+            results[label] = statistics.median(samples)
+
+    before = results["동기 + f-string (변경 전)"]
+    after  = results["큐 + 지연 포맷 (변경 후)"]
+    print(SUB)
+    ok(f"사이클당 호출 스레드 로그 비용: {before:.2f}ms → {after:.2f}ms ({before / after:.1f}배)")
+
+
+# ── 메인 ─────────────────────────────────────────────────────
+
+BENCHES = {
+    "sign":   bench_sign,
+    "db":     bench_db,
+    "import": bench_import,
+    "log":    bench_log,
+}
+
+
+if __name__ == "__main__":
+    selected = sys.argv[1:] or list(BENCHES)
+    for name in selected:
+        if name not in BENCHES:
+            print(f"알 수 없는 항목: {name} (가능: {', '.join(BENCHES)})")
+            sys.exit(1)
+    for name in selected:
+        BENCHES[name]()
+    print(f"\n{SEP}\n  측정 완료\n{SEP}")
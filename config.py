@@ -5,15 +5,37 @@ config.py - 전역 파라미터 중앙 관리
 core/ 모듈들은 이 파일에서 import 해서 사용.
 """
 
+import os
+
+# 환경변수 POLYMOLY_SIM=http://127.0.0.1:8700 → 모든 외부 API 를 로컬 시뮬레이터로 (python -m sim)
+SIM_URL = os.getenv("POLYMOLY_SIM", "").rstrip("/")
+
+
+def _endpoint(url: str, sim_path: str) -> str:
+    """실제 주소 또는 시뮬레이터 경로 (WebSocket 은 ws:// 로)."""
+    if not SIM_URL:
+        return url
+    base = SIM_URL.replace("http", "ws", 1) if url.startswith("wss://") else SIM_URL
+    return base + sim_path
+
+
 # ── API 엔드포인트 ──────────────────────────────────────────
-GAMMA_BASE = "https://gamma-api.polymarket.com"
-CLOB_HOST  = "https://clob.polymarket.com"
+GAMMA_BASE = _endpoint("https://gamma-api.polymarket.com", "/gamma")
+CLOB_HOST  = _endpoint("https://clob.polymarket.com", "/clob")
 CHAIN_ID   = 137   # Polygon mainnet
+CLOB_WS_USER = _endpoint("wss://ws-subscriptions-clob.polymarket.com/ws/user", "/clob/ws/user")        # 인증 user 채널
+CLOB_WS_MARKET = _endpoint("wss://ws-subscriptions-clob.polymarket.com/ws/market", "/clob/ws/market")  # 공개 market 채널
+SPORTS_WS      = _endpoint("wss://sports-api.polymarket.com/ws", "/sports/ws")                         # 경기 결과 (구독 불필요)
+SPORTS_WS_LEAGUES = ("nba",)   # sport_result 중 처리할 leagueAbbreviation
 
-ODDS_API_BASE   = "https://api.the-odds-api.com/v4"
+ODDS_API_BASE   = _endpoint("https://api.the-odds-api.com/v4", "/odds/v4")
 ODDS_BOOKMAKERS = "pinnacle"
 ODDS_SPORT      = "basketball_nba"   # MLB 추가 예정
 
+TELEGRAM_API = _endpoint("https://api.telegram.org", "/telegram")
+GAMMA_PAGE_SIZE = 200   # Gamma /events 페이지 크기 (offset 으로 끝까지 조회)
+GAMMA_MAX_PAGES = 20    # 페이지 조회 상한 (offset 무시 / 끝없는 응답 방어)
+
 # ── 실행 조건 (4가지 모두 충족해야 매수) ────────────────────
 MAX_PINNACLE_ODDS    = 1.55   # 배당 상한선
 MAX_POLYMARKET_PRICE = 0.50   # 폴리마켓 역배 기준 (50센트 미만)
@@ -28,6 +50,7 @@ BET_ENTRY_DEADLINE_HRS = 1    # 경기 시작 N시간 전 마감 (이 이하면
 MAX_BET_USDC = 30
 MIN_BET_USDC = 5
 MAX_POSITIONS = 5
+POSITION_BOOK_VERIFY = False  # 모니터 점검마다 메모리 포지션 북 ↔ DB 정합성 검사 (디버그용)
 
 # 갭 크기별 베팅 금액 [(gap_min, gap_max, usdc)]
 BET_SIZE_TIERS = [
@@ -36,20 +59,150 @@ BET_SIZE_TIERS = [
     (0.30, 1.00, 30),   # 30센트 이상 → $30
 ]
 
+# ── 주문 사전 서명 (스테이징) ────────────────────────────────
+STAGING_GAP_MARGIN  = 0.03  # 갭이 GAP_THRESHOLD - N 이상이면 주문을 미리 서명해 둠
+STAGED_ORDER_TTL    = 600   # 사전 서명 주문 유효 시간 (초) — 절반 경과 시 재서명
+STAGING_REFRESH_SEC = 30    # 후보 점검 주기 (초) — 진입 마감 해제 / 오래된 주문 재서명
+
+# ── 포지션 모니터링 (점검 시점) ──────────────────────────────
+# 경기 시작 ~ 종료 통상 소요 시간 (분). 예상 종료 시각 = commence_time + N분
+GAME_LENGTH_MIN = {
+    "basketball_nba": 150,
+    "baseball_mlb":   190,
+}
+DEFAULT_GAME_LENGTH_MIN   = 180
+MONITOR_NEAR_END_INTERVAL = 120    # 예상 종료 이후 점검 간격 (초)
+MONITOR_NEAR_END_WINDOW   = 3600   # 예상 종료 후 N초까지 촘촘히, 이후 MONITOR_INTERVAL 간격
+
+# ── 시계열 스냅샷 (배당 / 호가) ───────────────────────────────
+SNAPSHOT_FLUSH_ROWS       = 500    # 버퍼가 N행 이상이면 즉시 flush
+SNAPSHOT_FLUSH_INTERVAL   = 60     # 주기 flush (초)
+SNAPSHOT_COMPACT_INTERVAL = 3600   # 다운샘플 / 보존기간 정리 주기 (초)
+SNAPSHOT_DOWNSAMPLE_DAYS  = 7      # N일 지난 행 → 시간 단위 평균으로 압축 (주로 피드 호가)
+SNAPSHOT_RETENTION_DAYS   = 180    # N일 지난 행 삭제
+
+# ── 텔레그램 알림 아웃박스 ────────────────────────────────────
+OUTBOX_QUEUE_SIZE   = 500    # 메모리 큐 상한 (초과 시 가장 오래된 알림 폐기)
+OUTBOX_COALESCE_SEC = 1.0    # 이 시간 안에 몰린 알림은 한 메시지로 합침
+OUTBOX_MAX_CHARS    = 4000   # 합친 메시지 최대 길이 (Telegram 한도 4096자)
+OUTBOX_RATE_PER_MIN = 20     # 토큰 버킷: 분당 전송 수 (Telegram 그룹 채팅 한도)
+OUTBOX_MAX_ATTEMPTS = 5      # 전송 재시도 횟수 — 초과 시 폐기
+PAPER_NOTIFY_LABEL  = "🧪 <b>[모의]</b> "   # main.py --paper 알림 머리말 (실거래 알림과 구분)
+
 # ── 손실 관리 ────────────────────────────────────────────────
 MAX_CONSECUTIVE_LOSSES = 3   # 연속 N패 시 자동 중단
 
 # ── 폴링 주기 (초) ───────────────────────────────────────────
 POLL_INTERVAL = 3600   # 기본 1시간
 
+# ── 폴링 파이프라인 ──────────────────────────────────────────
+PIPELINE_SCAN_WORKERS = 4    # 오더북 조회 / 조건 검사 동시 워커 수
+PIPELINE_QUEUE_SIZE   = 16   # 단계 간 큐 상한 (가득 차면 앞 단계 대기 — backpressure)
+
+# ── HTTP 전송 (core/transport.py) ─────────────────────────────
+# 클라이언트별 연결 풀 / 시도당 타임아웃(초) / 재시도 포함 총 예산(초) / 재시도 횟수
+# 재시도는 멱등 요청(GET, POST /books)만 — 주문 / 텔레그램 전송은 재시도 안 함
+HTTP_CLIENTS = {
+    "gamma":    {"limit": 10, "timeout": 10.0, "budget": 30.0, "retries": 2},
+    "clob":     {"limit": 20, "timeout": 5.0,  "budget": 15.0, "retries": 2},
+    "odds":     {"limit": 2,  "timeout": 15.0, "budget": 30.0, "retries": 1},   # 크레딧 소비 — 보수적
+    "telegram": {"limit": 2,  "timeout": 10.0, "budget": 10.0, "retries": 0},   # 재전송은 outbox 담당
+}
+HTTP_KEEPALIVE_SEC  = 60     # 유휴 연결 유지 시간
+HTTP_DNS_TTL_SEC    = 300    # DNS 캐시
+HTTP_BACKOFF_BASE   = 0.5    # 재시도 대기 상한 = base × 2^n (full jitter)
+HTTP_BACKOFF_MAX    = 8.0
+HTTP_LATENCY_WINDOW = 500    # 호스트별 지연 통계 표본 수 (최근 N건)
+
+# hedge 요청: 조회가 호스트 p95 지연을 넘기면 같은 요청을 한 번 더 보내 먼저 온 응답 사용
+HTTP_HEDGE_MIN_SAMPLES = 20     # p95 산출 최소 표본 (그 전에는 hedge 안 함)
+HTTP_HEDGE_DELAY_MIN   = 0.05   # hedge 대기 하한 / 상한 (초)
+HTTP_HEDGE_DELAY_MAX   = 2.0
+HTTP_HEDGE_MAX_RATIO   = 0.1    # 누적 요청 대비 hedge 비율 상한 (API 폭주 방지)
+
+# 차단기: 연속 실패 시 일정 시간 즉시 실패 → 이후 시험 요청 1건으로 복구 판단
+BREAKER_FAILURES = 5     # 연속 실패(연결 오류 / 타임아웃 / 5xx) 횟수
+BREAKER_COOLDOWN = 30    # 차단 유지 (초)
+
+# ── 요청 속도 제한 (core/governor.py) ─────────────────────────
+# docs/polymarket/authentication/rate-limit.md 기준 엔드포인트 분류별 [(요청 수, 초), ...]
+# 요청 1건 = 엔드포인트 버킷 + 묶음 버킷(core/governor.py GROUPS) + 호스트 공용 버킷(gamma / clob) 모두에서 차감
+RATE_LIMITS = {
+    "gamma":          [(4000, 10)],
+    "gamma_events":   [(500, 10)],
+    "gamma_markets":  [(300, 10)],
+    "gamma_listing":  [(900, 10)],                  # /markets + /events 합산
+    "clob":           [(9000, 10)],
+    "clob_book":      [(1500, 10)],
+    "clob_books":     [(500, 10)],
+    "clob_tick_size": [(200, 10)],
+    "clob_order":     [(3500, 10), (36000, 600)],   # burst + sustained
+}
+RATE_LIMIT_HEADROOM  = 0.8   # 문서 한도의 80%까지만 사용
+RATE_TRADING_RESERVE = 0.2   # 호스트 공용 버킷 중 거래 전용 몫 (시세 조회는 이만큼 남기고 대기)
+
+# ── 멀티 프로세스 (supervisor.py) ────────────────────────────
+# 샤드(종목 / 마켓 그룹)마다 폴링 워커 프로세스 1개 + 정산 워커 1개
+SHARDS = {
+    "nba": {"odds_sport": "basketball_nba", "gamma_tag": "nba"},
+}
+SUPERVISOR_CHECK_INTERVAL = 1.0    # 워커 생존 확인 주기 (초)
+SUPERVISOR_RESTART_DELAY  = 5      # 비정상 종료 워커 재시작 대기 (초), 연속 실패 시 2배
+SUPERVISOR_RESTART_MAX    = 300
+SUPERVISOR_STABLE_SEC     = 600    # 이 시간 이상 살아 있었으면 재시작 대기 초기화
+
+# ── 공유 메모리 오더북 캐시 (core/bookcache.py) ───────────────
+BOOK_CACHE_SLOTS     = 256       # 동시 보관 토큰 수 (market 채널 구독 상한)
+BOOK_CACHE_DEPTH     = 10        # 토큰당 보관 호가 단계 (bid / ask 각각)
+BOOK_CACHE_STALE_SEC = 30        # 피드 heartbeat 가 이보다 오래되면 캐시 미사용 (REST 대체)
+BOOK_WATCH_TTL       = 3 * 3600  # 스캔 요청 토큰 구독 유지 시간 (초) — 진입 마감이 먼저 오면 그때 해제
+BOOK_WATCH_MAX       = 192       # 스캔 요청 토큰 상한 (보유 / 사전 서명 몫 슬롯 남김), 초과 시 가장 오래 요청 없던 토큰 해제
+
 # ── Odds API 크레딧 제어 ─────────────────────────────────────
 CREDITS_WARNING_THRESHOLD = 50     # 잔여 이하면 텔레그램 경고 발송
 CREDITS_MIN_RESERVE       = 10     # 잔여 이하면 Odds API 호출 중단
 DAILY_MAX_API_CALLS       = 100    # 하루 최대 Odds API 호출 횟수
 
+# ── 웜 스타트 (core/checkpoint.py) ────────────────────────────
+CHECKPOINT_MAX_AGE = 24 * 3600   # 저장 후 이 시간이 지난 체크포인트는 폐기 (콜드 스타트)
+
+# ── 지표 엔드포인트 (core/metrics.py) ─────────────────────────
+METRICS_HOST = "127.0.0.1"   # 로컬 전용 — 외부 노출은 리버스 프록시로
+METRICS_PORT = 9464          # GET /metrics (0 이면 비활성). supervisor 워커는 +1, +2, …
+METRICS_STAGE_BUCKETS   = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)             # 파이프라인 단계 (초)
+METRICS_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)      # 주문 지연 (초)
+
+# ── 이벤트 루프 감시 (core/watchdog.py) ───────────────────────
+WATCHDOG_INTERVAL    = 0.1    # 루프 지연 측정 주기 (초)
+WATCHDOG_STALL_SEC   = 0.25   # 이 이상 루프가 멈추면 경고 + 정지 중 스택 기록
+WATCHDOG_STACK_DEPTH = 15     # 기록할 스택 깊이 (안쪽 프레임부터)
+
+# ── 런타임 프로파일링 (core/profiler.py) ──────────────────────
+PROFILE_CYCLES             = 1      # SIGUSR1 / 제어 파일 1회당 프로파일할 사이클 수 (기본)
+PROFILE_TOP_N              = 30     # 요약 파일에 남길 함수 / 메모리 증가 위치 수
+PROFILE_TRACEMALLOC_FRAMES = 10     # tracemalloc 할당 위치 스택 깊이
+
+# ── 로컬 API 시뮬레이터 (sim/, python -m sim) ─────────────────
+SIM_HOST         = "127.0.0.1"
+SIM_PORT         = 8700
+SIM_MARKETS      = 200      # 생성할 경기(마켓) 수
+SIM_SEED         = 7        # 경기 / 가격 생성 시드 (재현 가능)
+SIM_GAP_RATIO    = 0.05     # 배당 역전(갭 ≥ GAP_THRESHOLD) 마켓 비율
+SIM_TICK_SEC     = 1.0      # 호가 변동 / 경기 종료 처리 주기 (초)
+SIM_TICK_CHANGES = 50       # 틱당 호가 변경 수 (market 채널 price_change)
+SIM_CREDITS      = 20_000   # Odds API 시작 잔여 크레딧 (호출당 1 차감)
+
 # ── 파일 경로 ────────────────────────────────────────────────
 DB_PATH           = "data/positions.db"
+PAPER_DB_PATH     = "data/paper.db"          # 모의 거래 기록 (main.py --paper, core/paper.py)
+PAPER_REPLAY_DB_PATH = "data/paper-replay.db"   # replay.py 결과 (실행마다 새로 생성)
 TEAM_MAPPING_PATH = "data/team_mapping.json"
+CHECKPOINT_PATH   = "data/checkpoint-{shard}.json.z"   # 웜 스타트 상태 (core/checkpoint.py)
+PAPER_CHECKPOINT_PATH = "data/paper-checkpoint-{shard}.json.z"   # 모의 거래 웜 스타트 상태 (실거래와 분리)
+PROFILE_CONTROL_PATH = "data/profile"   # 생성 / 수정 시 다음 사이클 프로파일 (core/profiler.py)
+PROFILE_DIR       = "logs"              # 프로파일 결과 (.pstats / .txt / .tracemalloc)
 CREDITS_STATE_PATH = "data/credits.json"
+EXPORT_DIR        = "data/export"    # analyze.py 컬럼형 내보내기 경로
 LOG_FILE          = "logs/bot.log"
 ERROR_LOG_FILE    = "logs/error.log"
+LOG_JSON          = False            # True 면 파일 로그를 JSON lines 로 (core/logsetup.py)
@@ -0,0 +1,303 @@
+"""
+core/bookcache.py - 공유 메모리 오더북 캐시 (market 채널 → 모든 프로세스)
+
+스캔 / 모니터가 매번 REST /book 을 부르면 호출 수만큼 지연과 속도 한도 소모.
+market 채널(MarketFeed) 하나가 book / price_change 이벤트로 호가를 유지하고
+고정 배치 공유 메모리에 기록 → 같은 프로세스든 다른 워커 프로세스든 직렬화 / IPC 없이 읽음.
+
+  배치:      헤더 + 슬롯 BOOK_CACHE_SLOTS 개 (토큰 1개 = 슬롯 1개, 쓰기 측이 배정)
+             슬롯 = seq / 세대 / 갱신 시각 / token_id / bid·ask 단계 수 / (가격, 수량) × BOOK_CACHE_DEPTH
+  쓰기:      MarketFeed 1개만 (단일 writer). 슬롯 갱신 전후로 seq 증가 (홀수 = 쓰는 중)
+  읽기:      seqlock — seq 짝수 확인 → 복사 → seq 재확인, 다르면 재시도 (락 없음)
+  유효성:    피드 재연결 시 세대 증가 → 이전 세대 슬롯은 새 book 스냅샷 전까지 미사용
+             heartbeat 가 BOOK_CACHE_STALE_SEC 이상 멈추면 전체 미사용 → 호출 측 REST 대체
+  구독 요청: 캐시에 없는 토큰은 WatchList 에 등록 → 피드가 다음 PING 주기에 구독 추가
+             만료(요청 후 BOOK_WATCH_TTL 또는 진입 마감) / 상한(BOOK_WATCH_MAX) 초과 시 해제 → 슬롯 반납
+
+get() 결과는 REST /book 과 같은 형태 (bids 오름차순 / asks 내림차순 — 최우선 호가가 마지막).
+seqlock 은 쓰기 순서가 다른 코어에 그대로 보이는 메모리 모델(x86 TSO) 기준.
+"""
+
+import logging
+import struct
+import threading
+import time
+from collections import OrderedDict
+from multiprocessing import shared_memory
+
+from config import (
+    BOOK_CACHE_SLOTS,
+    BOOK_CACHE_DEPTH,
+    BOOK_CACHE_STALE_SEC,
+    BOOK_WATCH_TTL,
+    BOOK_WATCH_MAX,
+)
+
+log = logging.getLogger(__name__)
+
+MAGIC       = 0x424F4F4B    # "BOOK"
+TOKEN_BYTES = 80            # token_id 최대 길이 (10진 78자리)
+READ_TRIES  = 8             # seqlock 재시도 횟수 (초과 시 miss 처리)
+
+_HEADER = struct.Struct("<IIIIQQd")       # magic, slots, depth, _, 세대, 배정 횟수, heartbeat
+_SLOT   = struct.Struct(f"<QQd{TOKEN_BYTES}sII")   # seq, 세대, 갱신 시각, token_id, bid 수, ask 수
+_SEQ    = struct.Struct("<Q")
+HEADER_SIZE = 64
+
+
+class WatchList:
+    """스캔 측이 원하는 토큰 (피드 구독 대상). supervisor 모드에서는 공유 프로세스 1개."""
+
+    def __init__(self, ttl: float = BOOK_WATCH_TTL, limit: int = BOOK_WATCH_MAX):
+        self._ttl    = ttl
+        self._limit  = limit
+        self._lock   = threading.Lock()
+        self._tokens: OrderedDict[str, float] = OrderedDict()    # token_id → 만료 시각 (요청 순)
+
+    def add(self, token_id: str, until: float | None = None) -> None:
+        """구독 요청. until(진입 마감 등)이 ttl 보다 빠르면 그때 만료. 상한 초과 시 가장 오래된 요청 해제."""
+        expires = time.time() + self._ttl
+        if until is not None:
+            expires = min(expires, until)
+        with self._lock:
+            self._tokens.pop(token_id, None)
+            self._tokens[token_id] = expires
+            while len(self._tokens) > self._limit:
+                self._tokens.popitem(last=False)
+
+    def tokens(self) -> set[str]:
+        """만료 제외 후 요청 토큰 집합."""
+        now = time.time()
+        with self._lock:
+            for token_id in [t for t, exp in self._tokens.items() if exp <= now]:
+                del self._tokens[token_id]
+            return set(self._tokens)
+
+
+class BookCache:
+    """공유 메모리 오더북. 쓰기는 MarketFeed 1곳, 읽기는 어느 프로세스든."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, watch: WatchList | None, owner: bool):
+        magic, slots, depth, *_ = _HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"[bookcache] 오더북 캐시 아님: {shm.name}")
+        self._shm    = shm
+        self._buf    = shm.buf
+        self._watch  = watch
+        self._owner  = owner
+        self._slots  = slots
+        self._depth  = depth
+        self._levels = struct.Struct(f"<{4 * depth}d")
+        self._stride = _SLOT.size + self._levels.size
+        # 읽기 측: token_id → 슬롯 (헤더 배정 횟수가 바뀌면 재구성)
+        self._index:   dict[str, int] = {}
+        self._indexed  = -1
+        self._watched: dict[str, float] = {}   # WatchList 마지막 등록 시각 (IPC 최소화)
+        # 쓰기 측: 전체 호가 (price → size) + 슬롯 배정
+        self._books:   dict[str, tuple[dict[float, float], dict[float, float]]] = {}
+        self._slot_of: dict[str, int] = {}
+        self._free     = list(range(slots - 1, -1, -1))
+        self._full_warned = False
+
+    # ── 생성 / 연결 ──────────────────────────────────────────
+
+    @classmethod
+    def create(
+        cls,
+        watch: WatchList | None = None,
+        slots: int = BOOK_CACHE_SLOTS,
+        depth: int = BOOK_CACHE_DEPTH,
+    ) -> "BookCache":
+        """공유 메모리 생성 (supervisor / 단일 프로세스 main). close() 시 해제."""
+        stride = _SLOT.size + 32 * depth
+        shm = shared_memory.SharedMemory(create=True, size=HEADER_SIZE + slots * stride)
+        shm.buf[:shm.size] = bytes(shm.size)
+        _HEADER.pack_into(shm.buf, 0, MAGIC, slots, depth, 0, 1, 0, 0.0)
+        log.info(f"[bookcache] 생성: {shm.name} ({slots}슬롯 × {depth}단계, {shm.size // 1024}KB)")
+        return cls(shm, watch, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, watch: WatchList | None = None) -> "BookCache":
+        """다른 프로세스가 만든 캐시에 연결 (워커 프로세스)."""
+        return cls(shared_memory.SharedMemory(name=name), watch, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def close(self) -> None:
+        self._buf = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def _header(self) -> tuple[int, int, float]:
+        """(세대, 배정 횟수, heartbeat)."""
+        return _HEADER.unpack_from(self._buf, 0)[4:]
+
+    def _offset(self, slot: int) -> int:
+        return HEADER_SIZE + slot * self._stride
+
+    # ── 읽기 ─────────────────────────────────────────────────
+
+    def get(self, token_id: str, watch: bool = True, until: float | None = None) -> dict | None:
+        """최신 오더북 (REST /book 형태) 또는 None (미구독 / 오래됨 / 재연결 중).
+
+        watch=True 면 WatchList 에 등록 → 피드가 구독 추가, 다음 조회부터 캐시 사용.
+        until(epoch) 이후로는 구독 불필요 (진입 마감 — 그 뒤 스캔 안 함).
+        (보유 포지션처럼 이미 구독 중인 토큰은 watch=False)
+        """
+        book = self._read(token_id)
+        now  = time.time()
+        if watch and self._watch is not None and (
+            book is None or now - self._watched.get(token_id, 0.0) > BOOK_WATCH_TTL / 2
+        ):
+            self._watch.add(token_id, until)
+            self._watched[token_id] = now
+        return book
+
+    def _read(self, token_id: str) -> dict | None:
+        gen, assigned, heartbeat = self._header()
+        if time.time() - heartbeat > BOOK_CACHE_STALE_SEC:
+            return None
+        if assigned != self._indexed:
+            self._reindex(assigned)
+        slot = self._index.get(token_id)
+        if slot is None:
+            return None
+
+        off = self._offset(slot)
+        for _ in range(READ_TRIES):
+            seq = _SEQ.unpack_from(self._buf, off)[0]
+            if seq & 1:
+                continue
+            _, slot_gen, updated, raw, nb, na = _SLOT.unpack_from(self._buf, off)
+            levels = self._levels.unpack_from(self._buf, off + _SLOT.size)
+            if _SEQ.unpack_from(self._buf, off)[0] != seq:
+                continue
+            if raw.rstrip(b"\0").decode() != token_id:
+                self._indexed = -1     # 슬롯 재배정됨 → 다음 조회 때 재구성
+                return None
+            if slot_gen != gen:
+                return None
+            d = self._depth
+            return {
+                "asset_id":  token_id,
+                "bids": [
+                    {"price": str(levels[i]), "size": str(levels[d + i])}
+                    for i in range(nb - 1, -1, -1)
+                ],
+                "asks": [
+                    {"price": str(levels[2 * d + i]), "size": str(levels[3 * d + i])}
+                    for i in range(na - 1, -1, -1)
+                ],
+                "timestamp": str(int(updated * 1000)),
+            }
+        return None
+
+    def _reindex(self, assigned: int) -> None:
+        index = {}
+        for slot in range(self._slots):
+            raw = _SLOT.unpack_from(self._buf, self._offset(slot))[3].rstrip(b"\0")
+            if raw:
+                index[raw.decode()] = slot
+        self._index   = index
+        self._indexed = assigned
+
+    # ── 쓰기 (MarketFeed 전용) ───────────────────────────────
+
+    def invalidate(self) -> None:
+        """피드 재연결 / 종료 — 세대 증가로 기존 슬롯 전부 무효 (새 book 스냅샷 대기)."""
+        magic, slots, depth, _, gen, assigned, _ = _HEADER.unpack_from(self._buf, 0)
+        _HEADER.pack_into(self._buf, 0, magic, slots, depth, 0, gen + 1, assigned, 0.0)
+        self._books.clear()
+
+    def heartbeat(self) -> None:
+        """피드 생존 표시 (PING 주기)."""
+        magic, slots, depth, _, gen, assigned, _ = _HEADER.unpack_from(self._buf, 0)
+        _HEADER.pack_into(self._buf, 0, magic, slots, depth, 0, gen, assigned, time.time())
+
+    def apply(self, event: dict) -> None:
+        """market 채널 book / price_change 이벤트 반영."""
+        kind = event.get("event_type")
+        if kind == "book":
+            token_id = event.get("asset_id", "")
+            self._books[token_id] = (_levels(event.get("bids")), _levels(event.get("asks")))
+            self._write(token_id)
+        elif kind == "price_change":
+            touched = set()
+            for ch in event.get("price_changes") or []:
+                book = self._books.get(ch.get("asset_id", ""))
+                if book is None:
+                    continue    # book 스냅샷 전 변경분은 무시
+                side  = book[0] if ch.get("side") == "BUY" else book[1]
+                price = float(ch["price"])
+                size  = float(ch.get("size", 0))
+                if size > 0:
+                    side[price] = size
+                else:
+                    side.pop(price, None)
+                touched.add(ch["asset_id"])
+            for token_id in touched:
+                self._write(token_id)
+
+    def drop(self, token_id: str) -> None:
+        """구독 해제 토큰 — 슬롯 비우고 반납."""
+        self._books.pop(token_id, None)
+        slot = self._slot_of.pop(token_id, None)
+        if slot is None:
+            return
+        off = self._offset(slot)
+        seq = _SEQ.unpack_from(self._buf, off)[0]
+        _SEQ.pack_into(self._buf, off, seq + 1)
+        _SLOT.pack_into(self._buf, off, seq + 1, 0, 0.0, b"", 0, 0)
+        _SEQ.pack_into(self._buf, off, seq + 2)
+        self._free.append(slot)
+        self._bump_assigned()
+
+    def _write(self, token_id: str) -> None:
+        slot = self._slot_of.get(token_id)
+        if slot is None:
+            if not self._free:
+                if not self._full_warned:
+                    log.warning(f"[bookcache] 슬롯 {self._slots}개 모두 사용 — 추가 토큰은 REST 조회")
+                    self._full_warned = True
+                return
+            slot = self._slot_of[token_id] = self._free.pop()
+            assigned = True
+        else:
+            assigned = False
+
+        bids, asks = self._books[token_id]
+        d    = self._depth
+        top_b = sorted(bids.items(), reverse=True)[:d]
+        top_a = sorted(asks.items())[:d]
+        levels = [0.0] * (4 * d)
+        for i, (p, s) in enumerate(top_b):
+            levels[i], levels[d + i] = p, s
+        for i, (p, s) in enumerate(top_a):
+            levels[2 * d + i], levels[3 * d + i] = p, s
+
+        gen = self._header()[0]
+        off = self._offset(slot)
+        seq = _SEQ.unpack_from(self._buf, off)[0]
+        _SEQ.pack_into(self._buf, off, seq + 1)
+        _SLOT.pack_into(
+            self._buf, off, seq + 1, gen, time.time(), token_id.encode(), len(top_b), len(top_a),
+        )
+        self._levels.pack_into(self._buf, off + _SLOT.size, *levels)
+        _SEQ.pack_into(self._buf, off, seq + 2)
+        if assigned:
+            self._bump_assigned()
+
+    def _bump_assigned(self) -> None:
+        magic, slots, depth, _, gen, assigned, hb = _HEADER.unpack_from(self._buf, 0)
+        _HEADER.pack_into(self._buf, 0, magic, slots, depth, 0, gen, assigned + 1, hb)
+
+
+def _levels(raw: list[dict] | None) -> dict[float, float]:
+    return {
+        float(lv["price"]): float(lv["size"])
+        for lv in raw or ()
+        if lv.get("price") is not None and float(lv.get("size", 0)) > 0
+    }
@@ -0,0 +1,164 @@
+"""
+core/checkpoint.py - 웜 스타트 체크포인트 (재시작 시 Odds API 재호출 없이 복원)
+
+재시작하면 메모리 상태(직전 배당 / 마켓 / 폴링 일정)가 사라지고 즉시 전체 폴링 → 크레딧 소모.
+폴링 사이클마다 샤드별 상태를 압축 파일로 저장, 시작 시 복원 후 항목별로 검증.
+
+  저장 내용:  직전 Pinnacle 경기(배당) + 지문 / 폴리마켓 마켓 / 폴링 일정(다음 폴링 시각,
+              폴링 횟수, 크레딧 경고 발송 여부)
+  형식:       JSON → zlib, 임시 파일 기록 후 os.replace (쓰는 도중 종료돼도 이전 파일 유지)
+  복원 검증:  버전 / 샤드 / 저장 후 CHECKPOINT_MAX_AGE 초과 → 폐기 (콜드 스타트)
+              경기: 지문 불일치(손상) / 진입 마감 지난 경기 제외
+              마켓: 경기 시작 시각 지난 마켓 제외
+  재사용:     복원분은 매핑 + 사전 서명만 (주문 / 스냅샷 기록 없음 — Pipeline.warm_up),
+              다음 폴링에서 지문과 호가가 그대로인 경기는 재스캔 생략
+
+supervisor.py 멀티 프로세스 모드에서는 샤드(폴링 워커)마다 파일 1개.
+모의 거래(main.py --paper)는 PAPER_CHECKPOINT_PATH — 실거래 폴링 일정 / 상태와 섞이지 않음.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+import zlib
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from config import CHECKPOINT_PATH, CHECKPOINT_MAX_AGE, BET_ENTRY_DEADLINE_HRS
+from core.matcher import PolymarketMarket
+from core.odds_fetcher import PinnacleGame
+
+log = logging.getLogger(__name__)
+
+VERSION = 1
+
+
+@dataclass
+class WarmState:
+    """샤드 1개의 재시작 복원 상태."""
+    shard:                str
+    resume_at:            float = 0.0     # 다음 폴링 예정 (epoch) — 이전이면 Odds API 호출 안 함
+    poll_count:           int   = 0
+    credits_warning_sent: bool  = False
+    games:                list[PinnacleGame]     = field(default_factory=list)
+    markets:              list[PolymarketMarket] = field(default_factory=list)
+
+    @property
+    def due(self) -> bool:
+        """다음 폴링 시각이 지났으면 True (콜드 폴링 필요)."""
+        return time.time() >= self.resume_at
+
+
+def fingerprint(game: PinnacleGame) -> str:
+    """경기 + 배당 지문 (복원 시 손상 검출 / 배당 변경 비교)."""
+    raw = f"{game.game_id}|{game.commence_time.isoformat()}|{game.home_odds}|{game.away_odds}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def _path(shard: str, template: str | None = None) -> Path:
+    return Path((template or CHECKPOINT_PATH).format(shard=shard))
+
+
+def encode(obj) -> dict:
+    """PinnacleGame / PolymarketMarket → JSON 호환 dict (datetime → ISO 문자열)."""
+    d = asdict(obj)
+    for k, v in d.items():
+        if isinstance(v, datetime):
+            d[k] = v.isoformat()
+    return d
+
+
+def decode(cls, d: dict, time_field: str):
+    """encode() 역변환 (time_field 를 datetime 으로)."""
+    d = dict(d)
+    d[time_field] = datetime.fromisoformat(d[time_field])
+    return cls(**d)
+
+
+# ── 저장 ─────────────────────────────────────────────────────
+
+def save(state: WarmState, template: str | None = None) -> int:
+    """상태 저장 (동기 — 이벤트 루프에서는 to_thread). 기록한 바이트 수 반환.
+
+    template: 파일 경로 형식 ({shard} 포함, 기본 CHECKPOINT_PATH).
+    """
+    payload = {
+        "version":              VERSION,
+        "shard":                state.shard,
+        "saved_at":             time.time(),
+        "resume_at":            state.resume_at,
+        "poll_count":           state.poll_count,
+        "credits_warning_sent": state.credits_warning_sent,
+        "games":   [dict(encode(g), fp=fingerprint(g)) for g in state.games],
+        "markets": [encode(m) for m in state.markets],
+    }
+    data = zlib.compress(json.dumps(payload, separators=(",", ":")).encode(), 6)
+    path = _path(state.shard, template)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    log.debug(f"[checkpoint] 저장: {path} ({len(data)}B, 경기 {len(state.games)} / 마켓 {len(state.markets)})")
+    return len(data)
+
+
+# ── 복원 ─────────────────────────────────────────────────────
+
+def load(shard: str, template: str | None = None) -> WarmState | None:
+    """체크포인트 복원 + 검증. 없거나 무효면 None (콜드 스타트). template 은 save() 와 동일."""
+    path = _path(shard, template)
+    try:
+        payload = json.loads(zlib.decompress(path.read_bytes()))
+    except FileNotFoundError:
+        return None
+    except (OSError, zlib.error, ValueError) as e:
+        log.warning(f"[checkpoint] 읽기 실패 — 콜드 스타트: {e}")
+        return None
+
+    age = time.time() - payload.get("saved_at", 0)
+    if payload.get("version") != VERSION or payload.get("shard") != shard:
+        log.warning("[checkpoint] 버전 / 샤드 불일치 — 콜드 스타트")
+        return None
+    if age > CHECKPOINT_MAX_AGE:
+        log.info(f"[checkpoint] {age / 60:.0f}분 지난 체크포인트 — 콜드 스타트")
+        return None
+
+    now   = datetime.now(timezone.utc)
+    games = []
+    for raw in payload.get("games", []):
+        fp = raw.pop("fp", None)
+        try:
+            game = decode(PinnacleGame, raw, "commence_time")
+        except (KeyError, TypeError, ValueError):
+            continue
+        if fp != fingerprint(game) or game.hours_until_start() < BET_ENTRY_DEADLINE_HRS:
+            continue
+        games.append(game)
+
+    markets = []
+    for raw in payload.get("markets", []):
+        try:
+            market = decode(PolymarketMarket, raw, "game_start_time")
+        except (KeyError, TypeError, ValueError):
+            continue
+        if market.game_start_time > now:
+            markets.append(market)
+
+    state = WarmState(
+        shard                = shard,
+        resume_at            = payload.get("resume_at", 0.0),
+        poll_count           = payload.get("poll_count", 0),
+        credits_warning_sent = payload.get("credits_warning_sent", False),
+        games                = games,
+        markets              = markets,
+    )
+    dropped = len(payload.get("games", [])) - len(games)
+    log.info(
+        f"[checkpoint] 복원 ({age / 60:.0f}분 전 저장): 경기 {len(games)}개 (제외 {dropped}) / "
+        f"마켓 {len(markets)}개 / 폴링 #{state.poll_count}, "
+        f"다음 폴링 {max(0.0, state.resume_at - time.time()) / 60:.0f}분 후"
+    )
+    return state
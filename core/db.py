@@ -2,67 +2,367 @@
 core/db.py - SQLite 포지션 및 배팅 기록 관리
 
 테이블:
-  bets    - 체결된 배팅 기록 (진입 정보)
-  results - 경기 결과 및 수익/손실 기록
+  bets      - 체결된 배팅 기록 (진입 정보 + 실제 체결가/수량)
+  results   - 경기 결과 및 수익/손실 기록
+  bet_stats - 누적 통계 롤업 (단일 행) — insert/settle/void와 같은 트랜잭션에서 갱신
+              get_stats / count_consecutive_losses 는 전체 이력 집계 대신 이 행만 읽음
+  odds_snapshots / book_snapshots
+            - 시계열 (Pinnacle 배당 / 토큰별 best bid·ask·호가 깊이), ts 는 분 단위로 내림
+              호가는 market 채널 변동마다(분당 최대 1행), 배당은 폴링 시점마다
+              core/timeseries.py 가 메모리에 모아 executemany 일괄 기록
+  match_snapshots
+            - 스캔한 (경기, 마켓) 쌍의 최신 정보 — 모의 거래 재생 입력 (core/paper.py)
+  outbox    - 미전송 텔레그램 알림 (core/outbox.py) — 재시작 시 재전송
 
-모든 메서드는 동기(sync). 비동기 컨텍스트에서는 asyncio.to_thread()로 호출.
+스키마 마이그레이션:
+  PRAGMA user_version 으로 적용 버전 관리. _MIGRATIONS 순서대로 미적용분만 실행.
+  버전마다 BEGIN / COMMIT 트랜잭션 1개 (실패 시 스키마 + user_version 함께 롤백).
+
+체결 상태 (bets.fill_status):
+  matched / delayed  → 주문 응답 기준 (미확정)
+  mined / confirmed  → user 채널 trade 이벤트로 확정
+  failed             → 체결 실패 → outcome='void' (포지션 해제)
+
+연결 구조:
+  - 쓰기: 전용 writer 스레드 1개가 장기 연결을 소유, 큐로 작업 수신 (직렬화)
+  - 읽기: 스레드별 장기 연결 (threading.local) — WAL이라 쓰기 중에도 읽기 가능
+  - PRAGMA: WAL / synchronous=NORMAL / busy_timeout / mmap / 메모리 temp
+  - 연결을 재사용하므로 sqlite3 statement 캐시(cached_statements)로 prepared 재사용
+
+메서드는 동기(sync) — 쓰기는 writer 완료까지 대기.
+비동기 컨텍스트에서는 db.aio.<메서드>() 사용 (워커 스레드 실행, 이벤트 루프 비차단).
 """
 
+import asyncio
 import logging
+import queue
 import sqlite3
+import threading
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Callable
 
 from config import DB_PATH
 
 log = logging.getLogger(__name__)
 
+BUSY_TIMEOUT_SEC = 5.0
+STATEMENT_CACHE  = 256    # 연결당 prepared statement 캐시 크기
+
+_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",      # WAL에서는 커밋마다 fsync 불필요
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",        # 8MB
+    "PRAGMA mmap_size=67108864",      # 64MB
+)
+
+# 초기 스키마 이후 추가된 bets 컬럼 (기존 DB에 ALTER TABLE로 보강)
+_ADDED_BET_COLUMNS = [
+    ("condition_id", "TEXT"),
+    ("fill_status",  "TEXT"),
+    ("fill_price",   "REAL DEFAULT NULL"),
+    ("fill_size",    "REAL DEFAULT NULL"),
+]
+
+
+def _migrate_base(conn: sqlite3.Connection) -> None:
+    """기본 테이블 (bets / results)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS bets (
+            id            INTEGER PRIMARY KEY AUTOINCREMENT,
+            game_id       TEXT NOT NULL,
+            event_title   TEXT NOT NULL,
+            token_id      TEXT NOT NULL,
+            buy_label     TEXT NOT NULL,      -- "YES" | "NO"
+            favorite_team TEXT NOT NULL,
+            pinnacle_odds REAL NOT NULL,
+            pinnacle_prob REAL NOT NULL,
+            poly_price    REAL NOT NULL,
+            gap_size      REAL NOT NULL,
+            bet_usdc      REAL NOT NULL,
+            order_id      TEXT,
+            condition_id  TEXT,
+            fill_status   TEXT,               -- "matched" | "delayed" | "mined" | "confirmed" | "failed"
+            fill_price    REAL DEFAULT NULL,  -- 실제 평균 체결가
+            fill_size     REAL DEFAULT NULL,  -- 실제 체결 수량 (shares)
+            commence_time TEXT NOT NULL,
+            bet_at        TEXT NOT NULL,
+            outcome       TEXT DEFAULT 'pending',  -- "win" | "loss" | "pending" | "void"
+            pnl_usdc      REAL DEFAULT NULL,
+            settled_at    TEXT DEFAULT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS results (
+            id         INTEGER PRIMARY KEY AUTOINCREMENT,
+            bet_id     INTEGER NOT NULL REFERENCES bets(id),
+            order_id   TEXT NOT NULL,
+            outcome    TEXT NOT NULL,
+            pnl_usdc   REAL NOT NULL,
+            settled_at TEXT NOT NULL
+        )
+    """)
+    # 기존 DB 호환: 나중에 추가된 컬럼 보강
+    cols = {r["name"] for r in conn.execute("PRAGMA table_info(bets)")}
+    for name, decl in _ADDED_BET_COLUMNS:
+        if name not in cols:
+            conn.execute(f"ALTER TABLE bets ADD COLUMN {name} {decl}")
+
+
+def _migrate_indexes(conn: sqlite3.Connection) -> None:
+    """bets 조회 인덱스 (outcome / settled_at / token_id / game_id)"""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bets_outcome    ON bets(outcome)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bets_settled_at ON bets(settled_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bets_token_id   ON bets(token_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bets_game_id    ON bets(game_id)")
+
+
+def _migrate_stats(conn: sqlite3.Connection) -> None:
+    """bet_stats 롤업 테이블 + 기존 이력 백필"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS bet_stats (
+            id          INTEGER PRIMARY KEY CHECK (id = 1),
+            total       INTEGER NOT NULL DEFAULT 0,
+            wins        INTEGER NOT NULL DEFAULT 0,
+            losses      INTEGER NOT NULL DEFAULT 0,
+            pending     INTEGER NOT NULL DEFAULT 0,
+            voided      INTEGER NOT NULL DEFAULT 0,
+            total_pnl   REAL    NOT NULL DEFAULT 0,
+            loss_streak INTEGER NOT NULL DEFAULT 0   -- 최근 정산부터 연속 패배 수
+        )
+    """)
+    _rebuild_stats(conn)
+
+
+def _migrate_snapshots(conn: sqlite3.Connection) -> None:
+    """시계열 스냅샷 테이블 (odds_snapshots / book_snapshots)"""
+    # ts = 관측 시각을 분 단위로 내린 epoch 초 (다운샘플 후 시간 단위). (키, ts) 클러스터링 → 범위 조회 순차 읽기
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS odds_snapshots (
+            game_id   TEXT    NOT NULL,
+            ts        INTEGER NOT NULL,
+            home_odds REAL    NOT NULL,
+            away_odds REAL    NOT NULL,
+            PRIMARY KEY (game_id, ts)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS book_snapshots (
+            token_id  TEXT    NOT NULL,
+            ts        INTEGER NOT NULL,
+            best_bid  REAL,
+            best_ask  REAL,
+            bid_depth REAL    NOT NULL DEFAULT 0,   -- 상위 3호가 수량 합 (shares)
+            ask_depth REAL    NOT NULL DEFAULT 0,
+            PRIMARY KEY (token_id, ts)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_odds_snapshots_ts ON odds_snapshots(ts)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_book_snapshots_ts ON book_snapshots(ts)")
+
+
+def _migrate_outbox(conn: sqlite3.Connection) -> None:
+    """알림 아웃박스 테이블 (outbox)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS outbox (
+            id         INTEGER PRIMARY KEY AUTOINCREMENT,
+            text       TEXT    NOT NULL,
+            created_at TEXT    NOT NULL,
+            attempts   INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+
+def _migrate_matches(conn: sqlite3.Connection) -> None:
+    """매핑 경기 스냅샷 테이블 (match_snapshots)"""
+    # 스캔한 (경기, 마켓) 쌍 — 모의 거래 재생(core/paper.py)이 odds / book 스냅샷과 결합
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS match_snapshots (
+            game_id      TEXT    NOT NULL,
+            condition_id TEXT    NOT NULL,
+            ts           INTEGER NOT NULL,   -- 마지막 관측 (분 단위 epoch 초)
+            game         TEXT    NOT NULL,   -- PinnacleGame JSON
+            market       TEXT    NOT NULL,   -- PolymarketMarket JSON
+            PRIMARY KEY (game_id, condition_id)
+        ) WITHOUT ROWID
+    """)
+
+
+def _migrate_bet_sport(conn: sqlite3.Connection) -> None:
+    """bets.sport 컬럼 (샤드 종목 — 모니터 예상 종료 시각 계산)"""
+    cols = {r["name"] for r in conn.execute("PRAGMA table_info(bets)")}
+    if "sport" not in cols:
+        conn.execute("ALTER TABLE bets ADD COLUMN sport TEXT")    # NULL = 샤딩 이전 단일 종목 (ODDS_SPORT)
+
+
+_MIGRATIONS: list[Callable[[sqlite3.Connection], None]] = [
+    _migrate_base,        # v1
+    _migrate_indexes,     # v2
+    _migrate_stats,       # v3
+    _migrate_snapshots,   # v4
+    _migrate_outbox,      # v5
+    _migrate_matches,     # v6
+    _migrate_bet_sport,   # v7
+]
+
+
+def _rebuild_stats(conn: sqlite3.Connection) -> None:
+    """bets 전체를 집계해 bet_stats 행 재작성."""
+    row = conn.execute("""
+        SELECT
+            COUNT(*) AS total,
+            COALESCE(SUM(CASE WHEN outcome='win'     THEN 1 ELSE 0 END), 0) AS wins,
+            COALESCE(SUM(CASE WHEN outcome='loss'    THEN 1 ELSE 0 END), 0) AS losses,
+            COALESCE(SUM(CASE WHEN outcome='pending' THEN 1 ELSE 0 END), 0) AS pending,
+            COALESCE(SUM(CASE WHEN outcome='void'    THEN 1 ELSE 0 END), 0) AS voided,
+            COALESCE(SUM(COALESCE(pnl_usdc, 0)), 0) AS total_pnl
+        FROM bets
+    """).fetchone()
+    streak = 0
+    for r in conn.execute(
+        "SELECT outcome FROM bets WHERE outcome IN ('win', 'loss') ORDER BY settled_at DESC"
+    ):
+        if r["outcome"] != "loss":
+            break
+        streak += 1
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO bet_stats
+            (id, total, wins, losses, pending, voided, total_pnl, loss_streak)
+        VALUES (1, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (*row, streak),
+    )
+
+
+def _settle(
+    conn: sqlite3.Connection, bet_id: int, outcome: str, pnl_usdc: float, settled_at: str,
+) -> bool:
+    """정산 1건: bets 갱신 + results 기록 + 롤업 반영. pending 이 아니면 아무것도 안 하고 False."""
+    cur = conn.execute(
+        "UPDATE bets SET outcome=?, pnl_usdc=?, settled_at=? WHERE id=? AND outcome='pending'",
+        (outcome, pnl_usdc, settled_at, bet_id),
+    )
+    if not cur.rowcount:
+        return False
+    conn.execute(
+        """
+        INSERT INTO results (bet_id, order_id, outcome, pnl_usdc, settled_at)
+        SELECT id, order_id, ?, ?, ? FROM bets WHERE id=?
+        """,
+        (outcome, pnl_usdc, settled_at, bet_id),
+    )
+    _roll_settle(conn, outcome, pnl_usdc)
+    return True
+
+
+def _roll_settle(conn: sqlite3.Connection, outcome: str, pnl_usdc: float) -> None:
+    """pending → win/loss 정산을 bet_stats에 반영 (정산과 같은 트랜잭션)."""
+    conn.execute(
+        """
+        UPDATE bet_stats SET
+            pending     = pending - 1,
+            wins        = wins   + (? = 'win'),
+            losses      = losses + (? = 'loss'),
+            voided      = voided + (? = 'void'),
+            total_pnl   = total_pnl + ?,
+            loss_streak = CASE ? WHEN 'loss' THEN loss_streak + 1
+                                 WHEN 'win'  THEN 0
+                                 ELSE loss_streak END
+        WHERE id=1
+        """,
+        (outcome, outcome, outcome, pnl_usdc or 0, outcome),
+    )
+
 
 class DB:
     """SQLite 배팅 기록 관리."""
 
     def __init__(self, db_path: str = DB_PATH):
-        self._path = db_path
+        self._path  = db_path
+        self._local = threading.local()
+        self._queue: queue.Queue[tuple[Callable, Future] | None] = queue.Queue()
+        self._closed = False
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-        self._init_tables()
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._path)
+        self._writer = threading.Thread(
+            target=self._write_loop, name="db-writer", daemon=True,
+        )
+        self._writer.start()
+        self._write(self._init_tables).result()
+        self.aio = _AsyncDB(self)
+
+    # ── 연결 / writer 스레드 ─────────────────────────────────
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._path, timeout=BUSY_TIMEOUT_SEC, cached_statements=STATEMENT_CACHE,
+        )
         conn.row_factory = sqlite3.Row
+        for pragma in _PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """현재 스레드 전용 읽기 연결 (최초 1회 생성 후 재사용)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._open()
         return conn
 
-    def _init_tables(self) -> None:
-        with self._connect() as conn:
-            conn.executescript("""
-                CREATE TABLE IF NOT EXISTS bets (
-                    id            INTEGER PRIMARY KEY AUTOINCREMENT,
-                    game_id       TEXT NOT NULL,
-                    event_title   TEXT NOT NULL,
-                    token_id      TEXT NOT NULL,
-                    buy_label     TEXT NOT NULL,      -- "YES" | "NO"
-                    favorite_team TEXT NOT NULL,
-                    pinnacle_odds REAL NOT NULL,
-                    pinnacle_prob REAL NOT NULL,
-                    poly_price    REAL NOT NULL,
-                    gap_size      REAL NOT NULL,
-                    bet_usdc      REAL NOT NULL,
-                    order_id      TEXT,
-                    commence_time TEXT NOT NULL,
-                    bet_at        TEXT NOT NULL,
-                    outcome       TEXT DEFAULT 'pending',  -- "win" | "loss" | "pending"
-                    pnl_usdc      REAL DEFAULT NULL,
-                    settled_at    TEXT DEFAULT NULL
-                );
-
-                CREATE TABLE IF NOT EXISTS results (
-                    id         INTEGER PRIMARY KEY AUTOINCREMENT,
-                    bet_id     INTEGER NOT NULL REFERENCES bets(id),
-                    order_id   TEXT NOT NULL,
-                    outcome    TEXT NOT NULL,
-                    pnl_usdc   REAL NOT NULL,
-                    settled_at TEXT NOT NULL
-                );
-            """)
+    def _write_loop(self) -> None:
+        conn = self._open()
+        conn.execute("PRAGMA journal_mode=WAL")
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            job, fut = item
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                with conn:    # 작업 1건 = 트랜잭션 1개
+                    result = job(conn)
+                fut.set_result(result)
+            except BaseException as e:
+                fut.set_exception(e)
+        conn.close()
+
+    def _write(self, job: Callable[[sqlite3.Connection], Any]) -> Future:
+        """쓰기 작업을 writer 큐에 넣고 Future 반환."""
+        if self._closed:
+            raise RuntimeError("[db] writer 종료 후 쓰기 요청")
+        fut: Future = Future()
+        self._queue.put((job, fut))
+        return fut
+
+    def close(self) -> None:
+        """대기 중인 쓰기를 모두 처리한 뒤 writer 종료."""
+        self._closed = True
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def _init_tables(self, conn: sqlite3.Connection) -> None:
+        """미적용 마이그레이션을 순서대로 실행 (버전마다 명시적 트랜잭션 1개).
+
+        sqlite3 모듈은 DDL 앞에 BEGIN 을 넣지 않고 executescript 는 즉시 COMMIT 하므로
+        BEGIN / COMMIT 을 직접 실행 — 중간 실패 시 스키마와 user_version 이 함께 롤백.
+        """
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for target, migrate in enumerate(_MIGRATIONS, start=1):
+            if target <= version:
+                continue
+            conn.execute("BEGIN")
+            try:
+                migrate(conn)
+                conn.execute(f"PRAGMA user_version={target}")
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            log.info(f"[db] 스키마 마이그레이션 v{target}: {migrate.__doc__}")
         log.info(f"[db] SQLite 초기화: {self._path}")
 
     # ── 베팅 기록 ────────────────────────────────────────────
@@ -81,51 +381,240 @@ class DB:
         bet_usdc:      float,
         order_id:      str | None,
         commence_time: str,
+        condition_id:  str | None = None,
+        fill_status:   str | None = None,
+        fill_price:    float | None = None,
+        fill_size:     float | None = None,
+        sport:         str | None = None,
     ) -> int:
-        """베팅 기록 삽입. 삽입된 row ID 반환."""
+        """베팅 기록 삽입. 삽입된 row ID 반환.
+
+        fill_price / fill_size: 삽입 시점에 체결이 확정된 경우 (모의 거래 — core/paper.py).
+        sport: Odds API sport 키 (모니터가 종목별 경기 길이로 점검 시각 계산).
+        """
         bet_at = datetime.now(timezone.utc).isoformat()
-        with self._connect() as conn:
-            cur = conn.execute(
+        params = (
+            game_id, event_title, token_id, buy_label, favorite_team,
+            pinnacle_odds, pinnacle_prob, poly_price, gap_size,
+            bet_usdc, order_id, condition_id, fill_status, fill_price, fill_size,
+            commence_time, bet_at, sport,
+        )
+
+        def job(conn: sqlite3.Connection) -> int:
+            conn.execute("UPDATE bet_stats SET total=total+1, pending=pending+1 WHERE id=1")
+            return conn.execute(
                 """
                 INSERT INTO bets
                   (game_id, event_title, token_id, buy_label, favorite_team,
                    pinnacle_odds, pinnacle_prob, poly_price, gap_size,
-                   bet_usdc, order_id, commence_time, bet_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   bet_usdc, order_id, condition_id, fill_status, fill_price, fill_size,
+                   commence_time, bet_at, sport)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    game_id, event_title, token_id, buy_label, favorite_team,
-                    pinnacle_odds, pinnacle_prob, poly_price, gap_size,
-                    bet_usdc, order_id, commence_time, bet_at,
-                ),
-            )
-        log.info(f"[db] 베팅 삽입: bet_id={cur.lastrowid} | {event_title}")
-        return cur.lastrowid
+                params,
+            ).lastrowid
+
+        bet_id = self._write(job).result()
+        log.info(f"[db] 베팅 삽입: bet_id={bet_id} | {event_title}")
+        return bet_id
 
     def settle_bet(self, bet_id: int, outcome: str, pnl_usdc: float) -> None:
-        """베팅 결과 정산."""
+        """베팅 결과 정산 (이미 정산 / 무효된 베팅은 건너뜀)."""
+        self.settle_many([(bet_id, outcome, pnl_usdc)])
+
+    def settle_many(self, settlements: list[tuple[int, str, float]]) -> None:
+        """여러 베팅 일괄 정산 [(bet_id, outcome, pnl_usdc)] — 트랜잭션 1개."""
+        if not settlements:
+            return
+        settled_at = datetime.now(timezone.utc).isoformat()
+
+        def job(conn: sqlite3.Connection) -> list[bool]:
+            return [_settle(conn, bet_id, outcome, pnl_usdc, settled_at)
+                    for bet_id, outcome, pnl_usdc in settlements]
+
+        done = self._write(job).result()
+        for (bet_id, outcome, pnl_usdc), settled in zip(settlements, done):
+            if settled:
+                log.info(f"[db] 정산: bet_id={bet_id} | {outcome} | P&L=${pnl_usdc:+.2f}")
+            else:
+                log.warning(f"[db] 이미 정산된 베팅 — 건너뜀: bet_id={bet_id} | {outcome}")
+
+    # ── 체결 추적 ────────────────────────────────────────────
+
+    def record_fill(
+        self,
+        bet_id:      int,
+        fill_status: str,
+        fill_price:  float | None = None,
+        fill_size:   float | None = None,
+    ) -> None:
+        """user 채널 체결 상태 반영. 가격/수량이 None이면 기존 값 유지."""
+        self._write(lambda conn: conn.execute(
+            """
+            UPDATE bets SET
+                fill_status = ?,
+                fill_price  = COALESCE(?, fill_price),
+                fill_size   = COALESCE(?, fill_size)
+            WHERE id=?
+            """,
+            (fill_status, fill_price, fill_size, bet_id),
+        )).result()
+        log.info(
+            f"[db] 체결 상태: bet_id={bet_id} | {fill_status}"
+            + (f" | {fill_size:.2f}주 @ {fill_price:.4f}" if fill_price and fill_size else "")
+        )
+
+    def void_bet(self, bet_id: int, fill_status: str = "failed") -> None:
+        """체결 실패 베팅 무효 처리 (손익 0, 포지션 해제)."""
         settled_at = datetime.now(timezone.utc).isoformat()
-        with self._connect() as conn:
+
+        def job(conn: sqlite3.Connection) -> None:
+            cur = conn.execute(
+                """
+                UPDATE bets SET outcome='void', pnl_usdc=0, fill_status=?, settled_at=?
+                WHERE id=? AND outcome='pending'
+                """,
+                (fill_status, settled_at, bet_id),
+            )
+            if cur.rowcount:
+                conn.execute("UPDATE bet_stats SET pending=pending-1, voided=voided+1 WHERE id=1")
+
+        self._write(job).result()
+        log.warning(f"[db] 베팅 무효 (체결 실패): bet_id={bet_id} | {fill_status}")
+
+    # ── 시계열 스냅샷 ────────────────────────────────────────
+
+    def insert_snapshots(
+        self,
+        odds:    list[tuple[str, int, float, float]],
+        books:   list[tuple[str, int, float | None, float | None, float, float]],
+        matches: list[tuple[str, str, int, str, str]] = (),
+    ) -> None:
+        """스냅샷 일괄 기록 (executemany, 트랜잭션 1개). 같은 (키, ts)는 덮어씀.
+
+        matches: (game_id, condition_id, ts, game JSON, market JSON) — 쌍마다 최신 1행.
+        """
+        def job(conn: sqlite3.Connection) -> None:
+            if odds:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO odds_snapshots VALUES (?, ?, ?, ?)", odds,
+                )
+            if books:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO book_snapshots VALUES (?, ?, ?, ?, ?, ?)", books,
+                )
+            if matches:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO match_snapshots VALUES (?, ?, ?, ?, ?)", matches,
+                )
+
+        self._write(job).result()
+
+    def compact_snapshots(
+        self, downsample_before: int, delete_before: int, since: int = 0,
+    ) -> tuple[int, int]:
+        """보존기간 정리 + 다운샘플. (압축된 행 수, 삭제된 행 수) 반환.
+
+        [since, downsample_before) 구간의 행은 시간 단위 평균 1행으로 대체,
+        delete_before 이전 행은 삭제.
+        """
+        def job(conn: sqlite3.Connection) -> tuple[int, int]:
+            deleted = 0
+            for table in ("odds_snapshots", "book_snapshots", "match_snapshots"):
+                deleted += conn.execute(
+                    f"DELETE FROM {table} WHERE ts < ?", (delete_before,),
+                ).rowcount
+
+            window = (max(since, delete_before), downsample_before)
             conn.execute(
-                "UPDATE bets SET outcome=?, pnl_usdc=?, settled_at=? WHERE id=?",
-                (outcome, pnl_usdc, settled_at, bet_id),
+                """
+                INSERT OR REPLACE INTO odds_snapshots
+                SELECT game_id, ts - ts % 3600, AVG(home_odds), AVG(away_odds)
+                FROM odds_snapshots WHERE ts >= ? AND ts < ?
+                GROUP BY game_id, ts - ts % 3600
+                """,
+                window,
             )
             conn.execute(
                 """
-                INSERT INTO results (bet_id, order_id, outcome, pnl_usdc, settled_at)
-                SELECT id, order_id, ?, ?, ? FROM bets WHERE id=?
+                INSERT OR REPLACE INTO book_snapshots
+                SELECT token_id, ts - ts % 3600, AVG(best_bid), AVG(best_ask),
+                       AVG(bid_depth), AVG(ask_depth)
+                FROM book_snapshots WHERE ts >= ? AND ts < ?
+                GROUP BY token_id, ts - ts % 3600
                 """,
-                (outcome, pnl_usdc, settled_at, bet_id),
+                window,
             )
-        log.info(f"[db] 정산: bet_id={bet_id} | {outcome} | P&L=${pnl_usdc:+.2f}")
+            merged = 0
+            for table in ("odds_snapshots", "book_snapshots"):
+                merged += conn.execute(
+                    f"DELETE FROM {table} WHERE ts >= ? AND ts < ? AND ts % 3600 != 0",
+                    window,
+                ).rowcount
+            return merged, deleted
+
+        return self._write(job).result()
+
+    def get_snapshots(self, since: int = 0, until: int | None = None) -> dict[str, list[tuple]]:
+        """[since, until) 구간 스냅샷 전체 (모의 거래 재생용). 테이블별 ts 오름차순 튜플 목록."""
+        until = until if until is not None else 2 ** 62
+        conn  = self._reader()
+        return {
+            "matches": [tuple(r) for r in conn.execute(
+                "SELECT game_id, condition_id, ts, game, market FROM match_snapshots "
+                "WHERE ts >= ? ORDER BY ts", (since,),
+            )],
+            "odds": [tuple(r) for r in conn.execute(
+                "SELECT game_id, ts, home_odds, away_odds FROM odds_snapshots "
+                "WHERE ts >= ? AND ts < ? ORDER BY ts", (since, until),
+            )],
+            "books": [tuple(r) for r in conn.execute(
+                "SELECT token_id, ts, best_bid, best_ask, bid_depth, ask_depth FROM book_snapshots "
+                "WHERE ts >= ? AND ts < ? ORDER BY ts", (since, until),
+            )],
+        }
+
+    # ── 알림 아웃박스 ────────────────────────────────────────
+
+    def outbox_put(self, text: str) -> Future:
+        """미전송 알림 1건 저장 요청 (비차단). row ID 를 담은 Future 반환."""
+        created_at = datetime.now(timezone.utc).isoformat()
+        return self._write(lambda conn: conn.execute(
+            "INSERT INTO outbox (text, created_at) VALUES (?, ?)", (text, created_at),
+        ).lastrowid)
+
+    def outbox_done(self, ids: list[int]) -> None:
+        """전송 완료(또는 포기) 알림 삭제."""
+        self._write(lambda conn: conn.executemany(
+            "DELETE FROM outbox WHERE id=?", [(i,) for i in ids],
+        )).result()
+
+    def outbox_retry(self, ids: list[int]) -> None:
+        self._write(lambda conn: conn.executemany(
+            "UPDATE outbox SET attempts=attempts+1 WHERE id=?", [(i,) for i in ids],
+        )).result()
+
+    def outbox_pending(self) -> list[dict]:
+        rows = self._reader().execute("SELECT * FROM outbox ORDER BY id").fetchall()
+        return [dict(row) for row in rows]
 
     # ── 조회 ─────────────────────────────────────────────────
 
     def get_pending_bets(self) -> list[dict]:
-        with self._connect() as conn:
-            rows = conn.execute(
-                "SELECT * FROM bets WHERE outcome='pending' ORDER BY bet_at"
-            ).fetchall()
+        rows = self._reader().execute(
+            "SELECT * FROM bets WHERE outcome='pending' ORDER BY bet_at"
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_unconfirmed_bets(self) -> list[dict]:
+        """체결 확정(confirmed) 전인 보유 포지션 — 재시작 시 추적 재개용."""
+        rows = self._reader().execute(
+            """
+            SELECT * FROM bets
+            WHERE outcome='pending' AND order_id IS NOT NULL
+              AND COALESCE(fill_status, '') NOT IN ('confirmed', 'failed')
+            """
+        ).fetchall()
         return [dict(row) for row in rows]
 
     def get_active_token_ids(self) -> set[str]:
@@ -134,35 +623,38 @@ class DB:
         return {r["token_id"] for r in rows}
 
     def count_consecutive_losses(self) -> int:
-        """최근 결과에서 연속 패배 횟수."""
-        with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT outcome FROM bets
-                WHERE outcome IN ('win', 'loss')
-                ORDER BY settled_at DESC
-                LIMIT 10
-                """
-            ).fetchall()
-        count = 0
-        for row in rows:
-            if row["outcome"] == "loss":
-                count += 1
-            else:
-                break
-        return count
+        """최근 결과에서 연속 패배 횟수 (bet_stats 롤업 — O(1))."""
+        row = self._reader().execute(
+            "SELECT loss_streak FROM bet_stats WHERE id=1"
+        ).fetchone()
+        return row["loss_streak"] if row else 0
 
     def get_stats(self) -> dict:
-        with self._connect() as conn:
-            row = conn.execute(
-                """
-                SELECT
-                    COUNT(*) AS total,
-                    SUM(CASE WHEN outcome='win'  THEN 1 ELSE 0 END) AS wins,
-                    SUM(CASE WHEN outcome='loss' THEN 1 ELSE 0 END) AS losses,
-                    SUM(CASE WHEN outcome='pending' THEN 1 ELSE 0 END) AS pending,
-                    ROUND(SUM(COALESCE(pnl_usdc, 0)), 2) AS total_pnl
-                FROM bets
-                """
-            ).fetchone()
+        row = self._reader().execute(
+            """
+            SELECT total, wins, losses, pending, ROUND(total_pnl, 2) AS total_pnl
+            FROM bet_stats WHERE id=1
+            """
+        ).fetchone()
         return dict(row) if row else {}
+
+    def rebuild_stats(self) -> None:
+        """bets 전체 재집계로 롤업 복구 (수동 보정용)."""
+        self._write(_rebuild_stats).result()
+        log.info(f"[db] 통계 롤업 재구성: {self.get_stats()}")
+
+
+class _AsyncDB:
+    """DB 메서드의 비동기 버전 (db.aio.get_stats()) — 워커 스레드에서 실행."""
+
+    def __init__(self, db: DB):
+        self._db = db
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        method = getattr(self._db, name)
+
+        async def call(*args, **kwargs):
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+        call.__name__ = name
+        return call
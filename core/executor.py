@@ -2,12 +2,17 @@
 core/executor.py - 폴리마켓 FOK 시장가 매수 실행
 
 ArbitrageOpportunity를 받아 CLOB에 FOK(Fill-Or-Kill) 매수 주문 실행.
-주문 성공 시 SQLite에 포지션 기록.
+주문 성공 시 SQLite에 포지션 기록 + OrderTracker에 order_id 등록 (체결 확정 추적).
 
 주문 방식:
   - MarketOrderArgs: 시장가, amount(USDC 기준), worst_price(슬리피지 보호)
   - FOK: 즉시 전량 체결 or 전량 취소
   - py-clob-client는 동기 SDK → asyncio.to_thread()로 비동기 래핑
+  - 사전 서명 주문(core/staging.py)이 조건과 일치하면 서명 생략, 제출만 수행
+  - CLOB 호출은 Governor 버킷 통과 (TRADING 우선순위 — 시세 조회보다 먼저)
+  - py-clob-client(web3 / eth 서명 스택)는 initialize() 시점에 import
+    → 분석 도구 / 주문 없는 워커는 SDK 로드 비용 없음
+  - 제출 경로는 _submit() 하나 — 모의 거래(core/paper.py PaperExecutor)가 이 부분만 교체
 """
 
 import asyncio
@@ -15,19 +20,20 @@ import logging
 import os
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-
-from dotenv import load_dotenv
-from py_clob_client.client import ClobClient
-from py_clob_client.clob_types import (
-    ApiCreds, MarketOrderArgs, OrderType, PartialCreateOrderOptions,
-)
-from py_clob_client.order_builder.constants import BUY
+from typing import TYPE_CHECKING
 
 from config import CLOB_HOST, CHAIN_ID, MAX_POSITIONS
 from core.db import DB
+from core.governor import TRADING, Governor
+from core.metrics import ORDERS, ORDER_LATENCY
+from core.order_tracker import OrderTracker
+from core.positions import PositionBook
 from core.scanner import ArbitrageOpportunity
+from core.staging import OrderStager
+
+if TYPE_CHECKING:
+    from py_clob_client.client import ClobClient
 
-load_dotenv()
 log = logging.getLogger(__name__)
 
 
@@ -40,6 +46,9 @@ class ExecutionResult:
     message:     str
     opportunity: ArbitrageOpportunity
     timestamp:   datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    latency_ms:  float | None = None   # 감지(detected_at) → 제출 완료까지
+    staged:      bool = False          # 사전 서명 주문 사용 여부
+    bet_id:      int | None = None     # DB 기록 ID (성공 시)
 
     def __str__(self) -> str:
         opp = self.opportunity
@@ -55,15 +64,36 @@ class ExecutionResult:
 class Executor:
     """폴리마켓 주문 실행기."""
 
-    def __init__(self, db: DB):
-        self._db   = db
-        self._client: ClobClient | None = None
+    def __init__(
+        self,
+        db:        DB,
+        tracker:   OrderTracker | None = None,
+        positions: PositionBook | None = None,
+        governor:  Governor | None = None,
+    ):
+        self._db        = db
+        self._tracker   = tracker
+        self._positions = positions if positions is not None else PositionBook(db)
+        self._client: "ClobClient | None" = None
+        self._gov       = governor or Governor()
+        self._stager    = OrderStager(self._gov)
+
+    @property
+    def positions(self) -> PositionBook:
+        return self._positions
+
+    @property
+    def stager(self) -> OrderStager:
+        return self._stager
 
     async def initialize(self) -> None:
         """CLOB L2 클라이언트 초기화."""
         await asyncio.to_thread(self._init_client)
 
     def _init_client(self) -> None:
+        from py_clob_client.client import ClobClient
+        from py_clob_client.clob_types import ApiCreds
+
         key         = os.getenv("PRIVATE_KEY")
         funder      = os.getenv("FUNDER_ADDRESS")
         api_key     = os.getenv("POLY_API_KEY")
@@ -87,63 +117,146 @@ class Executor:
             signature_type=sig_type,
             creds=creds,
         )
+        self._stager.bind(self._client)
         log.info("[executor] CLOB 클라이언트 초기화 완료")
 
     def has_position(self, token_id: str) -> bool:
         """해당 token_id의 포지션이 이미 있는지 확인."""
-        return token_id in self._db.get_active_token_ids()
+        return self._positions.has(token_id)
+
+    @property
+    def ready(self) -> bool:
+        """주문 가능 여부 (CLOB 클라이언트 초기화 완료)."""
+        return self._client is not None
 
     async def execute(self, opp: ArbitrageOpportunity) -> ExecutionResult:
         """FOK 매수 주문 실행."""
-        if self._client is None:
+        if not self.ready:
             return ExecutionResult(
                 success=False, order_id=None, status="error",
                 message="클라이언트 미초기화", opportunity=opp,
             )
 
-        # 최대 포지션 수 체크
-        active = len(self._db.get_active_token_ids())
-        if active >= MAX_POSITIONS:
-            log.info(f"[executor] 최대 포지션 도달 ({active}/{MAX_POSITIONS}) — 스킵")
+        # 최대 포지션 수 / 중복 체크 + 슬롯 예약 (다른 워커 프로세스와 동시 주문 방지)
+        reason = self._positions.reserve(opp.token_id, MAX_POSITIONS)
+        if reason == "limit":
+            log.info(f"[executor] 최대 포지션 도달 ({MAX_POSITIONS}) — 스킵")
             return ExecutionResult(
                 success=False, order_id=None, status="skipped",
                 message=f"최대 포지션 {MAX_POSITIONS}개 도달",
                 opportunity=opp,
             )
+        if reason == "held":
+            log.info(f"[executor] 이미 포지션 보유 / 주문 중: {opp.event_title} — 스킵")
+            return ExecutionResult(
+                success=False, order_id=None, status="skipped",
+                message="이미 포지션 보유", opportunity=opp,
+            )
+
+        try:
+            if self._tracker is not None:    # 새 마켓이면 제출 전에 user 채널 구독
+                await self._tracker.prepare(opp.matched.poly.condition_id)
+            result = await self._submit(opp)
+        finally:
+            self._positions.release(opp.token_id)
+
+        ORDERS.inc(status=result.status)
+        if result.latency_ms is not None:
+            ORDER_LATENCY.observe(result.latency_ms / 1000, staged=str(result.staged).lower())
+
+        # 체결 확정 추적 (delayed → 이후 MATCHED/CONFIRMED/FAILED 수신)
+        if result.success and self._tracker is not None and result.order_id:
+            await self._tracker.track(
+                result.order_id, result.bet_id, opp.matched.poly.condition_id,
+            )
+        return result
 
+    async def _submit(self, opp: ArbitrageOpportunity) -> ExecutionResult:
+        """주문 제출 + 체결 기록 (슬롯 예약 후 호출). 모의 거래는 core/paper.py 가 대체."""
+        await self._stager.wait(opp.token_id)
         return await asyncio.to_thread(self._place_order, opp)
 
+    def _record_bet(
+        self,
+        opp:         ArbitrageOpportunity,
+        order_id:    str | None,
+        fill_status: str,
+        fill_price:  float | None = None,
+        fill_size:   float | None = None,
+    ) -> int:
+        """체결된 주문을 포지션 북 + DB에 기록. bet_id 반환."""
+        return self._positions.insert_bet(
+            game_id       = opp.game_id,
+            event_title   = opp.event_title,
+            token_id      = opp.token_id,
+            buy_label     = opp.buy_token_label,
+            favorite_team = opp.favorite_team,
+            pinnacle_odds = opp.matched.pinnacle.favorite_odds,
+            pinnacle_prob = opp.pinnacle_prob,
+            poly_price    = opp.poly_price,
+            gap_size      = opp.gap_size,
+            bet_usdc      = opp.bet_usdc,
+            order_id      = order_id,
+            commence_time = opp.matched.pinnacle.commence_time.isoformat(),
+            condition_id  = opp.matched.poly.condition_id,
+            fill_status   = fill_status,
+            fill_price    = fill_price,
+            fill_size     = fill_size,
+            sport         = opp.matched.pinnacle.sport,
+        )
+
     def _place_order(self, opp: ArbitrageOpportunity) -> ExecutionResult:
         """동기 주문 실행 (to_thread에서 호출).
 
         올바른 시장가 주문 플로우:
           1. get_tick_size / get_neg_risk  →  주문 옵션 조회
           2. create_market_order(args, options)  →  EIP-712 서명
+             (사전 서명 주문이 금액/가격/tick 모두 일치하면 생략)
           3. post_order(signed, OrderType.FOK)   →  CLOB 제출
         """
+        from py_clob_client.clob_types import MarketOrderArgs, OrderType, PartialCreateOrderOptions
+        from py_clob_client.order_builder.constants import BUY
+
         try:
             # 1. 마켓별 tick_size / neg_risk 조회 (없으면 주문 거부됨)
-            tick_size = self._client.get_tick_size(opp.token_id)
-            neg_risk  = self._client.get_neg_risk(opp.token_id)
+            gov       = self._gov
+            tick_size = gov.call("clob_tick_size", self._client.get_tick_size, opp.token_id, priority=TRADING)
+            neg_risk  = gov.call("clob", self._client.get_neg_risk, opp.token_id, priority=TRADING)
             log.debug(
                 f"[executor] 마켓 옵션: tick_size={tick_size}, neg_risk={neg_risk}"
             )
 
-            order_args = MarketOrderArgs(
-                token_id = opp.token_id,
-                amount   = opp.bet_usdc,    # USDC 금액 (BUY 기준)
-                side     = BUY,
-                price    = opp.poly_price,  # worst-price: 슬리피지 상한
-            )
-            options = PartialCreateOrderOptions(
-                tick_size=tick_size,
-                neg_risk=neg_risk,
+            # 2. 서명 (사전 서명 주문 우선)
+            staged = self._stager.take(
+                opp.token_id, opp.bet_usdc, opp.poly_price, tick_size,
             )
+            if staged is not None:
+                signed_order = staged.signed
+            else:
+                order_args = MarketOrderArgs(
+                    token_id = opp.token_id,
+                    amount   = opp.bet_usdc,    # USDC 금액 (BUY 기준)
+                    side     = BUY,
+                    price    = opp.poly_price,  # worst-price: 슬리피지 상한
+                )
+                options = PartialCreateOrderOptions(
+                    tick_size=tick_size,
+                    neg_risk=neg_risk,
+                )
+                # 수수료율 캐시 미스 시 조회 1회 발생 가능
+                signed_order = gov.call(
+                    "clob", self._client.create_market_order, order_args, options, priority=TRADING,
+                )
 
-            # 2. 서명
-            signed_order = self._client.create_market_order(order_args, options)
             # 3. FOK 제출
-            resp = self._client.post_order(signed_order, OrderType.FOK)
+            resp = gov.call(
+                "clob_order", self._client.post_order, signed_order, OrderType.FOK, priority=TRADING,
+            )
+            latency_ms = (datetime.now(timezone.utc) - opp.detected_at).total_seconds() * 1000
+            log.info(
+                f"[executor] 감지→제출 {latency_ms:.0f}ms | "
+                + (f"사전 서명 사용 (서명 {staged.sign_ms:.1f}ms 절약)" if staged else "즉시 서명")
+            )
 
             order_id     = resp.get("orderID") or resp.get("order_id")
             status_field = resp.get("status", "")
@@ -151,20 +264,7 @@ class Executor:
 
             # 성공: "matched"(즉시 체결) 또는 "delayed"(스포츠 마켓 3초 지연 후 체결)
             if status_field in ("matched", "delayed"):
-                self._db.insert_bet(
-                    game_id       = opp.game_id,
-                    event_title   = opp.event_title,
-                    token_id      = opp.token_id,
-                    buy_label     = opp.buy_token_label,
-                    favorite_team = opp.favorite_team,
-                    pinnacle_odds = opp.matched.pinnacle.favorite_odds,
-                    pinnacle_prob = opp.pinnacle_prob,
-                    poly_price    = opp.poly_price,
-                    gap_size      = opp.gap_size,
-                    bet_usdc      = opp.bet_usdc,
-                    order_id      = order_id,
-                    commence_time = opp.matched.pinnacle.commence_time.isoformat(),
-                )
+                bet_id = self._record_bet(opp, order_id, status_field)
                 label = "체결" if status_field == "matched" else "지연 체결(3s)"
                 log.info(
                     f"[executor] {label}: {opp.event_title} | "
@@ -175,6 +275,8 @@ class Executor:
                     success=True, order_id=order_id, status=status_field,
                     message=f"{label} @ {opp.poly_price:.2f}",
                     opportunity=opp,
+                    latency_ms=latency_ms, staged=staged is not None,
+                    bet_id=bet_id,
                 )
 
             # FOK 미체결 (errorMsg 포함 출력)
@@ -186,6 +288,7 @@ class Executor:
                 success=False, order_id=order_id, status="fok_cancelled",
                 message=f"FOK 미체결 ({reason})",
                 opportunity=opp,
+                latency_ms=latency_ms, staged=staged is not None,
             )
 
         except Exception as e:
@@ -0,0 +1,248 @@
+"""
+core/export.py - 배팅 / 스냅샷 기록 컬럼형 내보내기 + 오프라인 분석
+
+positions.db 테이블을 날짜별 파티션 컬럼 파일로 내보내고,
+분석 시 메모리 매핑으로 읽어 NumPy / pandas 로 바로 넘김 (행 단위 반복 없음).
+
+레이아웃 (hive 스타일):
+  <out>/<table>/date=YYYY-MM-DD/part.arrow     Arrow IPC (비압축 — 메모리 매핑 zero-copy)
+  <out>/<table>/date=YYYY-MM-DD/part.parquet   Parquet (zstd — 보관용, 용량 작음)
+
+  bets            → bet_at 날짜
+  results         → settled_at 날짜
+  odds_snapshots  → ts 날짜 (UTC)
+  book_snapshots  → ts 날짜 (UTC)
+
+pyarrow 는 선택 의존성 (봇 실행에는 불필요). 미설치 시 내보내기 / 분석만 RuntimeError.
+봇 실행 중에도 안전하도록 DB는 읽기 전용(mode=ro)으로 연다.
+"""
+
+import logging
+import math
+import shutil
+import sqlite3
+from itertools import groupby
+from pathlib import Path
+
+from config import BET_SIZE_TIERS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:    # 분석 도구 전용 선택 의존성
+    pa = None
+    pq = None
+
+log = logging.getLogger(__name__)
+
+# 테이블 → (파티션 날짜 식, 정렬 컬럼)
+EXPORT_TABLES = {
+    "bets":           ("substr(bet_at, 1, 10)",     "bet_at"),
+    "results":        ("substr(settled_at, 1, 10)", "settled_at"),
+    "odds_snapshots": ("date(ts, 'unixepoch')",     "ts"),
+    "book_snapshots": ("date(ts, 'unixepoch')",     "ts"),
+}
+FORMATS    = {"arrow": "part.arrow", "parquet": "part.parquet"}
+BATCH_ROWS = 10_000    # fetchmany 단위
+
+# Pinnacle 배당 구간 경계 (분석용)
+ODDS_BUCKET_EDGES = (1.00, 1.20, 1.30, 1.40, 1.50, math.inf)
+
+
+def _require() -> None:
+    if pa is None:
+        raise RuntimeError("pyarrow 미설치 — pip install pyarrow numpy")
+
+
+def _arrow_type(decl: str) -> "pa.DataType":
+    decl = decl.upper()
+    if "INT" in decl:
+        return pa.int64()
+    if "REAL" in decl or "FLOA" in decl or "DOUB" in decl:
+        return pa.float64()
+    return pa.string()
+
+
+# ── 내보내기 ─────────────────────────────────────────────────
+
+def export(
+    db_path: str,
+    out_dir: str,
+    fmt:     str = "arrow",
+    since:   str | None = None,
+) -> dict[str, int]:
+    """DB 테이블을 날짜 파티션 파일로 내보냄. 테이블별 행 수 반환.
+
+    since(YYYY-MM-DD)를 주면 그 날짜 이후 파티션만 다시 씀 (증분 내보내기).
+    다시 쓰는 범위의 기존 파티션은 먼저 지움 → DB 에서 사라진 날짜(보존기간 정리 등)가 남지 않음.
+    """
+    _require()
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식: {fmt} (가능: {', '.join(FORMATS)})")
+
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        counts = {}
+        for table in EXPORT_TABLES:
+            counts[table] = _export_table(conn, table, Path(out_dir) / table, fmt, since)
+        return counts
+    finally:
+        conn.close()
+
+
+def _export_table(
+    conn:   sqlite3.Connection,
+    table:  str,
+    root:   Path,
+    fmt:    str,
+    since:  str | None,
+) -> int:
+    info = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    if not info:
+        log.info(f"[export] {table}: 테이블 없음 — 건너뜀")
+        return 0
+    schema = pa.schema([(name, _arrow_type(decl)) for _, name, decl, *_ in info])
+
+    date_expr, order_col = EXPORT_TABLES[table]
+    sql    = f"SELECT {date_expr} AS _date, * FROM {table}"
+    params: tuple = ()
+    if since:
+        sql   += f" WHERE {date_expr} >= ?"
+        params = (since,)
+    cur = conn.execute(f"{sql} ORDER BY {order_col}", params)
+    _clear_partitions(root, since)
+
+    total = 0
+    day:  str | None = None
+    rows: list[tuple] = []
+    while chunk := cur.fetchmany(BATCH_ROWS):
+        for date, group in groupby(chunk, key=lambda r: r[0]):
+            if date != day and rows:
+                _write_partition(root, day, schema, rows, fmt)
+                total += len(rows)
+                rows = []
+            day = date
+            rows.extend(r[1:] for r in group)
+    if rows:
+        _write_partition(root, day, schema, rows, fmt)
+        total += len(rows)
+
+    log.info(f"[export] {table}: {total}행 → {root}")
+    return total
+
+
+def _clear_partitions(root: Path, since: str | None) -> None:
+    """다시 쓸 범위(since 이후, 없으면 전체)의 기존 파티션 삭제."""
+    for part in root.glob("date=*"):
+        day = part.name.removeprefix("date=")
+        if since is None or (day != "unknown" and day >= since):
+            shutil.rmtree(part)
+
+
+def _write_partition(
+    root: Path, day: str | None, schema: "pa.Schema", rows: list[tuple], fmt: str,
+) -> None:
+    part = root / f"date={day or 'unknown'}"
+    part.mkdir(parents=True)
+
+    columns = list(zip(*rows))
+    batch   = pa.record_batch(
+        [pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+        schema=schema,
+    )
+    path = part / FORMATS[fmt]
+    if fmt == "parquet":
+        pq.write_table(pa.Table.from_batches([batch]), path, compression="zstd")
+    else:
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            writer.write_batch(batch)
+
+
+# ── 읽기 ─────────────────────────────────────────────────────
+
+def load(out_dir: str, table: str, columns: list[str] | None = None) -> "pa.Table":
+    """내보낸 테이블 로드 (전 파티션 연결).
+
+    Arrow IPC는 메모리 매핑 — 버퍼 복사 없이 .to_numpy() / .to_pandas() 가능.
+    """
+    _require()
+    root  = Path(out_dir) / table
+    parts = []
+    for path in sorted(root.glob("date=*/part.*")):
+        if path.suffix == ".arrow":
+            t = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+            parts.append(t.select(columns) if columns else t)
+        elif path.suffix == ".parquet":
+            parts.append(pq.read_table(path, columns=columns))
+    if not parts:
+        raise FileNotFoundError(f"내보낸 파일 없음: {root} (먼저 export 실행)")
+    return pa.concat_tables(parts)
+
+
+# ── 분석 ─────────────────────────────────────────────────────
+
+def _labels(edges: list[float], fmt: str) -> list[str]:
+    return [
+        f"{fmt.format(lo)}~" if math.isinf(hi) else f"{fmt.format(lo)}~{fmt.format(hi)}"
+        for lo, hi in zip(edges, edges[1:])
+    ]
+
+
+def pnl_report(bets: "pa.Table", by: str = "both") -> list[dict]:
+    """갭 티어 / 배당 구간별 P&L 집계 (void 제외).
+
+    by: "gap" | "odds" | "both"
+    반환 행: bucket 키 + n / wins / losses / pending / stake / pnl / win_rate / roi
+    """
+    import numpy as np
+
+    outcome = bets.column("outcome").to_numpy()
+    live    = outcome != "void"
+    outcome = outcome[live]
+    gap     = bets.column("gap_size").to_numpy()[live]
+    odds    = bets.column("pinnacle_odds").to_numpy()[live]
+    stake   = bets.column("bet_usdc").to_numpy()[live]
+    pnl     = np.nan_to_num(
+        bets.column("pnl_usdc").to_numpy(zero_copy_only=False).astype(float)
+    )[live]
+
+    gap_edges  = [t[0] for t in BET_SIZE_TIERS] + [math.inf]
+    odds_edges = list(ODDS_BUCKET_EDGES)
+    keys: list[tuple[str, np.ndarray]] = []
+    if by in ("gap", "both"):
+        keys.append(("gap", _bucket(gap, gap_edges, _labels(gap_edges, "{:.2f}"))))
+    if by in ("odds", "both"):
+        keys.append(("odds", _bucket(odds, odds_edges, _labels(odds_edges, "{:.2f}"))))
+    if not keys:
+        raise ValueError(f"by는 gap / odds / both 중 하나: {by}")
+
+    combo = np.array(["|".join(k) for k in zip(*(labels for _, labels in keys))], dtype=object)
+    rows  = []
+    for key in sorted(set(combo)):
+        m      = combo == key
+        wins   = int(np.sum(outcome[m] == "win"))
+        losses = int(np.sum(outcome[m] == "loss"))
+        settled_stake = float(np.sum(stake[m & (outcome != "pending")]))
+        row = dict(zip((name for name, _ in keys), key.split("|")))
+        row.update(
+            n        = int(m.sum()),
+            wins     = wins,
+            losses   = losses,
+            pending  = int(np.sum(outcome[m] == "pending")),
+            stake    = round(float(np.sum(stake[m])), 2),
+            pnl      = round(float(np.sum(pnl[m])), 2),
+            win_rate = round(wins / (wins + losses), 3) if wins + losses else None,
+            roi      = round(float(np.sum(pnl[m])) / settled_stake, 3) if settled_stake else None,
+        )
+        rows.append(row)
+    return rows
+
+
+def _bucket(values, edges: list[float], labels: list[str]):
+    """값 → 구간 라벨 배열 (구간 밖은 '<하한')."""
+    import numpy as np
+
+    idx = np.searchsorted(edges, values, side="right") - 1
+    out = np.array(labels, dtype=object)[np.clip(idx, 0, len(labels) - 1)]
+    out[idx < 0] = f"<{edges[0]:.2f}"
+    return out
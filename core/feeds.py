@@ -0,0 +1,277 @@
+"""
+core/feeds.py - 결과 이벤트 피드 (market 채널 / sports WebSocket)
+
+가격 임계값 폴링(monitor, 10분)은 경기 종료 후 늦게 결과를 감지 → 포지션 슬롯이 오래 막힘.
+두 피드로 종료 수 초 내 정산, 폴링은 예비 경로로만 유지.
+
+  MarketFeed (CLOB_WS_MARKET, custom_feature_enabled)
+    - 보유 토큰(assets_ids) + 스캔 요청 토큰(WatchList) 구독. 변경분은 PING 주기마다 동적 subscribe
+    - market_resolved → winning_asset_id 기준 즉시 승/패 정산 (Monitor.on_market_resolved)
+    - book / price_change → 공유 메모리 오더북 캐시 기록 (core/bookcache.py 단일 writer)
+                            + 호가 시계열 버퍼 (core/timeseries.py, 구독 토큰 분 단위)
+    - book / price_change / tick_size_change → 사전 서명 후보 재서명 (core/staging.py, 후보 토큰도 구독)
+
+  SportsFeed (SPORTS_WS — 구독 메시지 없음, 전체 경기 수신)
+    - sport_result 중 SPORTS_WS_LEAGUES 경기가 종료(ended / 종료 status) → 모니터 즉시 점검
+    - 서버 "ping" 에 "pong" 응답 (10초 내 미응답 시 연결 종료)
+
+heartbeat 규칙: docs/polymarket/websocket/overview.md
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+import aiohttp
+
+from config import CLOB_WS_MARKET, SPORTS_WS, SPORTS_WS_LEAGUES
+from core.bookcache import BookCache, WatchList
+from core.metrics import observe_ws_lag
+from core.positions import PositionBook
+from core.staging import OrderStager
+from core.transport import Transport
+
+log = logging.getLogger(__name__)
+
+PING_INTERVAL   = 10    # market 채널: 10초마다 PING
+RECONNECT_DELAY = 5     # 재연결 초기 대기 (초), 최대 60초까지 2배씩
+ENDED_TTL       = 6 * 3600    # 처리한 종료 gameId 보관 (초) — 재전송 중복만 막으면 충분
+
+# sport_result 종료 status (종목별 표기 혼재 — docs/polymarket/websocket/sports.md)
+FINAL_STATUSES = {"final", "f/ot", "f/so", "finished", "awarded", "canceled", "cancelled", "forfeit"}
+
+
+async def _keep_connected(
+    name:    str,
+    connect: Callable[[], Awaitable[None]],
+) -> None:
+    """연결 루프 (끊기면 지수 백오프로 재연결)."""
+    delay = RECONNECT_DELAY
+    while True:
+        try:
+            await connect()
+            delay = RECONNECT_DELAY
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.warning(f"[feeds] {name} 오류: {e}")
+        log.info(f"[feeds] {name} {delay}초 후 재연결")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 60)
+
+
+# ── market 채널 ──────────────────────────────────────────────
+
+ResolvedFn = Callable[[dict], Awaitable[None]]
+
+
+class MarketFeed:
+    """보유 토큰 market 채널 구독 → market_resolved 즉시 정산 + 오더북 캐시 갱신."""
+
+    def __init__(
+        self,
+        positions:   PositionBook,
+        on_resolved: ResolvedFn,
+        books:       BookCache | None = None,
+        watch:       WatchList | None = None,
+        stager:      OrderStager | None = None,
+        record:      Callable[[str, dict], None] | None = None,
+    ):
+        self._positions   = positions
+        self._on_resolved = on_resolved
+        self._books       = books
+        self._watch       = watch
+        self._stager      = stager
+        self._record      = record    # SnapshotRecorder.record_book (호가 시계열)
+        self._subscribed: set[str] = set()
+
+    def _wanted(self) -> set[str]:
+        wanted = self._positions.tokens()
+        if self._watch is not None:
+            wanted |= self._watch.tokens()
+        if self._stager is not None:
+            wanted |= self._stager.tokens()
+        return wanted
+
+    async def run(self, http: Transport) -> None:
+        async def connect() -> None:
+            async with http.ws_connect(CLOB_WS_MARKET, heartbeat=None) as ws:
+                wanted = self._wanted()
+                if self._books is not None:
+                    self._books.invalidate()
+                    for token_id in self._subscribed - wanted:
+                        self._books.drop(token_id)
+                self._subscribed = wanted
+                await ws.send_json({
+                    "assets_ids":             sorted(self._subscribed),
+                    "type":                   "market",
+                    "custom_feature_enabled": True,
+                })
+                log.info(f"[feeds] market 채널 연결 (토큰 {len(self._subscribed)}개)")
+                try:
+                    await self._read(ws)
+                finally:
+                    if self._books is not None:
+                        self._books.invalidate()
+
+        await _keep_connected("market 채널", connect)
+
+    async def _read(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        pinger = asyncio.create_task(self._ping(ws))
+        try:
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    break
+                if msg.data == "PONG":
+                    continue
+                try:
+                    data = json.loads(msg.data)
+                except json.JSONDecodeError:
+                    continue
+                for event in data if isinstance(data, list) else [data]:
+                    observe_ws_lag("market", event)
+                    kind = event.get("event_type")
+                    if kind == "market_resolved":
+                        await self._handle_resolved(event)
+                        continue
+                    if self._books is not None and kind in ("book", "price_change"):
+                        self._books.apply(event)
+                        if self._record is not None:
+                            self._record_books(event)
+                    if self._stager is not None:
+                        self._restage(kind, event)
+        finally:
+            pinger.cancel()
+
+    def _restage(self, kind: str, event: dict) -> None:
+        """사전 서명 후보의 best ask / tick_size 변경 전달."""
+        staged = self._stager.tokens()
+        if not staged:
+            return
+        if kind == "tick_size_change":
+            token_id = event.get("asset_id")
+            if token_id in staged and event.get("new_tick_size"):
+                self._stager.on_tick_size(token_id, str(event["new_tick_size"]))
+        elif kind == "book":
+            if event.get("asset_id") in staged and (price := _best_ask(event)) is not None:
+                self._stager.on_price(event["asset_id"], price)
+        elif kind == "price_change":
+            for token_id in _event_tokens(event) & staged:
+                book  = self._books.get(token_id, watch=False) if self._books is not None else None
+                price = _best_ask(book) if book is not None else None
+                if price is not None:
+                    self._stager.on_price(token_id, price)
+
+    def _record_books(self, event: dict) -> None:
+        """변경된 토큰의 캐시 오더북 → 시계열 버퍼 (분당 마지막 값만 남음)."""
+        for token_id in _event_tokens(event):
+            book = self._books.get(token_id, watch=False)
+            if book is not None:
+                self._record(token_id, book)
+
+    async def _ping(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        """PING + 구독 대상 변경분 동적 갱신 + 캐시 heartbeat."""
+        if self._books is not None:
+            self._books.heartbeat()
+        while not ws.closed:
+            await asyncio.sleep(PING_INTERVAL)
+            await ws.send_str("PING")
+            await self._sync(ws)
+            if self._books is not None:
+                self._books.heartbeat()
+
+    async def _sync(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        held    = self._wanted()
+        added   = held - self._subscribed
+        removed = self._subscribed - held
+        if added:
+            await ws.send_json({
+                "assets_ids":             sorted(added),
+                "operation":              "subscribe",
+                "custom_feature_enabled": True,
+            })
+        if removed:
+            await ws.send_json({"assets_ids": sorted(removed), "operation": "unsubscribe"})
+            if self._books is not None:
+                for token_id in removed:
+                    self._books.drop(token_id)
+        self._subscribed = held
+
+    async def _handle_resolved(self, event: dict) -> None:
+        if not set(event.get("assets_ids") or []) & self._positions.tokens():
+            return
+        log.info(
+            f"[feeds] market_resolved: {event.get('question', '')} → {event.get('winning_outcome')}"
+        )
+        try:
+            await self._on_resolved(event)
+        except Exception as e:
+            log.error(f"[feeds] market_resolved 정산 실패: {e}", exc_info=True)
+
+
+def _event_tokens(event: dict) -> set[str]:
+    """book / price_change 이벤트가 건드린 token_id."""
+    if "price_changes" in event:
+        return {ch["asset_id"] for ch in event["price_changes"] if ch.get("asset_id")}
+    return {event["asset_id"]} if event.get("asset_id") else set()
+
+
+def _best_ask(book: dict) -> float | None:
+    """최저 ask (정렬 방향 무관)."""
+    prices = [float(a["price"]) for a in book.get("asks") or () if float(a.get("size", 0)) > 0]
+    return min(prices) if prices else None
+
+
+# ── sports WebSocket ─────────────────────────────────────────
+
+class SportsFeed:
+    """sport_result 종료 이벤트 → 모니터 즉시 점검 트리거."""
+
+    def __init__(self, on_ended: Callable[[], None]):
+        self._on_ended = on_ended
+        self._ended: dict = {}    # 이미 처리한 gameId → 처리 시각 (중복 알림 방지, ENDED_TTL 후 정리)
+
+    async def run(self, http: Transport) -> None:
+        async def connect() -> None:
+            async with http.ws_connect(SPORTS_WS, heartbeat=None) as ws:
+                log.info("[feeds] sports WebSocket 연결")
+                async for msg in ws:
+                    if msg.type != aiohttp.WSMsgType.TEXT:
+                        break
+                    if msg.data == "ping":
+                        await ws.send_str("pong")
+                        continue
+                    try:
+                        event = json.loads(msg.data)
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(event, dict):
+                        self.handle(event)
+
+        await _keep_connected("sports WebSocket", connect)
+
+    def handle(self, event: dict) -> None:
+        if str(event.get("leagueAbbreviation", "")).lower() not in SPORTS_WS_LEAGUES:
+            return
+        ended = event.get("ended") is True or str(event.get("status", "")).lower() in FINAL_STATUSES
+        game_id = event.get("gameId")
+        if not ended or game_id in self._ended:
+            return
+        self._remember(game_id)
+        log.info(
+            f"[feeds] 경기 종료: {event.get('slug', game_id)} "
+            f"({event.get('status')} {event.get('score', '')}) → 포지션 즉시 점검"
+        )
+        self._on_ended()
+
+    def _remember(self, game_id) -> None:
+        """처리 기록 추가 + ENDED_TTL 지난 기록 정리 (삽입 순 = 시각 순)."""
+        now = time.monotonic()
+        while self._ended:
+            oldest, at = next(iter(self._ended.items()))
+            if now - at < ENDED_TTL:
+                break
+            del self._ended[oldest]
+        self._ended[game_id] = now
@@ -0,0 +1,173 @@
+"""
+core/governor.py - 엔드포인트별 요청 속도 제한 (클라이언트 측 토큰 버킷)
+
+서버 한도(docs/polymarket/authentication/rate-limit.md)를 넘으면 Cloudflare가
+요청을 지연 / 거부 → 스캔 / 모니터 동시성을 올릴수록 429·차단 위험.
+모든 외부 호출이 나가기 전에 Governor 버킷을 통과하도록 함.
+
+  - 분류:     (호스트, 메서드, 경로) → 엔드포인트 버킷 + 묶음 버킷 + 호스트 공용 버킷 (config.RATE_LIMITS)
+              묶음 = 여러 엔드포인트 합산 한도 (Gamma "/markets + /events listing")
+  - 버킷:     한도 × RATE_LIMIT_HEADROOM 을 창(window) 동안 균등 충전, 최대 보유량은 창의 절반
+              → 어떤 창에서도 문서 한도 미만 (burst + sustained 한도는 버킷 2개로)
+  - 우선순위: TRADING(주문 / 주문 옵션 조회)은 공용 버킷을 끝까지 사용,
+              DATA(시세 조회)는 RATE_TRADING_RESERVE 만큼 남기고 대기 → 주문이 시세 조회에 밀리지 않음
+  - 지표:     엔드포인트별 호출 수 / 대기 발생 수 / 평균·최대 대기 (ms)
+
+asyncio 경로(transport)는 acquire(), py-clob-client 동기 호출(to_thread)은 call() 사용.
+버킷 상태는 threading.Lock 으로 보호 (이벤트 루프와 워커 스레드 공용).
+멀티 프로세스(supervisor.py)에서는 프로세스마다 한도의 share 비율만 사용.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+from config import RATE_LIMITS, RATE_LIMIT_HEADROOM, RATE_TRADING_RESERVE
+
+log = logging.getLogger(__name__)
+
+TRADING = 0
+DATA    = 1
+
+# (호스트, 메서드, 경로) → 엔드포인트 분류. 목록에 없는 경로는 호스트 공용 버킷만 적용
+ENDPOINTS = {
+    ("gamma", "GET",  "/events"):    "gamma_events",
+    ("gamma", "GET",  "/markets"):   "gamma_markets",
+    ("clob",  "GET",  "/book"):      "clob_book",
+    ("clob",  "POST", "/books"):     "clob_books",
+    ("clob",  "GET",  "/tick-size"): "clob_tick_size",
+    ("clob",  "POST", "/order"):     "clob_order",
+}
+
+# 엔드포인트 → 함께 차감할 묶음 버킷 (문서의 합산 한도 — 샤드마다 /events 페이지를 넘겨도 합계로 제한)
+GROUPS = {
+    "gamma_events":  ("gamma_listing",),
+    "gamma_markets": ("gamma_listing",),
+}
+
+
+class _Bucket:
+    def __init__(self, limit: float, window: float, shared: bool):
+        self.rate     = limit * RATE_LIMIT_HEADROOM / window
+        self.capacity = max(1.0, self.rate * window / 2)
+        self.tokens   = self.capacity
+        self.updated  = time.monotonic()
+        self.reserve  = min(self.capacity * RATE_TRADING_RESERVE, self.capacity - 1) if shared else 0.0
+
+    def refill(self, now: float) -> None:
+        self.tokens  = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def shortfall(self, priority: int) -> float:
+        """토큰 1개를 가져가기까지 부족한 양 (0 이하면 즉시 가능)."""
+        floor = self.reserve if priority == DATA else 0.0
+        return 1.0 + floor - self.tokens
+
+
+@dataclass
+class _Stat:
+    calls:     int   = 0
+    throttled: int   = 0
+    wait_sum:  float = 0.0
+    wait_max:  float = 0.0
+
+
+class Governor:
+    """엔드포인트 분류별 토큰 버킷 묶음."""
+
+    def __init__(
+        self,
+        limits: dict[str, list[tuple[int, float]]] | None = None,
+        share:  float = 1.0,
+    ):
+        """share: 이 프로세스가 쓸 한도 비율 (워커 N개면 1/N)."""
+        limits = RATE_LIMITS if limits is None else limits
+        hosts  = {host for host, _, _ in ENDPOINTS}
+        self._buckets = {
+            key: [_Bucket(n * share, window, shared=key in hosts) for n, window in rules]
+            for key, rules in limits.items()
+        }
+        self._stats: dict[str, _Stat] = {}
+        self._lock  = threading.Lock()
+
+    @staticmethod
+    def classify(host: str, method: str, path: str) -> str:
+        """요청 → 엔드포인트 분류 이름 (목록에 없으면 호스트 이름)."""
+        return ENDPOINTS.get((host, method.upper(), path.split("?", 1)[0]), host)
+
+    def _keys(self, endpoint: str) -> list[str]:
+        host = endpoint.split("_", 1)[0]
+        return [endpoint] if endpoint == host else [endpoint, *GROUPS.get(endpoint, ()), host]
+
+    def _try_take(self, endpoint: str, priority: int) -> float:
+        """가능하면 모든 버킷에서 1개씩 차감 후 0 반환, 아니면 대기할 초."""
+        buckets = [b for key in self._keys(endpoint) for b in self._buckets.get(key, ())]
+        with self._lock:
+            now  = time.monotonic()
+            wait = 0.0
+            for b in buckets:
+                b.refill(now)
+                wait = max(wait, b.shortfall(priority) / b.rate)
+            if wait <= 0:
+                for b in buckets:
+                    b.tokens -= 1
+            return wait
+
+    def _record(self, endpoint: str, waited: float) -> None:
+        with self._lock:
+            s = self._stats.setdefault(endpoint, _Stat())
+            s.calls += 1
+            if waited > 0:
+                s.throttled += 1
+                s.wait_sum  += waited
+                s.wait_max   = max(s.wait_max, waited)
+
+    # ── 획득 ─────────────────────────────────────────────────
+
+    async def acquire(self, endpoint: str, priority: int = DATA) -> float:
+        """비동기 획득. 대기한 초 반환."""
+        t0     = time.monotonic()
+        waited = 0.0
+        while (wait := self._try_take(endpoint, priority)) > 0:
+            await asyncio.sleep(wait)
+            waited = time.monotonic() - t0
+        self._record(endpoint, waited)
+        return waited
+
+    def acquire_sync(self, endpoint: str, priority: int = DATA) -> float:
+        """동기 획득 (to_thread 워커 스레드 전용 — 이벤트 루프에서 호출 금지)."""
+        t0     = time.monotonic()
+        waited = 0.0
+        while (wait := self._try_take(endpoint, priority)) > 0:
+            time.sleep(wait)
+            waited = time.monotonic() - t0
+        self._record(endpoint, waited)
+        return waited
+
+    def call(self, endpoint: str, fn, *args, priority: int = DATA):
+        """동기 SDK 호출을 버킷 통과 후 실행."""
+        self.acquire_sync(endpoint, priority)
+        return fn(*args)
+
+    # ── 지표 ─────────────────────────────────────────────────
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            return {
+                name: {
+                    "calls":       s.calls,
+                    "throttled":   s.throttled,
+                    "avg_wait_ms": round(s.wait_sum / s.throttled * 1000, 1) if s.throttled else 0.0,
+                    "max_wait_ms": round(s.wait_max * 1000, 1),
+                }
+                for name, s in sorted(self._stats.items())
+            }
+
+    def log_stats(self) -> None:
+        for name, s in self.stats().items():
+            log.info(
+                f"[governor] {name}: 호출 {s['calls']} / 대기 {s['throttled']} "
+                f"(평균 {s['avg_wait_ms']}ms, 최대 {s['max_wait_ms']}ms)"
+            )
@@ -0,0 +1,132 @@
+"""
+core/logsetup.py - 비동기 로깅 (큐 핸들러 + 백그라운드 기록 스레드)
+
+RotatingFileHandler 를 루트에 직접 붙이면 이벤트 루프 스레드가 파일 쓰기 / 회전 / 콘솔 출력을
+모두 수행. 루트에는 QueueHandler 만 두고, 실제 핸들러는 QueueListener 스레드에서 실행.
+
+  이벤트 루프 스레드:  LogRecord 생성 + 큐 적재 (메시지 % 포맷도 하지 않음)
+  기록 스레드:         포맷 → 콘솔 / logs/bot.log / logs/error.log (핸들러별 레벨 유지)
+
+  지연 포맷:  핫 경로는 log.debug("[scanner] 마감 (%.1fh): %s", hrs, name) 형식
+              — 비활성 레벨이면 인자 포맷 없이 반환, 활성이어도 포맷은 기록 스레드에서
+  구조화:     LOG_JSON=True 면 파일 로그를 JSON lines 로 기록
+              extra={"stage": …, "game_id": …, "token_id": …} 필드는 그대로 키로 출력
+              (텍스트 형식에서는 무시 — 기존 로그 모양 유지)
+
+프로세스 종료 시 atexit 로 리스너 정지 (큐에 남은 레코드 기록 후 종료).
+supervisor.py 워커도 프로세스마다 setup_logging() 1회 — 리스너 1개.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+from datetime import datetime, timezone
+from pathlib import Path
+
+from config import LOG_FILE, ERROR_LOG_FILE, LOG_JSON
+
+FMT     = "%(asctime)s [%(levelname)s] %(message)s"
+DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+FIELDS = ("stage", "game_id", "token_id")    # extra 로 받는 구조화 필드
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """레코드 1건 → JSON 1줄 (ts / level / logger / msg + 구조화 필드 + 예외)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts":     datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level":  record.levelname,
+            "logger": record.name,
+            "msg":    record.getMessage(),
+        }
+        for key in FIELDS:
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """같은 프로세스 스레드 큐 전용 — 레코드를 그대로 적재.
+
+    기본 prepare() 는 호출 스레드에서 메시지를 포맷(프로세스 간 pickle 대비).
+    스레드 큐에서는 불필요하므로 포맷을 기록 스레드로 미룸.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def build_handlers(
+    log_file:       str  = LOG_FILE,
+    error_log_file: str  = ERROR_LOG_FILE,
+    json_lines:     bool = LOG_JSON,
+    stream=None,
+) -> list[logging.Handler]:
+    """콘솔(stream, 기본 stderr) + 일반 로그 + 에러 로그 핸들러."""
+    text     = logging.Formatter(FMT, DATEFMT)
+    file_fmt = JsonFormatter() if json_lines else text
+
+    console = logging.StreamHandler(stream)
+    console.setFormatter(text)
+
+    fh = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf-8"
+    )
+    fh.setLevel(logging.INFO)
+    fh.setFormatter(file_fmt)
+
+    eh = logging.handlers.RotatingFileHandler(
+        error_log_file, maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8"
+    )
+    eh.setLevel(logging.ERROR)
+    eh.setFormatter(file_fmt)
+    return [console, fh, eh]
+
+
+def start_listener(logger: logging.Logger, handlers: list[logging.Handler]) -> logging.handlers.QueueListener:
+    """logger 핸들러를 큐 1개로 교체, handlers 는 기록 스레드에서 실행."""
+    q: queue.SimpleQueue = queue.SimpleQueue()
+    for h in list(logger.handlers):
+        logger.removeHandler(h)
+    logger.addHandler(LocalQueueHandler(q))
+    listener = logging.handlers.QueueListener(q, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def setup_logging(
+    log_file:       str  = LOG_FILE,
+    error_log_file: str  = ERROR_LOG_FILE,
+    json_lines:     bool = LOG_JSON,
+) -> None:
+    """콘솔 + 파일 로그 (기록 스레드). supervisor.py 워커는 프로세스별 파일 사용 (회전 충돌 방지)."""
+    global _listener
+    Path("logs").mkdir(exist_ok=True)
+    stop_logging()
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    _listener = start_listener(root, build_handlers(log_file, error_log_file, json_lines))
+
+
+def stop_logging() -> None:
+    """기록 스레드 정지 (큐에 남은 레코드 기록 후) + 파일 닫기."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for h in _listener.handlers:
+        h.close()
+    _listener = None
+
+
+atexit.register(stop_logging)
@@ -22,10 +22,9 @@ import re
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 
-import aiohttp
-
-from config import GAMMA_BASE, TEAM_MAPPING_PATH
+from config import GAMMA_PAGE_SIZE, GAMMA_MAX_PAGES, TEAM_MAPPING_PATH
 from core.odds_fetcher import PinnacleGame
+from core.transport import Transport
 
 log = logging.getLogger(__name__)
 
@@ -96,7 +95,8 @@ def normalize(full_name: str, mapping: dict[str, str]) -> str:
 # ── Gamma API 조회 ───────────────────────────────────────────
 
 async def fetch_nba_poly_markets(
-    session: aiohttp.ClientSession,
+    http: Transport,
+    tag:  str = "nba",
 ) -> list[PolymarketMarket]:
     """Gamma API에서 NBA 예정 경기 승/패 마켓 조회.
 
@@ -105,17 +105,31 @@ async def fetch_nba_poly_markets(
       - acceptingOrders=true
       - 순수 팀 vs 팀 마켓만 (_is_matchup 필터)
       - game_start_time > now (아직 시작 전)
+    GAMMA_PAGE_SIZE 단위로 offset 페이지 조회 (마지막 페이지까지, 최대 GAMMA_MAX_PAGES).
+    새 이벤트가 없는 페이지(offset 무시 등 같은 페이지 반복)가 오면 거기서 중단.
     """
-    params = {
-        "tag_slug": "nba",
-        "active":   "true",
-        "closed":   "false",
-        "limit":    200,
-    }
-
-    async with session.get(f"{GAMMA_BASE}/events", params=params) as resp:
-        resp.raise_for_status()
-        events: list[dict] = await resp.json()
+    events: list[dict] = []
+    seen:   set[str]   = set()
+    offset = 0
+    for _ in range(GAMMA_MAX_PAGES):
+        page: list[dict] = await http.gamma.get_json("/events", params={
+            "tag_slug": tag,
+            "active":   "true",
+            "closed":   "false",
+            "limit":    GAMMA_PAGE_SIZE,
+            "offset":   offset,
+        })
+        fresh = [e for e in page if e.get("id") is None or e["id"] not in seen]
+        if page and not fresh:
+            log.warning(f"[matcher] Gamma 페이지 반복 (offset {offset}) — 조회 중단")
+            break
+        seen.update(e["id"] for e in fresh if e.get("id") is not None)
+        events.extend(fresh)
+        offset += len(page)
+        if len(page) < GAMMA_PAGE_SIZE:
+            break
+    else:
+        log.warning(f"[matcher] Gamma 페이지 상한 {GAMMA_MAX_PAGES} 도달 — 이후 이벤트 생략")
 
     now = datetime.now(timezone.utc)
     markets: list[PolymarketMarket] = []
@@ -236,14 +250,15 @@ def match_games(
         market = _find_market(poly_markets, home_s, away_s, game.commence_time)
         if market is None:
             log.debug(
-                f"[matcher] 매핑 실패: {game.home_team} vs {game.away_team} "
-                f"(home_s={home_s}, away_s={away_s})"
+                "[matcher] 매핑 실패: %s vs %s (home_s=%s, away_s=%s)",
+                game.home_team, game.away_team, home_s, away_s,
+                extra={"stage": "match", "game_id": game.game_id},
             )
             continue
 
         matched = MatchedGame(pinnacle=game, poly=market)
         results.append(matched)
-        log.info(str(matched))
+        log.info("%s", matched, extra={"stage": "match", "game_id": game.game_id})
 
     log.info(f"[matcher] {len(pinnacle_games)}경기 중 {len(results)}경기 매핑 성공")
     return results
@@ -0,0 +1,343 @@
+"""
+core/metrics.py - 내장 지표 레지스트리 + Prometheus 텍스트 엔드포인트
+
+로그 / 텔레그램만으로는 지연 / 처리량 대시보드나 알림을 만들 수 없음.
+핫 경로는 메모리 카운터만 갱신하고, 문자열 생성은 스크레이프 요청 때만 수행.
+
+  Counter     누적 값 (폴링 / 기회 / 주문 결과 / 체결 확정)
+  Gauge       현재 값 (WebSocket 지연). set_function() 은 스크레이프 시점에 계산
+              (잔여 크레딧 / 보유 포지션 — 평소 비용 0)
+  Histogram   고정 버킷 분포 (단계별 소요 / 감지→제출 지연 / 이벤트 루프 지연)
+  collector   스크레이프 시 호출되는 함수 — 기존 통계를 지표로 변환
+              (Transport 호스트별 요청 / 오류, Governor 대기)
+
+  serve(port)  127.0.0.1:METRICS_PORT 에서 GET /metrics 응답 (text/plain; version=0.0.4)
+               asyncio.start_server 기반 — 추가 의존성 없음, 요청이 없으면 비용 없음
+
+레이블은 지표 정의 시 이름을 정하고, 갱신 시 키워드 인자로 값 전달:
+  ORDERS.inc(status="matched")      STAGE_SECONDS.observe(0.42, stage="scan")
+
+이벤트 루프 스레드에서만 갱신 (to_thread 작업은 결과를 받은 뒤 기록).
+supervisor.py 멀티 프로세스 모드는 프로세스마다 레지스트리 / 포트 1개 (METRICS_PORT + 워커 순번).
+"""
+
+import asyncio
+import bisect
+import logging
+import math
+import time
+from collections.abc import Callable, Iterable
+
+from config import METRICS_HOST, METRICS_PORT, METRICS_LATENCY_BUCKETS, METRICS_STAGE_BUCKETS
+
+log = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# collector 반환 표본: (이름, 종류, 설명, 레이블, 값)
+Sample    = tuple[str, str, str, dict[str, str], float]
+Collector = Callable[[], Iterable[Sample]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable) -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+# ── 지표 ─────────────────────────────────────────────────────
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name   = name
+        self.help   = help
+        self.labels = labels
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels[n] for n in self.labels) if self.labels else ()
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """단조 증가 누적 값."""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, value: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + value
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        return self._header() + [
+            f"{self.name}{_labels(self.labels, key)} {_number(v)}"
+            for key, v in sorted(self._values.items())
+        ]
+
+
+class Gauge(_Metric):
+    """현재 값. set_function() 으로 등록한 값은 스크레이프 시점에 계산."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = {}
+        self._functions: dict[tuple, Callable[[], float | None]] = {}
+
+    def set(self, value: float, **labels) -> None:
+        self._values[self._key(labels)] = value
+
+    def set_function(self, fn: Callable[[], float | None], **labels) -> None:
+        """fn() 이 None 이면 해당 표본 생략. 예외는 스크레이프 로그만 남기고 생략."""
+        self._functions[self._key(labels)] = fn
+
+    def value(self, **labels) -> float | None:
+        key = self._key(labels)
+        if key in self._functions:
+            return self._functions[key]()
+        return self._values.get(key)
+
+    def render(self) -> list[str]:
+        values = dict(self._values)
+        for key, fn in self._functions.items():
+            try:
+                v = fn()
+            except Exception as e:
+                log.warning(f"[metrics] {self.name} 값 계산 실패: {e}")
+                continue
+            if v is not None:
+                values[key] = float(v)
+        return self._header() + [
+            f"{self.name}{_labels(self.labels, key)} {_number(v)}"
+            for key, v in sorted(values.items())
+        ]
+
+
+class Histogram(_Metric):
+    """고정 버킷 분포 (버킷 상한 이하 누적 개수 + 합계 + 개수)."""
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = METRICS_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[tuple, list[int]] = {}
+        self._sums:   dict[tuple, float]     = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key    = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)    # 마지막 = +Inf
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def count(self, **labels) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        names = self.labels + ("le",)
+        for key, counts in sorted(self._counts.items()):
+            total = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                total += n
+                lines.append(f"{self.name}_bucket{_labels(names, key + (_number(bound),))} {total}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_number(self._sums[key])}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {total}")
+        return lines
+
+
+# ── 레지스트리 ───────────────────────────────────────────────
+
+class Registry:
+    """지표 + collector 모음. render() 는 스크레이프 시에만 호출."""
+
+    def __init__(self):
+        self._metrics:    dict[str, _Metric] = {}
+        self._collectors: list[Collector]    = []
+
+    def _add(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"지표 이름 중복: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labels))
+
+    def histogram(
+        self, name: str, help: str, labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = METRICS_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def collect(self, collector: Collector) -> None:
+        """스크레이프 시 호출할 표본 생성 함수 등록."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+
+        grouped: dict[str, tuple[str, str, list[str]]] = {}
+        for collector in self._collectors:
+            try:
+                samples = list(collector())
+            except Exception as e:
+                log.warning(f"[metrics] collector 실패: {e}")
+                continue
+            for name, kind, help, labels, value in samples:
+                if value is None:
+                    continue
+                entry = grouped.setdefault(name, (kind, help, []))
+                entry[2].append(f"{name}{_labels(labels, labels.values())} {_number(float(value))}")
+        for name, (kind, help, samples) in grouped.items():
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}", *samples]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# ── 봇 지표 ──────────────────────────────────────────────────
+
+POLLS = REGISTRY.counter(
+    "polymoly_polls_total", "폴링 사이클 수")
+OPPORTUNITIES = REGISTRY.counter(
+    "polymoly_opportunities_total", "4조건 충족 기회 수")
+ORDERS = REGISTRY.counter(
+    "polymoly_orders_total", "FOK 주문 결과 (matched / delayed / fok_cancelled / error)", ("status",))
+FILLS = REGISTRY.counter(
+    "polymoly_fills_total", "user 채널 체결 확정 결과 (confirmed / failed / cancelled)", ("status",))
+WS_LAG = REGISTRY.gauge(
+    "polymoly_ws_lag_seconds", "WebSocket 이벤트 발생 시각 → 수신 지연", ("feed",))
+CREDITS = REGISTRY.gauge(
+    "polymoly_odds_credits_remaining", "Odds API 잔여 크레딧")
+OPEN_POSITIONS = REGISTRY.gauge(
+    "polymoly_open_positions", "보유 포지션 수")
+STAGE_SECONDS = REGISTRY.histogram(
+    "polymoly_stage_seconds", "폴링 파이프라인 단계별 소요", ("stage",), METRICS_STAGE_BUCKETS)
+ORDER_LATENCY = REGISTRY.histogram(
+    "polymoly_order_latency_seconds", "기회 감지 → FOK 제출 지연", ("staged",))
+LOOP_LAG = REGISTRY.histogram(
+    "polymoly_loop_lag_seconds", "이벤트 루프 지연 (core/watchdog.py)")
+LOOP_STALLS = REGISTRY.counter(
+    "polymoly_loop_stalls_total", "WATCHDOG_STALL_SEC 이상 이벤트 루프 정지 횟수")
+
+
+def observe_ws_lag(feed: str, event: dict) -> None:
+    """이벤트 timestamp(ms) 기준 수신 지연 기록. timestamp 없으면 무시."""
+    ts = event.get("timestamp")
+    if not ts:
+        return
+    try:
+        WS_LAG.set(max(0.0, time.time() - int(ts) / 1000), feed=feed)
+    except (TypeError, ValueError):
+        pass
+
+
+# ── collector ────────────────────────────────────────────────
+
+def transport_collector(http) -> Collector:
+    """Transport.stats() → 호스트별 요청 / 재시도 / 오류 / hedge / 차단 / 지연 분위수."""
+    counters = {
+        "requests": "HTTP 요청 수 (재시도 포함)",
+        "retries":  "HTTP 재시도 수",
+        "errors":   "HTTP 오류 수 (연결 / 타임아웃 / 5xx)",
+        "hedges":   "hedge 요청 수",
+        "rejected": "차단기로 즉시 실패한 요청 수",
+    }
+
+    def collect() -> Iterable[Sample]:
+        for host, s in http.stats().items():
+            labels = {"host": host}
+            for field, help in counters.items():
+                yield f"polymoly_http_{field}_total", "counter", help, labels, s[field]
+            for q, key in (("0.5", "p50_ms"), ("0.95", "p95_ms")):
+                ms = s[key]
+                yield (
+                    "polymoly_http_latency_seconds", "gauge", "HTTP 최근 지연 분위수",
+                    {"host": host, "quantile": q}, ms / 1000 if ms is not None else None,
+                )
+            yield (
+                "polymoly_http_breaker_open", "gauge", "차단기 열림 여부 (1 = open / half-open)",
+                labels, 0 if s["breaker"] == "closed" else 1,
+            )
+
+    return collect
+
+
+def governor_collector(governor) -> Collector:
+    """Governor.stats() → 엔드포인트별 호출 / 대기 수."""
+    def collect() -> Iterable[Sample]:
+        for endpoint, s in governor.stats().items():
+            labels = {"endpoint": endpoint}
+            yield "polymoly_governor_calls_total", "counter", "속도 제한 버킷 통과 수", labels, s["calls"]
+            yield "polymoly_governor_throttled_total", "counter", "속도 제한 대기 발생 수", labels, s["throttled"]
+    return collect
+
+
+# ── HTTP 엔드포인트 ──────────────────────────────────────────
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, registry: Registry) -> None:
+    try:
+        request = await asyncio.wait_for(reader.readline(), 5)
+        while (line := await asyncio.wait_for(reader.readline(), 5)) not in (b"\r\n", b"\n", b""):
+            pass                                        # 헤더 무시
+        parts = request.decode("latin-1").split()
+        if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+            status, body, ctype = "200 OK", registry.render().encode(), CONTENT_TYPE
+        else:
+            status, body, ctype = "404 Not Found", b"not found\n", "text/plain"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {ctype}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(port: int = METRICS_PORT, host: str = METRICS_HOST, registry: Registry = REGISTRY) -> None:
+    """지표 엔드포인트 실행 (취소될 때까지). port 0 이면 비활성."""
+    if not port:
+        return
+    try:
+        server = await asyncio.start_server(lambda r, w: _handle(r, w, registry), host, port)
+    except OSError as e:
+        log.warning(f"[metrics] {host}:{port} 바인드 실패 — 지표 엔드포인트 비활성: {e}")
+        return
+    log.info(f"[metrics] 지표 엔드포인트: http://{host}:{port}/metrics")
+    async with server:
+        await server.serve_forever()
@@ -1,106 +1,325 @@
 """
 core/monitor.py - 포지션 모니터링 (경기 종료 후 결과 감지)
 
-폴링 방식으로 보유 포지션의 토큰 가격을 주기적으로 확인.
+폴링 방식으로 보유 포지션의 토큰 가격을 확인.
   - best_bid >= 0.95  → 승리 (토큰 가격 1달러에 수렴)
   - best_bid <= 0.05  → 패배 (토큰 가격 0달러에 수렴)
   - 그 외             → 경기 미종료, 대기
 
+점검 시점 (deadline 힙):
+  - 포지션별 예상 종료 = commence_time + GAME_LENGTH_MIN[베팅 종목] — 그 전에는 조회하지 않음
+  - 예상 종료 후 MONITOR_NEAR_END_WINDOW 동안 MONITOR_NEAR_END_INTERVAL 간격
+  - 이후(연장 / 결과 지연)는 MONITOR_INTERVAL 간격
+  - 마감된 포지션만 모아서 점검
+
+점검 1회 = 왕복 1회:
+  - 오더북: 공유 메모리 캐시(core/bookcache.py)에 있는 토큰은 그대로 사용,
+            나머지만 POST /books 일괄 조회 (실패 시 동시성 제한 개별 GET /book)
+            느린 응답은 hedge 요청, CLOB 차단기가 열려 있으면 이번 점검 생략 (core/transport.py)
+  - 정산:   판정된 포지션 전부 settle_many() — DB 트랜잭션 1개
+  - 알림:   백그라운드 태스크로 전송 (점검 루프 비차단)
+
+즉시 정산 (core/feeds.py):
+  - market_resolved → on_market_resolved(): winning_asset_id 로 바로 승/패 정산
+  - sports 종료 이벤트 → wake(): 대기 중인 주기를 깨워 즉시 점검
+  가격 임계값 폴링은 피드 누락 / 연결 끊김 대비 예비 경로.
+
+P&L은 user 채널로 확정된 실제 체결가/수량(fill_price/fill_size) 기준.
+체결 정보가 없으면 주문 시점 금액/가격으로 계산.
+
+조회한 오더북은 recorder가 있으면 시계열 스냅샷으로 함께 기록.
+
 연속 3패 시 자동 중단 플래그 설정 → 폴링 루프 종료.
 """
 
 import asyncio
+import heapq
 import logging
+import time
+from datetime import datetime
 
-import aiohttp
-
-from config import MAX_CONSECUTIVE_LOSSES, CLOB_HOST
+from config import (
+    MAX_CONSECUTIVE_LOSSES, POSITION_BOOK_VERIFY, ODDS_SPORT,
+    GAME_LENGTH_MIN, DEFAULT_GAME_LENGTH_MIN,
+    MONITOR_NEAR_END_INTERVAL, MONITOR_NEAR_END_WINDOW,
+)
+from core.bookcache import BookCache
 from core.db import DB
 from core.executor import Executor
 from core.notifier import notify_settled
+from core.profiler import PROFILER
+from core.timeseries import SnapshotRecorder, book_summary
+from core.transport import CircuitOpenError, Transport
 
 log = logging.getLogger(__name__)
 
-MONITOR_INTERVAL = 600    # 10분마다 포지션 점검
+MONITOR_INTERVAL = 600    # 예상 종료 후 한참 지난 포지션 점검 간격 / 최대 대기
 WIN_THRESHOLD    = 0.95   # 이 이상 → 승리
 LOSS_THRESHOLD   = 0.05   # 이 이하 → 패배
+BOOKS_BATCH_SIZE = 100    # POST /books 1회당 토큰 수
+BOOK_CONCURRENCY = 8      # 일괄 조회 실패 시 개별 GET /book 동시 요청 수
 
 
 class Monitor:
     """보유 포지션 모니터링 및 결과 정산."""
 
-    def __init__(self, executor: Executor, db: DB):
-        self._executor = executor
-        self._db       = db
+    def __init__(
+        self,
+        executor: Executor,
+        db:       DB,
+        recorder: SnapshotRecorder | None = None,
+        books:    BookCache | None = None,
+    ):
+        self._executor  = executor
+        self._db        = db
+        self._positions = executor.positions
+        self._recorder  = recorder
+        self._books     = books
         self._stopped  = False
+        self._tasks: set[asyncio.Task] = set()    # 전송 중 알림 (GC 방지용 참조)
+        self._wake     = asyncio.Event()
+        self._lock     = asyncio.Lock()           # 폴링 / 피드 정산 직렬화 (이중 정산 방지)
+        self._http: Transport | None = None
+        # (점검 시각 epoch, bet_id) 최소 힙 + bet_id별 예약 시각 (중복 / 정산된 항목은 pop 시 폐기)
+        self._heap: list[tuple[float, int]] = []
+        self._deadline: dict[int, float] = {}
 
-    async def run(self, session: aiohttp.ClientSession) -> None:
-        """10분 간격으로 보유 포지션 상태 확인."""
+    @property
+    def stopped(self) -> bool:
+        """연속 패배 자동 중단 여부."""
+        return self._stopped
+
+    async def run(self, http: Transport) -> None:
+        """마감된 포지션만 점검 (가장 이른 마감까지 대기, wake() 시 즉시)."""
         log.info("[monitor] 포지션 모니터링 시작")
+        self._http = http
         while not self._stopped:
-            await asyncio.sleep(MONITOR_INTERVAL)
-            await self._check_all(session)
+            pending = await self._refresh()
+            timeout = MONITOR_INTERVAL
+            if self._heap:
+                timeout = min(timeout, max(0.0, self._heap[0][0] - time.time()))
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+                woken = True
+            except asyncio.TimeoutError:
+                woken = False
+            self._wake.clear()
+
+            due = self._pop_due(pending, woken)
+            if not due:
+                continue
+            async with self._lock:
+                # 대기 중 피드(on_market_resolved)가 정산한 포지션 제외 — pending 은 대기 전 스냅샷
+                live = {b["id"] for b in await self._db.aio.get_pending_bets()}
+                due  = [bet for bet in due if bet["id"] in live]
+                if due:
+                    with PROFILER.cycle("monitor"):
+                        await self._check_all(http, due)
+            for bet in due:
+                self._schedule(bet, after_check=True)
 
-    async def _check_all(self, session: aiohttp.ClientSession) -> None:
-        pending = self._db.get_pending_bets()
-        if not pending:
+    # ── 점검 스케줄 ──────────────────────────────────────────
+
+    async def _refresh(self) -> dict[int, dict]:
+        """보유 포지션 재조회 → 신규 포지션 예약, 정산된 포지션 예약 해제."""
+        pending = {b["id"]: b for b in await self._db.aio.get_pending_bets()}
+        if POSITION_BOOK_VERIFY:    # 방금 읽은 pending 으로 비교 (추가 조회 없음)
+            await asyncio.to_thread(self._positions.verify, set(pending))
+        for bet_id in self._deadline.keys() - pending.keys():
+            del self._deadline[bet_id]
+        for bet_id, bet in pending.items():
+            if bet_id not in self._deadline:
+                self._schedule(bet)
+        return pending
+
+    def _schedule(self, bet: dict, after_check: bool = False) -> None:
+        at = _next_check(bet, time.time(), after_check)
+        self._deadline[bet["id"]] = at
+        heapq.heappush(self._heap, (at, bet["id"]))
+
+    def _pop_due(self, pending: dict[int, dict], woken: bool) -> list[dict]:
+        """마감된 포지션 꺼내기. wake() 시에는 경기 시작된 포지션 전부."""
+        now = time.time()
+        due: dict[int, dict] = {}
+        while self._heap and self._heap[0][0] <= now:
+            at, bet_id = heapq.heappop(self._heap)
+            if bet_id in pending and self._deadline.get(bet_id) == at:
+                due[bet_id] = pending[bet_id]
+        if woken:
+            for bet_id, bet in pending.items():
+                start = _commence_ts(bet)
+                if start is None or start <= now:
+                    due[bet_id] = bet
+        return list(due.values())
+
+    async def check(self, http: Transport | None, bets: list[dict]) -> None:
+        """지정 포지션 즉시 점검 (일정과 무관 — 모의 거래 재생, core/paper.py)."""
+        async with self._lock:
+            await self._check_all(http, bets)
+
+    def wake(self) -> None:
+        """다음 점검을 즉시 실행 (sports 피드 경기 종료 이벤트)."""
+        self._wake.set()
+
+    async def on_market_resolved(self, event: dict) -> None:
+        """market_resolved 이벤트로 해당 마켓 보유 포지션 즉시 정산."""
+        winner = event.get("winning_asset_id")
+        assets = set(event.get("assets_ids") or [])
+        if not winner or self._http is None:
             return
+        async with self._lock:
+            pending = await self._db.aio.get_pending_bets()
+            settlements = []
+            for bet in pending:
+                if bet["token_id"] in assets:
+                    outcome = "win" if bet["token_id"] == winner else "loss"
+                    settlements.append((bet, outcome, _pnl(bet, outcome)))
+            if settlements:
+                await self._settle(self._http, settlements)
+                await self._check_streak()
 
+    async def _check_all(self, http: Transport, pending: list[dict]) -> None:
+        """지정 포지션 오더북 일괄 조회 → 임계값 판정 → 일괄 정산."""
         log.info(f"[monitor] 보유 포지션 {len(pending)}개 점검")
 
+        books = await self._fetch_books(http, list({b["token_id"] for b in pending}))
+
+        settlements: list[tuple[dict, str, float]] = []
         for bet in pending:
-            await self._check_one(session, bet)
+            book = books.get(bet["token_id"])
+            if book is None:
+                continue
+            bid = book_summary(book)[0]
+            if bid is None:
+                continue
+            if bid >= WIN_THRESHOLD:
+                # 승리: 보유 수량 × $1 - 매수 비용
+                settlements.append((bet, "win", _pnl(bet, "win")))
+            elif bid <= LOSS_THRESHOLD:
+                # 패배: 매수 비용 전액 손실
+                settlements.append((bet, "loss", _pnl(bet, "loss")))
 
-        # 연속 패배 체크
-        consecutive = self._db.count_consecutive_losses()
+        if settlements:
+            await self._settle(http, settlements)
+
+        await self._check_streak()
+
+    async def _check_streak(self) -> None:
+        """연속 패배 체크."""
+        consecutive = await self._db.aio.count_consecutive_losses()
         if consecutive >= MAX_CONSECUTIVE_LOSSES:
             log.error(f"[monitor] 연속 {consecutive}패 — 봇 자동 중단")
             self._stopped = True
 
-    async def _check_one(
-        self, session: aiohttp.ClientSession, bet: dict
+    async def _settle(
+        self, http: Transport, settlements: list[tuple[dict, str, float]],
     ) -> None:
-        token_id = bet["token_id"]
-        bet_id   = bet["id"]
-        bet_usdc = bet["bet_usdc"]
+        """일괄 정산 (트랜잭션 1개) 후 알림은 백그라운드 전송."""
+        await asyncio.to_thread(
+            self._positions.settle_many,
+            [(bet["id"], outcome, pnl) for bet, outcome, pnl in settlements],
+        )
+        for bet, outcome, pnl in settlements:
+            if outcome == "win":
+                log.info(f"[monitor] 🏆 승리: {bet['event_title']} | P&L=+${pnl:.2f}")
+            else:
+                log.info(f"[monitor] 💀 패배: {bet['event_title']} | P&L=-${abs(pnl):.2f}")
+            self._notify(notify_settled(http, bet["event_title"], outcome, pnl))
+
+    def _notify(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # ── 오더북 조회 ──────────────────────────────────────────
+
+    async def _fetch_books(
+        self, http: Transport, token_ids: list[str],
+    ) -> dict[str, dict]:
+        """보유 토큰 오더북 일괄 조회 → {token_id: book}. 조회 실패 토큰은 누락."""
+        books: dict[str, dict] = {}
+        if self._books is not None:
+            for token_id in token_ids:
+                if (book := self._books.get(token_id, watch=False)) is not None:
+                    books[token_id] = book
+            token_ids = [t for t in token_ids if t not in books]
+        for i in range(0, len(token_ids), BOOKS_BATCH_SIZE):
+            chunk = token_ids[i:i + BOOKS_BATCH_SIZE]
+            try:
+                # 조회 전용 POST — 멱등이므로 재시도 허용
+                for book in await http.clob.post_json(
+                    "/books", [{"token_id": t} for t in chunk], idempotent=True, hedge=True,
+                ):
+                    books[book.get("asset_id", "")] = book
+            except CircuitOpenError as e:
+                log.warning(f"[monitor] {e} — 다음 주기에 재점검")
+                break
+            except Exception as e:
+                log.warning(f"[monitor] /books 일괄 조회 실패 — 개별 조회로 대체: {e}")
+                books.update(await self._fetch_each(http, chunk))
+
+        if self._recorder is not None:
+            for token_id, book in books.items():
+                self._recorder.record_book(token_id, book)
+        return books
+
+    async def _fetch_each(
+        self, http: Transport, token_ids: list[str],
+    ) -> dict[str, dict]:
+        """GET /book 개별 조회 (동시 BOOK_CONCURRENCY개)."""
+        sem = asyncio.Semaphore(BOOK_CONCURRENCY)
+
+        async def fetch(token_id: str) -> tuple[str, dict | None]:
+            async with sem:
+                try:
+                    return token_id, await http.clob.get_json(
+                        "/book", params={"token_id": token_id}, hedge=True,
+                    )
+                except Exception as e:
+                    log.warning(f"[monitor] 오더북 조회 실패 {token_id[-8:]}: {e}")
+                    return token_id, None
+
+        results = await asyncio.gather(*(fetch(t) for t in token_ids))
+        return {t: book for t, book in results if book is not None}
+
+
+def _commence_ts(bet: dict) -> float | None:
+    try:
+        return datetime.fromisoformat(bet["commence_time"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _next_check(bet: dict, now: float, after_check: bool = False) -> float:
+    """다음 점검 시각 (epoch).
+
+    예상 종료 전  → 예상 종료 시각
+    종료 후 구간  → 첫 점검은 즉시, 이후 MONITOR_NEAR_END_INTERVAL 간격
+    그 이후       → MONITOR_INTERVAL 간격
+    시작 시각을 모르면 MONITOR_INTERVAL 간격.
+    """
+    start = _commence_ts(bet)
+    if start is None:
+        return now + MONITOR_INTERVAL
+    sport = bet.get("sport") or ODDS_SPORT    # NULL = 샤딩 이전 단일 종목
+    end = start + GAME_LENGTH_MIN.get(sport, DEFAULT_GAME_LENGTH_MIN) * 60
+    if now < end:
+        return end
+    if now < end + MONITOR_NEAR_END_WINDOW:
+        return now + MONITOR_NEAR_END_INTERVAL if after_check else now
+    return now + MONITOR_INTERVAL if after_check else now
 
-        bid = await self._fetch_best_bid(session, token_id)
-        if bid is None:
-            return
 
-        if bid >= WIN_THRESHOLD:
-            # 승리: 매수 금액 × (1 / poly_price) 만큼 수익
-            pnl = round(bet_usdc * (1 / bet["poly_price"]) - bet_usdc, 2)
-            self._db.settle_bet(bet_id, "win", pnl)
-            log.info(
-                f"[monitor] 🏆 승리: {bet['event_title']} | P&L=+${pnl:.2f}"
-            )
-            await notify_settled(session, bet["event_title"], "win", pnl)
-
-        elif bid <= LOSS_THRESHOLD:
-            # 패배: 베팅 금액 전액 손실
-            pnl = -round(bet_usdc, 2)
-            self._db.settle_bet(bet_id, "loss", pnl)
-            log.info(
-                f"[monitor] 💀 패배: {bet['event_title']} | P&L=-${bet_usdc:.2f}"
-            )
-            await notify_settled(session, bet["event_title"], "loss", pnl)
-
-    async def _fetch_best_bid(
-        self, session: aiohttp.ClientSession, token_id: str
-    ) -> float | None:
-        """CLOB REST API로 best_bid 조회."""
-        try:
-            async with session.get(
-                f"{CLOB_HOST}/book",
-                params={"token_id": token_id},
-            ) as resp:
-                resp.raise_for_status()
-                book = await resp.json()
-            bids = book.get("bids", [])
-            if not bids:
-                return None
-            return float(bids[0].get("price", 0))
-        except Exception as e:
-            log.warning(f"[monitor] 오더북 조회 실패 {token_id[-8:]}: {e}")
-            return None
+def _pnl(bet: dict, outcome: str) -> float:
+    """정산 손익. 실제 체결(fill_price/fill_size)이 있으면 그 기준."""
+    fill_price = bet.get("fill_price")
+    fill_size  = bet.get("fill_size")
+    if fill_price and fill_size:
+        shares = fill_size
+        cost   = fill_size * fill_price
+    else:
+        shares = bet["bet_usdc"] / bet["poly_price"]
+        cost   = bet["bet_usdc"]
+    if outcome == "win":
+        return round(shares - cost, 2)
+    return -round(cost, 2)
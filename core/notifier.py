@@ -9,54 +9,86 @@ core/notifier.py - 텔레그램 알림
   - 연속 패배 자동 중단
 
 Telegram Bot API: POST https://api.telegram.org/bot{TOKEN}/sendMessage
+
+install_outbox() 이후에는 전송이 core/outbox.py 백그라운드 서비스로 넘어감
+(거래 경로의 notify_* 호출은 즉시 반환).
 """
 
 import logging
 import os
 from datetime import datetime, timezone
 
-import aiohttp
-from dotenv import load_dotenv
+from core.transport import Transport
 
-load_dotenv()
 log = logging.getLogger(__name__)
 
-TELEGRAM_API = "https://api.telegram.org"
 
+# 설치되면 _send는 아웃박스에 넣고 즉시 반환 (core/outbox.py)
+_outbox = None
+
+
+def install_outbox(outbox):
+    """알림 아웃박스 설치 — 이후 모든 notify_*는 비차단 큐 적재. 이전 아웃박스 반환."""
+    global _outbox
+    prev, _outbox = _outbox, outbox
+    return prev
+
+
+async def _send(http: Transport, text: str) -> None:
+    """텔레그램 메시지 전송. 실패 시 로그만 남기고 계속 진행.
 
-async def _send(session: aiohttp.ClientSession, text: str) -> None:
-    """텔레그램 메시지 전송. 실패 시 로그만 남기고 계속 진행."""
+    아웃박스가 설치되어 있으면 큐에 넣고 바로 반환 (전송은 백그라운드).
+    """
+    if _outbox is not None:
+        _outbox.put(text)
+        return
+    await post_message(http, text)
+
+
+async def post_message(http: Transport, text: str) -> float | None:
+    """sendMessage 1회 호출.
+
+    반환: None = 완료(성공 또는 재시도 무의미), 0 이상 = 재시도 대기 초 (429 retry_after / 일시 오류).
+    """
     token   = os.getenv("TELEGRAM_BOT_TOKEN")
     chat_id = os.getenv("TELEGRAM_CHAT_ID")
 
     if not token or not chat_id:
         log.debug("[notifier] 텔레그램 미설정 — 알림 스킵")
-        return
+        return None
 
-    url = f"{TELEGRAM_API}/bot{token}/sendMessage"
     payload = {"chat_id": chat_id, "text": text, "parse_mode": "HTML"}
 
     try:
-        async with session.post(url, json=payload) as resp:
-            if resp.status != 200:
-                body = await resp.text()
-                log.warning(f"[notifier] 텔레그램 오류 {resp.status}: {body[:200]}")
+        resp = await http.telegram.request(
+            "POST", f"/bot{token}/sendMessage", json_body=payload, raise_for_status=False,
+        )
+        if resp.status == 200:
+            return None
+        log.warning(f"[notifier] 텔레그램 오류 {resp.status}: {str(resp.data)[:200]}")
+        if resp.status == 429:
+            try:
+                return float(resp.data["parameters"]["retry_after"])
+            except (ValueError, KeyError, TypeError):
+                return 1.0
+        return 0.0 if resp.status >= 500 else None
     except Exception as e:
         log.warning(f"[notifier] 전송 실패: {e}")
+        return 0.0
 
 
 # ── 알림 함수 ────────────────────────────────────────────────
 
-async def notify_started(session: aiohttp.ClientSession) -> None:
-    await _send(session, "🟢 <b>polymoly 봇 시작</b>\nPolymarket 배당 역전 모니터링 시작.")
+async def notify_started(http: Transport) -> None:
+    await _send(http, "🟢 <b>polymoly 봇 시작</b>\nPolymarket 배당 역전 모니터링 시작.")
 
 
-async def notify_stopped(session: aiohttp.ClientSession, reason: str = "") -> None:
-    await _send(session, f"🔴 <b>봇 중단</b>\n{reason}")
+async def notify_stopped(http: Transport, reason: str = "") -> None:
+    await _send(http, f"🔴 <b>봇 중단</b>\n{reason}")
 
 
 async def notify_opportunity(
-    session: aiohttp.ClientSession,
+    http: Transport,
     opp,   # ArbitrageOpportunity (순환 import 방지로 타입 힌트 생략)
 ) -> None:
     """배당 역전 기회 감지 알림."""
@@ -68,10 +100,10 @@ async def notify_opportunity(
         f"유동성: {opp.liquidity_shares:.0f}  베팅: ${opp.bet_usdc:.0f}\n"
         f"매수: {opp.buy_token_label}"
     )
-    await _send(session, text)
+    await _send(http, text)
 
 
-async def notify_executed(session: aiohttp.ClientSession, result) -> None:
+async def notify_executed(http: Transport, result) -> None:
     """매수 체결 알림."""
     opp = result.opportunity
     text = (
@@ -81,10 +113,10 @@ async def notify_executed(session: aiohttp.ClientSession, result) -> None:
         f"금액: ${opp.bet_usdc:.0f} @ {opp.poly_price:.2f}\n"
         f"order_id: {result.order_id}"
     )
-    await _send(session, text)
+    await _send(http, text)
 
 
-async def notify_failed(session: aiohttp.ClientSession, result) -> None:
+async def notify_failed(http: Transport, result) -> None:
     """매수 실패 알림."""
     opp = result.opportunity
     text = (
@@ -92,11 +124,11 @@ async def notify_failed(session: aiohttp.ClientSession, result) -> None:
         f"마켓: {opp.event_title}\n"
         f"{result.message}"
     )
-    await _send(session, text)
+    await _send(http, text)
 
 
 async def notify_settled(
-    session: aiohttp.ClientSession,
+    http: Transport,
     event_title: str,
     outcome: str,
     pnl: float,
@@ -109,11 +141,11 @@ async def notify_settled(
         f"마켓: {event_title}\n"
         f"P&L: {pnl_str}"
     )
-    await _send(session, text)
+    await _send(http, text)
 
 
 async def notify_auto_stopped(
-    session: aiohttp.ClientSession,
+    http: Transport,
     consecutive_losses: int,
     stats: dict,
 ) -> None:
@@ -124,11 +156,11 @@ async def notify_auto_stopped(
         f"승: {stats.get('wins', 0)} / 패: {stats.get('losses', 0)}\n"
         f"총 P&L: ${stats.get('total_pnl', 0):+.2f}"
     )
-    await _send(session, text)
+    await _send(http, text)
 
 
 async def notify_low_credits(
-    session: aiohttp.ClientSession,
+    http: Transport,
     remaining: int,
     used: int = 0,
 ) -> None:
@@ -139,13 +171,13 @@ async def notify_low_credits(
         f"크레딧이 최솟값 이하로 떨어져 Odds API 호출을 중단합니다.\n"
         f"다음 월 결제 후 봇을 재시작하세요."
     )
-    await _send(session, text)
+    await _send(http, text)
 
 
 # ── 디버깅/모니터링 알림 ──────────────────────────────────────
 
 async def notify_poll_start(
-    session: aiohttp.ClientSession,
+    http: Transport,
     cycle_num: int,
     active_positions: int = 0,
     credits_remaining: int | None = None,
@@ -157,33 +189,33 @@ async def notify_poll_start(
         f"📊 <b>폴링 #{cycle_num}</b>  {now}\n"
         f"보유 포지션: {active_positions}개  |  잔여 크레딧: {credits_str}"
     )
-    await _send(session, text)
+    await _send(http, text)
 
 
-async def notify_no_games(session: aiohttp.ClientSession) -> None:
+async def notify_no_games(http: Transport) -> None:
     """Odds API 정배 경기 없음."""
     await _send(
-        session,
+        http,
         "ℹ️ <b>정배 경기 없음</b>\nNBA 경기 없는 날이거나 전부 비등 배당.",
     )
 
 
-async def notify_no_markets(session: aiohttp.ClientSession) -> None:
+async def notify_no_markets(http: Transport) -> None:
     """Gamma API 폴리마켓 마켓 없음."""
     await _send(
-        session,
+        http,
         "⚠️ <b>폴리마켓 마켓 없음</b>\nGamma API에서 NBA 마켓 조회 결과 없음.",
     )
 
 
 async def notify_no_matches(
-    session: aiohttp.ClientSession,
+    http: Transport,
     n_pinnacle: int,
     n_poly: int,
 ) -> None:
     """Pinnacle ↔ 폴리마켓 경기 매핑 실패."""
     await _send(
-        session,
+        http,
         f"⚠️ <b>매핑 실패</b>\n"
         f"Pinnacle {n_pinnacle}경기 ↔ 폴리마켓 {n_poly}마켓\n"
         f"팀명 정규화 또는 시간 매칭 문제일 수 있음.",
@@ -191,36 +223,36 @@ async def notify_no_matches(
 
 
 async def notify_no_opportunities(
-    session: aiohttp.ClientSession,
+    http: Transport,
     n_matched: int,
 ) -> None:
     """스캔 완료 — 조건 미충족으로 기회 없음."""
     await _send(
-        session,
+        http,
         f"ℹ️ <b>기회 없음</b>\n{n_matched}경기 스캔 완료 — 갭/유동성 조건 미충족.",
     )
 
 
 async def notify_error(
-    session: aiohttp.ClientSession,
+    http: Transport,
     context: str,
     error_msg: str,
 ) -> None:
     """오류 발생 알림 (네트워크 / 예상치 못한 오류)."""
     await _send(
-        session,
+        http,
         f"❌ <b>오류 [{context}]</b>\n{error_msg}",
     )
 
 
 async def notify_credits_warning(
-    session: aiohttp.ClientSession,
+    http: Transport,
     remaining: int,
     threshold: int,
 ) -> None:
     """Odds API 크레딧 경고 (Warning 수준, 아직 호출 차단 아님)."""
     await _send(
-        session,
+        http,
         f"⚠️ <b>크레딧 경고</b>\n"
         f"잔여: {remaining:,} (경고 임계값: {threshold:,})\n"
         f"조만간 크레딧이 소진될 수 있습니다.",
@@ -228,14 +260,14 @@ async def notify_credits_warning(
 
 
 async def notify_daily_limit(
-    session: aiohttp.ClientSession,
+    http: Transport,
     count: int,
     limit: int,
     wait_hours: float,
 ) -> None:
     """일일 Odds API 호출 한도 도달 알림."""
     await _send(
-        session,
+        http,
         f"📵 <b>일일 호출 한도 도달</b>\n"
         f"오늘 호출: {count}/{limit}회\n"
         f"{wait_hours:.1f}시간 후(자정 UTC) 자동 재개됩니다.",
@@ -8,25 +8,25 @@ Odds API에서 Pinnacle 배당을 가져와 정배(1.5 이하) 경기만 반환.
   - 매 호출 후 잔여 크레딧을 data/credits.json에 저장
   - 잔여 < CREDITS_MIN_RESERVE → InsufficientCreditsError 발생 (호출 차단)
   - 잔여 < CREDITS_WARNING_THRESHOLD → 경고 로그 (main.py에서 Telegram 알림)
+  - 장부(CreditLedger)가 확인 → 호출 예약 → 기록을 Lock 안에서 처리
+    (supervisor.py 멀티 프로세스 모드에서는 install_ledger()로 공유 장부 프록시 설치)
 """
 
 import json
 import logging
 import os
+import threading
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
-import aiohttp
-from dotenv import load_dotenv
-
 from config import (
-    ODDS_API_BASE, ODDS_BOOKMAKERS, ODDS_SPORT, MAX_PINNACLE_ODDS,
+    ODDS_BOOKMAKERS, ODDS_SPORT, MAX_PINNACLE_ODDS,
     CREDITS_MIN_RESERVE, CREDITS_WARNING_THRESHOLD, CREDITS_STATE_PATH,
     DAILY_MAX_API_CALLS,
 )
+from core.transport import Transport
 
-load_dotenv()
 log = logging.getLogger(__name__)
 
 
@@ -83,9 +83,69 @@ def _save_credits(remaining: int, used: int, daily_date: str, daily_calls: int)
     }, indent=2))
 
 
+# ── 크레딧 장부 ──────────────────────────────────────────────
+
+class CreditLedger:
+    """크레딧 / 일일 호출 장부. 진행 중 호출도 일일 한도에 포함 (동시 호출 초과 방지)."""
+
+    def __init__(self):
+        self._lock     = threading.Lock()
+        self._inflight = 0
+
+    def remaining(self) -> int | None:
+        return _load_credits()
+
+    def reserve(self) -> tuple[str, int]:
+        """호출 1회 예약.
+
+        반환: ("ok", 오늘 호출 수) / ("credits", 잔여 크레딧) / ("daily", 오늘 호출 수)
+        (예외 대신 상태값 — 프로세스 간 프록시 호출에서도 그대로 전달되도록)
+        """
+        with self._lock:
+            state  = _load_state()
+            cached = state.get("remaining")
+            if cached is not None and int(cached) < CREDITS_MIN_RESERVE:
+                return "credits", int(cached)
+            calls = self._today_calls(state) + self._inflight
+            if calls >= DAILY_MAX_API_CALLS:
+                return "daily", calls
+            self._inflight += 1
+            return "ok", calls
+
+    def commit(self, remaining: int, used: int) -> int:
+        """예약한 호출 완료 — 크레딧 저장 + 일일 호출 +1. 오늘 호출 수 반환."""
+        with self._lock:
+            self._inflight = max(0, self._inflight - 1)
+            calls = self._today_calls(_load_state()) + 1
+            _save_credits(remaining, used, _today(), calls)
+            return calls
+
+    def release(self) -> None:
+        """예약한 호출 취소 (요청 실패 / 크레딧 헤더 없음)."""
+        with self._lock:
+            self._inflight = max(0, self._inflight - 1)
+
+    @staticmethod
+    def _today_calls(state: dict) -> int:
+        return state.get("daily_calls", 0) if state.get("daily_date") == _today() else 0
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+_ledger = CreditLedger()
+
+
+def install_ledger(ledger) -> None:
+    """크레딧 장부 교체 (멀티 프로세스 공유 장부 프록시)."""
+    global _ledger
+    _ledger = ledger
+
+
 def load_credits() -> int | None:
     """마지막으로 저장된 잔여 크레딧 반환 (외부 크레딧 상태 확인용)."""
-    return _load_credits()
+    return _ledger.remaining()
 
 
 @dataclass
@@ -97,6 +157,7 @@ class PinnacleGame:
     commence_time: datetime  # UTC
     home_odds:     float     # Pinnacle 소수 배당
     away_odds:     float
+    sport:         str = ODDS_SPORT   # Odds API sport 키 (샤드 — 모니터 예상 종료 시각 계산)
 
     @property
     def favorite_is_home(self) -> bool:
@@ -128,7 +189,7 @@ class PinnacleGame:
         )
 
 
-async def fetch_nba_games(session: aiohttp.ClientSession) -> list[PinnacleGame]:
+async def fetch_nba_games(http: Transport, sport: str = ODDS_SPORT) -> list[PinnacleGame]:
     """Pinnacle NBA 경기 배당 수집.
 
     Returns:
@@ -141,19 +202,13 @@ async def fetch_nba_games(session: aiohttp.ClientSession) -> list[PinnacleGame]:
     if not api_key:
         raise ValueError("[odds_fetcher] ODDS_API_KEY 미설정")
 
-    # 사전 크레딧 체크 (저장된 이전 값 기준)
-    state  = _load_state()
-    cached = state.get("remaining")
-    if cached is not None and int(cached) < CREDITS_MIN_RESERVE:
-        raise InsufficientCreditsError(int(cached))
-
-    # 일일 호출 횟수 체크
-    today      = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    day_calls  = state.get("daily_calls", 0) if state.get("daily_date") == today else 0
-    if day_calls >= DAILY_MAX_API_CALLS:
-        raise DailyLimitReachedError(day_calls, DAILY_MAX_API_CALLS)
+    # 사전 크레딧 / 일일 호출 횟수 체크 (저장된 이전 값 기준) + 호출 예약
+    status, value = _ledger.reserve()
+    if status == "credits":
+        raise InsufficientCreditsError(value)
+    if status == "daily":
+        raise DailyLimitReachedError(value, DAILY_MAX_API_CALLS)
 
-    url = f"{ODDS_API_BASE}/sports/{ODDS_SPORT}/odds"
     params = {
         "apiKey":     api_key,
         "bookmakers": ODDS_BOOKMAKERS,
@@ -162,20 +217,27 @@ async def fetch_nba_games(session: aiohttp.ClientSession) -> list[PinnacleGame]:
         "dateFormat": "iso",
     }
 
-    async with session.get(url, params=params) as resp:
-        remaining_str = resp.headers.get("x-requests-remaining", "")
-        used_str      = resp.headers.get("x-requests-used", "")
-        resp.raise_for_status()
-        raw_games: list[dict] = await resp.json()
+    try:
+        resp = await http.odds.request("GET", f"/sports/{sport}/odds", params=params)
+    except BaseException:
+        _ledger.release()
+        raise
+    remaining_str = resp.headers.get("x-requests-remaining", "")
+    used_str      = resp.headers.get("x-requests-used", "")
+    raw_games: list[dict] = resp.data
 
     # 크레딧 파싱 + 저장 (일일 호출 횟수 +1)
     try:
         remaining = int(remaining_str)
         used      = int(used_str)
-        _save_credits(remaining, used, today, day_calls + 1)
+    except (ValueError, TypeError):
+        _ledger.release()
+        log.debug("[odds_fetcher] 크레딧 헤더 파싱 실패: remaining='%s' used='%s'", remaining_str, used_str)
+    else:
+        day_calls = _ledger.commit(remaining, used)
         log.info(
             f"[odds_fetcher] 크레딧: 사용={used:,}, 남은={remaining:,} "
-            f"| 오늘 호출: {day_calls + 1}/{DAILY_MAX_API_CALLS}"
+            f"| 오늘 호출: {day_calls}/{DAILY_MAX_API_CALLS}"
         )
 
         if remaining < CREDITS_MIN_RESERVE:
@@ -185,17 +247,13 @@ async def fetch_nba_games(session: aiohttp.ClientSession) -> list[PinnacleGame]:
                 f"[odds_fetcher] ⚠️ 크레딧 경고: 잔여 {remaining:,} "
                 f"(경고 임계값 {CREDITS_WARNING_THRESHOLD:,})"
             )
-    except InsufficientCreditsError:
-        raise
-    except (ValueError, TypeError):
-        log.debug(f"[odds_fetcher] 크레딧 헤더 파싱 실패: remaining='{remaining_str}' used='{used_str}'")
 
-    games = _parse(raw_games)
-    log.info(f"[odds_fetcher] NBA {len(raw_games)}경기 → 정배 {len(games)}경기")
+    games = _parse(raw_games, sport)
+    log.info(f"[odds_fetcher] {sport} {len(raw_games)}경기 → 정배 {len(games)}경기")
     return games
 
 
-def _parse(raw_games: list[dict]) -> list[PinnacleGame]:
+def _parse(raw_games: list[dict], sport: str = ODDS_SPORT) -> list[PinnacleGame]:
     """Odds API 응답 파싱 → 정배 있는 PinnacleGame 리스트."""
     result = []
 
@@ -217,7 +275,7 @@ def _parse(raw_games: list[dict]) -> list[PinnacleGame]:
         home_odds, away_odds = _extract_h2h(pinnacle, home_team, away_team)
 
         if home_odds is None or away_odds is None:
-            log.debug(f"[odds_fetcher] 배당 없음: {home_team} vs {away_team}")
+            log.debug("[odds_fetcher] 배당 없음: %s vs %s", home_team, away_team)
             continue
 
         # 두 팀 중 하나라도 MAX_PINNACLE_ODDS 이하여야 함
@@ -231,9 +289,10 @@ def _parse(raw_games: list[dict]) -> list[PinnacleGame]:
             commence_time=commence_time,
             home_odds=home_odds,
             away_odds=away_odds,
+            sport=raw.get("sport_key") or sport,
         )
         result.append(game)
-        log.debug(str(game))
+        log.debug("%s", game, extra={"stage": "odds", "game_id": game.game_id})
 
     return result
 
@@ -0,0 +1,260 @@
+"""
+core/order_tracker.py - user WebSocket 채널 기반 주문 체결 추적
+
+executor가 받은 order_id를 인증 user 채널(CLOB_WS_USER)로 추적해
+trade 상태 전이를 DB에 반영. REST 주문 상태 폴링 없이 ms 단위로 체결 확인.
+
+trade 상태 (docs/polymarket/websocket/user-channel.md):
+  MATCHED → MINED → CONFIRMED        (CONFIRMED: 확정, 종료)
+     ↓        ↑
+  RETRYING ───┘
+     ↓
+  FAILED                             (FAILED: 실패, 종료 → 베팅 무효)
+
+order 이벤트:
+  CANCELLATION + size_matched=0 → 지연(delayed) FOK 미체결 → 베팅 무효
+
+실제 체결가(VWAP) / 체결 수량은 trade별로 모아 bets.fill_price / fill_size에 기록.
+구독은 condition_id(마켓) 단위. 신규 마켓은 주문 제출 전 prepare() 로 동적 subscribe
+(user 채널은 구독한 마켓 이벤트만 전달 — 제출 후 구독하면 첫 MATCHED 가 유실될 수 있음).
+track() 등록 전에 도착한 trade / order 이벤트는 order_id 별로 보관했다가 등록 시 재생.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+
+import aiohttp
+
+from config import CLOB_WS_USER
+from core.db import DB
+from core.metrics import FILLS, observe_ws_lag
+from core.positions import PositionBook
+from core.transport import Transport
+
+log = logging.getLogger(__name__)
+
+PING_INTERVAL   = 10    # 문서 기준: 10초마다 PING
+RECONNECT_DELAY = 5     # 재연결 초기 대기 (초), 최대 60초까지 2배씩
+EARLY_BUFFER    = 256   # track() 등록 전에 도착한 이벤트 보관 개수
+PREPARE_TTL     = 60    # prepare() 후 이 시간 안에 track() 이 없으면 구독 대상에서 제외 (초)
+
+TERMINAL = ("confirmed", "failed")
+
+
+@dataclass
+class TrackedOrder:
+    """추적 중인 주문 1건."""
+    order_id:     str
+    bet_id:       int
+    condition_id: str | None
+    status:       str = "matched"
+    # trade_id → (price, size, status)
+    trades:       dict[str, tuple[float, float, str]] = field(default_factory=dict)
+
+    def fill(self) -> tuple[float | None, float | None]:
+        """실패하지 않은 trade 기준 평균 체결가 / 총 수량."""
+        live = [(p, s) for p, s, st in self.trades.values() if st != "failed"]
+        size = sum(s for _, s in live)
+        if size <= 0:
+            return None, None
+        return round(sum(p * s for p, s in live) / size, 6), round(size, 6)
+
+
+class OrderTracker:
+    """user 채널 구독 + order_id별 체결 상태 추적."""
+
+    def __init__(self, db: DB, positions: PositionBook | None = None):
+        self._db      = db
+        self._void    = positions.void_bet if positions is not None else db.void_bet
+        self._orders: dict[str, TrackedOrder] = {}
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+        # 주문 응답보다 먼저 도착한 trade / order 이벤트 (order_id → 이벤트 목록)
+        self._early: dict[str, list[dict]] = {}
+        # 주문 제출 전 미리 구독한 마켓 (condition_id → prepare 시각)
+        self._prepared: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def _load_pending(self) -> None:
+        """재시작 시 미확정 주문 복원."""
+        for bet in self._db.get_unconfirmed_bets():
+            self._orders[bet["order_id"]] = TrackedOrder(
+                order_id     = bet["order_id"],
+                bet_id       = bet["id"],
+                condition_id = bet.get("condition_id"),
+                status       = bet.get("fill_status") or "matched",
+            )
+        if self._orders:
+            log.info(f"[tracker] 미확정 주문 {len(self._orders)}건 추적 재개")
+
+    async def prepare(self, condition_id: str | None) -> None:
+        """주문 제출 직전 호출 — 새 마켓이면 먼저 구독 (체결 이벤트가 구독보다 앞서지 않도록)."""
+        if not condition_id:
+            return
+        new_market = condition_id not in self._markets()
+        self._prepared[condition_id] = time.monotonic()
+        if new_market:
+            await self._subscribe(condition_id)
+
+    async def track(self, order_id: str, bet_id: int, condition_id: str | None) -> None:
+        """신규 주문 추적 등록. prepare() 없이 온 새 마켓이면 지금 구독, 먼저 온 이벤트 재생."""
+        new_market = condition_id and condition_id not in self._markets()
+        self._prepared.pop(condition_id, None)
+        self._orders[order_id] = TrackedOrder(order_id, bet_id, condition_id)
+        if new_market:
+            await self._subscribe(condition_id)
+        for event in self._early.pop(order_id, []):
+            await self.handle(event)
+
+    async def _subscribe(self, condition_id: str) -> None:
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.send_json({"markets": [condition_id], "operation": "subscribe"})
+
+    def _markets(self) -> set[str]:
+        cutoff = time.monotonic() - PREPARE_TTL
+        self._prepared = {c: ts for c, ts in self._prepared.items() if ts >= cutoff}
+        return {o.condition_id for o in self._orders.values() if o.condition_id} | set(self._prepared)
+
+    def _buffer(self, order_id: str, event: dict) -> None:
+        """track() 전에 도착한 이벤트 보관 (EARLY_BUFFER 초과 시 가장 오래된 주문분 폐기)."""
+        if order_id not in self._early and len(self._early) >= EARLY_BUFFER:
+            self._early.pop(next(iter(self._early)))
+        self._early.setdefault(order_id, []).append(event)
+
+    # ── 연결 루프 ────────────────────────────────────────────
+
+    async def run(self, http: Transport) -> None:
+        """user 채널 연결 유지 (끊기면 지수 백오프로 재연결)."""
+        auth = {
+            "apiKey":     os.getenv("POLY_API_KEY"),
+            "secret":     os.getenv("POLY_SECRET"),
+            "passphrase": os.getenv("POLY_PASSPHRASE"),
+        }
+        if not all(auth.values()):
+            log.warning("[tracker] API 자격증명 미설정 — 체결 추적 비활성")
+            return
+
+        await asyncio.to_thread(self._load_pending)
+
+        delay = RECONNECT_DELAY
+        while True:
+            try:
+                async with http.ws_connect(CLOB_WS_USER, heartbeat=None) as ws:
+                    self._ws = ws
+                    await ws.send_json({
+                        "auth":    auth,
+                        "markets": sorted(self._markets()),
+                        "type":    "user",
+                    })
+                    log.info(f"[tracker] user 채널 연결 (마켓 {len(self._markets())}개)")
+                    delay = RECONNECT_DELAY
+                    await self._read(ws)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning(f"[tracker] user 채널 오류: {e}")
+            finally:
+                self._ws = None
+            log.info(f"[tracker] {delay}초 후 재연결")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60)
+
+    async def _read(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        pinger = asyncio.create_task(self._ping(ws))
+        try:
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    break
+                if msg.data == "PONG":
+                    continue
+                try:
+                    data = json.loads(msg.data)
+                except json.JSONDecodeError:
+                    log.debug(f"[tracker] 비JSON 메시지: {msg.data[:80]}")
+                    continue
+                for event in data if isinstance(data, list) else [data]:
+                    await self.handle(event)
+        finally:
+            pinger.cancel()
+
+    async def _ping(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        while not ws.closed:
+            await asyncio.sleep(PING_INTERVAL)
+            await ws.send_str("PING")
+
+    # ── 이벤트 처리 ──────────────────────────────────────────
+
+    async def handle(self, event: dict) -> None:
+        """user 채널 이벤트 1건 처리 (trade / order)."""
+        event_type = event.get("event_type")
+        observe_ws_lag("user", event)
+        if event_type == "trade":
+            await self._on_trade(event)
+        elif event_type == "order":
+            await self._on_order(event)
+
+    async def _on_trade(self, event: dict) -> None:
+        status   = str(event.get("status", "")).lower()
+        trade_id = event.get("id", "")
+
+        # 시장가 FOK → 보통 taker. 지정가가 체결된 경우 maker_orders에 포함
+        fills: list[tuple[str, float, float]] = []
+        taker_id = event.get("taker_order_id")
+        if taker_id in self._orders:
+            fills.append((taker_id, float(event.get("price", 0)), float(event.get("size", 0))))
+        elif taker_id:
+            self._buffer(taker_id, event)
+        for mo in event.get("maker_orders") or []:
+            if mo.get("order_id") in self._orders:
+                fills.append((
+                    mo["order_id"], float(mo.get("price", 0)), float(mo.get("matched_amount", 0)),
+                ))
+
+        for order_id, price, size in fills:
+            order = self._orders[order_id]
+            order.trades[trade_id] = (price, size, status)
+            await self._update(order)
+
+    async def _on_order(self, event: dict) -> None:
+        order_id = event.get("id", "")
+        order    = self._orders.get(order_id)
+        if order is None:
+            if order_id:
+                self._buffer(order_id, event)
+            return
+        if event.get("type") == "CANCELLATION" and float(event.get("size_matched") or 0) == 0:
+            order.status = "failed"
+            await asyncio.to_thread(self._void, order.bet_id, "cancelled")
+            self._orders.pop(order.order_id, None)
+            FILLS.inc(status="cancelled")
+            log.warning(f"[tracker] 주문 취소 (미체결): order_id={order.order_id[:12]}…")
+
+    async def _update(self, order: TrackedOrder) -> None:
+        """trade 상태 집계 → 주문 상태 결정 → DB 반영."""
+        statuses = [st for _, _, st in order.trades.values()]
+        if all(st == "failed" for st in statuses):
+            status = "failed"
+        elif all(st in ("confirmed", "failed") for st in statuses):
+            status = "confirmed"
+        elif any(st == "mined" for st in statuses):
+            status = "mined"
+        else:
+            status = statuses[-1]
+
+        order.status = status
+
+        if status == "failed":
+            await asyncio.to_thread(self._void, order.bet_id, "failed")
+        else:
+            price, size = order.fill()
+            await self._db.aio.record_fill(order.bet_id, status, price, size)
+            log.info(f"[tracker] {status.upper()}: order_id={order.order_id[:12]}… bet_id={order.bet_id}")
+
+        if status in TERMINAL:
+            self._orders.pop(order.order_id, None)
+            FILLS.inc(status=status)
@@ -0,0 +1,180 @@
+"""
+core/outbox.py - 텔레그램 알림 아웃박스 (비차단 백그라운드 전송)
+
+notify_* 가 텔레그램 API 응답을 기다리면 주문 제출이 그만큼 늦어짐.
+notifier.install_outbox() 이후 _send 는 put() 으로 큐에 넣고 즉시 반환, 전송은 run() 담당.
+
+  - 큐:      메모리 deque (OUTBOX_QUEUE_SIZE 상한 — 초과 시 가장 오래된 알림 폐기)
+  - 영속화:  put() 시점에 outbox 테이블 저장 요청 (writer 스레드, 비차단) → 전송 성공 / 포기 /
+             큐 폐기 시 삭제 (비정상 종료 시에도 다음 시작 때 미전송분 재전송)
+  - 합치기:  OUTBOX_COALESCE_SEC 안에 몰린 알림은 OUTBOX_MAX_CHARS 까지 한 메시지로
+  - 속도:    토큰 버킷 (분당 OUTBOX_RATE_PER_MIN, 채팅당 초당 1건)
+  - 재시도:  429 → retry_after 만큼 대기, 5xx / 네트워크 오류 → 지수 백오프
+             OUTBOX_MAX_ATTEMPTS 초과 시 폐기
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from config import (
+    OUTBOX_QUEUE_SIZE,
+    OUTBOX_COALESCE_SEC,
+    OUTBOX_MAX_CHARS,
+    OUTBOX_RATE_PER_MIN,
+    OUTBOX_MAX_ATTEMPTS,
+)
+from core.db import DB
+from core.notifier import post_message
+from core.transport import Transport
+
+log = logging.getLogger(__name__)
+
+MIN_INTERVAL = 1.0     # 같은 채팅 연속 전송 최소 간격 (초)
+BACKOFF_BASE = 2.0     # 일시 오류 재시도 대기 (초), 시도마다 2배
+BACKOFF_MAX  = 60.0
+SEPARATOR    = "\n\n"
+
+
+class TokenBucket:
+    """초당 rate 개 충전, 최대 capacity 개 보유."""
+
+    def __init__(self, rate: float, capacity: float):
+        self._rate     = rate
+        self._capacity = capacity
+        self._tokens   = capacity
+        self._updated  = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens  = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+class Outbox:
+    """알림 큐 + 백그라운드 전송기."""
+
+    def __init__(self, db: DB, label: str = ""):
+        """label: 모든 알림 앞에 붙일 머리말 (모의 거래 알림 구분 — config.PAPER_NOTIFY_LABEL)."""
+        self._db      = db
+        self._label   = label
+        self._queue:  deque[tuple[str, Future]] = deque()    # (본문, 저장 row ID Future)
+        self._evicted: list[Future] = []                      # 큐 초과로 폐기 — 행 삭제 대기
+        self._ready   = asyncio.Event()
+        self._bucket  = TokenBucket(OUTBOX_RATE_PER_MIN / 60, OUTBOX_RATE_PER_MIN)
+        self._last    = 0.0
+        self._dropped = 0
+        self._closing = False
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def put(self, text: str) -> None:
+        """알림 적재 + DB 저장 요청 (즉시 반환)."""
+        if len(self._queue) >= OUTBOX_QUEUE_SIZE:
+            self._evicted.append(self._queue.popleft()[1])
+            self._dropped += 1
+            log.warning(f"[outbox] 큐 가득 참 — 오래된 알림 폐기 (누적 {self._dropped}건)")
+        text = self._label + text
+        self._queue.append((text, self._db.outbox_put(text)))
+        self._ready.set()
+
+    # ── 전송 루프 ────────────────────────────────────────────
+
+    async def run(self, http: Transport) -> None:
+        """미전송분 복구 후 큐 전송 루프.
+
+        이번 실행에서 put() 한 알림도 이미 저장돼 있으므로 큐에 있는 행은 복구 대상에서 제외
+        (큐 초과로 폐기된 행은 먼저 삭제).
+        """
+        await self._purge_evicted()
+        rows   = await self._db.aio.outbox_pending()
+        queued = set(await self._row_ids([fut for _, fut in self._queue]))
+        for row in rows:
+            if row["id"] not in queued:
+                await self._deliver(http, row["text"], [row["id"]], row["attempts"])
+
+        while True:
+            await self._ready.wait()
+            if not self._closing:
+                await asyncio.sleep(OUTBOX_COALESCE_SEC)    # 몰려오는 알림을 모음
+            await self._purge_evicted()
+            while self._queue:
+                text, futs = self._take_batch()
+                await self._deliver(http, text, await self._row_ids(futs))
+            self._ready.clear()
+
+    def _take_batch(self) -> tuple[str, list[Future]]:
+        """큐 앞쪽부터 OUTBOX_MAX_CHARS 까지 합쳐 한 메시지로. (본문, 저장 Future 목록) 반환."""
+        text, fut = self._queue.popleft()
+        parts, futs = [text], [fut]
+        size = len(text)
+        while self._queue and size + len(SEPARATOR) + len(self._queue[0][0]) <= OUTBOX_MAX_CHARS:
+            nxt, fut = self._queue.popleft()
+            parts.append(nxt)
+            futs.append(fut)
+            size += len(SEPARATOR) + len(nxt)
+        return SEPARATOR.join(parts), futs
+
+    @staticmethod
+    async def _row_ids(futs: list[Future]) -> list[int]:
+        """put() 저장 요청 완료 대기 → row ID 목록."""
+        return [await asyncio.wrap_future(fut) for fut in futs]
+
+    async def _purge_evicted(self) -> None:
+        """큐 초과로 폐기된 알림의 저장 행 삭제."""
+        if self._evicted:
+            futs, self._evicted = self._evicted, []
+            await self._db.aio.outbox_done(await self._row_ids(futs))
+
+    async def _deliver(
+        self, http: Transport, text: str, ids: list[int], attempts: int = 0,
+    ) -> None:
+        """1건 전송 (속도 제한 + 재시도). 성공 / 포기 시 outbox 행 삭제."""
+        while True:
+            await self._bucket.acquire()
+            wait = MIN_INTERVAL - (time.monotonic() - self._last)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last = time.monotonic()
+
+            retry_after = await post_message(http, text)
+            if retry_after is None:
+                break
+            attempts += 1
+            if attempts >= OUTBOX_MAX_ATTEMPTS:
+                log.error(f"[outbox] {attempts}회 실패 — 알림 폐기: {text[:60]!r}")
+                break
+            await self._db.aio.outbox_retry(ids)
+            delay = retry_after or min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+            log.info(f"[outbox] {delay:.0f}초 후 재전송 ({attempts}/{OUTBOX_MAX_ATTEMPTS})")
+            await asyncio.sleep(delay)
+        await self._db.aio.outbox_done(ids)
+
+    async def close(self, http: Transport, timeout: float = 10.0) -> None:
+        """남은 알림 직접 전송 (최대 timeout초). 못 보낸 알림은 이미 저장돼 있어 다음 시작 때 전송."""
+        self._closing = True
+        deadline = time.monotonic() + timeout
+        await self._purge_evicted()
+        try:
+            while self._queue and time.monotonic() < deadline:
+                text, futs = self._take_batch()
+                await asyncio.wait_for(
+                    self._deliver(http, text, await self._row_ids(futs)),
+                    max(0.1, deadline - time.monotonic()),
+                )
+        except asyncio.TimeoutError:
+            pass
+        if self._queue:
+            log.warning(f"[outbox] 미전송 알림 {len(self._queue)}건 — 다음 시작 시 전송")
+            self._queue.clear()
@@ -0,0 +1,265 @@
+"""
+core/paper.py - 모의 거래 (실제 주문 없이 같은 전략 / 정산 경로 검증 + 기록 데이터 재생 부하 테스트)
+
+  PaperExecutor  Executor 와 같은 인터페이스 — 제출 단계(_submit)만 교체.
+                 CLOB 주문 대신 현재 오더북(공유 캐시 → 없으면 감지 시점 오더북)에 FOK 시뮬레이션:
+                 worst-price(= 감지 best ask, 실주문의 MarketOrderArgs.price) 이하 ask 를 싼 가격부터
+                 소진해 금액 전액이 채워지면 VWAP / 수량으로 즉시 체결 확정(confirmed),
+                 못 채우면 전량 취소(fok_cancelled). SDK / 자격증명 불필요.
+                 기록은 별도 DB(PAPER_DB_PATH) — 정산은 일반 Monitor 가 그대로 담당.
+                 (python main.py --paper)
+
+  replay()       기록된 스냅샷(match / odds / book — core/timeseries.py)을 시각 순으로 대기 없이 재생
+                 → scanner.check_game → PaperExecutor → Monitor.check 정산.
+                 경기 시작 시각은 재생 시각 기준으로 이동 (진입 창 / 마감 판정이 기록 당시와 동일).
+                 알림은 폐기. 처리량(틱 / 평가 / 주문 per 초) 보고.
+                 (python replay.py)
+
+재생 오더북은 스냅샷 요약(best bid / ask + 상위 3호가 수량 합)으로 만든 1단계 호가
+→ 최우선가 외 호가가 없으므로 체결 판정은 worst-price 규칙과 같고, 깊이 초과 금액은 미체결.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+
+from core.bookcache import BookCache
+from core.checkpoint import decode
+from core.db import DB
+from core.executor import ExecutionResult, Executor
+from core.governor import Governor
+from core.matcher import MatchedGame, PolymarketMarket
+from core.monitor import Monitor
+from core.notifier import install_outbox
+from core.odds_fetcher import PinnacleGame
+from core.positions import PositionBook
+from core.scanner import ArbitrageOpportunity, check_game
+
+log = logging.getLogger(__name__)
+
+EPS = 1e-9
+
+
+def simulate_fok(book: dict, amount_usdc: float, worst_price: float) -> tuple[float, float] | None:
+    """FOK 시장가 매수 시뮬레이션.
+
+    worst_price 이하 ask 를 싼 가격부터 소진 → amount_usdc 전액 체결 시 (VWAP, shares).
+    전액을 채우지 못하면 None (전량 취소). 정렬 방향과 무관.
+    """
+    levels = sorted(
+        (float(lv["price"]), float(lv.get("size", 0)))
+        for lv in book.get("asks") or [] if lv.get("price") is not None
+    )
+    cost = shares = 0.0
+    for price, size in levels:
+        if price > worst_price + EPS or price <= 0:
+            break
+        take    = min(size, (amount_usdc - cost) / price)
+        cost   += take * price
+        shares += take
+        if cost >= amount_usdc - EPS:
+            return cost / shares, shares
+    return None
+
+
+class PaperExecutor(Executor):
+    """모의 주문 실행기 — 체결 시뮬레이션 후 즉시 확정 기록."""
+
+    def __init__(
+        self,
+        db:        DB,
+        positions: PositionBook | None = None,
+        governor:  Governor | None = None,
+        books:     BookCache | None = None,
+    ):
+        """books: 제출 시점 오더북 (없거나 캐시 미스면 감지 시점 오더북 opp.book 사용)."""
+        super().__init__(db, None, positions, governor)
+        self._books = books
+
+    @property
+    def ready(self) -> bool:
+        return True
+
+    async def initialize(self) -> None:
+        log.info("[paper] 모의 거래 모드 — CLOB 주문 없음")
+
+    async def _submit(self, opp: ArbitrageOpportunity) -> ExecutionResult:
+        book = self._books.get(opp.token_id, watch=False) if self._books is not None else None
+        book = book or opp.book
+        if book is None:
+            return ExecutionResult(
+                success=False, order_id=None, status="error",
+                message="모의 체결 불가 (오더북 없음)", opportunity=opp,
+            )
+
+        fill       = simulate_fok(book, opp.bet_usdc, opp.poly_price)
+        latency_ms = (datetime.now(timezone.utc) - opp.detected_at).total_seconds() * 1000
+        if fill is None:
+            log.info(
+                "[paper] 모의 FOK 미체결: %s | $%.0f @ ≤%.2f 유동성 부족",
+                opp.event_title, opp.bet_usdc, opp.poly_price,
+                extra={"stage": "execute", "game_id": opp.game_id, "token_id": opp.token_id},
+            )
+            return ExecutionResult(
+                success=False, order_id=None, status="fok_cancelled",
+                message=f"모의 FOK 미체결 (≤{opp.poly_price:.2f} 유동성 부족)",
+                opportunity=opp, latency_ms=latency_ms,
+            )
+
+        price, shares = fill
+        order_id = f"paper-{uuid.uuid4().hex[:16]}"
+        bet_id   = await asyncio.to_thread(self._record_bet, opp, order_id, "confirmed", price, shares)
+        log.info(
+            "[paper] 모의 체결: %s | %s $%.0f → %.1f주 @ %.4f",
+            opp.event_title, opp.buy_token_label, opp.bet_usdc, shares, price,
+            extra={"stage": "execute", "game_id": opp.game_id, "token_id": opp.token_id},
+        )
+        return ExecutionResult(
+            success=True, order_id=order_id, status="matched",
+            message=f"모의 체결 {shares:.1f}주 @ {price:.4f}",
+            opportunity=opp, latency_ms=latency_ms, bet_id=bet_id,
+        )
+
+
+# ── 기록 데이터 재생 ─────────────────────────────────────────
+
+def synthetic_book(
+    best_bid: float | None, best_ask: float | None, bid_depth: float, ask_depth: float,
+) -> dict:
+    """스냅샷 요약 → 1단계 오더북 (CLOB REST /book 형식)."""
+    return {
+        "bids": [{"price": str(best_bid), "size": str(bid_depth)}] if best_bid is not None else [],
+        "asks": [{"price": str(best_ask), "size": str(ask_depth)}] if best_ask is not None else [],
+    }
+
+
+class _ReplayBooks:
+    """재생용 오더북 저장소 (BookCache.get 과 같은 호출 형태 — scanner / monitor 공용)."""
+
+    def __init__(self):
+        self._books: dict[str, dict] = {}
+
+    def set(self, token_id: str, book: dict) -> None:
+        self._books[token_id] = book
+
+    def get(self, token_id: str, watch: bool = True, until: float | None = None) -> dict | None:
+        return self._books.get(token_id)
+
+
+class _Discard:
+    """알림 아웃박스 대체 — 재생 중 텔레그램 전송 안 함."""
+
+    def put(self, text: str) -> None:
+        pass
+
+
+@dataclass
+class ReplayReport:
+    """재생 결과 (건수 + 처리량)."""
+    ticks:         int   = 0     # 재생한 스냅샷 시각 수 (분)
+    evaluations:   int   = 0     # check_game 호출 수
+    opportunities: int   = 0
+    orders:        dict[str, int] = field(default_factory=dict)   # 실행 결과 status별
+    stats:         dict  = field(default_factory=dict)            # 모의 DB 통계 (DB.get_stats)
+    span_sec:      int   = 0     # 재생한 기록 구간 길이
+    elapsed:       float = 0.0
+    stopped:       bool  = False # 연속 패배 자동 중단
+
+    def summary(self) -> str:
+        rate = 1 / self.elapsed if self.elapsed > 0 else 0.0
+        return (
+            f"기록 {self.span_sec / 3600:.1f}시간 → {self.elapsed:.2f}s 재생 | "
+            f"틱 {self.ticks} ({self.ticks * rate:,.0f}/s) | "
+            f"평가 {self.evaluations} ({self.evaluations * rate:,.0f}/s) | "
+            f"기회 {self.opportunities} | 주문 {self.orders} | 통계 {self.stats}"
+            + (" | 연속 패배 중단" if self.stopped else "")
+        )
+
+
+async def replay(
+    source: DB, paper: DB, since: int = 0, until: int | None = None,
+) -> ReplayReport:
+    """source 스냅샷을 시각 순으로 재생 → paper DB 에 모의 베팅 / 정산 기록."""
+    report = ReplayReport()
+    t0     = time.perf_counter()
+    data   = await source.aio.get_snapshots(since, until)
+
+    matches:  dict[str, list[MatchedGame]] = defaultdict(list)   # game_id → 매핑
+    by_token: dict[str, set[str]]          = defaultdict(set)    # token_id → game_id
+    for game_id, _, _, game, market in data["matches"]:
+        poly = decode(PolymarketMarket, json.loads(market), "game_start_time")
+        matches[game_id].append(MatchedGame(decode(PinnacleGame, json.loads(game), "commence_time"), poly))
+        by_token[poly.yes_token_id].add(game_id)
+        by_token[poly.no_token_id].add(game_id)
+
+    ticks: dict[int, tuple[list, list]] = defaultdict(lambda: ([], []))
+    for row in data["odds"]:
+        if row[0] in matches:
+            ticks[row[1]][0].append(row)
+    for row in data["books"]:
+        if row[0] in by_token:
+            ticks[row[1]][1].append(row)
+
+    books    = _ReplayBooks()
+    executor = PaperExecutor(paper)
+    monitor  = Monitor(executor, paper, books=books)
+    odds: dict[str, tuple[float, float]] = {}
+    prev_outbox = install_outbox(_Discard())
+    try:
+        for ts in sorted(ticks):
+            odds_rows, book_rows = ticks[ts]
+            report.ticks += 1
+            touched: set[str] = set()
+            for game_id, _, home, away in odds_rows:
+                odds[game_id] = (home, away)
+                touched.add(game_id)
+            updated: set[str] = set()
+            for token_id, _, bid, ask, bid_depth, ask_depth in book_rows:
+                books.set(token_id, synthetic_book(bid, ask, bid_depth, ask_depth))
+                updated.add(token_id)
+                touched |= by_token[token_id]
+
+            # 재생 시각 기준으로 경기 시작 시각 이동 → 기록 당시와 같은 "시작까지 남은 시간"
+            shift = timedelta(seconds=time.time() - ts)
+            for game_id in touched:
+                if game_id not in odds:
+                    continue
+                home, away = odds[game_id]
+                for base in matches[game_id]:
+                    game = replace(
+                        base.pinnacle, home_odds=home, away_odds=away,
+                        commence_time=base.pinnacle.commence_time + shift,
+                    )
+                    m = MatchedGame(game, base.poly)
+                    if books.get(m.buy_token_id) is None:
+                        continue
+                    report.evaluations += 1
+                    opp = await check_game(None, m, books=books)
+                    if opp is None:
+                        continue
+                    report.opportunities += 1
+                    result = await executor.execute(opp)
+                    report.orders[result.status] = report.orders.get(result.status, 0) + 1
+
+            held = {t for t in updated if executor.has_position(t)}
+            if held:
+                bets = [b for b in await paper.aio.get_pending_bets() if b["token_id"] in held]
+                await monitor.check(None, bets)
+            if monitor.stopped:
+                report.stopped = True
+                break
+        await asyncio.sleep(0)    # 정산 알림 태스크 정리
+    finally:
+        install_outbox(prev_outbox)
+
+    if ticks:
+        report.span_sec = max(ticks) - min(ticks)
+    report.stats   = await paper.aio.get_stats()
+    report.elapsed = time.perf_counter() - t0
+    log.info(f"[paper] 재생 완료: {report.summary()}")
+    return report
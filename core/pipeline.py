@@ -0,0 +1,249 @@
+"""
+core/pipeline.py - 폴링 사이클 단계별 비동기 파이프라인
+
+기존 polling_loop는 수집 → 조회 → 매핑 → 스캔 → 실행을 순서대로 await.
+서로 독립인 I/O를 겹쳐 사이클 지연을 가장 느린 분기 수준으로 줄임.
+
+  [fetch]    Odds API(Pinnacle) ∥ Gamma API(폴리마켓) 동시 조회
+  [match]    매핑된 경기를 하나씩 scan 큐로 (큐 가득 차면 대기 — backpressure)
+  [scan]     PIPELINE_SCAN_WORKERS 개 워커가 오더북 조회 + 4조건 검사 → 기회 큐
+  [execute]  단일 소비자 — 포지션 한도 / 중복 체크가 순서대로 적용되도록 직렬 실행
+
+단계별 소요 시간은 CycleReport.timings 에 기록 (단계 첫 시작 ~ 마지막 종료) + 지표 히스토그램.
+웜 스타트(core/checkpoint.py 복원분)는 warm_up() — 매핑 + 사전 서명만, 주문 / 스냅샷 기록 없음.
+  웜 스캔에서 기회가 아니던 경기는 다음 폴링에서 배당 지문과 캐시 호가가 그대로면 재스캔 생략.
+한 단계에서 예외가 나면 나머지 단계 태스크를 취소하고 그대로 전파 (polling_loop 예외 처리 유지).
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+from config import PIPELINE_SCAN_WORKERS, PIPELINE_QUEUE_SIZE, ODDS_SPORT
+from core.bookcache import BookCache
+from core.checkpoint import fingerprint
+from core.executor import Executor
+from core.matcher import PolymarketMarket, fetch_nba_poly_markets, match_games
+from core.metrics import OPPORTUNITIES, STAGE_SECONDS
+from core.notifier import notify_opportunity, notify_executed, notify_failed
+from core.odds_fetcher import PinnacleGame, fetch_nba_games
+from core.scanner import best_ask_and_shares, check_game
+from core.timeseries import SnapshotRecorder
+from core.transport import Transport
+
+log = logging.getLogger(__name__)
+
+_DONE = object()    # 단계 종료 표시
+
+
+@dataclass
+class CycleReport:
+    """사이클 1회 결과 (건수 + 단계별 소요 초)."""
+    pinnacle_games: int = 0
+    poly_markets:   int = 0
+    matched:        int = 0
+    opportunities:  int = 0
+    executed:       int = 0
+    unchanged:      int = 0    # 웜 스캔 이후 그대로라 재스캔 생략한 경기
+    timings:        dict[str, float] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        return " | ".join(f"{name} {sec:.2f}s" for name, sec in self.timings.items())
+
+
+class _Span:
+    """단계 시간 측정: 여러 워커의 첫 시작 ~ 마지막 종료."""
+
+    def __init__(self, report: CycleReport, name: str):
+        self._report = report
+        self._name   = name
+        self._start: float | None = None
+        self._end    = 0.0
+
+    def __enter__(self) -> "_Span":
+        if self._start is None:
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._end = time.perf_counter()
+        self._report.timings[self._name] = self._end - self._start
+
+
+async def _gather_or_cancel(*aws) -> list:
+    """전부 대기. 하나라도 실패하면 나머지 취소 후 예외 전파."""
+    tasks = [asyncio.ensure_future(a) for a in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+class Pipeline:
+    """폴링 사이클 1회 실행기."""
+
+    def __init__(
+        self,
+        executor:     Executor,
+        team_mapping: dict[str, str],
+        recorder:     SnapshotRecorder | None = None,
+        sport:        str = ODDS_SPORT,
+        tag:          str = "nba",
+        books:        BookCache | None = None,
+    ):
+        """sport / tag: Odds API sport 키, Gamma tag_slug (config.SHARDS 샤드 단위).
+
+        books: 공유 메모리 오더북 캐시 (스캔 시 REST 대신 우선 사용).
+        """
+        self._executor = executor
+        self._mapping  = team_mapping
+        self._recorder = recorder
+        self._sport    = sport
+        self._tag      = tag
+        self._books    = books
+        self.games:   list[PinnacleGame]     = []    # 직전 사이클 입력 (체크포인트 저장용)
+        self.markets: list[PolymarketMarket] = []
+        # 웜 스캔 결과: 매수 토큰 → (배당 지문, (best ask, 유동성)) — 다음 폴링 1회만 사용
+        self._warm_seen: dict[str, tuple[str, tuple[float | None, float]]] = {}
+
+    async def warm_up(
+        self,
+        http:    Transport,
+        games:   list[PinnacleGame],
+        markets: list[PolymarketMarket],
+    ) -> int:
+        """복원한 배당 / 마켓으로 매핑 + 사전 서명 (Odds API / Gamma 미호출). 매핑 경기 수 반환.
+
+        저장 시점 배당이라 기회가 보여도 주문하지 않고 배당 스냅샷도 기록하지 않음.
+        오더북은 지금 조회 → 후보 토큰 서명 / 구독, tick_size · neg_risk 캐시 채움.
+        """
+        self.games, self.markets = games, markets
+        matched = match_games(games, markets, self._mapping)
+        stage   = self._executor.stager.stage
+        for m in matched:
+            seen: dict[str, dict] = {}
+            opp = await check_game(http, m, stage, seen.__setitem__, self._books)
+            # 진입 구간 안에서 오더북까지 본 뒤 기회가 아니었던 경기만 (기회면 다음 폴링에서 새 배당으로 재판정)
+            if opp is None and (book := seen.get(m.buy_token_id)) is not None:
+                self._warm_seen[m.buy_token_id] = (fingerprint(m.pinnacle), best_ask_and_shares(book))
+        log.info(f"[pipeline] 웜 스타트: {len(matched)}경기 매핑 / 사전 서명 후보 {len(self._executor.stager.tokens())}개")
+        return len(matched)
+
+    async def run_cycle(self, http: Transport) -> CycleReport:
+        report = CycleReport()
+        t0 = time.perf_counter()
+
+        games, markets = await _gather_or_cancel(
+            self._timed(report, "odds", fetch_nba_games(http, self._sport)),
+            self._timed(report, "gamma", fetch_nba_poly_markets(http, self._tag)),
+        )
+        self.games, self.markets = games, markets
+        report.pinnacle_games = len(games)
+        report.poly_markets   = len(markets)
+        if self._recorder is not None:
+            for game in games:
+                self._recorder.record_odds(game)
+
+        if games and markets:
+            matched_q: asyncio.Queue = asyncio.Queue(PIPELINE_QUEUE_SIZE)
+            opp_q:     asyncio.Queue = asyncio.Queue(PIPELINE_QUEUE_SIZE)
+            scan_span = _Span(report, "scan")
+            await _gather_or_cancel(
+                self._match(games, markets, matched_q, report),
+                *(
+                    self._scan_worker(http, matched_q, opp_q, scan_span, report)
+                    for _ in range(PIPELINE_SCAN_WORKERS)
+                ),
+                self._execute(http, opp_q, report),
+            )
+            log.info(
+                f"[pipeline] {report.matched}경기 스캔 → 기회 {report.opportunities}개 "
+                f"/ 체결 {report.executed}건" + (f" (변동 없어 생략 {report.unchanged})" if report.unchanged else "")
+            )
+        self._warm_seen.clear()
+
+        report.timings["total"] = time.perf_counter() - t0
+        for stage, sec in report.timings.items():
+            STAGE_SECONDS.observe(sec, stage=stage)
+        log.info(f"[pipeline] 단계별 소요: {report.summary()}")
+        return report
+
+    @staticmethod
+    async def _timed(report: CycleReport, name: str, aw):
+        with _Span(report, name):
+            return await aw
+
+    # ── 단계 ─────────────────────────────────────────────────
+
+    async def _match(
+        self, games, markets, out: asyncio.Queue, report: CycleReport,
+    ) -> None:
+        with _Span(report, "match"):
+            matched = match_games(games, markets, self._mapping)
+        report.matched = len(matched)
+        if self._recorder is not None:
+            for m in matched:
+                self._recorder.record_match(m)
+        for m in matched:
+            await out.put(m)
+        for _ in range(PIPELINE_SCAN_WORKERS):
+            await out.put(_DONE)
+
+    async def _scan_worker(
+        self,
+        http:    Transport,
+        inbox:   asyncio.Queue,
+        out:     asyncio.Queue,
+        span:    _Span,
+        report:  CycleReport,
+    ) -> None:
+        stage  = self._executor.stager.stage
+        record = self._recorder.record_book if self._recorder is not None else None
+        while (m := await inbox.get()) is not _DONE:
+            if self._unchanged(m):
+                report.unchanged += 1
+                continue
+            with span:
+                opp = await check_game(http, m, stage, record, self._books)
+            if opp is not None:
+                report.opportunities += 1
+                OPPORTUNITIES.inc()
+                log.info("%s", opp, extra={"stage": "scan", "game_id": opp.game_id, "token_id": opp.token_id})
+                await out.put(opp)
+        await out.put(_DONE)
+
+    def _unchanged(self, m) -> bool:
+        """웜 스캔 이후 배당 지문 / 캐시 best ask · 유동성이 모두 그대로면 True (결과 동일 — 재스캔 생략)."""
+        seen = self._warm_seen.pop(m.buy_token_id, None)
+        if seen is None or self._books is None or seen[0] != fingerprint(m.pinnacle):
+            return False
+        book = self._books.get(m.buy_token_id, watch=False)
+        return book is not None and best_ask_and_shares(book) == seen[1]
+
+    async def _execute(
+        self, http: Transport, inbox: asyncio.Queue, report: CycleReport,
+    ) -> None:
+        span    = _Span(report, "execute")
+        pending = PIPELINE_SCAN_WORKERS
+        while pending:
+            opp = await inbox.get()
+            if opp is _DONE:
+                pending -= 1
+                continue
+            if self._executor.has_position(opp.token_id):
+                log.debug("[pipeline] 이미 포지션 보유: %s", opp.event_title, extra={"token_id": opp.token_id})
+                continue
+
+            with span:
+                await notify_opportunity(http, opp)
+                result = await self._executor.execute(opp)
+
+            if result.success:
+                report.executed += 1
+                await notify_executed(http, result)
+            elif result.status not in ("skipped",):
+                await notify_failed(http, result)
@@ -0,0 +1,129 @@
+"""
+core/positions.py - 메모리 포지션 북 (SQLite write-through)
+
+has_position / MAX_POSITIONS 체크마다 DB 전체 pending 행을 읽던 방식 대신
+시작 시 1회 로드한 메모리 북으로 O(1) 조회.
+
+  - 로드:   시작 시 DB pending 베팅 1회 조회
+  - 갱신:   insert_bet / settle_bet(settle_many) / void_bet → DB 기록 후 메모리 반영 (write-through)
+  - 검증:   verify() — DB pending 과 비교, 불일치 시 경고 + DB 기준 재동기화 (선택, POSITION_BOOK_VERIFY)
+  - 예약:   reserve() — 한도 / 중복 확인과 주문 슬롯 확보를 한 번에 (주문 완료 후 release)
+            supervisor.py 멀티 프로세스 모드에서는 공유 프로세스의 북 1개를 모든 워커가 사용
+
+executor(to_thread 주문 스레드)와 monitor(이벤트 루프)가 함께 쓰므로 Lock으로 보호.
+"""
+
+import logging
+import threading
+from collections import Counter
+
+from core.db import DB
+
+log = logging.getLogger(__name__)
+
+
+class PositionBook:
+    """보유(pending) 포지션 메모리 인덱스."""
+
+    def __init__(self, db: DB):
+        self._db     = db
+        self._lock   = threading.Lock()
+        self._bets:   dict[int, str] = {}    # bet_id → token_id
+        self._tokens: Counter[str]   = Counter()
+        self._reserved: set[str]     = set()   # 주문 진행 중 token_id
+        self.load()
+
+    def load(self) -> None:
+        """DB pending 베팅으로 북 재구성."""
+        pending = self._db.get_pending_bets()
+        with self._lock:
+            self._bets   = {b["id"]: b["token_id"] for b in pending}
+            self._tokens = Counter(self._bets.values())
+        log.info(f"[positions] 포지션 북 로드: {len(self._bets)}개")
+
+    # ── 조회 (O(1)) ──────────────────────────────────────────
+
+    def has(self, token_id: str) -> bool:
+        return self._tokens[token_id] > 0
+
+    def count(self) -> int:
+        return len(self._bets)
+
+    def tokens(self) -> set[str]:
+        """보유 token_id 집합 (스냅샷 복사본)."""
+        with self._lock:
+            return set(self._tokens)
+
+    def __contains__(self, token_id: str) -> bool:
+        return self.has(token_id)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    # ── 주문 슬롯 예약 ───────────────────────────────────────
+
+    def reserve(self, token_id: str, limit: int) -> str | None:
+        """주문 슬롯 확보. 성공 시 None, 실패 시 사유 ("held" / "limit")."""
+        with self._lock:
+            if self._tokens[token_id] > 0 or token_id in self._reserved:
+                return "held"
+            if len(self._bets) + len(self._reserved) >= limit:
+                return "limit"
+            self._reserved.add(token_id)
+            return None
+
+    def release(self, token_id: str) -> None:
+        with self._lock:
+            self._reserved.discard(token_id)
+
+    # ── 갱신 (write-through) ─────────────────────────────────
+
+    def insert_bet(self, **bet) -> int:
+        """DB 베팅 삽입 후 북에 추가. 인자는 DB.insert_bet과 동일."""
+        bet_id = self._db.insert_bet(**bet)
+        with self._lock:
+            self._bets[bet_id] = bet["token_id"]
+            self._tokens[bet["token_id"]] += 1
+        return bet_id
+
+    def settle_bet(self, bet_id: int, outcome: str, pnl_usdc: float) -> None:
+        self._db.settle_bet(bet_id, outcome, pnl_usdc)
+        self._remove(bet_id)
+
+    def settle_many(self, settlements: list[tuple[int, str, float]]) -> None:
+        """일괄 정산 [(bet_id, outcome, pnl_usdc)] — DB 트랜잭션 1개."""
+        self._db.settle_many(settlements)
+        for bet_id, _, _ in settlements:
+            self._remove(bet_id)
+
+    def void_bet(self, bet_id: int, fill_status: str = "failed") -> None:
+        self._db.void_bet(bet_id, fill_status)
+        self._remove(bet_id)
+
+    def _remove(self, bet_id: int) -> None:
+        with self._lock:
+            token_id = self._bets.pop(bet_id, None)
+            if token_id is not None:
+                self._tokens[token_id] -= 1
+                if self._tokens[token_id] <= 0:
+                    del self._tokens[token_id]
+
+    # ── 정합성 검사 ──────────────────────────────────────────
+
+    def verify(self, db_ids: set[int] | None = None) -> bool:
+        """DB pending 과 비교. 불일치면 경고 후 DB 기준으로 재로드.
+
+        db_ids: 호출 측이 이미 읽은 pending bet_id (없으면 DB 조회).
+        """
+        if db_ids is None:
+            db_ids = {b["id"] for b in self._db.get_pending_bets()}
+        with self._lock:
+            mem_ids = set(self._bets)
+        if db_ids == mem_ids:
+            return True
+        log.warning(
+            f"[positions] 포지션 북 불일치 — DB만: {sorted(db_ids - mem_ids)}, "
+            f"메모리만: {sorted(mem_ids - db_ids)} → 재동기화"
+        )
+        self.load()
+        return False
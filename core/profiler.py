@@ -0,0 +1,178 @@
+"""
+core/profiler.py - 런타임 사이클 프로파일러 (재시작 없이 다음 N 사이클 cProfile + tracemalloc)
+
+운영 중 폴링 / 모니터 사이클이 느려지면 프로파일러로 재시작해야 원인 확인 가능 → 상태 유실.
+켜는 방법 2가지, 켜진 뒤 다음 N 사이클만 측정하고 자동으로 꺼짐:
+
+  시그널:     kill -USR1 <pid>         → 다음 PROFILE_CYCLES 사이클 (종류 무관)
+              (supervisor.py 에 보내면 모든 워커로 전달)
+  제어 파일:  PROFILE_CONTROL_PATH 생성 / 수정 (mtime 변경 감지 — 모든 프로세스가 각각 반응)
+              내용: "3" / "poll 3" / "monitor 2"  (비어 있으면 PROFILE_CYCLES, 종류 무관)
+
+사이클 1개당 PROFILE_DIR 에 기록 (파일명: profile-<종류>-<사이클 id>-<pid>-<시각>):
+  .pstats       cProfile 원본 (python -m pstats / snakeviz 로 분석)
+  .txt          누적 시간 상위 PROFILE_TOP_N 함수 + 사이클 동안 증가한 메모리 상위 (tracemalloc)
+  .tracemalloc  사이클 종료 시점 스냅샷 (사이클 간 비교: Snapshot.load(...).compare_to)
+
+cProfile 은 스레드 단위 — 사이클 동안 같은 이벤트 루프에서 실행된 다른 태스크도 함께 기록.
+프로파일은 한 번에 1개만 (폴링 / 모니터 사이클이 겹치면 나중 사이클은 측정 안 함).
+결과 기록(pstats 정렬 / 스냅샷 비교 / 파일 쓰기)은 전용 스레드 1개 — 사이클 종료 시 루프에서는
+tracemalloc 스냅샷만 찍고 바로 반환.
+꺼져 있을 때 비용: 사이클 시작마다 제어 파일 stat 1회.
+"""
+
+import contextlib
+import cProfile
+import io
+import logging
+import os
+import pstats
+import signal
+import time
+import tracemalloc
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from config import (
+    PROFILE_CONTROL_PATH, PROFILE_CYCLES, PROFILE_DIR,
+    PROFILE_TOP_N, PROFILE_TRACEMALLOC_FRAMES,
+)
+
+log = logging.getLogger(__name__)
+
+KINDS = ("poll", "monitor")
+
+
+class CycleProfiler:
+    """arm() 이후 cycle() 구간 N개를 프로파일."""
+
+    def __init__(self, control_path: str = PROFILE_CONTROL_PATH, out_dir: str = PROFILE_DIR):
+        self._control   = Path(control_path)
+        self._out_dir   = Path(out_dir)
+        self._mtime:    float | None = None      # 제어 파일 마지막 확인 mtime (None = 기준 미설정)
+        self._remaining = 0
+        self._kind:     str | None = None        # None = 종류 무관
+        self._active    = False
+        self._traced    = False                  # tracemalloc 을 여기서 시작했는지
+        self._counts:   dict[str, int] = {}      # 종류별 사이클 번호 (cycle_id 미지정 시)
+        self._writer    = ThreadPoolExecutor(max_workers=1, thread_name_prefix="profiler")
+        self._pending:  list[Future] = []        # 기록 중인 결과
+
+    @property
+    def armed(self) -> bool:
+        return self._remaining > 0
+
+    def arm(self, cycles: int = PROFILE_CYCLES, kind: str | None = None) -> None:
+        """다음 cycles 개 사이클 프로파일 (kind 지정 시 해당 종류만)."""
+        self._remaining = max(0, cycles)
+        self._kind      = kind
+        log.info(f"[profiler] 다음 {cycles}개 {kind or '전체'} 사이클 프로파일 예약")
+
+    def install_signal(self) -> None:
+        """SIGUSR1 → arm() (실행 중인 이벤트 루프에 등록)."""
+        import asyncio
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, self.arm)
+
+    def _check_control(self) -> None:
+        try:
+            st = self._control.stat()
+        except FileNotFoundError:
+            self._mtime = self._mtime or 0.0
+            return
+        except OSError:
+            return
+        if self._mtime is None:                   # 시작 전부터 있던 파일은 무시
+            self._mtime = st.st_mtime
+            return
+        if st.st_mtime == self._mtime:
+            return
+        self._mtime = st.st_mtime
+        cycles, kind = PROFILE_CYCLES, None
+        try:
+            for word in self._control.read_text().split():
+                if word in KINDS:
+                    kind = word
+                else:
+                    cycles = int(word)
+        except (OSError, ValueError) as e:
+            log.warning(f"[profiler] 제어 파일 형식 오류 ({e}) — 기본값 사용")
+        self.arm(cycles, kind)
+
+    @contextlib.contextmanager
+    def cycle(self, kind: str, cycle_id: int | None = None) -> Iterator[None]:
+        """사이클 구간. 예약돼 있으면 cProfile + tracemalloc 측정 후 PROFILE_DIR 에 기록."""
+        self._check_control()
+        if not self._remaining or self._active or self._kind not in (None, kind):
+            yield
+            return
+
+        self._counts[kind] = self._counts.get(kind, 0) + 1
+        cycle_id = cycle_id if cycle_id is not None else self._counts[kind]
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+            self._traced = True
+        before = tracemalloc.take_snapshot()
+        prof   = cProfile.Profile()
+        self._active = True
+        t0 = time.perf_counter()
+        prof.enable()
+        try:
+            yield
+        finally:
+            prof.disable()
+            elapsed = time.perf_counter() - t0
+            self._active = False
+            self._remaining -= 1
+            after  = tracemalloc.take_snapshot()
+            traced = tracemalloc.get_traced_memory()
+            self._pending = [f for f in self._pending if not f.done()]
+            self._pending.append(self._writer.submit(
+                self._write_safe, kind, cycle_id, elapsed, prof, before, after, traced,
+            ))
+            if not self._remaining and self._traced:
+                tracemalloc.stop()
+                self._traced = False
+
+    def flush(self, timeout: float | None = None) -> None:
+        """기록 중인 결과 파일 쓰기 완료까지 대기 (최대 timeout초)."""
+        wait(self._pending, timeout)
+        self._pending = [f for f in self._pending if not f.done()]
+
+    def _write_safe(self, *args) -> None:
+        try:
+            self._write(*args)
+        except OSError as e:
+            log.warning(f"[profiler] 결과 기록 실패: {e}")
+
+    def _write(
+        self, kind: str, cycle_id: int, elapsed: float,
+        prof: cProfile.Profile, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot,
+        traced: tuple[int, int],
+    ) -> Path:
+        """결과 파일 기록 (기록 스레드). traced: 사이클 종료 시점 (현재, 최대) 추적 메모리."""
+        self._out_dir.mkdir(parents=True, exist_ok=True)
+        stem = self._out_dir / (
+            f"profile-{kind}-{cycle_id}-{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}"
+        )
+        prof.dump_stats(f"{stem}.pstats")
+        after.dump(f"{stem}.tracemalloc")
+
+        buf = io.StringIO()
+        buf.write(f"{kind} 사이클 #{cycle_id} | pid {os.getpid()} | {elapsed:.3f}s\n\n")
+        pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+
+        growth = [d for d in after.compare_to(before, "lineno") if d.size_diff > 0]
+        total  = sum(d.size_diff for d in growth)
+        buf.write(f"\n── 사이클 중 메모리 증가 상위 (합계 {total / 1024:.1f}KiB) ──\n")
+        for d in growth[:PROFILE_TOP_N]:
+            buf.write(f"{d.size_diff / 1024:>10.1f}KiB {d.count_diff:>+7}  {d.traceback}\n")
+        current, peak = traced
+        buf.write(f"\n추적 메모리: 현재 {current / 1024 / 1024:.1f}MiB / 최대 {peak / 1024 / 1024:.1f}MiB\n")
+        Path(f"{stem}.txt").write_text(buf.getvalue(), encoding="utf-8")
+
+        log.info(f"[profiler] {kind} 사이클 #{cycle_id} ({elapsed:.2f}s) → {stem}.txt")
+        return stem
+
+
+PROFILER = CycleProfiler()
@@ -10,14 +10,24 @@ core/scanner.py - 배당 역전 감지 엔진
 매수 토큰:
   정배팀이 홈팀(폴리마켓 YES측) → YES 토큰 ask 가격 조회
   정배팀이 원정팀(폴리마켓 NO측) → NO 토큰 ask 가격 조회
+
+사전 서명 (stage 콜백 전달 시):
+  유동성(조건 4) 충족 토큰의 Pinnacle 확률 / best ask / 진입 마감을 OrderStager 에 전달
+  → 갭 >= GAP_THRESHOLD - STAGING_GAP_MARGIN 이면 제출할 금액으로 서명 예약, 아니면 후보 해제
+  (이후 갱신은 market 채널 가격 / tick 변경 — core/staging.py)
+
+스냅샷 (record 콜백 전달 시):
+  조회한 오더북을 그대로 넘겨 시계열 버퍼에 기록 (core/timeseries.py)
+
+오더북 캐시 (books 전달 시):
+  market 채널이 유지하는 공유 메모리 오더북 우선 (core/bookcache.py), 없으면 REST /book
 """
 
 import logging
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
-import aiohttp
-
 from config import (
     MAX_POLYMARKET_PRICE,
     GAP_THRESHOLD,
@@ -26,12 +36,18 @@ from config import (
     BET_ENTRY_DEADLINE_HRS,
     BET_SIZE_TIERS,
     MAX_BET_USDC,
-    CLOB_HOST,
 )
+from core.bookcache import BookCache
 from core.matcher import MatchedGame
+from core.transport import CircuitOpenError, Transport
 
 log = logging.getLogger(__name__)
 
+# 사전 서명 콜백: (token_id, pinnacle_prob, best_ask, 진입 마감 epoch) → None (즉시 반환)
+StageFn = Callable[[str, float, float, float], None]
+# 스냅샷 콜백: (token_id, 오더북) → None (즉시 반환)
+RecordFn = Callable[[str, dict], None]
+
 
 @dataclass
 class ArbitrageOpportunity:
@@ -45,6 +61,7 @@ class ArbitrageOpportunity:
     detected_at:      datetime = field(
         default_factory=lambda: datetime.now(timezone.utc)
     )
+    book:             dict | None = field(default=None, repr=False)   # 감지 시점 오더북 (모의 체결용)
 
     # 편의 프로퍼티
     @property
@@ -79,71 +96,67 @@ class ArbitrageOpportunity:
         )
 
 
-async def scan(
-    session:       aiohttp.ClientSession,
-    matched_games: list[MatchedGame],
-) -> list[ArbitrageOpportunity]:
-    """매핑된 경기 목록에서 4조건 충족 기회 탐색."""
-    opportunities = []
-
-    for m in matched_games:
-        opp = await _check(session, m)
-        if opp is not None:
-            opportunities.append(opp)
-            log.info(str(opp))
-
-    log.info(f"[scanner] {len(matched_games)}경기 스캔 → 기회 {len(opportunities)}개")
-    return opportunities
-
-
-async def _check(
-    session: aiohttp.ClientSession,
+async def check_game(
+    http: Transport,
     m: MatchedGame,
+    stage: StageFn | None = None,
+    record: RecordFn | None = None,
+    books: BookCache | None = None,
 ) -> ArbitrageOpportunity | None:
     """단일 매핑 경기에 대해 4조건 검사."""
-    game = m.pinnacle
+    game  = m.pinnacle
+    extra = {"stage": "scan", "game_id": game.game_id, "token_id": m.buy_token_id}
 
     # 경기 진입 시간 체크
     hrs = game.hours_until_start()
     if hrs > BET_ENTRY_WINDOW_HRS:
-        log.debug(f"[scanner] 진입 전 ({hrs:.1f}h): {game.home_team} vs {game.away_team}")
+        log.debug("[scanner] 진입 전 (%.1fh): %s vs %s", hrs, game.home_team, game.away_team, extra=extra)
         return None
     if hrs < BET_ENTRY_DEADLINE_HRS:
-        log.debug(f"[scanner] 마감 ({hrs:.1f}h): {game.home_team} vs {game.away_team}")
+        log.debug("[scanner] 마감 (%.1fh): %s vs %s", hrs, game.home_team, game.away_team, extra=extra)
         return None
 
-    # 폴리마켓 오더북 조회 (정배팀 매수 토큰)
-    book = await _fetch_orderbook(session, m.buy_token_id)
+    # 폴리마켓 오더북 조회 (정배팀 매수 토큰) — 캐시 우선, 없으면 REST (구독은 진입 마감까지)
+    until = game.commence_time.timestamp() - BET_ENTRY_DEADLINE_HRS * 3600
+    book  = books.get(m.buy_token_id, until=until) if books is not None else None
+    if book is None:
+        book = await _fetch_orderbook(http, m.buy_token_id)
     if book is None:
         return None
+    if record is not None:
+        record(m.buy_token_id, book)
 
-    best_ask, shares = _best_ask_and_shares(book)
+    best_ask, shares = best_ask_and_shares(book)
     if best_ask is None:
-        log.debug(f"[scanner] ask 없음: {m.poly.question}")
+        log.debug("[scanner] ask 없음: %s", m.poly.question, extra=extra)
         return None
 
     pinnacle_prob = game.favorite_prob
 
+    # 임계값 근접 또는 돌파 — 주문 사전 서명 (후보 조건은 core/staging.py 판정)
+    if stage is not None and shares >= MIN_LIQUIDITY_SHARES:
+        stage(m.buy_token_id, pinnacle_prob, best_ask, until)
+
     # 조건 2: 폴리마켓 현재가 < 50센트
     if best_ask >= MAX_POLYMARKET_PRICE:
-        log.debug(f"[scanner] 폴리가 높음 ({best_ask:.2f}): {m.poly.question}")
+        log.debug("[scanner] 폴리가 높음 (%.2f): %s", best_ask, m.poly.question, extra=extra)
         return None
 
     # 조건 3: 갭 >= 15센트
     gap = pinnacle_prob - best_ask
     if gap < GAP_THRESHOLD:
         log.debug(
-            f"[scanner] 갭 부족 ({gap:.2f}): {m.poly.question} "
-            f"(pinnacle={pinnacle_prob:.2f}, poly={best_ask:.2f})"
+            "[scanner] 갭 부족 (%.2f): %s (pinnacle=%.2f, poly=%.2f)",
+            gap, m.poly.question, pinnacle_prob, best_ask, extra=extra,
         )
         return None
 
     # 조건 4: 유동성 >= 50 shares
     if shares < MIN_LIQUIDITY_SHARES:
-        log.debug(f"[scanner] 유동성 부족 ({shares:.0f}): {m.poly.question}")
+        log.debug("[scanner] 유동성 부족 (%.0f): %s", shares, m.poly.question, extra=extra)
         return None
 
-    bet_usdc = _calc_bet(gap)
+    bet_usdc = calc_bet(gap)
 
     return ArbitrageOpportunity(
         matched          = m,
@@ -152,27 +165,26 @@ async def _check(
         gap_size         = gap,
         liquidity_shares = shares,
         bet_usdc         = bet_usdc,
+        book             = book,
     )
 
 
 async def _fetch_orderbook(
-    session: aiohttp.ClientSession,
+    http: Transport,
     token_id: str,
 ) -> dict | None:
-    """CLOB REST API로 오더북 조회."""
+    """CLOB REST API로 오더북 조회 (느린 응답은 hedge, CLOB 장애 시 차단기로 즉시 실패)."""
     try:
-        async with session.get(
-            f"{CLOB_HOST}/book",
-            params={"token_id": token_id},
-        ) as resp:
-            resp.raise_for_status()
-            return await resp.json()
+        return await http.clob.get_json("/book", params={"token_id": token_id}, hedge=True)
+    except CircuitOpenError:
+        log.debug("[scanner] CLOB 차단기 열림 — 오더북 생략 %s", token_id[-8:], extra={"token_id": token_id})
+        return None
     except Exception as e:
         log.warning(f"[scanner] 오더북 조회 실패 {token_id[-8:]}: {e}")
         return None
 
 
-def _best_ask_and_shares(book: dict) -> tuple[float | None, float]:
+def best_ask_and_shares(book: dict) -> tuple[float | None, float]:
     """오더북에서 최저 ask 가격과 근방 유동성 추출.
 
     CLOB 오더북은 asks가 내림차순(비쌈→쌈) 정렬.
@@ -190,7 +202,7 @@ def _best_ask_and_shares(book: dict) -> tuple[float | None, float]:
     return float(price), shares
 
 
-def _calc_bet(gap: float) -> float:
+def calc_bet(gap: float) -> float:
     """갭 크기에 따른 베팅 금액 결정."""
     for g_min, g_max, amount in BET_SIZE_TIERS:
         if g_min <= gap < g_max:
@@ -0,0 +1,146 @@
+"""
+core/shared.py - 멀티 프로세스 공유 상태 (supervisor.py 전용)
+
+워커 프로세스들이 같은 자원을 쓰도록 공유 프로세스(BaseManager 서버) 1개가 소유하고
+워커는 프록시로 호출 (호출 1회 = 로컬 소켓 왕복).
+
+  db         DB 1개 → 쓰기 스레드 1개 유지 (SQLite 단일 writer)
+  positions  PositionBook 1개 → MAX_POSITIONS / 중복 체크가 전 워커 합산 (reserve 원자적)
+  ledger     CreditLedger 1개 → Odds API 크레딧 / 일일 호출 수 합산
+  control    자동 중단 플래그 (정산 워커가 설정 → 폴링 워커 종료)
+  watch      오더북 캐시 구독 요청 토큰 (폴링 워커 등록 → 정산 워커 market 채널 구독)
+
+워커 → 정산 워커 단방향 전달은 multiprocessing.Queue (supervisor 생성, 재시작 시 재사용):
+  QueueOutbox     notify_* 텍스트 → 정산 워커 Outbox (텔레그램 속도 제한을 한 곳에서)
+  RemoteTracker   제출 전 마켓 구독 / 신규 주문 → 정산 워커 OrderTracker.prepare / track
+                  (user 채널 연결 1개, 항목 = (메서드 이름, 인자))
+"""
+
+import asyncio
+import logging
+import queue
+from multiprocessing.managers import BaseManager
+
+from core.bookcache import WatchList
+from core.db import DB, _AsyncDB
+from core.odds_fetcher import CreditLedger
+from core.positions import PositionBook
+
+log = logging.getLogger(__name__)
+
+QUEUE_POLL_SEC = 0.5    # Queue 대기 간격 (취소 확인 주기)
+
+
+# ── 공유 프로세스 쪽 객체 ────────────────────────────────────
+
+class Control:
+    """전 워커 공통 중단 플래그."""
+
+    def __init__(self):
+        self._reason: str | None = None
+
+    def stop(self, reason: str) -> None:
+        if self._reason is None:
+            self._reason = reason
+
+    def stopped(self) -> bool:
+        return self._reason is not None
+
+    def reason(self) -> str | None:
+        return self._reason
+
+
+_objects: dict[str, object] = {}    # 공유 프로세스 안의 싱글톤
+
+
+def _get_db() -> DB:
+    if "db" not in _objects:
+        _objects["db"] = DB()
+    return _objects["db"]
+
+
+def _get_positions() -> PositionBook:
+    if "positions" not in _objects:
+        _objects["positions"] = PositionBook(_get_db())
+    return _objects["positions"]
+
+
+def _get_ledger() -> CreditLedger:
+    return _objects.setdefault("ledger", CreditLedger())
+
+
+def _get_control() -> Control:
+    return _objects.setdefault("control", Control())
+
+
+def _get_watch() -> WatchList:
+    return _objects.setdefault("watch", WatchList())
+
+
+class SharedManager(BaseManager):
+    """공유 상태 서버 / 클라이언트."""
+
+
+SharedManager.register("db",        callable=_get_db)
+SharedManager.register("positions", callable=_get_positions)
+SharedManager.register("ledger",    callable=_get_ledger)
+SharedManager.register("control",   callable=_get_control)
+SharedManager.register("watch",     callable=_get_watch)
+
+
+def connect(address, authkey: bytes) -> SharedManager:
+    """워커 프로세스에서 공유 프로세스에 연결."""
+    manager = SharedManager(address=address, authkey=authkey)
+    manager.connect()
+    return manager
+
+
+# ── 워커 쪽 래퍼 ─────────────────────────────────────────────
+
+class RemoteDB:
+    """DB 프록시 + db.aio (기존 모듈이 그대로 쓰도록 DB와 같은 인터페이스)."""
+
+    def __init__(self, proxy):
+        self._proxy = proxy
+        self.aio    = _AsyncDB(self)
+
+    def __getattr__(self, name: str):
+        return getattr(self._proxy, name)
+
+
+class QueueOutbox:
+    """notifier.install_outbox() 용 — 텍스트를 정산 워커로 넘김 (즉시 반환)."""
+
+    def __init__(self, q):
+        self._q = q
+
+    def put(self, text: str) -> None:
+        self._q.put(text)
+
+
+class RemoteTracker:
+    """Executor 용 — 신규 주문을 정산 워커의 OrderTracker 로 넘김."""
+
+    def __init__(self, q):
+        self._q = q
+
+    async def prepare(self, condition_id: str | None) -> None:
+        self._q.put(("prepare", (condition_id,)))
+
+    async def track(self, order_id: str, bet_id: int, condition_id: str | None) -> None:
+        self._q.put(("track", (order_id, bet_id, condition_id)))
+
+
+async def drain(q, handle) -> None:
+    """Queue 항목을 handle(item) 으로 전달 (정산 워커). handle 은 동기 / 비동기 모두 가능."""
+    while True:
+        try:
+            item = await asyncio.to_thread(q.get, True, QUEUE_POLL_SEC)
+        except queue.Empty:
+            continue
+        try:
+            result = handle(item)
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            log.error(f"[shared] 큐 항목 처리 실패: {e}", exc_info=True)
@@ -0,0 +1,259 @@
+"""
+core/staging.py - 임계값 근접 후보 주문 사전 서명 (스테이징)
+
+EIP-712 서명(create_market_order)은 CPU 작업이라 감지 → 제출 사이 지연을 만든다.
+갭이 GAP_THRESHOLD - STAGING_GAP_MARGIN 이상인 후보는 현재 worst-price / 제출 금액으로
+주문을 미리 서명해 두고, 갭이 임계값을 넘는 순간 executor는 제출(post)만 한다.
+
+후보 등록: 스캔(check_game)이 (token_id, Pinnacle 확률, best ask, 진입 마감 시각) 전달
+  - 금액 = 갭이 임계값을 넘었을 때 실제 제출할 티어 금액 (calc_bet(max(갭, GAP_THRESHOLD)))
+  - 갭이 마진 밖으로 벗어나거나 가격 >= MAX_POLYMARKET_PRICE → 후보 해제
+
+갱신 (스캔 사이):
+  - market 채널 book / price_change → on_price (best ask 변경 시 금액 재계산 + 재서명)
+  - market 채널 tick_size_change   → on_tick_size (기존 서명 무효화 후 재서명)
+  - run() 주기(STAGING_REFRESH_SEC) → 진입 마감 후보 해제, STAGED_ORDER_TTL 절반 경과 주문 재서명
+    (supervisor 폴링 워커는 피드가 없으므로 공유 오더북 캐시에서 best ask 를 읽어 on_price)
+
+서명 주문은 1회용 (take 시 주문 + 후보 제거 — salt 중복 제출 방지).
+
+py-clob-client는 동기 SDK → 서명은 asyncio.to_thread()로 백그라운드 실행.
+주문 옵션 조회는 Governor 버킷 통과 (주문 준비이므로 TRADING 우선순위).
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+from config import (
+    GAP_THRESHOLD, MAX_POLYMARKET_PRICE, STAGING_GAP_MARGIN,
+    STAGED_ORDER_TTL, STAGING_REFRESH_SEC,
+)
+from core.bookcache import BookCache
+from core.governor import TRADING, Governor
+from core.scanner import best_ask_and_shares, calc_bet
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class StagedOrder:
+    """미리 서명된 FOK 매수 주문."""
+    token_id:  str
+    amount:    float      # USDC 금액
+    price:     float      # worst-price
+    tick_size: str
+    neg_risk:  bool
+    signed:    object     # py_clob_client SignedOrder
+    signed_at: float      # time.monotonic()
+    sign_ms:   float      # 서명 소요 시간 (ms) — 제출 시 절약되는 시간
+
+    def matches(self, amount: float, price: float, tick_size: str) -> bool:
+        return (
+            self.amount == amount
+            and self.price == price
+            and str(self.tick_size) == str(tick_size)
+        )
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() - self.signed_at > STAGED_ORDER_TTL
+
+    @property
+    def stale(self) -> bool:
+        """TTL 절반 경과 — 만료 전에 재서명."""
+        return time.monotonic() - self.signed_at > STAGED_ORDER_TTL / 2
+
+
+@dataclass
+class _Candidate:
+    """사전 서명 후보 (스캔 시점 정보)."""
+    prob:  float      # Pinnacle 임플라이드 확률 — 가격 변경 시 갭 재계산
+    price: float      # 마지막 best ask
+    until: float      # 진입 마감 (epoch) — 이후 후보 해제
+
+
+def staged_amount(prob: float, price: float) -> float | None:
+    """후보면 갭이 임계값을 넘었을 때 제출할 금액, 아니면 None."""
+    gap = prob - price
+    if price >= MAX_POLYMARKET_PRICE or gap < GAP_THRESHOLD - STAGING_GAP_MARGIN:
+        return None
+    return calc_bet(max(gap, GAP_THRESHOLD))
+
+
+class OrderStager:
+    """token_id별 사전 서명 주문 보관소."""
+
+    def __init__(self, governor: Governor | None = None):
+        self._client  = None
+        self._gov     = governor if governor is not None else Governor()
+        self._orders:  dict[str, StagedOrder] = {}
+        self._cands:   dict[str, _Candidate] = {}
+        self._tasks:   dict[str, asyncio.Task] = {}
+        self._pending: dict[str, tuple[float, float]] = {}   # 진행 중 서명 (금액, 가격)
+        self._gen:     dict[str, int] = {}     # 늦게 끝난 이전 서명이 덮어쓰지 않도록
+        self._lock     = threading.Lock()   # to_thread 서명 스레드와 공유
+
+    def bind(self, client) -> None:
+        """CLOB 클라이언트 연결 (Executor.initialize 이후)."""
+        self._client = client
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    # ── 스테이징 ────────────────────────────────────────────
+
+    def stage(self, token_id: str, prob: float, price: float, until: float) -> None:
+        """후보 등록 + 주문 사전 서명 예약 (즉시 반환). 후보 조건 밖이면 해제."""
+        if self._client is None:
+            return
+        if staged_amount(prob, price) is None:
+            self.discard(token_id)
+            return
+        self._cands[token_id] = _Candidate(prob, price, until)
+        self._resign(token_id)
+
+    def on_price(self, token_id: str, price: float) -> None:
+        """best ask 변경 — 후보면 갭 / 금액 재계산 후 재서명 (벗어나면 해제)."""
+        cand = self._cands.get(token_id)
+        if cand is None or cand.price == price:
+            return
+        if staged_amount(cand.prob, price) is None:
+            log.debug(f"[staging] 후보 해제 (ask {price:.2f}): {token_id[-8:]}")
+            self.discard(token_id)
+            return
+        cand.price = price
+        self._resign(token_id)
+
+    def on_tick_size(self, token_id: str, tick_size: str) -> None:
+        """tick_size 변경 — 기존 서명 주문 무효화 후 재서명."""
+        with self._lock:
+            cur = self._orders.get(token_id)
+            if cur is None or str(cur.tick_size) == str(tick_size):
+                return
+            del self._orders[token_id]
+        log.debug(f"[staging] tick_size 변경 {cur.tick_size}→{tick_size}: {token_id[-8:]}")
+        self._resign(token_id)
+
+    def discard(self, token_id: str) -> None:
+        """후보 해제 — 서명 주문 폐기, 진행 중 서명 결과는 무시."""
+        self._cands.pop(token_id, None)
+        self._tasks.pop(token_id, None)
+        self._pending.pop(token_id, None)
+        with self._lock:
+            self._orders.pop(token_id, None)
+            self._gen[token_id] = self._gen.get(token_id, 0) + 1
+
+    def tokens(self) -> set[str]:
+        """현재 후보 token_id."""
+        return set(self._cands)
+
+    def refresh(self, books: BookCache | None = None) -> None:
+        """진입 마감 후보 해제 + 오래된 주문 재서명. books 가 있으면 캐시 best ask 로 on_price."""
+        now = time.time()
+        with self._lock:
+            for token_id in [t for t in self._orders if t not in self._cands]:
+                del self._orders[token_id]
+        for token_id in [t for t in self._pending if t not in self._cands]:
+            self._pending.pop(token_id)
+            self._tasks.pop(token_id, None)
+        for token_id, cand in list(self._cands.items()):
+            if now >= cand.until:
+                self.discard(token_id)
+                continue
+            if books is not None:
+                book = books.get(token_id, until=cand.until)    # 후보 토큰 구독 유지
+                price = best_ask_and_shares(book)[0] if book is not None else None
+                if price is not None and price != cand.price:
+                    self.on_price(token_id, price)
+                    continue
+            self._resign(token_id)
+
+    async def run(self, books: BookCache | None = None) -> None:
+        """STAGING_REFRESH_SEC 주기 refresh (종료 시 취소)."""
+        while True:
+            await asyncio.sleep(STAGING_REFRESH_SEC)
+            self.refresh(books)
+
+    def _resign(self, token_id: str) -> None:
+        """후보의 현재 가격 / 금액으로 서명 예약. 같은 조건의 신선한 주문이 있으면 무시."""
+        if self._client is None:
+            return
+        cand   = self._cands[token_id]
+        amount = staged_amount(cand.prob, cand.price)
+        with self._lock:
+            cur = self._orders.get(token_id)
+        if cur is not None and not cur.stale and cur.amount == amount and cur.price == cand.price:
+            return
+        task = self._tasks.get(token_id)
+        if task is not None and not task.done() and self._pending.get(token_id) == (amount, cand.price):
+            return
+
+        gen = self._gen.get(token_id, 0) + 1
+        self._gen[token_id]     = gen
+        self._pending[token_id] = (amount, cand.price)
+        self._tasks[token_id]   = asyncio.get_running_loop().create_task(
+            asyncio.to_thread(self._sign, token_id, amount, cand.price, gen)
+        )
+
+    def _sign(self, token_id: str, amount: float, price: float, gen: int) -> None:
+        """동기 서명 (to_thread에서 호출)."""
+        from py_clob_client.clob_types import MarketOrderArgs, PartialCreateOrderOptions
+        from py_clob_client.order_builder.constants import BUY
+
+        try:
+            gov       = self._gov
+            tick_size = gov.call("clob_tick_size", self._client.get_tick_size, token_id, priority=TRADING)
+            neg_risk  = gov.call("clob", self._client.get_neg_risk, token_id, priority=TRADING)
+
+            t0 = time.perf_counter()
+            signed = gov.call(
+                "clob", self._client.create_market_order,
+                MarketOrderArgs(token_id=token_id, amount=amount, side=BUY, price=price),
+                PartialCreateOrderOptions(tick_size=tick_size, neg_risk=neg_risk),
+                priority=TRADING,
+            )
+            sign_ms = (time.perf_counter() - t0) * 1000
+        except Exception as e:
+            log.warning(f"[staging] 사전 서명 실패 {token_id[-8:]}: {e}")
+            return
+
+        with self._lock:
+            if self._gen.get(token_id) != gen:
+                return
+            self._orders[token_id] = StagedOrder(
+                token_id  = token_id,
+                amount    = amount,
+                price     = price,
+                tick_size = tick_size,
+                neg_risk  = neg_risk,
+                signed    = signed,
+                signed_at = time.monotonic(),
+                sign_ms   = sign_ms,
+            )
+        log.debug(
+            "[staging] 사전 서명: %s $%.0f @ %.2f (tick=%s, %.1fms)",
+            token_id[-8:], amount, price, tick_size, sign_ms,
+            extra={"stage": "staging", "token_id": token_id},
+        )
+
+    # ── 제출 시점 ────────────────────────────────────────────
+
+    async def wait(self, token_id: str) -> None:
+        """진행 중인 서명이 있으면 완료까지 대기 (새로 서명하는 것보다 빠름)."""
+        task = self._tasks.pop(token_id, None)
+        if task is not None and not task.done():
+            await task
+
+    def take(
+        self, token_id: str, amount: float, price: float, tick_size: str,
+    ) -> StagedOrder | None:
+        """조건이 일치하는 사전 서명 주문을 꺼냄 (1회용, 후보도 해제). 없거나 불일치면 None."""
+        self._cands.pop(token_id, None)
+        with self._lock:
+            cur = self._orders.pop(token_id, None)
+        if cur is None or cur.expired or not cur.matches(amount, price, tick_size):
+            return None
+        return cur
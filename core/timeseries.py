@@ -0,0 +1,160 @@
+"""
+core/timeseries.py - 배당 / 호가 시계열 스냅샷 기록
+
+Pinnacle 라인 변동과 폴리마켓 가격 경로 보관 (ts = 관측 시각을 분 단위로 내림).
+기록 경로(피드 / scanner / monitor)는 메모리 버퍼에 넣기만 하고 즉시 반환 →
+DB 쓰기는 모아서 executemany 1회 + 트랜잭션 1개로 처리 (쓰기 증폭 최소화).
+
+관측 빈도 (출처마다 다름):
+  - 호가: market 채널 book / price_change 마다 (MarketFeed — 보유 / 스캔 / 사전 서명 후보 토큰)
+          → 변동이 있는 분마다 1행. 스캔 / 모니터 REST 조회분도 같은 버퍼에 합류
+  - 배당: Odds API 폴링 시점에만 (POLL_INTERVAL, 통상 1시간) → 폴링당 1행
+
+  - 버퍼:     (키, 분) 단위 dict — 같은 분 안의 반복 관측은 마지막 값만 유지
+  - flush:    SNAPSHOT_FLUSH_ROWS 도달 시 즉시, 그 외 SNAPSHOT_FLUSH_INTERVAL 마다
+  - 다운샘플: SNAPSHOT_DOWNSAMPLE_DAYS 지난 행 → 시간 단위 평균 1행
+              (행 수를 줄이는 대상은 호가 — 배당은 이미 폴링 간격이라 대부분 그대로)
+  - 보존:     SNAPSHOT_RETENTION_DAYS 지난 행 삭제
+  - 매핑:     스캔한 (경기, 마켓) 쌍 — 모의 거래 재생(core/paper.py)이 배당 / 호가와 결합
+
+테이블 스키마는 core/db.py 마이그레이션(v4, v6) 참고.
+"""
+
+import asyncio
+import json
+import logging
+import time
+
+from config import (
+    SNAPSHOT_FLUSH_ROWS,
+    SNAPSHOT_FLUSH_INTERVAL,
+    SNAPSHOT_COMPACT_INTERVAL,
+    SNAPSHOT_DOWNSAMPLE_DAYS,
+    SNAPSHOT_RETENTION_DAYS,
+)
+from core.checkpoint import encode
+from core.db import DB
+from core.matcher import MatchedGame
+from core.odds_fetcher import PinnacleGame
+
+log = logging.getLogger(__name__)
+
+DEPTH_LEVELS = 3    # 깊이 = 최우선 호가부터 N단계 수량 합 (scanner 유동성 기준과 동일)
+
+
+def _minute(ts: float | None = None) -> int:
+    ts = time.time() if ts is None else ts
+    return int(ts) // 60 * 60
+
+
+def _hour(ts: float) -> int:
+    return int(ts) // 3600 * 3600
+
+
+def book_summary(book: dict) -> tuple[float | None, float | None, float, float]:
+    """CLOB 오더북 → (best_bid, best_ask, bid_depth, ask_depth). 정렬 방향과 무관."""
+    def side(levels: list[dict], descending: bool) -> tuple[float | None, float]:
+        parsed = sorted(
+            (
+                (float(lv["price"]), float(lv.get("size", 0)))
+                for lv in levels if lv.get("price") is not None
+            ),
+            reverse=descending,
+        )
+        if not parsed:
+            return None, 0.0
+        return parsed[0][0], sum(size for _, size in parsed[:DEPTH_LEVELS])
+
+    best_bid, bid_depth = side(book.get("bids") or [], descending=True)
+    best_ask, ask_depth = side(book.get("asks") or [], descending=False)
+    return best_bid, best_ask, bid_depth, ask_depth
+
+
+class SnapshotRecorder:
+    """스냅샷 메모리 버퍼 + 일괄 flush + 주기 정리."""
+
+    def __init__(self, db: DB):
+        self._db    = db
+        self._odds:  dict[tuple[str, int], tuple] = {}
+        self._books: dict[tuple[str, int], tuple] = {}
+        self._matches: dict[tuple[str, str], tuple] = {}
+        self._flush_task: asyncio.Task | None = None
+        self._compacted_until = 0    # 다운샘플 완료 경계 (재시작 시 0 → 1회 전체 확인)
+
+    def __len__(self) -> int:
+        return len(self._odds) + len(self._books) + len(self._matches)
+
+    # ── 기록 (거래 경로 — 즉시 반환) ─────────────────────────
+
+    def record_odds(self, game: PinnacleGame) -> None:
+        ts = _minute()
+        self._odds[(game.game_id, ts)] = (game.game_id, ts, game.home_odds, game.away_odds)
+        self._maybe_flush()
+
+    def record_book(self, token_id: str, book: dict) -> None:
+        ts = _minute()
+        self._books[(token_id, ts)] = (token_id, ts, *book_summary(book))
+        self._maybe_flush()
+
+    def record_match(self, m: MatchedGame) -> None:
+        """매핑 경기 (모의 거래 재생 입력). 쌍마다 최신 1행만 유지."""
+        key = (m.pinnacle.game_id, m.poly.condition_id)
+        self._matches[key] = (
+            *key, _minute(),
+            json.dumps(encode(m.pinnacle), separators=(",", ":")),
+            json.dumps(encode(m.poly), separators=(",", ":")),
+        )
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        if len(self) < SNAPSHOT_FLUSH_ROWS:
+            return
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+        except RuntimeError:
+            pass    # 이벤트 루프 밖 (스크립트) — 주기 flush / 종료 시 flush에 맡김
+
+    # ── flush / 정리 ─────────────────────────────────────────
+
+    async def flush(self) -> int:
+        """버퍼를 비우고 DB에 일괄 기록. 기록한 행 수 반환."""
+        odds,    self._odds    = list(self._odds.values()),    {}
+        books,   self._books   = list(self._books.values()),   {}
+        matches, self._matches = list(self._matches.values()), {}
+        rows = len(odds) + len(books) + len(matches)
+        if not rows:
+            return 0
+        try:
+            await self._db.aio.insert_snapshots(odds, books, matches)
+        except Exception as e:
+            log.warning(f"[timeseries] 스냅샷 기록 실패 ({rows}행 폐기): {e}")
+            return 0
+        log.debug(f"[timeseries] flush: 배당 {len(odds)}행 / 호가 {len(books)}행 / 매핑 {len(matches)}행")
+        return rows
+
+    async def compact(self) -> None:
+        """시간 단위 다운샘플 + 보존기간 초과 행 삭제."""
+        now = time.time()
+        downsample_before = _hour(now - SNAPSHOT_DOWNSAMPLE_DAYS * 86400)
+        delete_before     = _hour(now - SNAPSHOT_RETENTION_DAYS * 86400)
+        merged, deleted = await self._db.aio.compact_snapshots(
+            downsample_before, delete_before, self._compacted_until,
+        )
+        self._compacted_until = downsample_before
+        if merged or deleted:
+            log.info(f"[timeseries] 정리: 다운샘플 {merged}행 / 보존기간 초과 삭제 {deleted}행")
+
+    async def run(self, compact: bool = True) -> None:
+        """주기 flush + 정리 루프. compact=False 면 flush만 (정리는 다른 프로세스 담당)."""
+        last_compact = -float(SNAPSHOT_COMPACT_INTERVAL)
+        while True:
+            await asyncio.sleep(SNAPSHOT_FLUSH_INTERVAL)
+            await self.flush()
+            if compact and time.monotonic() - last_compact >= SNAPSHOT_COMPACT_INTERVAL:
+                try:
+                    await self.compact()
+                except Exception as e:
+                    log.warning(f"[timeseries] 정리 실패: {e}")
+                last_compact = time.monotonic()
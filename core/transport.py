@@ -0,0 +1,466 @@
+"""
+core/transport.py - 공용 HTTP 전송 계층 (호스트별 클라이언트 / 재시도 / 타임아웃)
+
+모듈마다 기본 ClientSession 으로 session.get 을 직접 호출하면
+타임아웃 없음 / 호스트 간 연결 풀 공유 / 재시도 정책 제각각 문제가 생김.
+Transport 가 호스트별 이름 있는 클라이언트를 소유하고 모든 REST 호출을 통과시킴.
+
+  http.gamma     GAMMA_BASE      (마켓 조회)
+  http.clob      CLOB_HOST       (오더북)
+  http.odds      ODDS_API_BASE   (Pinnacle 배당 — 크레딧 소비)
+  http.telegram  TELEGRAM_API    (알림)
+  http.ws_connect(url)           WebSocket 전용 세션 (user / market / sports 피드)
+
+클라이언트별 (config.HTTP_CLIENTS):
+  - 전용 TCPConnector: 연결 수 상한, keep-alive(HTTP_KEEPALIVE_SEC), DNS 캐시
+  - 응답 압축 (Accept-Encoding: gzip, deflate — 자동 해제)
+  - 타임아웃: 시도당 timeout + 재시도 / 대기 포함 총 budget
+  - 재시도: 연결 오류 / 타임아웃 / 429 / 5xx, 멱등 요청만 (GET 기본, POST 는 idempotent=True 명시)
+            대기 = Retry-After 헤더 우선, 없으면 full jitter 지수 백오프
+  - 통계: 요청 / 재시도 / 오류 수, 신규 vs 재사용 연결 수, 최근 지연 p50 / p95
+  - 속도 제한: 매 시도 전 Governor 버킷 통과 (core/governor.py — 엔드포인트별 문서 한도)
+  - hedge:  hedge=True 조회는 호스트 p95 지연까지 응답이 없으면 같은 요청 1건 추가,
+            먼저 성공한 응답 사용 / 나머지 취소 (누적 HTTP_HEDGE_MAX_RATIO 이내)
+  - 차단기: 연속 BREAKER_FAILURES회 실패 → BREAKER_COOLDOWN초 동안 CircuitOpenError 즉시 발생
+            이후 시험 요청 1건 성공 시 복구
+
+4xx(429 제외)와 재시도 소진 시 aiohttp.ClientResponseError / ClientError 그대로 전파
+(호출부 예외 처리 유지).
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+import aiohttp
+
+from config import (
+    GAMMA_BASE, CLOB_HOST, ODDS_API_BASE, TELEGRAM_API,
+    HTTP_CLIENTS,
+    HTTP_KEEPALIVE_SEC,
+    HTTP_DNS_TTL_SEC,
+    HTTP_BACKOFF_BASE,
+    HTTP_BACKOFF_MAX,
+    HTTP_LATENCY_WINDOW,
+    HTTP_HEDGE_MIN_SAMPLES,
+    HTTP_HEDGE_DELAY_MIN,
+    HTTP_HEDGE_DELAY_MAX,
+    HTTP_HEDGE_MAX_RATIO,
+    BREAKER_FAILURES,
+    BREAKER_COOLDOWN,
+)
+from core.governor import DATA, Governor
+
+log = logging.getLogger(__name__)
+
+RETRY_STATUSES    = {429, 500, 502, 503, 504}
+IDEMPOTENT        = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+CONNECT_TIMEOUT   = 5.0    # 연결 수립 타임아웃 상한 (초)
+RETRY_AFTER_MAX   = 30.0   # Retry-After 헤더 상한 (초)
+
+
+@dataclass
+class Response:
+    """본문까지 읽은 응답 (연결은 이미 풀에 반환됨)."""
+    status:  int
+    headers: Any          # CIMultiDictProxy — 대소문자 무관 조회
+    data:    Any          # JSON 파싱 결과, JSON이 아니면 텍스트
+
+
+@dataclass
+class HostStats:
+    """호스트별 누적 카운터 + 최근 지연 표본."""
+    requests:     int = 0
+    retries:      int = 0
+    errors:       int = 0
+    new_conns:    int = 0
+    reused_conns: int = 0
+    hedges:       int = 0
+    hedge_wins:   int = 0     # hedge 요청이 먼저 도착한 횟수
+    rejected:     int = 0     # 차단기로 즉시 실패한 횟수
+    latencies:    deque = field(default_factory=lambda: deque(maxlen=HTTP_LATENCY_WINDOW))
+
+    def percentile(self, q: float) -> float | None:
+        """최근 지연 분위수 (초). 표본 없으면 None."""
+        if not self.latencies:
+            return None
+        data = sorted(self.latencies)
+        return data[min(len(data) - 1, int(q * len(data)))]
+
+    def snapshot(self) -> dict:
+        p50, p95 = self.percentile(0.50), self.percentile(0.95)
+        conns    = self.new_conns + self.reused_conns
+        return {
+            "requests":     self.requests,
+            "retries":      self.retries,
+            "errors":       self.errors,
+            "new_conns":    self.new_conns,
+            "reused_conns": self.reused_conns,
+            "reuse_rate":   round(self.reused_conns / conns, 3) if conns else None,
+            "hedges":       self.hedges,
+            "hedge_wins":   self.hedge_wins,
+            "rejected":     self.rejected,
+            "p50_ms":       round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms":       round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+
+class CircuitOpenError(aiohttp.ClientError):
+    """차단기 열림 — 요청을 보내지 않고 즉시 실패."""
+
+
+class CircuitBreaker:
+    """연속 실패 기반 차단기 (closed → open → half-open 시험 1건 → closed / open)."""
+
+    def __init__(self, name: str, failures: int = BREAKER_FAILURES, cooldown: float = BREAKER_COOLDOWN):
+        self._name      = name
+        self._threshold = failures
+        self._cooldown  = cooldown
+        self._failures  = 0
+        self._opened_at: float | None = None
+        self._probe_at:  float | None = None
+        self.opens      = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "open" if time.monotonic() - self._opened_at < self._cooldown else "half_open"
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self._opened_at < self._cooldown:
+            return False
+        # half-open: 시험 요청 1건만 (응답 없이 사라진 시험은 cooldown 후 재시도)
+        if self._probe_at is not None and now - self._probe_at < self._cooldown:
+            return False
+        self._probe_at = now
+        return True
+
+    def success(self) -> None:
+        if self._opened_at is not None:
+            log.info(f"[transport] {self._name} 차단기 복구")
+        self._failures  = 0
+        self._opened_at = None
+        self._probe_at  = None
+
+    def failure(self) -> None:
+        self._failures += 1
+        probing = self._probe_at is not None
+        if probing or (self._opened_at is None and self._failures >= self._threshold):
+            self._opened_at = time.monotonic()
+            self._probe_at  = None
+            self.opens     += 1
+            log.warning(
+                f"[transport] {self._name} 차단기 열림 (연속 실패 {self._failures}회) "
+                f"— {self._cooldown}초간 즉시 실패"
+            )
+
+
+def _backoff(attempt: int) -> float:
+    """full jitter: 0 ~ min(MAX, BASE × 2^attempt)."""
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * 2 ** attempt))
+
+
+def _retry_after(headers) -> float | None:
+    try:
+        return min(RETRY_AFTER_MAX, max(0.0, float(headers.get("Retry-After", ""))))
+    except (TypeError, ValueError):
+        return None
+
+
+class HttpClient:
+    """단일 호스트 전용 클라이언트 (연결 풀 + 재시도 + 통계)."""
+
+    def __init__(
+        self,
+        name:     str,
+        base_url: str,
+        limit:    int,
+        timeout:  float,
+        budget:   float,
+        retries:  int,
+        ssl:      Any = None,
+        governor: Governor | None = None,
+    ):
+        self.name     = name
+        self.base_url = base_url.rstrip("/")
+        self.stats    = HostStats()
+        self._limit   = limit
+        self._timeout = timeout
+        self._budget  = budget
+        self._retries = retries
+        self._ssl     = ssl
+        self._gov     = governor
+        self.breaker  = CircuitBreaker(name)
+        self._session: aiohttp.ClientSession | None = None
+
+    async def start(self) -> None:
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_end.append(self._on_new_conn)
+        trace.on_connection_reuseconn.append(self._on_reused_conn)
+        connector = aiohttp.TCPConnector(
+            limit             = self._limit,
+            limit_per_host    = self._limit,
+            keepalive_timeout = HTTP_KEEPALIVE_SEC,
+            ttl_dns_cache     = HTTP_DNS_TTL_SEC,
+            ssl               = self._ssl if self._ssl is not None else True,
+        )
+        self._session = aiohttp.ClientSession(
+            connector     = connector,
+            timeout       = aiohttp.ClientTimeout(
+                total=self._timeout, connect=min(self._timeout, CONNECT_TIMEOUT),
+            ),
+            headers       = {"Accept-Encoding": "gzip, deflate"},
+            trace_configs = [trace],
+        )
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _on_new_conn(self, *_) -> None:
+        self.stats.new_conns += 1
+
+    async def _on_reused_conn(self, *_) -> None:
+        self.stats.reused_conns += 1
+
+    # ── 요청 ─────────────────────────────────────────────────
+
+    async def request(
+        self,
+        method: str,
+        path:   str,
+        *,
+        params:     dict | None = None,
+        json_body:  Any = None,
+        idempotent: bool | None = None,
+        raise_for_status: bool = True,
+        priority:   int = DATA,
+        hedge:      bool = False,
+    ) -> Response:
+        """요청 1건 (재시도 포함). 본문까지 읽어 Response 반환.
+
+        idempotent 미지정 시 메서드로 판단 (GET 등 → 재시도, POST → 1회만).
+        raise_for_status=False 면 최종 응답 상태와 무관하게 Response 반환.
+        hedge=True 는 멱등 조회 전용 — p95 지연 후 중복 요청 (먼저 성공한 응답 사용).
+        """
+        def send():
+            return self._request(
+                method, path, params, json_body, idempotent, raise_for_status, priority,
+            )
+
+        if hedge:
+            return await self._hedged(send)
+        return await send()
+
+    async def _request(
+        self,
+        method:     str,
+        path:       str,
+        params:     dict | None,
+        json_body:  Any,
+        idempotent: bool | None,
+        raise_for_status: bool,
+        priority:   int,
+    ) -> Response:
+        if self._session is None:
+            raise RuntimeError(f"[transport] {self.name} 클라이언트 미시작")
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT
+        attempts = 1 + (self._retries if idempotent else 0)
+        url      = f"{self.base_url}{path}"
+        loop     = asyncio.get_running_loop()
+        deadline = loop.time() + self._budget
+        endpoint = Governor.classify(self.name, method, path)
+
+        for attempt in range(attempts):
+            last    = attempt == attempts - 1
+            if not self.breaker.allow():
+                self.stats.rejected += 1
+                raise CircuitOpenError(f"[transport] {self.name} 차단기 열림 — {path} 즉시 실패")
+            if self._gov is not None:
+                await self._gov.acquire(endpoint, priority)
+            timeout = min(self._timeout, deadline - loop.time())
+            if timeout <= 0:
+                raise asyncio.TimeoutError(f"[transport] {self.name} {path} 예산 {self._budget}초 소진")
+            self.stats.requests += 1
+            t0 = time.perf_counter()
+            try:
+                async with self._session.request(
+                    method, url, params=params, json=json_body,
+                    timeout=aiohttp.ClientTimeout(
+                        total=timeout, connect=min(timeout, CONNECT_TIMEOUT),
+                    ),
+                ) as resp:
+                    text = await resp.text()
+                    self.stats.latencies.append(time.perf_counter() - t0)
+                    if resp.status >= 500:
+                        self.breaker.failure()
+                    else:
+                        self.breaker.success()
+                    if resp.status in RETRY_STATUSES and not last:
+                        wait = self._retry_wait(
+                            attempt, deadline, _retry_after(resp.headers), f"HTTP {resp.status}",
+                        )
+                        if wait is not None:
+                            await asyncio.sleep(wait)
+                            continue
+                    if resp.status >= 400:
+                        self.stats.errors += 1
+                        if raise_for_status:
+                            raise aiohttp.ClientResponseError(
+                                resp.request_info, resp.history,
+                                status=resp.status, message=text[:200], headers=resp.headers,
+                            )
+                    try:
+                        data = json.loads(text) if text else None
+                    except json.JSONDecodeError:
+                        data = text
+                    return Response(resp.status, resp.headers, data)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                self.stats.errors += 1
+                self.breaker.failure()
+                wait = None if last else self._retry_wait(attempt, deadline, None, type(e).__name__)
+                if wait is None:
+                    raise
+                await asyncio.sleep(wait)
+        raise AssertionError("unreachable")
+
+    def _retry_wait(
+        self, attempt: int, deadline: float, delay: float | None, reason: str,
+    ) -> float | None:
+        """재시도 대기 시간 (초). 대기 후 예산이 남지 않으면 None (재시도 안 함)."""
+        wait = delay if delay is not None else _backoff(attempt)
+        if asyncio.get_running_loop().time() + wait >= deadline:
+            return None
+        self.stats.retries += 1
+        log.debug("[transport] %s %s — %.2f초 후 재시도 (%d)", self.name, reason, wait, attempt + 1)
+        return wait
+
+    # ── hedge ────────────────────────────────────────────────
+
+    def _hedge_delay(self) -> float | None:
+        """hedge 대기 (초) = 호스트 p95. 표본 부족 / 비율 상한 도달 시 None."""
+        if len(self.stats.latencies) < HTTP_HEDGE_MIN_SAMPLES:
+            return None
+        if self.stats.hedges >= HTTP_HEDGE_MAX_RATIO * self.stats.requests:
+            return None
+        p95 = self.stats.percentile(0.95)
+        return min(HTTP_HEDGE_DELAY_MAX, max(HTTP_HEDGE_DELAY_MIN, p95))
+
+    async def _hedged(self, send) -> Response:
+        primary = asyncio.ensure_future(send())
+        tasks   = {primary}
+        try:
+            delay = self._hedge_delay()
+            if delay is not None:
+                await asyncio.wait(tasks, timeout=delay)
+                # 대기 중 다른 요청이 비율을 채웠을 수 있으므로 다시 확인
+                if not primary.done() and self._hedge_delay() is not None:
+                    self.stats.hedges += 1
+                    tasks.add(asyncio.ensure_future(send()))
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for t in done:
+                    if t.exception() is None:
+                        if t is not primary:
+                            self.stats.hedge_wins += 1
+                        return t.result()
+            return primary.result()    # 모두 실패 — 원 요청 예외 전파
+        finally:
+            for t in tasks:
+                if not t.done():
+                    t.cancel()
+
+    async def get_json(self, path: str, params: dict | None = None, hedge: bool = False) -> Any:
+        return (await self.request("GET", path, params=params, hedge=hedge)).data
+
+    async def post_json(
+        self, path: str, body: Any, idempotent: bool = False, hedge: bool = False,
+    ) -> Any:
+        return (await self.request(
+            "POST", path, json_body=body, idempotent=idempotent, hedge=hedge and idempotent,
+        )).data
+
+
+class Transport:
+    """이름 있는 호스트별 클라이언트 묶음. async with 로 수명 관리."""
+
+    def __init__(
+        self,
+        ssl:      Any = None,
+        bases:    dict[str, str] | None = None,
+        governor: Governor | None = None,
+    ):
+        """ssl: SSLContext / False (검증 생략 — 테스트 스크립트용). bases: 클라이언트별 주소 덮어쓰기.
+
+        governor 미지정 시 전용 Governor 생성 (executor 와 공유하려면 main 에서 같은 객체 전달).
+        """
+        urls = {
+            "gamma":    GAMMA_BASE,
+            "clob":     CLOB_HOST,
+            "odds":     ODDS_API_BASE,
+            "telegram": TELEGRAM_API,
+        }
+        urls.update(bases or {})
+        self._ssl     = ssl
+        self.governor = governor if governor is not None else Governor()
+        self._clients = {
+            name: HttpClient(name, urls[name], ssl=ssl, governor=self.governor, **HTTP_CLIENTS[name])
+            for name in urls
+        }
+        self.gamma    = self._clients["gamma"]
+        self.clob     = self._clients["clob"]
+        self.odds     = self._clients["odds"]
+        self.telegram = self._clients["telegram"]
+        self._ws: aiohttp.ClientSession | None = None
+
+    async def __aenter__(self) -> "Transport":
+        for client in self._clients.values():
+            await client.start()
+        self._ws = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(ssl=self._ssl if self._ssl is not None else True),
+        )
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        for client in self._clients.values():
+            await client.close()
+        if self._ws is not None:
+            await self._ws.close()
+            self._ws = None
+
+    def ws_connect(self, url: str, **kwargs):
+        """WebSocket 연결 (async with 로 사용)."""
+        return self._ws.ws_connect(url, **kwargs)
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            name: {**c.stats.snapshot(), "breaker": c.breaker.state}
+            for name, c in self._clients.items()
+        }
+
+    def log_stats(self) -> None:
+        for name, s in self.stats().items():
+            if not s["requests"]:
+                continue
+            log.info(
+                f"[transport] {name}: 요청 {s['requests']} / 재시도 {s['retries']} / 오류 {s['errors']} "
+                f"| 연결 신규 {s['new_conns']} 재사용 {s['reused_conns']} "
+                f"| hedge {s['hedges']} (선착 {s['hedge_wins']}) / 차단 {s['rejected']} "
+                f"| p50 {s['p50_ms']}ms p95 {s['p95_ms']}ms"
+            )
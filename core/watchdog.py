@@ -0,0 +1,85 @@
+"""
+core/watchdog.py - 이벤트 루프 정지 감시 (루프 지연 측정 + 막고 있는 코드 스택 기록)
+
+DB 메서드 / 크레딧 파일 읽기 / 공유 프록시(IPC) 같은 동기 호출이 이벤트 루프에서 실행되면
+그동안 WebSocket heartbeat / 주문 제출이 모두 멈춤. 어디서 막혔는지 찾기 위한 감시기.
+
+  [루프]    WATCHDOG_INTERVAL 마다 sleep → 실제 깨어난 시각과의 차이 = 루프 지연
+            → 지표 polymoly_loop_lag_seconds (히스토그램)
+            지연 ≥ WATCHDOG_STALL_SEC → polymoly_loop_stalls_total + 경고 (정지 시간 / 위치)
+  [스레드]  루프 heartbeat 가 WATCHDOG_STALL_SEC 이상 밀리면 정지 중인 루프 스레드의
+            스택(sys._current_frames) + 실행 중 태스크 이름을 즉시 경고 로그로 기록
+            (루프가 돌아오지 않는 경우에도 위치 확인 가능)
+
+정지 1회당 스택은 1번만 기록. 감시 스레드는 daemon — 프로세스 종료를 막지 않음.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from config import WATCHDOG_INTERVAL, WATCHDOG_STALL_SEC, WATCHDOG_STACK_DEPTH
+from core.metrics import LOOP_LAG, LOOP_STALLS
+
+log = logging.getLogger(__name__)
+
+
+class LoopWatchdog:
+    """실행 중인 이벤트 루프 1개 감시 (run() 을 태스크로 실행)."""
+
+    def __init__(self, interval: float = WATCHDOG_INTERVAL, threshold: float = WATCHDOG_STALL_SEC):
+        self._interval  = interval
+        self._threshold = threshold
+        self._beat      = time.monotonic()
+        self._captured: tuple[float, str, str] | None = None    # (beat, 태스크, 스택)
+        self.last_stall: tuple[float, str, str] | None = None   # (지연 초, 태스크, 스택) — 최근 정지
+
+    async def run(self) -> None:
+        loop    = asyncio.get_running_loop()
+        stopped = threading.Event()
+        thread  = threading.Thread(
+            target=self._watch, args=(loop, threading.get_ident(), stopped),
+            name="loop-watchdog", daemon=True,
+        )
+        thread.start()
+        try:
+            while True:
+                self._beat = time.monotonic()
+                await asyncio.sleep(self._interval)
+                lag = max(0.0, time.monotonic() - self._beat - self._interval)
+                LOOP_LAG.observe(lag)
+                if lag >= self._threshold:
+                    self._report(lag)
+        finally:
+            stopped.set()
+
+    def _report(self, lag: float) -> None:
+        LOOP_STALLS.inc()
+        captured = self._captured if self._captured and self._captured[0] == self._beat else None
+        task, stack = captured[1:] if captured else ("?", "")
+        self.last_stall = (lag, task, stack)
+        where = stack.strip().splitlines()[-2].strip() if stack else "스택 미기록 (감시 주기보다 짧음)"
+        log.warning(f"[watchdog] 이벤트 루프 {lag * 1000:.0f}ms 정지 — 태스크 {task} | {where}")
+
+    # ── 감시 스레드 ──────────────────────────────────────────
+
+    def _watch(self, loop: asyncio.AbstractEventLoop, loop_thread: int, stopped: threading.Event) -> None:
+        while not stopped.wait(self._threshold / 2):
+            beat   = self._beat
+            behind = time.monotonic() - beat - self._interval
+            if behind < self._threshold or (self._captured and self._captured[0] == beat):
+                continue
+            frame = sys._current_frames().get(loop_thread)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame, limit=WATCHDOG_STACK_DEPTH))
+            try:
+                current = asyncio.current_task(loop)
+                task    = current.get_name() if current is not None else "콜백"
+            except RuntimeError:
+                task = "?"
+            self._captured = (beat, task, stack)
+            log.warning(f"[watchdog] 이벤트 루프 {behind * 1000:.0f}ms 이상 정지 중 — 태스크 {task}\n{stack}")
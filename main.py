@@ -5,222 +5,288 @@ main.py - Polymarket 배당 역전 봇 (polymoly) 진입점
   1. [수집]  Odds API → Pinnacle NBA 배당 수집 (1.5 이하 정배 필터)
   2. [조회]  Gamma API → 폴리마켓 NBA 예정 경기 마켓 조회
   3. [매핑]  팀명 정규화 + 시간 매칭으로 동일 경기 식별
-  4. [스캔]  4조건 검사 → 배당 역전 기회 감지
+  4. [스캔]  4조건 검사 → 배당 역전 기회 감지 (배당 / 호가 시계열 스냅샷 기록)
   5. [실행]  조건 충족 시 FOK 시장가 매수
-  6. [모니터] 경기 종료 후 결과 감지 → 수익/손실 기록
+  6. [추적]  user WebSocket 채널로 주문 체결 확정 (실제 체결가/수량 기록)
+  7. [모니터] 경기 종료 후 결과 감지 → 수익/손실 기록
+             (market_resolved / sports 종료 이벤트로 즉시, 가격 폴링은 예비)
 
+1~5단계는 core/pipeline.py 비동기 파이프라인 (수집 ∥ 조회 동시, 스캔 워커 병렬)
+재시작 시 core/checkpoint.py 로 직전 배당 / 마켓 / 폴링 일정 복원 (다음 폴링 전에는 Odds API 미호출)
+오더북은 market 채널이 유지하는 공유 메모리 캐시 우선 (core/bookcache.py), 없으면 REST
 폴링 주기: 1시간 (POLL_INTERVAL)
+지표: http://127.0.0.1:METRICS_PORT/metrics (Prometheus 텍스트, core/metrics.py)
+루프 정지 감시: core/watchdog.py (WATCHDOG_STALL_SEC 이상 막은 코드 스택 경고)
+프로파일: kill -USR1 <pid> 또는 data/profile 수정 → 다음 사이클 cProfile + tracemalloc (core/profiler.py)
+
+사용법:
+  python main.py            # 실거래
+  python main.py --paper    # 모의 거래 — 오더북 대상 FOK 시뮬레이션, PAPER_DB_PATH 에 기록 (core/paper.py)
 """
 
+import argparse
 import asyncio
 import logging
-import logging.handlers
+import time
+from collections.abc import Callable
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
 
 import aiohttp
 from dotenv import load_dotenv
 
 from config import (
-    POLL_INTERVAL, MAX_CONSECUTIVE_LOSSES, LOG_FILE, ERROR_LOG_FILE,
-    CREDITS_WARNING_THRESHOLD,
+    POLL_INTERVAL, MAX_CONSECUTIVE_LOSSES,
+    CREDITS_WARNING_THRESHOLD, SHARDS,
+    DB_PATH, PAPER_DB_PATH, PAPER_CHECKPOINT_PATH, PAPER_NOTIFY_LABEL,
 )
+from core import checkpoint, metrics
+from core.bookcache import BookCache, WatchList
 from core.db import DB
 from core.executor import Executor
-from core.matcher import fetch_nba_poly_markets, load_team_mapping, match_games
+from core.feeds import MarketFeed, SportsFeed
+from core.governor import Governor
+from core.logsetup import setup_logging
+from core.matcher import load_team_mapping
 from core.monitor import Monitor
+from core.order_tracker import OrderTracker
+from core.positions import PositionBook
+from core.outbox import Outbox
 from core.notifier import (
+    install_outbox,
     notify_started, notify_stopped,
-    notify_opportunity, notify_executed, notify_failed,
     notify_auto_stopped, notify_low_credits,
     notify_poll_start, notify_no_games, notify_no_markets,
     notify_no_matches, notify_no_opportunities,
     notify_error, notify_credits_warning, notify_daily_limit,
 )
-from core.odds_fetcher import fetch_nba_games, InsufficientCreditsError, DailyLimitReachedError, load_credits
-from core.scanner import scan
+from core.odds_fetcher import InsufficientCreditsError, DailyLimitReachedError, load_credits
+from core.paper import PaperExecutor
+from core.pipeline import Pipeline
+from core.profiler import PROFILER
+from core.timeseries import SnapshotRecorder
+from core.transport import Transport
+from core.watchdog import LoopWatchdog
 
 load_dotenv()
 
 
-# ── 로깅 설정 ────────────────────────────────────────────────
-
-def setup_logging() -> None:
-    Path("logs").mkdir(exist_ok=True)
-
-    fmt     = "%(asctime)s [%(levelname)s] %(message)s"
-    datefmt = "%Y-%m-%d %H:%M:%S"
-
-    logging.basicConfig(level=logging.INFO, format=fmt, datefmt=datefmt)
-
-    fh = logging.handlers.RotatingFileHandler(
-        LOG_FILE, maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf-8"
-    )
-    fh.setLevel(logging.INFO)
-    fh.setFormatter(logging.Formatter(fmt, datefmt))
-
-    eh = logging.handlers.RotatingFileHandler(
-        ERROR_LOG_FILE, maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8"
-    )
-    eh.setLevel(logging.ERROR)
-    eh.setFormatter(logging.Formatter(fmt, datefmt))
-
-    root = logging.getLogger()
-    root.addHandler(fh)
-    root.addHandler(eh)
-
-
 log = logging.getLogger(__name__)
 
 
 # ── 메인 폴링 루프 ───────────────────────────────────────────
 
 async def polling_loop(
-    session:  aiohttp.ClientSession,
+    http:     Transport,
     executor: Executor,
-    monitor:  Monitor,
-    db:       DB,
+    stopped:  Callable[[], bool],
+    recorder: SnapshotRecorder,
+    shard:    str = "nba",
+    books:    BookCache | None = None,
+    checkpoint_path: str | None = None,
 ) -> None:
-    """Odds API + Gamma API 조회 → 갭 감지 → 매수 실행 루프."""
+    """Odds API + Gamma API 조회 → 갭 감지 → 매수 실행 루프.
+
+    stopped: 연속 패배 자동 중단 확인 (True 면 루프 종료). shard: config.SHARDS 키.
+    books: 공유 메모리 오더북 캐시 (없으면 매번 REST 조회).
+    checkpoint_path: 웜 스타트 파일 경로 형식 (기본 CHECKPOINT_PATH, 모의 거래는 PAPER_CHECKPOINT_PATH).
+    """
     team_mapping = load_team_mapping()
     log.info(f"[main] 팀 매핑 로드: {len(team_mapping)}팀")
+    cfg      = SHARDS[shard]
+    pipeline = Pipeline(
+        executor, team_mapping, recorder,
+        sport=cfg["odds_sport"], tag=cfg["gamma_tag"], books=books,
+    )
+
+    # 웜 스타트: 다음 폴링 예정 전이면 복원한 배당 / 마켓으로 매핑 + 사전 서명만 (주문 없음) 후 대기
+    warm  = checkpoint.load(shard, checkpoint_path)
+    state = warm or checkpoint.WarmState(shard)
+    if warm is not None and not warm.due:
+        try:
+            await pipeline.warm_up(http, warm.games, warm.markets)
+        except Exception as e:
+            log.warning(f"[main] 웜 스타트 실패: {e}")
+        await asyncio.sleep(warm.resume_at - time.time())
 
-    poll_count           = 0
-    credits_warning_sent = False   # WARNING 알림은 세션당 1회만
+    poll_count           = state.poll_count
+    credits_warning_sent = state.credits_warning_sent   # WARNING 알림은 세션당 1회만
+
+    async def save_checkpoint(wait: float) -> None:
+        state.resume_at            = time.time() + wait
+        state.poll_count           = poll_count
+        state.credits_warning_sent = credits_warning_sent
+        state.games, state.markets = pipeline.games, pipeline.markets
+        try:
+            await asyncio.to_thread(checkpoint.save, state, checkpoint_path)
+        except OSError as e:
+            log.warning(f"[main] 체크포인트 저장 실패: {e}")
 
     while True:
-        if monitor._stopped:
+        if stopped():
             log.error("[main] 모니터 자동 중단 — 폴링 종료")
             break
 
         poll_count += 1
+        metrics.POLLS.inc()
         log.info("=" * 60)
         log.info(f"[main] 폴링 #{poll_count}: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}")
 
         # 폴링 시작 알림 (보유 포지션 수 + 이전 저장된 크레딧 포함)
-        active_positions   = len(db.get_active_token_ids())
-        credits_before     = load_credits()
-        await notify_poll_start(session, poll_count, active_positions, credits_before)
+        # 파일 / 공유 프록시(IPC) 읽기 — 루프 밖에서
+        active_positions   = await asyncio.to_thread(executor.positions.count)
+        credits_before     = await asyncio.to_thread(load_credits)
+        await notify_poll_start(http, poll_count, active_positions, credits_before)
 
+        wait = POLL_INTERVAL
         try:
-            # 1. Pinnacle NBA 배당 수집
-            pinnacle_games = await fetch_nba_games(session)
+            # 1~5. 수집 ∥ 조회 → 매핑 → 스캔 → 실행 (core/pipeline.py)
+            with PROFILER.cycle("poll", poll_count):    # SIGUSR1 / 제어 파일로 예약된 경우만 측정
+                report = await pipeline.run_cycle(http)
 
             # 크레딧 경고 체크 (API 호출 직후 갱신된 값 기준, 세션당 1회)
-            credits_now = load_credits()
+            credits_now = await asyncio.to_thread(load_credits)
             if (
                 not credits_warning_sent
                 and credits_now is not None
                 and credits_now < CREDITS_WARNING_THRESHOLD
             ):
-                await notify_credits_warning(session, credits_now, CREDITS_WARNING_THRESHOLD)
+                await notify_credits_warning(http, credits_now, CREDITS_WARNING_THRESHOLD)
                 credits_warning_sent = True
 
-            if not pinnacle_games:
+            if not report.pinnacle_games:
                 log.info("[main] 정배 경기 없음 — 대기")
-                await notify_no_games(session)
-                await asyncio.sleep(POLL_INTERVAL)
-                continue
-
-            # 2. 폴리마켓 NBA 마켓 조회
-            poly_markets = await fetch_nba_poly_markets(session)
-            if not poly_markets:
+                await notify_no_games(http)
+            elif not report.poly_markets:
                 log.info("[main] 폴리마켓 경기 없음 — 대기")
-                await notify_no_markets(session)
-                await asyncio.sleep(POLL_INTERVAL)
-                continue
-
-            # 3. 경기 매핑
-            matched = match_games(pinnacle_games, poly_markets, team_mapping)
-            if not matched:
+                await notify_no_markets(http)
+            elif not report.matched:
                 log.info("[main] 매핑 성공 경기 없음 — 대기")
-                await notify_no_matches(session, len(pinnacle_games), len(poly_markets))
-                await asyncio.sleep(POLL_INTERVAL)
-                continue
-
-            # 4. 배당 역전 감지
-            opportunities = await scan(session, matched)
-
-            if not opportunities:
-                await notify_no_opportunities(session, len(matched))
-
-            # 5. 매수 실행
-            for opp in opportunities:
-                if executor.has_position(opp.token_id):
-                    log.debug(f"[main] 이미 포지션 보유: {opp.event_title}")
-                    continue
-
-                await notify_opportunity(session, opp)
-                result = await executor.execute(opp)
+                await notify_no_matches(http, report.pinnacle_games, report.poly_markets)
+            elif not report.opportunities:
+                await notify_no_opportunities(http, report.matched)
 
-                if result.success:
-                    await notify_executed(session, result)
-                elif result.status not in ("skipped",):
-                    await notify_failed(session, result)
+            log.info(f"[main] 다음 폴링: {POLL_INTERVAL // 60}분 후")
 
         except DailyLimitReachedError as e:
             log.warning(str(e))
             now      = datetime.now(timezone.utc)
             midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-            wait_sec = (midnight - now).total_seconds()
-            wait_hrs = wait_sec / 3600
+            wait     = (midnight - now).total_seconds()
+            wait_hrs = wait / 3600
             log.info(f"[main] 일일 한도 — {wait_hrs:.1f}시간 후(자정 UTC) 재개")
-            await notify_daily_limit(session, e.count, e.limit, wait_hrs)
-            await asyncio.sleep(wait_sec)
-            continue
+            await notify_daily_limit(http, e.count, e.limit, wait_hrs)
         except InsufficientCreditsError as e:
             log.error(str(e))
-            await notify_low_credits(session, e.remaining)
+            await notify_low_credits(http, e.remaining)
             log.info("[main] Odds API 크레딧 소진 — 6시간 후 재시도")
-            await asyncio.sleep(6 * 3600)
-            continue
+            wait = 6 * 3600
         except aiohttp.ClientError as e:
             log.error(f"[main] 네트워크 오류: {e} — 5분 후 재시도")
-            await notify_error(session, "네트워크", str(e))
-            await asyncio.sleep(300)
-            continue
+            await notify_error(http, "네트워크", str(e))
+            wait = 300
         except Exception as e:
             log.error(f"[main] 예상치 못한 오류: {e}", exc_info=True)
-            await notify_error(session, "예상치 못한 오류", str(e))
-            await asyncio.sleep(300)
-            continue
+            await notify_error(http, "예상치 못한 오류", str(e))
+            wait = 300
 
-        log.info(f"[main] 다음 폴링: {POLL_INTERVAL // 60}분 후")
-        await asyncio.sleep(POLL_INTERVAL)
+        await save_checkpoint(wait)
+        await asyncio.sleep(wait)
 
 
 # ── 진입점 ───────────────────────────────────────────────────
 
-async def main() -> None:
-    setup_logging()
-    log.info("=== polymoly 봇 시작 ===")
+def install_metrics(http: Transport, governor: Governor, positions: PositionBook | None = None) -> None:
+    """스크레이프 시점에 계산하는 지표 등록 (잔여 크레딧 / 보유 포지션 / HTTP / 속도 제한)."""
+    metrics.CREDITS.set_function(load_credits)
+    if positions is not None:
+        metrics.OPEN_POSITIONS.set_function(positions.count)
+    metrics.REGISTRY.collect(metrics.transport_collector(http))
+    metrics.REGISTRY.collect(metrics.governor_collector(governor))
+
 
-    db       = DB()
-    executor = Executor(db)
-    monitor  = Monitor(executor, db)
+async def main(paper: bool = False) -> None:
+    """paper: 모의 거래 (주문 / 체결 추적 없이 PAPER_DB_PATH 에 기록, 정산은 동일).
 
-    async with aiohttp.ClientSession() as session:
-        await notify_started(session)
+    모의 거래는 체크포인트도 따로 (PAPER_CHECKPOINT_PATH), 텔레그램 알림에는 PAPER_NOTIFY_LABEL 머리말.
+    """
+    setup_logging()
+    log.info("=== polymoly 봇 시작 ===" + (" (모의 거래)" if paper else ""))
+    PROFILER.install_signal()
+
+    db        = DB(PAPER_DB_PATH if paper else DB_PATH)
+    positions = PositionBook(db)
+    governor  = Governor()    # REST 호출 속도 제한 — transport / executor 공유
+    watch     = WatchList()
+    books     = BookCache.create(watch)    # market 채널 → 스캔 / 모니터 오더북
+    if paper:
+        tracker  = None
+        executor = PaperExecutor(db, positions, governor, books)
+    else:
+        tracker  = OrderTracker(db, positions)
+        executor = Executor(db, tracker, positions, governor)
+    recorder  = SnapshotRecorder(db)
+    monitor   = Monitor(executor, db, recorder, books)
+    market    = MarketFeed(
+        positions, monitor.on_market_resolved, books, watch, executor.stager, recorder.record_book,
+    )
+    sports    = SportsFeed(monitor.wake)
+    outbox    = Outbox(db, PAPER_NOTIFY_LABEL if paper else "")
+    install_outbox(outbox)    # 이후 notify_* 는 큐 적재 후 즉시 반환
+
+    async with Transport(governor=governor) as http:
+        install_metrics(http, governor, positions)
+        await notify_started(http)
         await executor.initialize()
 
-        try:
-            await asyncio.gather(
-                polling_loop(session, executor, monitor, db),
-                monitor.run(session),
+        # 폴링 / 모니터는 자동 중단 시 반환, 나머지(피드 / 추적 / 아웃박스 등)는 끝나지 않음
+        # → 어느 하나라도 끝나면(반환 / 오류) 전부 취소 후 종료 경로로
+        loops = [
+            asyncio.create_task(polling_loop(
+                http, executor, lambda: monitor.stopped, recorder, books=books,
+                checkpoint_path=PAPER_CHECKPOINT_PATH if paper else None,
+            )),
+            asyncio.create_task(monitor.run(http)),
+        ]
+        background = [
+            asyncio.create_task(c) for c in (
+                *([tracker.run(http)] if tracker is not None else []),
+                recorder.run(),
+                market.run(http),
+                executor.stager.run(),
+                sports.run(http),
+                outbox.run(http),
+                metrics.serve(),
+                LoopWatchdog().run(),
             )
+        ]
+        try:
+            done, _ = await asyncio.wait([*loops, *background], return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()    # 오류 전파
         except asyncio.CancelledError:
             log.info("[main] 종료 요청")
         except Exception as e:
             log.error(f"[main] 치명적 오류: {e}", exc_info=True)
         finally:
-            consecutive = db.count_consecutive_losses()
+            for task in (*loops, *background):
+                task.cancel()
+            await asyncio.gather(*loops, *background, return_exceptions=True)
+            consecutive = await db.aio.count_consecutive_losses()
             if consecutive >= MAX_CONSECUTIVE_LOSSES:
-                await notify_auto_stopped(session, consecutive, db.get_stats())
+                await notify_auto_stopped(http, consecutive, await db.aio.get_stats())
             else:
-                await notify_stopped(session, "봇 정상 종료")
+                await notify_stopped(http, "봇 정상 종료")
+            await outbox.close(http)
+            await recorder.flush()
+            http.log_stats()
+            governor.log_stats()
+            books.close()
+            db.close()
 
     log.info("=== 봇 종료 ===")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="polymoly 배당 역전 봇")
+    parser.add_argument("--paper", action="store_true", help="모의 거래 (실제 주문 없음)")
+    asyncio.run(main(parser.parse_args().paper))
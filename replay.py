@@ -0,0 +1,85 @@
+"""
+replay.py - 기록 데이터 모의 거래 재생 (positions.db 스냅샷 → 전략 / 모의 체결 / 정산, 대기 없이)
+
+기록된 매핑 경기 / 배당 / 호가 스냅샷을 시각 순으로 최대 속도 재생 (core/paper.py).
+전략 변경 검증 + 스캔 / 실행 / 정산 경로 처리량 측정용. 결과 DB 는 실행마다 새로 생성.
+
+사용법:
+  python replay.py                              # 전체 기록 재생 → data/paper-replay.db
+  python replay.py --since 2026-03-01           # 해당 날짜(UTC) 이후만
+  python replay.py --until 2026-03-08 -v        # 구간 지정 + 판정 로그 출력
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from config import DB_PATH, PAPER_REPLAY_DB_PATH
+from core.db import DB
+from core.paper import replay
+
+SEP = "=" * 65
+
+
+def _epoch(day: str | None) -> int | None:
+    if day is None:
+        return None
+    return int(datetime.fromisoformat(day).replace(tzinfo=timezone.utc).timestamp())
+
+
+def _reset(path: str) -> None:
+    for suffix in ("", "-wal", "-shm"):
+        Path(path + suffix).unlink(missing_ok=True)
+
+
+async def run(args: argparse.Namespace) -> None:
+    _reset(args.out)
+    source = DB(args.db)
+    paper  = DB(args.out)
+    try:
+        report = await replay(source, paper, _epoch(args.since) or 0, _epoch(args.until))
+    finally:
+        source.close()
+        paper.close()
+
+    stats = report.stats
+    print(SEP)
+    print(f"  기록 구간    {report.span_sec / 3600:>10.1f}시간 ({report.ticks:,}틱)")
+    print(f"  재생 시간    {report.elapsed:>10.2f}s")
+    print(f"  평가         {report.evaluations:>10,}  ({report.evaluations / max(report.elapsed, 1e-9):,.0f}/s)")
+    print(f"  기회         {report.opportunities:>10,}")
+    for status, n in sorted(report.orders.items()):
+        print(f"    {status:<14} {n:>8,}")
+    print(
+        f"  베팅 {stats.get('total', 0)} | 승 {stats.get('wins', 0)} / 패 {stats.get('losses', 0)} "
+        f"/ 대기 {stats.get('pending', 0)} | P&L ${stats.get('total_pnl', 0):+.2f}"
+    )
+    if report.stopped:
+        print("  ⚠️  연속 패배 자동 중단 조건 도달 — 이후 구간 미재생")
+    print(f"  → {args.out}")
+    print(SEP)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="polymoly 모의 거래 재생")
+    parser.add_argument("--db", default=DB_PATH, help="스냅샷 원본 DB")
+    parser.add_argument("--out", default=PAPER_REPLAY_DB_PATH, help="모의 베팅 기록 DB (덮어씀)")
+    parser.add_argument("--since", help="YYYY-MM-DD (UTC) 이후만")
+    parser.add_argument("--until", help="YYYY-MM-DD (UTC) 이전만")
+    parser.add_argument("-v", "--verbose", action="store_true", help="판정 / 체결 로그 출력")
+    args = parser.parse_args()
+
+    if Path(args.out).resolve() == Path(args.db).resolve():
+        print("❌ --out 이 원본 DB 와 같음")
+        sys.exit(1)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s",
+    )
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+sim/__main__.py - 로컬 API 시뮬레이터 실행 (Gamma / CLOB / WebSocket / Odds API / Telegram 대역)
+
+실제 API 없이 main() 루프 전체를 부하 / 장애 조건에서 재현 가능하게 실행.
+경기 / 가격은 시드 고정 (sim/world.py), 장애 주입은 서비스별 (sim/faults.py).
+
+사용법:
+  python -m sim                                   # SIM_MARKETS 개 경기, 127.0.0.1:8700
+  python -m sim --markets 3000 --tick 0.5         # 3000 마켓, 0.5초마다 호가 변동
+  python -m sim --latency 0.05 --error-rate 0.02  # 전체 서비스 지연 50ms + 503 2%
+  python -m sim --fault clob:rate_limit=50,jitter=0.2 --fault telegram:rate_limit=1
+
+  다른 셸에서 (출력되는 환경변수 그대로):
+  POLYMOLY_SIM=http://127.0.0.1:8700 ODDS_API_KEY=sim TELEGRAM_BOT_TOKEN=sim TELEGRAM_CHAT_ID=1 \\
+      python main.py --paper
+
+  실행 중: curl localhost:8700/sim/stats
+           curl -X POST localhost:8700/sim/faults -d '{"clob": {"error_rate": 0.5}}'
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+
+from config import (
+    SIM_CREDITS, SIM_GAP_RATIO, SIM_HOST, SIM_MARKETS, SIM_PORT,
+    SIM_SEED, SIM_TICK_CHANGES, SIM_TICK_SEC,
+)
+from sim.faults import SERVICES, Faults
+from sim.servers import build_app, start
+from sim.world import World
+
+SEP = "=" * 65
+
+
+def _faults(args: argparse.Namespace) -> dict[str, Faults]:
+    base   = Faults(args.latency, args.jitter, args.error_rate, args.rate_limit)
+    faults = {name: Faults.parse("", base) for name in SERVICES}
+    for spec in args.fault:
+        service, _, settings = spec.partition(":")
+        if service not in faults:
+            raise SystemExit(f"❌ 알 수 없는 서비스: {service} ({', '.join(SERVICES)})")
+        faults[service] = Faults.parse(settings, faults[service])
+    return faults
+
+
+async def run(args: argparse.Namespace) -> None:
+    world = World(
+        markets=args.markets, seed=args.seed, gap_ratio=args.gap_ratio, credits=args.credits,
+        start_hrs=(args.start_min, args.start_max), tick_changes=args.changes,
+    )
+    faults = _faults(args)
+    runner, url = await start(build_app(world, faults, tick_sec=args.tick, seed=args.seed), args.host, args.port)
+    print(SEP)
+    print(f"  시뮬레이터 {url} | 경기 {args.markets} | 시드 {args.seed}")
+    for name, service in faults.items():
+        if any(service.settings().values()):
+            print(f"  장애 {name:<9} {service.settings()}")
+    print(f"\n  POLYMOLY_SIM={url} ODDS_API_KEY=sim TELEGRAM_BOT_TOKEN=sim TELEGRAM_CHAT_ID=1 \\")
+    print("      python main.py --paper")
+    print(SEP)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        print(json.dumps(dict(world.stats), ensure_ascii=False))
+        await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="polymoly 로컬 API 시뮬레이터")
+    parser.add_argument("--host", default=SIM_HOST)
+    parser.add_argument("--port", type=int, default=SIM_PORT)
+    parser.add_argument("--markets", type=int, default=SIM_MARKETS)
+    parser.add_argument("--seed", type=int, default=SIM_SEED)
+    parser.add_argument("--gap-ratio", type=float, default=SIM_GAP_RATIO, help="배당 역전 마켓 비율")
+    parser.add_argument("--credits", type=int, default=SIM_CREDITS, help="Odds API 시작 크레딧")
+    parser.add_argument("--start-min", type=float, default=1.5, help="경기 시작 최소 N시간 후")
+    parser.add_argument("--start-max", type=float, default=23.0, help="경기 시작 최대 N시간 후")
+    parser.add_argument("--tick", type=float, default=SIM_TICK_SEC, help="호가 변동 주기 (초, 0 = 정지)")
+    parser.add_argument("--changes", type=int, default=SIM_TICK_CHANGES, help="틱당 호가 변경 수")
+    parser.add_argument("--latency", type=float, default=0.0, help="전체 서비스 응답 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="추가 무작위 지연 상한 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 응답 비율")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="서비스별 초당 허용 요청 (0 = 무제한)")
+    parser.add_argument("--fault", action="append", default=[], metavar="SERVICE:KEY=VAL,…",
+                        help=f"서비스별 장애 덮어쓰기 ({', '.join(SERVICES)})")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+sim/faults.py - 서비스별 장애 주입 (지연 / 오류 / 속도 제한)
+
+서비스(gamma / clob / odds / telegram / sports) 하위 앱마다 aiohttp 미들웨어 1개.
+WebSocket 핸드셰이크에도 적용 → 오류 / 429 는 재연결 경로 검증에 사용.
+
+  latency     모든 응답 전 고정 지연 (초)
+  jitter      추가 무작위 지연 상한 (초, 균등 분포)
+  error_rate  503 응답 비율 (0~1)
+  rate_limit  초당 허용 요청 (0 = 무제한). 초과 시 429 + Retry-After
+              (telegram 은 Bot API 형식 parameters.retry_after 포함)
+
+실행 중 변경: POST /sim/faults {"clob": {"error_rate": 0.5}} (sim/servers.py)
+"""
+
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field, fields
+
+from aiohttp import web
+
+SERVICES = ("gamma", "clob", "odds", "telegram", "sports")
+
+
+@dataclass
+class Faults:
+    """서비스 1개의 장애 설정 (실행 중 필드 변경 가능)."""
+    latency:    float = 0.0
+    jitter:     float = 0.0
+    error_rate: float = 0.0
+    rate_limit: float = 0.0
+    _tokens:    float = field(default=0.0, repr=False)
+    _updated:   float = field(default=0.0, repr=False)
+
+    @classmethod
+    def parse(cls, spec: str, base: "Faults | None" = None) -> "Faults":
+        """"latency=0.05,error_rate=0.01" → Faults (base 값 위에 덮어씀)."""
+        faults = cls(**base.settings()) if base is not None else cls()
+        for item in filter(None, spec.split(",")):
+            key, _, value = item.partition("=")
+            faults.update({key.strip(): float(value)})
+        return faults
+
+    def settings(self) -> dict[str, float]:
+        return {f.name: getattr(self, f.name) for f in fields(self) if not f.name.startswith("_")}
+
+    def update(self, values: dict[str, float]) -> None:
+        for key, value in values.items():
+            if key not in self.settings():
+                raise ValueError(f"[sim] 알 수 없는 장애 설정: {key}")
+            setattr(self, key, float(value))
+
+    def allow(self) -> bool:
+        """토큰 버킷 (용량 = 1초 분량)."""
+        if self.rate_limit <= 0:
+            return True
+        now = time.monotonic()
+        self._tokens  = min(self.rate_limit, self._tokens + (now - self._updated) * self.rate_limit)
+        self._updated = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+def middleware(service: str, faults: Faults, stats: Counter, rng: random.Random):
+    """서비스 하위 앱용 장애 주입 미들웨어."""
+
+    @web.middleware
+    async def inject(request: web.Request, handler):
+        stats[f"{service}_requests"] += 1
+        delay = faults.latency + (rng.uniform(0, faults.jitter) if faults.jitter > 0 else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if not faults.allow():
+            stats[f"{service}_limited"] += 1
+            body = {"error": "rate limited"}
+            if service == "telegram":
+                body = {"ok": False, "error_code": 429, "description": "Too Many Requests: retry after 1",
+                        "parameters": {"retry_after": 1}}
+            return web.json_response(body, status=429, headers={"Retry-After": "1"})
+        if faults.error_rate > 0 and rng.random() < faults.error_rate:
+            stats[f"{service}_errors"] += 1
+            return web.json_response({"error": "sim: injected failure"}, status=503)
+        return await handler(request)
+
+    return inject
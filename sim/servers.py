@@ -0,0 +1,354 @@
+"""
+sim/servers.py - 외부 API 대역 서버 (aiohttp.web, 포트 1개에 서비스별 경로)
+
+  /gamma/events                       Gamma 마켓 조회 (limit / offset 페이지)
+  /clob/book  /clob/books             오더북 (GET 단건 / POST 일괄)
+  /clob/tick-size /neg-risk /fee-rate 주문 옵션 (py-clob-client)
+  /clob/order                         FOK 주문 (sim/world.py 체결 판정)
+  /clob/ws/market  /clob/ws/user      market 채널 (book / price_change / market_resolved), user 채널 (trade)
+  /sports/ws                          sport_result (서버 "ping" → 클라이언트 "pong")
+  /odds/v4/sports/{sport}/odds        Pinnacle h2h + x-requests-remaining / x-requests-used
+  /telegram/bot{token}/sendMessage    수신 메시지는 World.messages 에 보관
+  /sim/stats  /sim/faults             카운터 조회 / 장애 설정 조회·변경 (장애 주입 대상 아님)
+
+config.py 의 주소는 POLYMOLY_SIM 환경변수로 이 서버 경로에 맞춰짐 — 봇 코드는 변경 없이 접속.
+틱(tick_sec)마다 World.tick() 이벤트를 구독 중인 WebSocket 에 묶어서(JSON 배열) 전송.
+"""
+
+import asyncio
+import json
+import logging
+import random
+from collections import defaultdict
+
+from aiohttp import WSMsgType, web
+
+from config import SIM_HOST, SIM_PORT, SIM_TICK_SEC
+from sim.faults import SERVICES, Faults, middleware
+from sim.world import Event, World
+
+log = logging.getLogger(__name__)
+
+SPORTS_PING_SEC = 5.0
+
+WORLD  = web.AppKey("world", World)
+FAULTS = web.AppKey("faults", dict)
+HUB    = web.AppKey("hub", object)
+
+
+class _Hub:
+    """WebSocket 연결 + 구독 대상. 이벤트를 연결별로 묶어 전송."""
+
+    def __init__(self):
+        self.market: dict[web.WebSocketResponse, set[str]] = {}   # → asset_id
+        self.user:   dict[web.WebSocketResponse, set[str]] = {}   # → condition_id (빈 집합 = 전체)
+        self.sports: set[web.WebSocketResponse] = set()
+
+    async def dispatch(self, events: list[Event]) -> None:
+        batches: dict[web.WebSocketResponse, list[dict]] = defaultdict(list)
+        for channel, event in events:
+            if channel == "market":
+                assets = _assets(event)
+                for ws, wanted in self.market.items():
+                    if wanted & assets:
+                        batches[ws].append(_only(event, wanted))
+            elif channel == "user":
+                for ws, markets in self.user.items():
+                    if not markets or event.get("market") in markets:
+                        batches[ws].append(event)
+            elif channel == "sports":
+                for ws in self.sports:
+                    batches[ws].append(event)
+        for ws, batch in batches.items():
+            await _send(ws, batch if len(batch) > 1 else batch[0])
+
+    async def close(self) -> None:
+        for ws in [*self.market, *self.user, *self.sports]:
+            await ws.close()
+
+
+def _assets(event: dict) -> set[str]:
+    if "price_changes" in event:
+        return {ch["asset_id"] for ch in event["price_changes"]}
+    if "assets_ids" in event:
+        return set(event["assets_ids"])
+    return {event.get("asset_id", "")}
+
+
+def _only(event: dict, wanted: set[str]) -> dict:
+    """price_change 는 구독 토큰 변경분만."""
+    if "price_changes" not in event:
+        return event
+    return dict(event, price_changes=[ch for ch in event["price_changes"] if ch["asset_id"] in wanted])
+
+
+async def _send(ws: web.WebSocketResponse, payload) -> None:
+    if ws.closed:
+        return
+    try:
+        await ws.send_str(json.dumps(payload, separators=(",", ":")))
+    except (ConnectionError, RuntimeError):
+        pass
+
+
+# ── Gamma ────────────────────────────────────────────────────
+
+async def gamma_events(request: web.Request) -> web.Response:
+    world  = request.app[WORLD]
+    limit  = int(request.query.get("limit", 100))
+    offset = int(request.query.get("offset", 0))
+    return web.json_response(world.gamma_events(offset, limit))
+
+
+# ── CLOB REST ────────────────────────────────────────────────
+
+async def clob_book(request: web.Request) -> web.Response:
+    book = request.app[WORLD].book(request.query.get("token_id", ""))
+    if book is None:
+        return web.json_response({"error": "No orderbook exists for the requested token id"}, status=404)
+    return web.json_response(book)
+
+
+async def clob_books(request: web.Request) -> web.Response:
+    world = request.app[WORLD]
+    body  = await request.json()
+    books = [world.book(str(item.get("token_id", ""))) for item in body]
+    return web.json_response([b for b in books if b is not None])
+
+
+async def clob_tick_size(request: web.Request) -> web.Response:
+    return web.json_response({"minimum_tick_size": 0.01})
+
+
+async def clob_neg_risk(request: web.Request) -> web.Response:
+    return web.json_response({"neg_risk": False})
+
+
+async def clob_fee_rate(request: web.Request) -> web.Response:
+    return web.json_response({"base_fee": 0})
+
+
+async def clob_order(request: web.Request) -> web.Response:
+    world = request.app[WORLD]
+    hub   = request.app[HUB]
+    resp, events = world.place_order(await request.json())
+    loop  = asyncio.get_running_loop()
+    for delay, event in events:
+        loop.call_later(delay, lambda e=event: asyncio.ensure_future(hub.dispatch([("user", e)])))
+    return web.json_response(resp)
+
+
+# ── CLOB WebSocket ───────────────────────────────────────────
+
+async def _pong(ws: web.WebSocketResponse, data: str) -> bool:
+    """클라이언트 PING 응답. PING 이었으면 True."""
+    if data == "PING":
+        await ws.send_str("PONG")
+        return True
+    return False
+
+
+async def ws_market(request: web.Request) -> web.WebSocketResponse:
+    world = request.app[WORLD]
+    hub   = request.app[HUB]
+    ws    = web.WebSocketResponse()
+    await ws.prepare(request)
+    hub.market[ws] = set()
+    try:
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                break
+            if await _pong(ws, msg.data):
+                continue
+            try:
+                req = json.loads(msg.data)
+            except json.JSONDecodeError:
+                continue
+            assets = {a for a in req.get("assets_ids") or [] if a in world.books}
+            if req.get("operation") == "unsubscribe":
+                hub.market[ws] -= assets
+                continue
+            new = assets - hub.market[ws]
+            hub.market[ws] |= assets
+            if new:    # 구독 시 book 스냅샷
+                await _send(ws, [world.book_event(a) for a in sorted(new)])
+    finally:
+        hub.market.pop(ws, None)
+    return ws
+
+
+async def ws_user(request: web.Request) -> web.WebSocketResponse:
+    hub = request.app[HUB]
+    ws  = web.WebSocketResponse()
+    await ws.prepare(request)
+    hub.user[ws] = set()
+    try:
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                break
+            if await _pong(ws, msg.data):
+                continue
+            try:
+                req = json.loads(msg.data)
+            except json.JSONDecodeError:
+                continue
+            markets = set(req.get("markets") or [])
+            if req.get("operation") == "unsubscribe":
+                hub.user[ws] -= markets
+            else:
+                hub.user[ws] |= markets
+    finally:
+        hub.user.pop(ws, None)
+    return ws
+
+
+# ── sports WebSocket ─────────────────────────────────────────
+
+async def ws_sports(request: web.Request) -> web.WebSocketResponse:
+    hub = request.app[HUB]
+    ws  = web.WebSocketResponse()
+    await ws.prepare(request)
+    hub.sports.add(ws)
+
+    async def ping() -> None:
+        while not ws.closed:
+            await asyncio.sleep(SPORTS_PING_SEC)
+            await _send_text(ws, "ping")
+
+    pinger = asyncio.create_task(ping())
+    try:
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                break
+    finally:
+        pinger.cancel()
+        hub.sports.discard(ws)
+    return ws
+
+
+async def _send_text(ws: web.WebSocketResponse, text: str) -> None:
+    try:
+        await ws.send_str(text)
+    except (ConnectionError, RuntimeError):
+        pass
+
+
+# ── Odds API / Telegram ──────────────────────────────────────
+
+async def odds_sports(request: web.Request) -> web.Response:
+    world = request.app[WORLD]
+    if not request.query.get("apiKey"):
+        return web.json_response({"message": "API key is missing"}, status=401)
+    if world.credits <= 0:
+        return web.json_response({"message": "Usage quota has been reached"}, status=401,
+                                 headers={"x-requests-remaining": "0", "x-requests-used": str(world.credits_used)})
+    games = world.odds()
+    return web.json_response(games, headers={
+        "x-requests-remaining": str(world.credits),
+        "x-requests-used":      str(world.credits_used),
+        "x-requests-last":      "1",
+    })
+
+
+async def telegram_send(request: web.Request) -> web.Response:
+    world = request.app[WORLD]
+    body  = await request.json()
+    world.messages.append(body)
+    world.stats["messages"] += 1
+    return web.json_response({"ok": True, "result": {"message_id": len(world.messages)}})
+
+
+# ── 제어 ─────────────────────────────────────────────────────
+
+async def sim_stats(request: web.Request) -> web.Response:
+    world = request.app[WORLD]
+    return web.json_response({
+        **world.stats,
+        "credits_remaining": world.credits,
+        "open_games":        len(world.open_games()),
+        "ws_market":         len(request.app[HUB].market),
+        "ws_user":           len(request.app[HUB].user),
+        "ws_sports":         len(request.app[HUB].sports),
+    })
+
+
+async def sim_faults(request: web.Request) -> web.Response:
+    faults: dict[str, Faults] = request.app[FAULTS]
+    if request.method == "POST":
+        try:
+            for service, values in (await request.json()).items():
+                faults[service].update(values)
+        except (KeyError, ValueError, AttributeError) as e:
+            return web.json_response({"error": str(e)}, status=400)
+    return web.json_response({name: f.settings() for name, f in faults.items()})
+
+
+# ── 앱 구성 ──────────────────────────────────────────────────
+
+def build_app(
+    world:    World,
+    faults:   dict[str, Faults] | None = None,
+    tick_sec: float = SIM_TICK_SEC,
+    seed:     int = 0,
+) -> web.Application:
+    """서비스별 하위 앱(장애 주입 미들웨어 포함) + 제어 경로 + 틱 태스크."""
+    faults = {name: (faults or {}).get(name) or Faults() for name in SERVICES}
+    rng    = random.Random(seed)
+    app    = web.Application()
+    app[WORLD]  = world
+    app[FAULTS] = faults
+    app[HUB]    = _Hub()
+
+    routes = {
+        "gamma":    [web.get("/events", gamma_events)],
+        "clob": [
+            web.get("/book", clob_book),
+            web.post("/books", clob_books),
+            web.get("/tick-size", clob_tick_size),
+            web.get("/neg-risk", clob_neg_risk),
+            web.get("/fee-rate", clob_fee_rate),
+            web.post("/order", clob_order),
+            web.get("/ws/market", ws_market),
+            web.get("/ws/user", ws_user),
+        ],
+        "odds":     [web.get("/v4/sports/{sport}/odds", odds_sports)],
+        "telegram": [web.post("/bot{token}/sendMessage", telegram_send)],
+        "sports":   [web.get("/ws", ws_sports)],
+    }
+    for name, service_routes in routes.items():
+        sub = web.Application(middlewares=[middleware(name, faults[name], world.stats, rng)])
+        sub[WORLD], sub[HUB] = world, app[HUB]
+        sub.add_routes(service_routes)
+        app.add_subapp(f"/{name}", sub)
+    app.add_routes([web.get("/sim/stats", sim_stats), web.route("*", "/sim/faults", sim_faults)])
+
+    async def ticker(app: web.Application):
+        async def loop() -> None:
+            while True:
+                await asyncio.sleep(tick_sec)
+                await app[HUB].dispatch(world.tick())
+
+        task = asyncio.create_task(loop()) if tick_sec > 0 else None
+        yield
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def close_ws(app: web.Application) -> None:
+        await app[HUB].close()
+
+    app.cleanup_ctx.append(ticker)
+    app.on_shutdown.append(close_ws)
+    return app
+
+
+async def start(app: web.Application, host: str = SIM_HOST, port: int = SIM_PORT) -> tuple[web.AppRunner, str]:
+    """서버 시작 → (runner, 기본 주소). port=0 이면 빈 포트 자동 선택. 종료는 runner.cleanup()."""
+    runner = web.AppRunner(app, handle_signals=False, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound = runner.addresses[0][1]
+    url   = f"http://{host}:{bound}"
+    log.info(f"[sim] 시뮬레이터 시작: {url} (경기 {len(app[WORLD].games)}개)")
+    return runner, url
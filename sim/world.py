@@ -0,0 +1,382 @@
+"""
+sim/world.py - 시뮬레이터 상태 (경기 / 마켓 / 오더북 / 주문 / 크레딧 / 알림)
+
+서버(sim/servers.py)가 공유하는 단일 상태. 네트워크와 무관한 순수 로직 — 이벤트는 반환만 하고
+WebSocket 전송은 서버가 담당. 시드 고정 → 같은 설정이면 같은 경기 / 가격.
+
+  경기:   markets 개, 시작 시각 지금 + start_hrs 구간 균등 분포 (기본: 진입 창 안)
+          팀명 "Sim Home 0001" / "Sim Away 0001" — 팀 매핑 없이 matcher 부분 문자열 매칭 성립
+          Pinnacle 정배 배당 1.25~1.55, 폴리마켓 호가 = 공정 확률 ± 노이즈 (5단계, 0.01 tick)
+          gap_ratio 비율은 정배 토큰 ask 를 공정 확률보다 0.16~0.30 낮게 (배당 역전 기회)
+  틱:     무작위 호가 변경 → price_change / 예상 종료 지난 경기 결과 확정
+          (승리 토큰 bid 0.99, 패배 0.01) → book + market_resolved + sport_result
+  주문:   FOK — core/paper.simulate_fok 와 같은 worst-price 규칙으로 판정 후 호가 소진,
+          체결 시 user 채널 trade MATCHED → confirm_delay 후 CONFIRMED
+  크레딧: Odds API 호출당 1 차감 (x-requests-remaining / x-requests-used)
+"""
+
+import json
+import random
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from config import (
+    DEFAULT_GAME_LENGTH_MIN, GAME_LENGTH_MIN, ODDS_SPORT, SPORTS_WS_LEAGUES,
+    SIM_CREDITS, SIM_GAP_RATIO, SIM_MARKETS, SIM_SEED, SIM_TICK_CHANGES,
+)
+from core.paper import simulate_fok
+
+TICK   = 0.01
+LEVELS = 5
+
+Event = tuple[str, dict]                 # (채널 "market" / "user" / "sports", 이벤트)
+
+
+def _ms(now: float | None = None) -> str:
+    return str(int((time.time() if now is None else now) * 1000))
+
+
+def _px(price: float) -> float:
+    return round(min(0.99, max(0.01, price)), 2)
+
+
+@dataclass
+class Book:
+    """토큰 1개 오더북 {가격: 수량}."""
+    bids: dict[float, float] = field(default_factory=dict)
+    asks: dict[float, float] = field(default_factory=dict)
+
+    def best_bid(self) -> float | None:
+        return max(self.bids) if self.bids else None
+
+    def best_ask(self) -> float | None:
+        return min(self.asks) if self.asks else None
+
+    def levels(self) -> dict:
+        """CLOB REST /book 정렬 (bids 오름차순, asks 내림차순 — 최우선 호가가 마지막)."""
+        return {
+            "bids": [{"price": f"{p:.2f}", "size": f"{s:.2f}"} for p, s in sorted(self.bids.items())],
+            "asks": [{"price": f"{p:.2f}", "size": f"{s:.2f}"} for p, s in sorted(self.asks.items(), reverse=True)],
+        }
+
+
+@dataclass
+class SimGame:
+    """경기 1개 = Odds API 경기 + Gamma 마켓 + YES / NO 토큰."""
+    idx:          int
+    start:        datetime
+    home_odds:    float
+    away_odds:    float
+    winner:       str | None = None      # 결과 확정 시 승리 토큰
+
+    @property
+    def game_id(self) -> str:
+        return f"sim{self.idx:05d}"
+
+    @property
+    def condition_id(self) -> str:
+        return f"0xsim{self.idx:060d}"
+
+    @property
+    def home(self) -> str:
+        return f"Sim Home {self.idx:04d}"
+
+    @property
+    def away(self) -> str:
+        return f"Sim Away {self.idx:04d}"
+
+    @property
+    def question(self) -> str:
+        return f"{self.home} vs. {self.away}"
+
+    @property
+    def yes_token(self) -> str:
+        return f"{9_000_000_000 + self.idx * 2}"
+
+    @property
+    def no_token(self) -> str:
+        return f"{9_000_000_000 + self.idx * 2 + 1}"
+
+    @property
+    def home_prob(self) -> float:
+        """배당 마진 제거한 홈팀 공정 확률."""
+        h, a = 1 / self.home_odds, 1 / self.away_odds
+        return h / (h + a)
+
+
+class World:
+    """시뮬레이터 전체 상태."""
+
+    def __init__(
+        self,
+        markets:       int   = SIM_MARKETS,
+        seed:          int   = SIM_SEED,
+        gap_ratio:     float = SIM_GAP_RATIO,
+        credits:       int   = SIM_CREDITS,
+        start_hrs:     tuple[float, float] = (1.5, 23.0),
+        tick_changes:  int   = SIM_TICK_CHANGES,
+        confirm_delay: float = 2.0,
+    ):
+        self.rng           = random.Random(seed)
+        self.credits       = credits
+        self.credits_used  = 0
+        self.tick_changes  = tick_changes
+        self.confirm_delay = confirm_delay
+        self.stats: Counter[str] = Counter()
+        self.messages: list[dict] = []          # 수신한 텔레그램 sendMessage
+        self.games:    list[SimGame] = []
+        self.by_token: dict[str, SimGame] = {}
+        self.books:    dict[str, Book] = {}
+
+        now    = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        gapped = set(self.rng.sample(range(markets), round(markets * gap_ratio)))
+        for idx in range(markets):
+            fav_odds = round(self.rng.uniform(1.25, 1.55), 3)
+            dog_odds = round(1 / max(0.05, 1.03 - 1 / fav_odds), 3)
+            home_fav = self.rng.random() < 0.6
+            game = SimGame(
+                idx       = idx,
+                start     = now + timedelta(hours=self.rng.uniform(*start_hrs)),
+                home_odds = fav_odds if home_fav else dog_odds,
+                away_odds = dog_odds if home_fav else fav_odds,
+            )
+            self.games.append(game)
+            self.by_token[game.yes_token] = self.by_token[game.no_token] = game
+            fair = game.home_prob
+            if idx in gapped:    # 정배 토큰을 싸게 (갭 0.16~0.30)
+                gap  = self.rng.uniform(0.16, 0.30)
+                fair = fair - gap if home_fav else fair + gap
+            else:
+                fair += self.rng.uniform(-0.03, 0.03)
+            self.books[game.yes_token] = self._seed_book(fair)
+            self.books[game.no_token]  = self._seed_book(1 - fair)
+
+    def _seed_book(self, mid: float) -> Book:
+        mid  = min(0.97, max(0.03, mid))
+        book = Book()
+        ask  = _px(mid + TICK)
+        bid  = _px(ask - TICK * self.rng.randint(1, 3))
+        for i in range(LEVELS):
+            if ask + i * TICK <= 0.99:
+                book.asks[_px(ask + i * TICK)] = round(self.rng.uniform(40, 400), 2)
+            if bid - i * TICK >= 0.01:
+                book.bids[_px(bid - i * TICK)] = round(self.rng.uniform(40, 400), 2)
+        return book
+
+    # ── REST 응답 본문 ───────────────────────────────────────
+
+    def open_games(self, now: datetime | None = None) -> list[SimGame]:
+        """결과 미확정 + 시작 전 경기 (Gamma / Odds API 노출 대상)."""
+        now = now or datetime.now(timezone.utc)
+        return [g for g in self.games if g.winner is None and g.start > now]
+
+    def gamma_events(self, offset: int, limit: int) -> list[dict]:
+        """Gamma /events 페이지."""
+        return [
+            {
+                "id":    str(g.idx),
+                "slug":  f"sim-{g.idx:04d}",
+                "title": g.question,
+                "markets": [{
+                    "question":        g.question,
+                    "conditionId":     g.condition_id,
+                    "gameStartTime":   g.start.strftime("%Y-%m-%d %H:%M:%S+00"),
+                    "acceptingOrders": True,
+                    "outcomes":        json.dumps([g.home, g.away]),
+                    "clobTokenIds":    json.dumps([g.yes_token, g.no_token]),
+                }],
+            }
+            for g in self.open_games()[offset:offset + limit]
+        ]
+
+    def odds(self) -> list[dict]:
+        """Odds API /sports/{sport}/odds (Pinnacle h2h). 호출당 크레딧 1 차감."""
+        self.credits      = max(0, self.credits - 1)
+        self.credits_used += 1
+        return [
+            {
+                "id":            g.game_id,
+                "sport_key":     ODDS_SPORT,
+                "commence_time": g.start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "home_team":     g.home,
+                "away_team":     g.away,
+                "bookmakers": [{
+                    "key": "pinnacle",
+                    "markets": [{
+                        "key": "h2h",
+                        "outcomes": [
+                            {"name": g.home, "price": g.home_odds},
+                            {"name": g.away, "price": g.away_odds},
+                        ],
+                    }],
+                }],
+            }
+            for g in self.open_games()
+        ]
+
+    def book(self, token_id: str) -> dict | None:
+        """CLOB /book 응답 (없는 토큰이면 None)."""
+        book = self.books.get(token_id)
+        if book is None:
+            return None
+        game = self.by_token[token_id]
+        return {
+            "market":    game.condition_id,
+            "asset_id":  token_id,
+            "timestamp": _ms(),
+            "hash":      f"{hash((token_id, tuple(book.asks.items()))) & 0xffffffff:08x}",
+            **book.levels(),
+        }
+
+    def book_event(self, token_id: str) -> dict:
+        """market 채널 book 스냅샷 이벤트."""
+        return dict(self.book(token_id), event_type="book")
+
+    # ── 주문 ─────────────────────────────────────────────────
+
+    def place_order(self, body: dict) -> tuple[dict, list[tuple[float, Event]]]:
+        """POST /order (FOK 매수). (응답, [(지연 초, user 채널 이벤트)]) 반환.
+
+        body: py-clob-client post_order 형식 {"order": {tokenId, makerAmount, takerAmount, side}, ...}
+        BUY: makerAmount = USDC × 1e6, takerAmount = 수량 × 1e6 → worst price = maker / taker.
+        """
+        self.stats["orders"] += 1
+        order    = body.get("order") or {}
+        order_id = f"0x{uuid.uuid4().hex}"
+        token_id = str(order.get("tokenId", ""))
+        book     = self.books.get(token_id)
+        try:
+            usdc   = int(order["makerAmount"]) / 1e6
+            shares = int(order["takerAmount"]) / 1e6
+        except (KeyError, TypeError, ValueError):
+            return {"success": False, "errorMsg": "invalid order", "orderID": "", "status": ""}, []
+        if book is None or str(order.get("side", "BUY")) not in ("BUY", "0") or shares <= 0:
+            return {"success": False, "errorMsg": "invalid order", "orderID": "", "status": ""}, []
+
+        fill = simulate_fok(book.levels(), usdc, usdc / shares)
+        if fill is None or self.by_token[token_id].winner is not None:
+            self.stats["killed"] += 1
+            return {
+                "success": False, "orderID": order_id, "status": "unmatched",
+                "errorMsg": "order couldn't be fully filled. FOK orders are fully filled or killed.",
+            }, []
+
+        price, filled = fill
+        self._consume(book, filled)
+        self.stats["fills"] += 1
+        trade = {
+            "event_type":     "trade",
+            "id":             uuid.uuid4().hex,
+            "taker_order_id": order_id,
+            "market":         self.by_token[token_id].condition_id,
+            "asset_id":       token_id,
+            "side":           "BUY",
+            "price":          f"{price:.6f}",
+            "size":           f"{filled:.6f}",
+            "maker_orders":   [],
+        }
+        return (
+            {
+                "success": True, "errorMsg": "", "orderID": order_id, "status": "matched",
+                "makingAmount": f"{usdc:.6f}", "takingAmount": f"{filled:.6f}",
+            },
+            [
+                (0.0,                dict(trade, status="MATCHED")),
+                (self.confirm_delay, dict(trade, status="CONFIRMED")),
+            ],
+        )
+
+    @staticmethod
+    def _consume(book: Book, shares: float) -> None:
+        for price in sorted(book.asks):
+            take = min(shares, book.asks[price])
+            book.asks[price] -= take
+            shares -= take
+            if book.asks[price] <= 1e-9:
+                del book.asks[price]
+            if shares <= 1e-9:
+                break
+
+    # ── 시간 경과 ────────────────────────────────────────────
+
+    def tick(self, now: float | None = None) -> list[Event]:
+        """호가 변동 + 종료 경기 결과 확정. 발생한 이벤트 목록 반환."""
+        now    = time.time() if now is None else now
+        events: list[Event] = []
+        live   = [g for g in self.games if g.winner is None]
+        length = timedelta(minutes=GAME_LENGTH_MIN.get(ODDS_SPORT, DEFAULT_GAME_LENGTH_MIN))
+        for game in live:
+            if game.start + length <= datetime.fromtimestamp(now, timezone.utc):
+                events += self.resolve(game, now=now)
+
+        changes: dict[str, list[dict]] = {}
+        for _ in range(self.tick_changes if live else 0):
+            game     = self.rng.choice(live)
+            token_id = self.rng.choice((game.yes_token, game.no_token))
+            change   = self._jiggle(token_id)
+            if change is not None:
+                changes.setdefault(game.condition_id, []).append(change)
+        for market, price_changes in changes.items():
+            events.append(("market", {
+                "event_type":    "price_change",
+                "market":        market,
+                "price_changes": price_changes,
+                "timestamp":     _ms(now),
+            }))
+        self.stats["ticks"] += 1
+        return events
+
+    def _jiggle(self, token_id: str) -> dict | None:
+        """호가 1단계 수량 변경 / 추가 / 삭제 (교차 없이)."""
+        book = self.books[token_id]
+        buy  = self.rng.random() < 0.5
+        side = book.bids if buy else book.asks
+        if not side:
+            return None
+        price = _px(self.rng.choice(list(side)) + self.rng.choice((-TICK, 0.0, TICK)))
+        if buy and book.asks and price >= min(book.asks):
+            return None
+        if not buy and book.bids and price <= max(book.bids):
+            return None
+        size = 0.0 if len(side) > 2 and self.rng.random() < 0.2 else round(self.rng.uniform(20, 400), 2)
+        if size:
+            side[price] = size
+        else:
+            side.pop(price, None)
+        return {"asset_id": token_id, "price": f"{price:.2f}", "size": f"{size:.2f}",
+                "side": "BUY" if buy else "SELL"}
+
+    def resolve(self, game: SimGame, home_wins: bool | None = None, now: float | None = None) -> list[Event]:
+        """경기 결과 확정 (미지정 시 공정 확률로 추첨) → 호가 수렴 + 결과 이벤트."""
+        if home_wins is None:
+            home_wins = self.rng.random() < game.home_prob
+        winner, loser = (game.yes_token, game.no_token) if home_wins else (game.no_token, game.yes_token)
+        game.winner = winner
+        self.books[winner] = Book(bids={0.99: 10_000.0}, asks={})
+        self.books[loser]  = Book(bids={0.01: 10_000.0}, asks={0.02: 10_000.0})
+        self.stats["resolved"] += 1
+        ts = _ms(now)
+        return [
+            ("market", self.book_event(winner)),
+            ("market", self.book_event(loser)),
+            ("market", {
+                "event_type":       "market_resolved",
+                "market":           game.condition_id,
+                "question":         game.question,
+                "assets_ids":       [game.yes_token, game.no_token],
+                "winning_asset_id": winner,
+                "winning_outcome":  game.home if home_wins else game.away,
+                "timestamp":        ts,
+            }),
+            ("sports", {
+                "gameId":             game.idx,
+                "leagueAbbreviation": SPORTS_WS_LEAGUES[0],
+                "slug":               f"sim-{game.idx:04d}",
+                "status":             "Final",
+                "ended":              True,
+                "score":              "110-100" if home_wins else "100-110",
+            }),
+        ]
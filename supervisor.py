@@ -0,0 +1,307 @@
+"""
+supervisor.py - 멀티 프로세스 실행 진입점 (샤드별 폴링 워커 + 정산 워커)
+
+단일 프로세스(main.py)는 스캔 / 서명 CPU 작업과 피드 처리가 이벤트 루프 1개를 공유.
+샤드(config.SHARDS — 종목 / 마켓 그룹)마다 폴링 워커 프로세스를 따로 띄워 분리.
+
+  [shared]       BaseManager 서버 — DB / PositionBook / CreditLedger / 중단 플래그 소유 (core/shared.py)
+  [settle]       정산 워커 1개 — Monitor + 주문 추적 + WebSocket 피드 + 텔레그램 아웃박스 + 스냅샷 정리
+  [sport:<키>]   샤드별 폴링 워커 — 수집 → 조회 → 매핑 → 스캔 → 실행 (main.polling_loop)
+
+  - 한도:    MAX_POSITIONS / 중복 체크는 공유 PositionBook.reserve() 로 전 워커 합산
+             Odds API 크레딧 / 일일 호출 수는 공유 CreditLedger 로 합산
+             REST 속도 제한은 워커마다 한도의 1/(워커 수) 만 사용 (Governor share)
+  - 알림:    폴링 워커의 notify_* → Queue → 정산 워커 아웃박스 (전송은 한 곳에서)
+  - 오더북:  supervisor 가 공유 메모리 캐시 생성, 정산 워커 market 채널이 단일 writer,
+             폴링 워커는 직접 읽기 (core/bookcache.py). 구독 요청은 공유 WatchList
+             사전 서명 후보는 폴링 워커가 캐시 best ask 로 주기 재서명 (core/staging.py)
+  - 재시작:  비정상 종료(exit ≠ 0) 워커만 재시작, 대기 SUPERVISOR_RESTART_DELAY 부터 2배씩
+             (SUPERVISOR_STABLE_SEC 이상 살아 있었으면 초기화)
+  - 중단:    정산 워커가 연속 패배 자동 중단 → 중단 플래그 → 폴링 워커 종료 → 전체 종료
+  - 로그:    워커별 logs/bot-<이름>.log (회전 파일 충돌 방지)
+  - 프로파일: supervisor 에 SIGUSR1 → 모든 워커로 전달 (core/profiler.py)
+  - 지표:    정산 워커 METRICS_PORT, 폴링 워커 METRICS_PORT + 1, + 2, … (SHARDS 순서)
+
+사용법:
+  python supervisor.py        (단일 프로세스는 기존대로 python main.py)
+"""
+
+import asyncio
+import logging
+import multiprocessing as mp
+import os
+import signal
+import time
+from dataclasses import dataclass
+
+from dotenv import load_dotenv
+
+from config import (
+    SHARDS, METRICS_PORT, SUPERVISOR_CHECK_INTERVAL, SUPERVISOR_RESTART_DELAY,
+    SUPERVISOR_RESTART_MAX, SUPERVISOR_STABLE_SEC,
+)
+
+load_dotenv()
+log = logging.getLogger(__name__)
+
+SETTLE = "settle"
+
+
+# ── 워커 프로세스 ────────────────────────────────────────────
+
+def _worker_logging(name: str) -> None:
+    from core.logsetup import setup_logging
+    tag = name.replace(":", "-")
+    setup_logging(f"logs/bot-{tag}.log", f"logs/error-{tag}.log")
+
+
+def _shared_init() -> None:
+    """공유 프로세스 초기화 — 종료는 supervisor 가 워커 정리 후 shutdown() 으로."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+    _worker_logging("shared")
+
+
+def _run_worker(name: str, address, authkey: bytes, book_name: str, notify_q, track_q) -> None:
+    """워커 프로세스 진입점 (spawn 대상 — 최상위 함수)."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_logging(name)
+    coro = _settle_worker if name == SETTLE else _sport_worker
+
+    async def run() -> None:
+        from core.profiler import PROFILER
+        task = asyncio.current_task()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+        PROFILER.install_signal()
+        await coro(name, address, authkey, book_name, notify_q, track_q)
+
+    try:
+        asyncio.run(run())
+    except asyncio.CancelledError:
+        log.info(f"[supervisor] {name} 종료 요청")
+
+
+async def _settle_worker(
+    name: str, address, authkey: bytes, book_name: str, notify_q, track_q,
+) -> None:
+    from core import metrics
+    from core.bookcache import BookCache
+    from core.executor import Executor
+    from core.feeds import MarketFeed, SportsFeed
+    from core.governor import Governor
+    from core.monitor import Monitor
+    from core.notifier import install_outbox, notify_auto_stopped, notify_started, notify_stopped
+    from core.order_tracker import OrderTracker
+    from core.outbox import Outbox
+    from core.shared import RemoteDB, connect, drain
+    from core.timeseries import SnapshotRecorder
+    from core.transport import Transport
+    from core.watchdog import LoopWatchdog
+    from main import install_metrics
+
+    manager   = connect(address, authkey)
+    db        = RemoteDB(manager.db())
+    positions = manager.positions()
+    control   = manager.control()
+    tracker   = OrderTracker(db, positions)
+    governor  = Governor(share=1 / (len(SHARDS) + 1))
+    executor  = Executor(db, tracker, positions, governor)    # 주문 없음 — Monitor 포지션 참조용
+    recorder  = SnapshotRecorder(db)
+    watch     = manager.watch()
+    books     = BookCache.attach(book_name, watch)
+    monitor   = Monitor(executor, db, recorder, books)
+    market    = MarketFeed(positions, monitor.on_market_resolved, books, watch, record=recorder.record_book)
+    sports    = SportsFeed(monitor.wake)
+    outbox    = Outbox(db)
+    install_outbox(outbox)
+
+    async with Transport(governor=governor) as http:
+        install_metrics(http, governor, positions)
+        await notify_started(http)
+        background = [
+            asyncio.create_task(c) for c in (
+                tracker.run(http), recorder.run(), market.run(http), sports.run(http),
+                outbox.run(http),
+                drain(notify_q, outbox.put),
+                drain(track_q, lambda item: getattr(tracker, item[0])(*item[1])),    # prepare / track
+                metrics.serve(METRICS_PORT),
+                LoopWatchdog().run(),
+            )
+        ]
+        try:
+            await monitor.run(http)    # 연속 패배 자동 중단 시 반환
+            control.stop("auto_stop")
+            consecutive = await db.aio.count_consecutive_losses()
+            await notify_auto_stopped(http, consecutive, await db.aio.get_stats())
+        except asyncio.CancelledError:
+            await notify_stopped(http, "봇 정상 종료")
+            raise
+        finally:
+            for t in background:
+                t.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+            await outbox.close(http)
+            await recorder.flush()
+            http.log_stats()
+            governor.log_stats()
+            books.close()
+
+
+async def _sport_worker(
+    name: str, address, authkey: bytes, book_name: str, notify_q, track_q,
+) -> None:
+    from core import metrics
+    from core.bookcache import BookCache
+    from core.executor import Executor
+    from core.governor import Governor
+    from core.notifier import install_outbox
+    from core.odds_fetcher import install_ledger
+    from core.shared import QueueOutbox, RemoteDB, RemoteTracker, connect
+    from core.timeseries import SnapshotRecorder
+    from core.transport import Transport
+    from core.watchdog import LoopWatchdog
+    from main import install_metrics, polling_loop
+
+    shard    = name.split(":", 1)[1]
+    manager  = connect(address, authkey)
+    db       = RemoteDB(manager.db())
+    control  = manager.control()
+    governor = Governor(share=1 / (len(SHARDS) + 1))
+    executor = Executor(db, RemoteTracker(track_q), manager.positions(), governor)
+    recorder = SnapshotRecorder(db)
+    books    = BookCache.attach(book_name, manager.watch())
+    install_ledger(manager.ledger())
+    install_outbox(QueueOutbox(notify_q))
+
+    async with Transport(governor=governor) as http:
+        install_metrics(http, governor)
+        await executor.initialize()
+        background = [
+            asyncio.create_task(recorder.run(compact=False)),
+            asyncio.create_task(executor.stager.run(books)),    # 피드 없음 — 공유 캐시로 재서명
+            asyncio.create_task(metrics.serve(METRICS_PORT + 1 + list(SHARDS).index(shard))),
+            asyncio.create_task(LoopWatchdog().run()),
+        ]
+        try:
+            await polling_loop(http, executor, control.stopped, recorder, shard, books)
+        finally:
+            for t in background:
+                t.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+            await recorder.flush()
+            http.log_stats()
+            governor.log_stats()
+            books.close()
+
+
+# ── 감독 루프 ────────────────────────────────────────────────
+
+@dataclass
+class _Slot:
+    """워커 1개 상태 (재시작 대기 포함)."""
+    name:       str
+    proc:       mp.Process | None = None
+    started:    float = 0.0
+    delay:      float = SUPERVISOR_RESTART_DELAY
+    restart_at: float = 0.0
+    done:       bool  = False    # 정상 종료 — 재시작 안 함
+
+
+class Supervisor:
+    """공유 프로세스 + 워커 프로세스 기동 / 감시 / 재시작."""
+
+    def __init__(self):
+        self._ctx     = mp.get_context("spawn")
+        self._authkey = os.urandom(16)
+        self._manager = None
+        self._books   = None
+        self._queues  = ()
+        self._slots   = [_Slot(SETTLE)] + [_Slot(f"sport:{key}") for key in SHARDS]
+        self._stop    = False
+
+    def _spawn(self, slot: _Slot) -> None:
+        slot.proc = self._ctx.Process(
+            target=_run_worker, name=slot.name,
+            args=(slot.name, self._manager.address, self._authkey, self._books.name, *self._queues),
+        )
+        slot.proc.start()
+        slot.started = time.monotonic()
+        log.info(f"[supervisor] {slot.name} 시작 (pid {slot.proc.pid})")
+
+    def _check(self, slot: _Slot, now: float) -> None:
+        if slot.done:
+            return
+        if slot.proc is None:
+            if now >= slot.restart_at:
+                self._spawn(slot)
+            return
+        if slot.proc.is_alive():
+            return
+
+        code, slot.proc = slot.proc.exitcode, None
+        if code == 0:
+            slot.done = True
+            log.info(f"[supervisor] {slot.name} 정상 종료")
+            if slot.name == SETTLE:
+                log.error("[supervisor] 정산 워커 자동 중단 — 전체 종료")
+                self._stop = True
+            return
+        if now - slot.started >= SUPERVISOR_STABLE_SEC:
+            slot.delay = SUPERVISOR_RESTART_DELAY
+        slot.restart_at = now + slot.delay
+        log.error(f"[supervisor] {slot.name} 비정상 종료 (exit {code}) — {slot.delay:.0f}초 후 재시작")
+        slot.delay = min(slot.delay * 2, SUPERVISOR_RESTART_MAX)
+
+    def run(self) -> None:
+        from core.bookcache import BookCache
+        from core.shared import SharedManager
+
+        self._manager = SharedManager(ctx=self._ctx, authkey=self._authkey)
+        self._manager.start(_shared_init)
+        self._books   = BookCache.create()    # 워커 재시작과 무관하게 유지
+        self._queues  = (self._ctx.Queue(), self._ctx.Queue())    # 알림, 주문 추적
+        signal.signal(signal.SIGTERM, lambda *_: setattr(self, "_stop", True))
+        signal.signal(signal.SIGUSR1, lambda *_: self._forward(signal.SIGUSR1))
+        try:
+            while not self._stop and not all(s.done for s in self._slots):
+                now = time.monotonic()
+                for slot in self._slots:
+                    self._check(slot, now)
+                time.sleep(SUPERVISOR_CHECK_INTERVAL)
+        except KeyboardInterrupt:
+            log.info("[supervisor] 종료 요청")
+        finally:
+            self._shutdown()
+
+    def _forward(self, signum: int) -> None:
+        """실행 중인 워커 전체로 시그널 전달 (SIGUSR1 — 프로파일 예약)."""
+        for slot in self._slots:
+            if slot.proc is not None and slot.proc.is_alive():
+                os.kill(slot.proc.pid, signum)
+        log.info(f"[supervisor] 시그널 {signal.Signals(signum).name} → 워커 전달")
+
+    def _shutdown(self) -> None:
+        """폴링 워커 먼저 종료 → 정산 워커(알림 전송 마무리) → 공유 프로세스."""
+        for slot in sorted(self._slots, key=lambda s: s.name == SETTLE):
+            if slot.proc is not None and slot.proc.is_alive():
+                slot.proc.terminate()
+                slot.proc.join(timeout=30)
+                if slot.proc.is_alive():
+                    log.warning(f"[supervisor] {slot.name} 강제 종료")
+                    slot.proc.kill()
+                    slot.proc.join()
+        self._manager.db().close()
+        self._manager.shutdown()
+        self._books.close()
+
+
+def main() -> None:
+    _worker_logging("supervisor")
+    log.info(f"=== polymoly supervisor 시작 — 샤드 {list(SHARDS)} ===")
+    Supervisor().run()
+    log.info("=== supervisor 종료 ===")
+
+
+if __name__ == "__main__":
+    main()
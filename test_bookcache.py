@@ -0,0 +1,229 @@
+"""
+test_bookcache.py - core/bookcache.py 공유 메모리 오더북 캐시 테스트
+
+외부 연결 없이 market 채널 이벤트(book / price_change)를 직접 넣어 검증.
+  - book 스냅샷 / price_change 반영, REST /book 과 같은 정렬 (최우선 호가가 마지막)
+  - 재연결(invalidate) / heartbeat 정지 / 구독 해제(drop) 시 miss
+  - 미보유 토큰 조회 → WatchList 등록, 진입 마감 / 상한 초과 시 해제
+  - 다른 프로세스에서 읽기 (연속 쓰기 중에도 찢어진 호가 없음)
+
+사용법:
+  python test_bookcache.py
+"""
+
+import multiprocessing as mp
+import sys
+import time
+
+import core.bookcache as bookcache
+from core.bookcache import BookCache, WatchList
+
+SEP = "=" * 65
+
+TOKEN = "71321045679252212594626385532706912750332728571942532289631379312455583992563"
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def fail(msg: str) -> None: print(f"  ❌ {msg}")
+
+
+def _book(token_id: str = TOKEN, bid: float = 0.48, ask: float = 0.52) -> dict:
+    return {
+        "event_type": "book",
+        "asset_id":   token_id,
+        "bids": [{"price": str(bid - 0.01), "size": "30"}, {"price": str(bid), "size": "20"}],
+        "asks": [{"price": str(ask + 0.01), "size": "60"}, {"price": str(ask), "size": "25"}],
+    }
+
+
+def _change(token_id: str, side: str, price: float, size: float) -> dict:
+    return {
+        "event_type":    "price_change",
+        "price_changes": [
+            {"asset_id": token_id, "side": side, "price": str(price), "size": str(size)},
+        ],
+    }
+
+
+def _live(slots: int = 8, depth: int = 4, watch: WatchList | None = None) -> BookCache:
+    cache = BookCache.create(watch, slots=slots, depth=depth)
+    cache.heartbeat()
+    return cache
+
+
+# ── 테스트 ───────────────────────────────────────────────────
+
+def test_book_snapshot():
+    cache = _live()
+    try:
+        cache.apply(_book())
+        book = cache.get(TOKEN)
+        assert book is not None, "캐시 miss"
+        assert [float(b["price"]) for b in book["bids"]] == [0.47, 0.48], book
+        assert [float(a["price"]) for a in book["asks"]] == [0.53, 0.52], book
+        assert float(book["asks"][-1]["size"]) == 25.0, book
+    finally:
+        cache.close()
+
+
+def test_price_change():
+    cache = _live()
+    try:
+        cache.apply(_book())
+        cache.apply(_change(TOKEN, "SELL", 0.51, 40))     # 새 최우선 ask
+        cache.apply(_change(TOKEN, "BUY", 0.48, 0))       # 최우선 bid 제거
+        book = cache.get(TOKEN)
+        assert book["asks"][-1] == {"price": "0.51", "size": "40.0"}, book
+        assert float(book["bids"][-1]["price"]) == 0.47, book
+        cache.apply(_change("other", "SELL", 0.5, 10))    # 스냅샷 전 변경분은 무시
+        assert cache.get("other", watch=False) is None
+    finally:
+        cache.close()
+
+
+def test_depth_limit():
+    cache = _live(depth=2)
+    try:
+        cache.apply({
+            "event_type": "book", "asset_id": TOKEN, "bids": [],
+            "asks": [{"price": str(p / 100), "size": "1"} for p in range(50, 60)],
+        })
+        book = cache.get(TOKEN)
+        assert [a["price"] for a in book["asks"]] == ["0.51", "0.5"], book
+    finally:
+        cache.close()
+
+
+def test_invalidate_and_stale():
+    cache = _live()
+    try:
+        cache.apply(_book())
+        cache.invalidate()                                 # 재연결 — 새 세대
+        cache.heartbeat()
+        assert cache.get(TOKEN, watch=False) is None, "이전 세대 호가 사용"
+        cache.apply(_book())
+        assert cache.get(TOKEN, watch=False) is not None
+
+        reader = BookCache.attach(cache.name)
+        try:
+            saved, bookcache.BOOK_CACHE_STALE_SEC = bookcache.BOOK_CACHE_STALE_SEC, 0.05
+            try:
+                time.sleep(0.1)                            # heartbeat 정지
+                assert reader.get(TOKEN) is None, "오래된 캐시 사용"
+            finally:
+                bookcache.BOOK_CACHE_STALE_SEC = saved
+        finally:
+            reader.close()
+    finally:
+        cache.close()
+
+
+def test_drop_and_reuse():
+    cache = _live(slots=2)
+    try:
+        cache.apply(_book("a"))
+        cache.apply(_book("b"))
+        cache.apply(_book("c"))                            # 슬롯 부족 — 기록 안 함
+        assert cache.get("c", watch=False) is None
+        cache.drop("a")
+        assert cache.get("a", watch=False) is None
+        cache.apply(_book("c", ask=0.3))                   # 반납된 슬롯 재사용
+        assert cache.get("c", watch=False)["asks"][-1]["price"] == "0.3"
+        assert cache.get("b", watch=False) is not None
+    finally:
+        cache.close()
+
+
+def test_watch_on_miss():
+    watch = WatchList()
+    cache = _live(watch=watch)
+    try:
+        assert cache.get(TOKEN) is None
+        assert watch.tokens() == {TOKEN}, watch.tokens()
+        assert cache.get("held", watch=False) is None
+        assert "held" not in watch.tokens()
+    finally:
+        cache.close()
+
+
+def test_watch_expiry():
+    watch = WatchList(ttl=3600, limit=2)
+    watch.add("a")
+    watch.add("b", until=time.time() - 1)    # 진입 마감 지남 → 즉시 만료
+    assert watch.tokens() == {"a"}, watch.tokens()
+    watch.add("b")
+    watch.add("a")                           # 재요청 → 가장 최근
+    watch.add("c")                           # 상한 2 → 가장 오래 요청 없던 b 해제
+    assert watch.tokens() == {"a", "c"}, watch.tokens()
+
+
+def _reader(name: str, n: int, out) -> None:
+    cache = BookCache.attach(name)
+    seen = torn = 0
+    for _ in range(n):
+        book = cache.get(TOKEN, watch=False)
+        if book is None:
+            continue
+        seen += 1
+        # 쓰기 측은 bid / ask 를 항상 같은 k 로 기록 → 다르면 찢어진 읽기
+        bid = float(book["bids"][-1]["price"])
+        ask = float(book["asks"][-1]["price"])
+        if round(ask - bid, 6) != 0.5:
+            torn += 1
+    cache.close()
+    out.put((seen, torn))
+
+
+def test_cross_process_reads():
+    cache = _live(depth=10)
+    ctx   = mp.get_context("spawn")
+    out   = ctx.Queue()
+    try:
+        cache.apply(_book(bid=0.0, ask=0.5))
+        proc = ctx.Process(target=_reader, args=(cache.name, 20000, out))
+        proc.start()
+        k = 0
+        while proc.is_alive():
+            k = (k + 1) % 40
+            cache.apply(_book(bid=k / 100, ask=k / 100 + 0.5))
+            cache.heartbeat()
+        seen, torn = out.get(timeout=5)
+        proc.join()
+        assert seen > 0, "다른 프로세스에서 읽지 못함"
+        assert torn == 0, f"찢어진 읽기 {torn}/{seen}"
+    finally:
+        cache.close()
+
+
+TESTS = [
+    test_book_snapshot,
+    test_price_change,
+    test_depth_limit,
+    test_invalidate_and_stale,
+    test_drop_and_reuse,
+    test_watch_on_miss,
+    test_watch_expiry,
+    test_cross_process_reads,
+]
+
+
+def main() -> None:
+    header("core/bookcache.py — 공유 메모리 오더북 캐시 테스트")
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            ok(test.__name__)
+        except Exception as e:
+            failed += 1
+            fail(f"{test.__name__}: {type(e).__name__} {e}")
+    print(f"\n  {len(TESTS) - failed}/{len(TESTS)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+test_checkpoint.py - core/checkpoint.py 웜 스타트 저장 / 복원 테스트
+
+임시 디렉터리에 저장 후 복원 (외부 API 호출 없음).
+  - 경기 / 마켓 / 폴링 일정 왕복, 모의 거래 경로 분리
+  - 진입 마감 지난 경기 / 시작한 마켓 / 지문 불일치 경기 제외
+  - 만료 / 손상 / 다른 샤드 파일 → None (콜드 스타트)
+
+사용법:
+  python test_checkpoint.py
+"""
+
+import json
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import core.checkpoint as checkpoint
+from core.checkpoint import WarmState
+from core.matcher import PolymarketMarket
+from core.odds_fetcher import PinnacleGame
+
+SEP = "=" * 65
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def fail(msg: str) -> None: print(f"  ❌ {msg}")
+
+
+def _game(game_id: str, hours: float, home_odds: float = 1.4) -> PinnacleGame:
+    return PinnacleGame(
+        game_id       = game_id,
+        home_team     = "Miami Heat",
+        away_team     = "Philadelphia 76ers",
+        commence_time = datetime.now(timezone.utc) + timedelta(hours=hours),
+        home_odds     = home_odds,
+        away_odds     = 3.1,
+    )
+
+
+def _market(cid: str, hours: float) -> PolymarketMarket:
+    return PolymarketMarket(
+        condition_id    = cid,
+        question        = "Heat vs. 76ers",
+        game_start_time = datetime.now(timezone.utc) + timedelta(hours=hours),
+        home_short      = "Heat",
+        away_short      = "76ers",
+        yes_token_id    = f"{cid}-yes",
+        no_token_id     = f"{cid}-no",
+    )
+
+
+def _in_tmpdir(test):
+    """CHECKPOINT_PATH 를 임시 디렉터리로 바꿔 실행."""
+    def run():
+        saved = checkpoint.CHECKPOINT_PATH
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint.CHECKPOINT_PATH = str(Path(tmp) / "checkpoint-{shard}.json.z")
+            try:
+                test()
+            finally:
+                checkpoint.CHECKPOINT_PATH = saved
+    run.__name__ = test.__name__
+    return run
+
+
+# ── 테스트 ───────────────────────────────────────────────────
+
+@_in_tmpdir
+def test_round_trip():
+    state = WarmState(
+        shard="nba", resume_at=time.time() + 1800, poll_count=7, credits_warning_sent=True,
+        games=[_game("g1", 5)], markets=[_market("c1", 5)],
+    )
+    assert checkpoint.save(state) > 0
+    got = checkpoint.load("nba")
+    assert got is not None and not got.due, got
+    assert got.poll_count == 7 and got.credits_warning_sent, got
+    assert got.games == state.games, got.games
+    assert got.markets == state.markets, got.markets
+    assert checkpoint.load("mlb") is None, "다른 샤드 파일 사용"
+
+
+@_in_tmpdir
+def test_paper_path():
+    paper = checkpoint.CHECKPOINT_PATH.replace("checkpoint-", "paper-checkpoint-")
+    checkpoint.save(WarmState(shard="nba", poll_count=3, games=[_game("g1", 5)]), paper)
+    assert checkpoint.load("nba") is None, "모의 거래 체크포인트를 실거래가 사용"
+    got = checkpoint.load("nba", paper)
+    assert got is not None and got.poll_count == 3, got
+
+
+@_in_tmpdir
+def test_validation():
+    state = WarmState(
+        shard="nba", resume_at=time.time() - 1,
+        games=[_game("live", 5), _game("closing", 0.5), _game("tampered", 5)],
+        markets=[_market("future", 3), _market("started", -1)],
+    )
+    checkpoint.save(state)
+    path = Path(checkpoint.CHECKPOINT_PATH.format(shard="nba"))
+    payload = json.loads(zlib.decompress(path.read_bytes()))
+    payload["games"][2]["home_odds"] = 1.01    # 지문 불일치
+    path.write_bytes(zlib.compress(json.dumps(payload).encode()))
+
+    got = checkpoint.load("nba")
+    assert got is not None and got.due, got
+    assert [g.game_id for g in got.games] == ["live"], got.games
+    assert [m.condition_id for m in got.markets] == ["future"], got.markets
+
+
+@_in_tmpdir
+def test_expired_or_corrupt():
+    checkpoint.save(WarmState(shard="nba", games=[_game("g1", 5)]))
+    path = Path(checkpoint.CHECKPOINT_PATH.format(shard="nba"))
+    payload = json.loads(zlib.decompress(path.read_bytes()))
+    payload["saved_at"] -= checkpoint.CHECKPOINT_MAX_AGE + 60
+    path.write_bytes(zlib.compress(json.dumps(payload).encode()))
+    assert checkpoint.load("nba") is None, "만료 체크포인트 사용"
+
+    path.write_bytes(b"not zlib")
+    assert checkpoint.load("nba") is None, "손상 파일 사용"
+
+
+TESTS = [
+    test_round_trip,
+    test_paper_path,
+    test_validation,
+    test_expired_or_corrupt,
+]
+
+
+def main() -> None:
+    header("core/checkpoint.py — 웜 스타트 체크포인트 테스트")
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            ok(test.__name__)
+        except Exception as e:
+            failed += 1
+            fail(f"{test.__name__}: {type(e).__name__} {e}")
+    print(f"\n  {len(TESTS) - failed}/{len(TESTS)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
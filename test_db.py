@@ -0,0 +1,229 @@
+"""
+test_db.py - core/db.py SQLite 계층 테스트
+
+임시 DB 로 검증 (외부 연결 없음).
+  - writer 스레드: 여러 스레드 / db.aio 동시 쓰기 → 유실 / 중복 ID 없이 직렬화
+  - db.aio: 쓰기 대기 중에도 이벤트 루프 비차단, 읽기는 WAL 이라 쓰기와 병행
+  - close(): 대기 중인 쓰기 모두 반영 후 종료, 이후 쓰기는 RuntimeError
+  - 마이그레이션: v0 (초기 bets 스키마, user_version 0) DB → 컬럼 보강 + bet_stats 백필
+  - 중복 정산: 같은 베팅 두 번 정산해도 첫 결과 유지, bet_stats 가 전체 재집계와 일치
+
+사용법:
+  python test_db.py
+"""
+
+import asyncio
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+from core.db import _MIGRATIONS, DB
+
+SEP = "=" * 65
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def fail(msg: str) -> None: print(f"  ❌ {msg}")
+
+
+def _bet(i: int) -> dict:
+    return dict(
+        game_id=f"g{i}", event_title=f"Team{i} vs. Team{i + 1}", token_id=f"tok{i}", buy_label="YES",
+        favorite_team=f"Team{i}", pinnacle_odds=1.35, pinnacle_prob=0.741, poly_price=0.55,
+        gap_size=0.19, bet_usdc=10, order_id=f"0x{i:064x}", commence_time="2026-03-02T00:00:00+00:00",
+    )
+
+
+def _stats(path: str) -> dict:
+    with sqlite3.connect(path) as conn:
+        conn.row_factory = sqlite3.Row
+        return dict(conn.execute("SELECT * FROM bet_stats WHERE id=1").fetchone())
+
+
+# ── 테스트 ───────────────────────────────────────────────────
+
+def test_concurrent_writers():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DB(f"{tmp}/positions.db")
+        try:
+            ids: list[int] = []
+            lock = threading.Lock()
+
+            def worker(base: int) -> None:
+                for i in range(base, base + 25):
+                    bet_id = db.insert_bet(**_bet(i))
+                    with lock:
+                        ids.append(bet_id)
+
+            threads = [threading.Thread(target=worker, args=(n * 25,)) for n in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            async def more() -> list[int]:
+                return await asyncio.gather(*(db.aio.insert_bet(**_bet(200 + i)) for i in range(50)))
+
+            ids += asyncio.run(more())
+            assert len(ids) == len(set(ids)) == 250, len(set(ids))
+            assert len(db.get_pending_bets()) == 250
+            assert db.get_stats()["total"] == db.get_stats()["pending"] == 250, db.get_stats()
+        finally:
+            db.close()
+
+
+def test_aio_does_not_block():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DB(f"{tmp}/positions.db")
+        try:
+            slow = threading.Event()
+            db._write(lambda conn: slow.wait(2))    # writer 를 점유한 느린 쓰기
+
+            async def run() -> int:
+                ticks = 0
+
+                async def ticker() -> None:
+                    nonlocal ticks
+                    while True:
+                        await asyncio.sleep(0.01)
+                        ticks += 1
+
+                task = asyncio.create_task(ticker())
+                write = asyncio.create_task(db.aio.insert_bet(**_bet(1)))
+                await asyncio.sleep(0.2)
+                assert not write.done(), "writer 점유 중 쓰기 완료"
+                assert await db.aio.get_pending_bets() == [], "읽기가 쓰기 대기에 막힘"
+                slow.set()
+                await write
+                task.cancel()
+                return ticks
+
+            assert asyncio.run(run()) >= 10, "쓰기 대기 중 이벤트 루프 정지"
+            assert len(db.get_pending_bets()) == 1
+        finally:
+            slow.set()
+            db.close()
+
+
+def test_close_drains():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = f"{tmp}/positions.db"
+        db   = DB(path)
+        gate = threading.Event()
+        db._write(lambda conn: gate.wait(2))
+        futures = [db._write(lambda conn, i=i: conn.execute(
+            "INSERT INTO outbox (text, created_at) VALUES (?, ?)", (f"m{i}", "now"),
+        )) for i in range(20)]
+        closer = threading.Thread(target=db.close)
+        closer.start()
+        time.sleep(0.05)
+        gate.set()
+        closer.join(5)
+        assert all(f.done() for f in futures)
+        with sqlite3.connect(path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0] == 20
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        try:
+            db.insert_bet(**_bet(1))
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("종료 후 쓰기 허용")
+
+
+def test_migrate_v0():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = f"{tmp}/positions.db"
+        with sqlite3.connect(path) as conn:    # 체결 추적 / 롤업 이전 스키마
+            conn.execute("""
+                CREATE TABLE bets (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, game_id TEXT NOT NULL, event_title TEXT NOT NULL,
+                    token_id TEXT NOT NULL, buy_label TEXT NOT NULL, favorite_team TEXT NOT NULL,
+                    pinnacle_odds REAL NOT NULL, pinnacle_prob REAL NOT NULL, poly_price REAL NOT NULL,
+                    gap_size REAL NOT NULL, bet_usdc REAL NOT NULL, order_id TEXT,
+                    commence_time TEXT NOT NULL, bet_at TEXT NOT NULL, outcome TEXT DEFAULT 'pending',
+                    pnl_usdc REAL DEFAULT NULL, settled_at TEXT DEFAULT NULL
+                )
+            """)
+            conn.executemany(
+                """
+                INSERT INTO bets (game_id, event_title, token_id, buy_label, favorite_team, pinnacle_odds,
+                                  pinnacle_prob, poly_price, gap_size, bet_usdc, order_id, commence_time,
+                                  bet_at, outcome, pnl_usdc, settled_at)
+                VALUES ('g', 'A vs. B', ?, 'YES', 'A', 1.35, 0.741, 0.55, 0.19, 10, ?, 'c', '2026-03-01', ?, ?, ?)
+                """,
+                [("t1", "o1", "win", 8.0, "2026-03-01"), ("t2", "o2", "loss", -10.0, "2026-03-02"),
+                 ("t3", "o3", "pending", None, None)],
+            )
+
+        db = DB(path)
+        try:
+            bet_id = db.insert_bet(**_bet(4), condition_id="0xc")
+            assert db.get_stats() == {"total": 4, "wins": 1, "losses": 1, "pending": 2, "total_pnl": -2.0}, \
+                db.get_stats()
+            assert db.count_consecutive_losses() == 1
+            assert [b["id"] for b in db.get_pending_bets()] == [3, bet_id]
+        finally:
+            db.close()
+        with sqlite3.connect(path) as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == len(_MIGRATIONS)
+            cols = {r[1] for r in conn.execute("PRAGMA table_info(bets)")}
+            assert {"condition_id", "fill_status", "fill_price", "fill_size", "sport"} <= cols, cols
+        DB(path).close()    # 재실행 시 마이그레이션 없음 (멱등)
+
+
+def test_double_settle():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = f"{tmp}/positions.db"
+        db   = DB(path)
+        try:
+            a, b, c = (db.insert_bet(**_bet(i)) for i in range(3))
+            db.settle_bet(a, "loss", -10.0)
+            db.settle_bet(a, "win", 8.0)                              # 중복 정산 → 무시
+            db.settle_many([(b, "win", 8.0), (b, "loss", -10.0)])    # 같은 배치 안 중복
+            db.void_bet(c)
+            db.settle_bet(c, "win", 8.0)                              # 무효 후 정산 → 무시
+
+            with sqlite3.connect(path) as conn:
+                rows = conn.execute("SELECT id, outcome, pnl_usdc FROM bets ORDER BY id").fetchall()
+                assert rows == [(a, "loss", -10.0), (b, "win", 8.0), (c, "void", 0.0)], rows
+                assert conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 2
+            rolled = _stats(path)
+            db.rebuild_stats()
+            assert rolled == _stats(path), (rolled, _stats(path))
+            assert db.get_stats() == {"total": 3, "wins": 1, "losses": 1, "pending": 0, "total_pnl": -2.0}
+        finally:
+            db.close()
+
+
+TESTS = [
+    test_concurrent_writers,
+    test_aio_does_not_block,
+    test_close_drains,
+    test_migrate_v0,
+    test_double_settle,
+]
+
+
+def main() -> None:
+    header("core/db.py — SQLite 계층 테스트")
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            ok(test.__name__)
+        except Exception as e:
+            failed += 1
+            fail(f"{test.__name__}: {type(e).__name__} {e}")
+    print(f"\n  {len(TESTS) - failed}/{len(TESTS)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
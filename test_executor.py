@@ -19,11 +19,12 @@ import ssl
 import sys
 from datetime import datetime, timezone
 
-import aiohttp
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from core.transport import Transport
+
 SEP = "=" * 65
 SUB = "-" * 65
 
@@ -38,11 +39,11 @@ def info(msg: str) -> None: print(f"  ℹ️  {msg}")
 def fail(msg: str) -> None: print(f"  ❌ {msg}")
 
 
-def _make_connector() -> aiohttp.TCPConnector:
+def _insecure_ssl() -> ssl.SSLContext:
     ctx = ssl.create_default_context()
     ctx.check_hostname = False
     ctx.verify_mode    = ssl.CERT_NONE
-    return aiohttp.TCPConnector(ssl=ctx)
+    return ctx
 
 
 # ── [1] CLOB 클라이언트 초기화 ──────────────────────────────
@@ -125,13 +126,13 @@ async def test_credentials(client) -> dict | None:
 
 # ── [2] NBA 마켓 조회 ────────────────────────────────────────
 
-async def test_markets(session: aiohttp.ClientSession):
+async def test_markets(http: Transport):
     from core.matcher import fetch_nba_poly_markets
 
     header("[2] Gamma API — NBA 마켓 조회")
 
     try:
-        markets = await fetch_nba_poly_markets(session)
+        markets = await fetch_nba_poly_markets(http)
     except Exception as e:
         fail(f"Gamma API 오류: {e}")
         return []
@@ -156,13 +157,11 @@ async def test_markets(session: aiohttp.ClientSession):
 # ── [3] 오더북 조회 + 매수 후보 선정 ────────────────────────
 
 async def select_target(
-    session: aiohttp.ClientSession,
+    http: Transport,
     client,
     markets,
 ) -> dict | None:
     """마켓별 CLOB 오더북 조회 → 매수 후보 1개 선정."""
-    from config import CLOB_HOST
-
     header("[3] CLOB 오더북 — 매수 후보 선정")
 
     print(f"  {'마켓':<40} {'토큰':<5} {'ask':>7} {'유동성':>9}  tick  neg_risk")
@@ -174,12 +173,7 @@ async def select_target(
         for label, token_id in [("YES", m.yes_token_id), ("NO", m.no_token_id)]:
             # 오더북 조회
             try:
-                async with session.get(
-                    f"{CLOB_HOST}/book",
-                    params={"token_id": token_id},
-                ) as resp:
-                    resp.raise_for_status()
-                    book = await resp.json()
+                book = await http.clob.get_json("/book", params={"token_id": token_id})
             except Exception as e:
                 print(f"  {m.question:<40}  오더북 오류: {e}")
                 continue
@@ -341,7 +335,7 @@ async def main(confirm: bool, amount: float) -> None:
         fail("클라이언트 초기화 실패 — .env 확인")
         return
 
-    async with aiohttp.ClientSession(connector=_make_connector()) as session:
+    async with Transport(ssl=_insecure_ssl()) as http:
 
         # [1] 자격증명 확인
         cred_info = await test_credentials(client)
@@ -356,12 +350,12 @@ async def main(confirm: bool, amount: float) -> None:
                 warn("allowance 미설정 — 주문이 거부될 수 있음")
 
         # [2] 마켓 조회
-        markets = await test_markets(session)
+        markets = await test_markets(http)
         if not markets:
             return
 
         # [3] 매수 후보 선정
-        target = await select_target(session, client, markets)
+        target = await select_target(http, client, markets)
         if target is None:
             return
 
@@ -0,0 +1,169 @@
+"""
+test_export.py - core/export.py 컬럼형 내보내기 / P&L 집계 테스트
+
+임시 DB 로 검증 (pyarrow / numpy 필요 — 미설치 시 건너뜀).
+  - 날짜 파티션: bets(bet_at) / results(settled_at) / 스냅샷(ts UTC) 별 디렉터리 + 행 수
+  - 증분(--since): 해당 날짜 이후 파티션만 다시 씀, DB 에서 사라진 날짜는 삭제
+  - Arrow IPC 로드: 메모리 매핑 (Arrow 메모리 풀 할당 없음) + NumPy zero-copy 변환
+  - pnl_report: 갭 티어 × 배당 구간별 n / 승패 / P&L / ROI (void 제외)
+
+사용법:
+  python test_export.py
+"""
+
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from core.db import DB
+from core.export import export, load, pa, pnl_report
+
+SEP  = "=" * 65
+DAY1 = int(datetime(2026, 3, 1, 12, tzinfo=timezone.utc).timestamp())
+DAY2 = DAY1 + 86400
+DAY3 = DAY2 + 86400
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def fail(msg: str) -> None: print(f"  ❌ {msg}")
+
+
+def _bet(db: DB, i: int, gap: float, odds: float, usdc: float) -> int:
+    return db.insert_bet(
+        game_id=f"g{i}", event_title=f"Team{i} vs. Team{i + 1}", token_id=f"tok{i}",
+        buy_label="YES", favorite_team=f"Team{i}", pinnacle_odds=odds,
+        pinnacle_prob=round(1 / odds, 3), poly_price=round(1 / odds - gap, 3), gap_size=gap,
+        bet_usdc=usdc, order_id=f"0x{i:064x}", commence_time="2026-03-02T00:00:00+00:00",
+    )
+
+
+def _fixture(tmp: str) -> str:
+    """베팅 4건(3/1 · 3/2, 승 / 패 / 대기 / void) + 3일치 스냅샷."""
+    path = f"{tmp}/positions.db"
+    db   = DB(path)
+    try:
+        win  = _bet(db, 1, 0.16, 1.35, 10)
+        loss = _bet(db, 2, 0.25, 1.45, 20)
+        _bet(db, 3, 0.17, 1.25, 10)
+        void = _bet(db, 4, 0.18, 1.40, 10)
+        db.settle_bet(win, "win", 12.0)
+        db.settle_bet(loss, "loss", -20.0)
+        db.void_bet(void)
+        db.insert_snapshots(
+            odds=[("g1", ts, 1.35, 3.4) for ts in (DAY1, DAY2, DAY3)],
+            books=[("tok1", ts + m * 60, 0.40, 0.45, 100, 80) for ts in (DAY1, DAY2, DAY3) for m in range(3)],
+        )
+    finally:
+        db.close()
+    with sqlite3.connect(path) as conn:    # 베팅 / 정산 날짜 고정
+        conn.execute("UPDATE bets SET bet_at = CASE WHEN id <= 2 THEN '2026-03-01T10:00:00+00:00' "
+                     "ELSE '2026-03-02T10:00:00+00:00' END")
+        conn.execute("UPDATE results SET settled_at = '2026-03-02T08:00:00+00:00'")
+    return path
+
+
+def _days(out: str, table: str) -> list[str]:
+    return sorted(p.name for p in (Path(out) / table).glob("date=*"))
+
+
+# ── 테스트 ───────────────────────────────────────────────────
+
+def test_partitions():
+    if pa is None:
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        db, out = _fixture(tmp), f"{tmp}/export"
+        counts = export(db, out)
+        assert counts == {"bets": 4, "results": 2, "odds_snapshots": 3, "book_snapshots": 9}, counts
+        assert _days(out, "bets") == ["date=2026-03-01", "date=2026-03-02"]
+        assert _days(out, "results") == ["date=2026-03-02"]
+        assert _days(out, "book_snapshots") == ["date=2026-03-01", "date=2026-03-02", "date=2026-03-03"]
+        assert load(out, "book_snapshots").num_rows == 9
+        assert load(out, "bets", ["id"]).column_names == ["id"]
+
+
+def test_since_replaces_stale():
+    if pa is None:
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        db, out = _fixture(tmp), f"{tmp}/export"
+        export(db, out)
+        with sqlite3.connect(db) as conn:    # 3/3 스냅샷 소멸 + 3/2 1행 삭제
+            conn.execute("DELETE FROM odds_snapshots WHERE ts >= ?", (DAY3 - 3600,))
+            conn.execute("DELETE FROM book_snapshots WHERE ts = ?", (DAY2,))
+
+        counts = export(db, out, since="2026-03-02")
+        assert counts["odds_snapshots"] == 1 and counts["book_snapshots"] == 5, counts
+        assert _days(out, "odds_snapshots") == ["date=2026-03-01", "date=2026-03-02"]
+        assert load(out, "book_snapshots").num_rows == 8    # 3/1 파티션은 그대로
+
+        export(db, out, fmt="parquet")    # 전체 재내보내기 — 형식 변경 시 이전 파일도 제거
+        assert not list(Path(out).glob("*/date=*/part.arrow"))
+        assert load(out, "odds_snapshots").num_rows == 2
+
+
+def test_zero_copy_load():
+    if pa is None:
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        db, out = _fixture(tmp), f"{tmp}/export"
+        export(db, out)
+        before = pa.total_allocated_bytes()
+        books  = load(out, "book_snapshots")
+        assert pa.total_allocated_bytes() == before, "메모리 매핑 대신 복사"
+        for chunk in books.column("best_ask").chunks:
+            chunk.to_numpy(zero_copy_only=True)    # 복사가 필요하면 ArrowInvalid
+
+
+def test_pnl_report():
+    if pa is None:
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        db, out = _fixture(tmp), f"{tmp}/export"
+        export(db, out)
+        bets = load(out, "bets")
+
+        by_gap = {r["gap"]: r for r in pnl_report(bets, "gap")}
+        assert set(by_gap) == {"0.15~0.20", "0.20~0.30"}, by_gap
+        low = by_gap["0.15~0.20"]
+        assert (low["n"], low["wins"], low["pending"], low["pnl"]) == (2, 1, 1, 12.0), low
+        assert low["win_rate"] == 1.0 and low["roi"] == 1.2, low
+        assert by_gap["0.20~0.30"]["roi"] == -1.0
+
+        both = pnl_report(bets, "both")
+        assert sum(r["n"] for r in both) == 3 and {r["odds"] for r in both} == {"1.20~1.30", "1.30~1.40", "1.40~1.50"}
+
+
+TESTS = [
+    test_partitions,
+    test_since_replaces_stale,
+    test_zero_copy_load,
+    test_pnl_report,
+]
+
+
+def main() -> None:
+    header("core/export.py — 컬럼형 내보내기 / P&L 집계 테스트")
+    if pa is None:
+        print("  ℹ️  pyarrow 미설치 — 건너뜀 (pip install pyarrow numpy)")
+        sys.exit(0)
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            ok(test.__name__)
+        except Exception as e:
+            failed += 1
+            fail(f"{test.__name__}: {type(e).__name__} {e}")
+    print(f"\n  {len(TESTS) - failed}/{len(TESTS)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
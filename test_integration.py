@@ -20,11 +20,12 @@ import ssl
 import sys
 from datetime import datetime, timezone
 
-import aiohttp
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from core.transport import Transport
+
 # ── 출력 헬퍼 ────────────────────────────────────────────────
 
 SEP = "=" * 65
@@ -43,22 +44,22 @@ def fail(msg: str) -> None: print(f"  ❌ {msg}")
 
 # ── SSL 컨텍스트 (macOS VPN/방화벽 대응) ────────────────────
 
-def _make_connector() -> aiohttp.TCPConnector:
+def _insecure_ssl() -> ssl.SSLContext:
     ctx = ssl.create_default_context()
     ctx.check_hostname = False
     ctx.verify_mode    = ssl.CERT_NONE
-    return aiohttp.TCPConnector(ssl=ctx)
+    return ctx
 
 
 # ── [1] Gamma API 테스트 ─────────────────────────────────────
 
-async def test_gamma(session: aiohttp.ClientSession):
+async def test_gamma(http: Transport):
     from core.matcher import fetch_nba_poly_markets
 
     header("[1] Gamma API — 폴리마켓 NBA 마켓 조회 (무료)")
 
     try:
-        markets = await fetch_nba_poly_markets(session)
+        markets = await fetch_nba_poly_markets(http)
     except Exception as e:
         fail(f"Gamma API 오류: {e}")
         return []
@@ -92,13 +93,13 @@ async def test_gamma(session: aiohttp.ClientSession):
 
 # ── [2-A] Odds API 실제 호출 ─────────────────────────────────
 
-async def test_odds_live(session: aiohttp.ClientSession):
+async def test_odds_live(http: Transport):
     from core.odds_fetcher import fetch_nba_games
 
     header("[2] Odds API — Pinnacle 배당 실제 호출 (⚠️ 크레딧 소비)")
 
     try:
-        games = await fetch_nba_games(session)
+        games = await fetch_nba_games(http)
     except Exception as e:
         fail(f"Odds API 오류: {e}")
         return []
@@ -248,8 +249,8 @@ async def test_matching(pinnacle_games, poly_markets, live_mode: bool):
 
 # ── [4] 갭 스캔 테스트 ───────────────────────────────────────
 
-async def test_scan(session: aiohttp.ClientSession, matched_games):
-    from core.scanner import _fetch_orderbook, _best_ask_and_shares
+async def test_scan(http: Transport, matched_games):
+    from core.scanner import _fetch_orderbook, best_ask_and_shares
     from config import MAX_POLYMARKET_PRICE, GAP_THRESHOLD, MIN_LIQUIDITY_SHARES
 
     header("[4] 갭 스캔 — CLOB 오더북 실시간 조회 (무료)")
@@ -266,13 +267,13 @@ async def test_scan(session: aiohttp.ClientSession, matched_games):
     opportunities = []
     for m in matched_games:
         g    = m.pinnacle
-        book = await _fetch_orderbook(session, m.buy_token_id)
+        book = await _fetch_orderbook(http, m.buy_token_id)
 
         if book is None:
             print(f"  {m.poly.question:<38}  오더북 조회 실패")
             continue
 
-        best_ask, shares = _best_ask_and_shares(book)
+        best_ask, shares = best_ask_and_shares(book)
         if best_ask is None:
             print(f"  {m.poly.question:<38}  ask 없음")
             continue
@@ -304,8 +305,8 @@ async def test_scan(session: aiohttp.ClientSession, matched_games):
         ok(f"기회 {len(opportunities)}개 감지!")
         for m, price, gap, shares in opportunities:
             g = m.pinnacle
-            from core.scanner import _calc_bet
-            bet = _calc_bet(gap)
+            from core.scanner import calc_bet
+            bet = calc_bet(gap)
             print(
                 f"    → {m.poly.question}\n"
                 f"       정배: {g.favorite_team} ({g.favorite_odds:.2f}배 / {g.favorite_prob:.1%})\n"
@@ -324,7 +325,7 @@ async def test_sim(matched_games):
     실제 CLOB 호출 없음. 정배팀을 폴리마켓이 역배로 가격 책정하는
     시나리오를 가상으로 재현해 scanner 로직과 베팅 금액 산출 확인.
     """
-    from core.scanner import ArbitrageOpportunity, _calc_bet
+    from core.scanner import ArbitrageOpportunity, calc_bet
     from config import MAX_POLYMARKET_PRICE, GAP_THRESHOLD, MIN_LIQUIDITY_SHARES
 
     header("[5] 갭 감지 시뮬레이션 (가상 CLOB 가격)")
@@ -364,7 +365,7 @@ async def test_sim(matched_games):
         all_ok = c2 and c3 and c4
 
         if all_ok:
-            bet     = _calc_bet(gap)
+            bet     = calc_bet(gap)
             verdict = f"🎯 기회! → ${bet:.0f} 베팅"
             if opportunity is None:
                 opportunity = ArbitrageOpportunity(
@@ -408,14 +409,14 @@ async def main(live: bool) -> None:
     print(f"  {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}")
     print(SEP)
 
-    async with aiohttp.ClientSession(connector=_make_connector()) as session:
+    async with Transport(ssl=_insecure_ssl()) as http:
 
         # [1] Gamma API (항상 실시간, 무료)
-        poly_markets = await test_gamma(session)
+        poly_markets = await test_gamma(http)
 
         # [2] Odds API (live or mock)
         if live:
-            pinnacle_games = await test_odds_live(session)
+            pinnacle_games = await test_odds_live(http)
         else:
             pinnacle_games = await test_odds_mock(poly_markets)
 
@@ -423,7 +424,7 @@ async def main(live: bool) -> None:
         matched = await test_matching(pinnacle_games, poly_markets, live_mode=live)
 
         # [4] 갭 스캔 (CLOB 오더북, 항상 실시간, 무료)
-        await test_scan(session, matched)
+        await test_scan(http, matched)
 
         # [5] 갭 감지 시뮬레이션 (가상 CLOB 가격, 무료)
         await test_sim(matched)
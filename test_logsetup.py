@@ -0,0 +1,121 @@
+"""
+test_logsetup.py - core/logsetup.py 비동기 로깅 테스트
+
+임시 디렉터리 로그 파일로 검증 (외부 연결 없음).
+  - 큐 → 기록 스레드 → 파일 (핸들러별 레벨 유지: error.log 는 ERROR 만)
+  - 메시지 포맷은 호출 스레드가 아닌 기록 스레드에서
+  - JSON lines: stage / game_id / token_id 필드 + 예외
+
+사용법:
+  python test_logsetup.py
+"""
+
+import json
+import logging
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+from core.logsetup import build_handlers, start_listener
+
+SEP = "=" * 65
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def fail(msg: str) -> None: print(f"  ❌ {msg}")
+
+
+def _logged(json_lines: bool, emit) -> tuple[list[str], list[str]]:
+    """임시 파일 핸들러로 emit(log) 실행 → (bot.log 줄, error.log 줄)."""
+    log = logging.getLogger(f"test.logsetup.{json_lines}")
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmp, open(Path(tmp) / "console", "w") as console:
+        handlers = build_handlers(f"{tmp}/bot.log", f"{tmp}/error.log", json_lines, console)
+        listener = start_listener(log, handlers)
+        try:
+            emit(log)
+        finally:
+            listener.stop()
+            for h in handlers:
+                h.close()
+            for h in list(log.handlers):
+                log.removeHandler(h)
+        return (
+            Path(tmp, "bot.log").read_text(encoding="utf-8").splitlines(),
+            Path(tmp, "error.log").read_text(encoding="utf-8").splitlines(),
+        )
+
+
+# ── 테스트 ───────────────────────────────────────────────────
+
+def test_queue_and_levels():
+    def emit(log):
+        log.debug("숨김 %s", 1)
+        log.info("[scanner] 마감 (%.1fh): %s", 0.5, "Heat")
+        log.error("[main] 오류")
+
+    lines, errors = _logged(False, emit)
+    assert len(lines) == 2 and lines[0].endswith("[INFO] [scanner] 마감 (0.5h): Heat"), lines
+    assert len(errors) == 1 and errors[0].endswith("[ERROR] [main] 오류"), errors
+
+
+def test_format_off_thread():
+    caller  = threading.get_ident()
+    threads = []
+
+    class _Probe:
+        def __str__(self):
+            threads.append(threading.get_ident())
+            return "probe"
+
+    lines, _ = _logged(False, lambda log: log.info("%s", _Probe()))
+    assert lines and lines[0].endswith("probe"), lines
+    assert threads and caller not in threads, "호출 스레드에서 포맷됨"
+
+
+def test_json_lines():
+    def emit(log):
+        log.info("[pipeline] 기회 %s", "Heat", extra={"stage": "scan", "game_id": "g1", "token_id": "t1"})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            log.error("[main] 오류", exc_info=True)
+
+    lines, errors = _logged(True, emit)
+    first = json.loads(lines[0])
+    assert first["msg"] == "[pipeline] 기회 Heat", first
+    assert (first["stage"], first["game_id"], first["token_id"]) == ("scan", "g1", "t1"), first
+    assert first["level"] == "INFO" and "exc" not in first, first
+    err = json.loads(errors[0])
+    assert "ValueError: boom" in err["exc"] and "stage" not in err, err
+
+
+TESTS = [
+    test_queue_and_levels,
+    test_format_off_thread,
+    test_json_lines,
+]
+
+
+def main() -> None:
+    header("core/logsetup.py — 비동기 로깅 테스트")
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            ok(test.__name__)
+        except Exception as e:
+            failed += 1
+            fail(f"{test.__name__}: {type(e).__name__} {e}")
+    print(f"\n  {len(TESTS) - failed}/{len(TESTS)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
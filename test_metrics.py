@@ -0,0 +1,155 @@
+"""
+test_metrics.py - core/metrics.py 지표 레지스트리 / Prometheus 엔드포인트 테스트
+
+외부 연결 없이 로컬 레지스트리 + 127.0.0.1 임시 포트로 검증.
+  - Counter / Gauge / Histogram 텍스트 형식 (레이블, 누적 버킷, +Inf, _sum / _count)
+  - set_function / collector 는 스크레이프 시점에만 호출
+  - GET /metrics 200, 그 외 경로 404
+
+사용법:
+  python test_metrics.py
+"""
+
+import asyncio
+import socket
+import sys
+
+import aiohttp
+
+from core import metrics
+from core.metrics import Registry
+
+SEP = "=" * 65
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def fail(msg: str) -> None: print(f"  ❌ {msg}")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# ── 테스트 ───────────────────────────────────────────────────
+
+def test_counter_and_gauge():
+    reg    = Registry()
+    orders = reg.counter("t_orders_total", "주문", ("status",))
+    lag    = reg.gauge("t_lag_seconds", "지연", ("feed",))
+    orders.inc(status="matched")
+    orders.inc(2, status="matched")
+    orders.inc(status='fok"cancelled')
+    lag.set(0.25, feed="market")
+
+    text = reg.render()
+    assert "# TYPE t_orders_total counter" in text, text
+    assert 't_orders_total{status="matched"} 3' in text, text
+    assert 't_orders_total{status="fok\\"cancelled"} 1' in text, text
+    assert 't_lag_seconds{feed="market"} 0.25' in text, text
+    assert orders.value(status="matched") == 3
+
+
+def test_histogram():
+    reg  = Registry()
+    hist = reg.histogram("t_stage_seconds", "단계", ("stage",), buckets=(0.1, 1))
+    for v in (0.05, 0.1, 0.5, 3):
+        hist.observe(v, stage="scan")
+
+    text = reg.render()
+    assert 't_stage_seconds_bucket{stage="scan",le="0.1"} 2' in text, text
+    assert 't_stage_seconds_bucket{stage="scan",le="1"} 3' in text, text
+    assert 't_stage_seconds_bucket{stage="scan",le="+Inf"} 4' in text, text
+    assert 't_stage_seconds_sum{stage="scan"} 3.65' in text, text
+    assert 't_stage_seconds_count{stage="scan"} 4' in text, text
+    assert hist.count(stage="scan") == 4
+
+
+def test_lazy_values():
+    calls = []
+
+    class _Http:
+        def stats(self):
+            calls.append("http")
+            return {"clob": {
+                "requests": 10, "retries": 1, "errors": 0, "hedges": 2, "rejected": 0,
+                "p50_ms": 40.0, "p95_ms": None, "breaker": "closed",
+            }}
+
+    reg       = Registry()
+    credits   = reg.gauge("t_credits", "크레딧")
+    positions = reg.gauge("t_positions", "포지션")
+    credits.set_function(lambda: calls.append("credits") or 42)
+    positions.set_function(lambda: 1 / 0)                        # 실패 → 표본 생략
+    reg.collect(metrics.transport_collector(_Http()))
+    assert calls == [], "스크레이프 전 호출됨"
+
+    text = reg.render()
+    assert calls == ["credits", "http"], calls
+    assert "t_credits 42" in text, text
+    assert "\nt_positions " not in text, text
+    assert 'polymoly_http_requests_total{host="clob"} 10' in text, text
+    assert 'polymoly_http_latency_seconds{host="clob",quantile="0.5"} 0.04' in text, text
+    assert 'quantile="0.95"' not in text, text
+    assert text.count("# TYPE polymoly_http_requests_total counter") == 1, text
+
+
+def test_endpoint():
+    reg = Registry()
+    reg.counter("t_polls_total", "폴링").inc()
+    port = _free_port()
+
+    async def run():
+        server = asyncio.create_task(metrics.serve(port, registry=reg))
+        try:
+            for _ in range(50):
+                try:
+                    async with aiohttp.ClientSession() as s:
+                        async with s.get(f"http://127.0.0.1:{port}/metrics") as r:
+                            body  = await r.text()
+                            ctype = r.headers["Content-Type"]
+                            assert r.status == 200, r.status
+                        async with s.get(f"http://127.0.0.1:{port}/") as r:
+                            assert r.status == 404, r.status
+                    return body, ctype
+                except aiohttp.ClientConnectorError:
+                    await asyncio.sleep(0.02)
+            raise AssertionError("엔드포인트 연결 실패")
+        finally:
+            server.cancel()
+            await asyncio.gather(server, return_exceptions=True)
+
+    body, ctype = asyncio.run(run())
+    assert ctype.startswith("text/plain; version=0.0.4"), ctype
+    assert "t_polls_total 1" in body, body
+
+
+TESTS = [
+    test_counter_and_gauge,
+    test_histogram,
+    test_lazy_values,
+    test_endpoint,
+]
+
+
+def main() -> None:
+    header("core/metrics.py — 지표 레지스트리 / 엔드포인트 테스트")
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            ok(test.__name__)
+        except Exception as e:
+            failed += 1
+            fail(f"{test.__name__}: {type(e).__name__} {e}")
+    print(f"\n  {len(TESTS) - failed}/{len(TESTS)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
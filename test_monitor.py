@@ -0,0 +1,266 @@
+"""
+test_monitor.py - core/monitor.py 포지션 모니터링 / 정산 테스트
+
+임시 DB + 가짜 CLOB 클라이언트로 검증 (외부 연결 없음).
+  - 일괄 점검: 중복 토큰 1회 조회, 캐시 토큰은 조회 생략, BOOKS_BATCH_SIZE 단위 POST /books,
+               판정된 포지션 전부 settle_many 1회 (승 / 패 / 미종료 / 호가 없음)
+  - /books 실패 → 개별 GET /book 대체
+  - 연속 MAX_CONSECUTIVE_LOSSES 패 → 자동 중단
+  - market_resolved: 오더북 조회 없이 winning_asset_id 로 해당 마켓 포지션만 즉시 정산 (재수신 무시)
+  - run(): 대기 중 피드가 정산한 포지션은 깨어난 뒤 다시 점검 / 정산하지 않음
+  - 점검 시각: 베팅에 기록된 종목(샤드)의 경기 길이 기준, 종목 없으면 ODDS_SPORT
+
+사용법:
+  python test_monitor.py
+"""
+
+import asyncio
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import core.monitor as monitor_mod
+from config import DEFAULT_GAME_LENGTH_MIN, GAME_LENGTH_MIN, MAX_CONSECUTIVE_LOSSES, ODDS_SPORT
+from core.db import DB
+from core.monitor import Monitor, _next_check
+from core.positions import PositionBook
+
+SEP = "=" * 65
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def fail(msg: str) -> None: print(f"  ❌ {msg}")
+
+
+def _book(token_id: str, bid: float) -> dict:
+    return {"asset_id": token_id, "bids": [{"price": str(bid), "size": "10"}], "asks": []}
+
+
+class _Clob:
+    """http.clob 대역 — POST /books / GET /book 호출 기록."""
+
+    def __init__(self, bids: dict[str, float], fail_batch: bool = False):
+        self.bids       = bids
+        self.fail_batch = fail_batch
+        self.posts: list[list[str]] = []
+        self.gets:  list[str] = []
+
+    async def post_json(self, path: str, body: list[dict], **kw) -> list[dict]:
+        tokens = [b["token_id"] for b in body]
+        self.posts.append(tokens)
+        if self.fail_batch:
+            raise RuntimeError("/books 500")
+        return [_book(t, self.bids[t]) for t in tokens if t in self.bids]
+
+    async def get_json(self, path: str, params: dict, **kw) -> dict:
+        self.gets.append(params["token_id"])
+        if params["token_id"] not in self.bids:
+            raise RuntimeError("404")
+        return _book(params["token_id"], self.bids[params["token_id"]])
+
+
+class _Books:
+    """BookCache 대역 (공유 메모리 캐시에 있는 토큰)."""
+
+    def __init__(self, books: dict[str, dict]):
+        self.books = books
+
+    def get(self, token_id: str, watch: bool = True) -> dict | None:
+        return self.books.get(token_id)
+
+
+def _monitor(db: DB, books: _Books | None = None) -> tuple[Monitor, PositionBook, list]:
+    """Monitor + 포지션 북. settle_many 호출 목록도 반환."""
+    positions = PositionBook(db)
+    calls: list[list[tuple]] = []
+    settle = positions.settle_many
+    positions.settle_many = lambda s: (calls.append(s), settle(s))[1]
+    return Monitor(SimpleNamespace(positions=positions), db, books=books), positions, calls
+
+
+def _bet(db: DB, positions: PositionBook, token_id: str,
+         commence_time: str = "2026-03-02T00:00:00+00:00", sport: str | None = None) -> dict:
+    bet_id = positions.insert_bet(
+        game_id="g1", event_title=f"{token_id} 경기", token_id=token_id, buy_label="YES",
+        favorite_team="Heat", pinnacle_odds=1.35, pinnacle_prob=0.741, poly_price=0.5,
+        gap_size=0.19, bet_usdc=10, order_id=f"0x{token_id}", commence_time=commence_time,
+        sport=sport,
+    )
+    return next(b for b in db.get_pending_bets() if b["id"] == bet_id)
+
+
+# ── 테스트 ───────────────────────────────────────────────────
+
+def test_batch_settle():
+    async def run(tmp: str):
+        db = DB(f"{tmp}/positions.db")
+        saved = monitor_mod.BOOKS_BATCH_SIZE
+        monitor_mod.BOOKS_BATCH_SIZE = 2
+        try:
+            monitor, positions, calls = _monitor(db, _Books({"cached": _book("cached", 0.98)}))
+            bets = [_bet(db, positions, t) for t in ("win", "win", "loss", "live", "gone", "cached")]
+            clob = _Clob({"win": 0.97, "loss": 0.03, "live": 0.5})
+
+            await monitor.check(SimpleNamespace(clob=clob), bets)
+            assert [len(p) for p in clob.posts] == [2, 2], clob.posts    # 중복 / 캐시 토큰 제외
+            assert sorted(sum(clob.posts, [])) == ["gone", "live", "loss", "win"], clob.posts
+            assert len(calls) == 1, calls
+            assert sorted(o for _, o, _ in calls[0]) == ["loss", "win", "win", "win"], calls[0]
+            assert positions.tokens() == {"live", "gone"}, positions.tokens()
+
+            stats = db.get_stats()
+            assert (stats["wins"], stats["losses"], stats["pending"]) == (3, 1, 2), stats
+            assert stats["total_pnl"] == round(3 * 10 - 10, 2), stats    # 승: 20주 - $10, 패: -$10
+            assert not monitor.stopped
+        finally:
+            monitor_mod.BOOKS_BATCH_SIZE = saved
+            db.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(tmp))
+
+
+def test_fallback_each():
+    async def run(tmp: str):
+        db = DB(f"{tmp}/positions.db")
+        try:
+            monitor, positions, calls = _monitor(db)
+            bets = [_bet(db, positions, t) for t in ("win", "live", "gone")]
+            clob = _Clob({"win": 0.99, "live": 0.4}, fail_batch=True)
+
+            await monitor.check(SimpleNamespace(clob=clob), bets)
+            assert len(clob.posts) == 1 and sorted(clob.gets) == ["gone", "live", "win"], clob.gets
+            assert [(o, p) for _, o, p in calls[0]] == [("win", 10.0)], calls
+            assert positions.tokens() == {"live", "gone"}
+        finally:
+            db.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(tmp))
+
+
+def test_loss_streak():
+    async def run(tmp: str):
+        db = DB(f"{tmp}/positions.db")
+        try:
+            monitor, positions, _ = _monitor(db)
+            tokens = [f"l{i}" for i in range(MAX_CONSECUTIVE_LOSSES)]
+            clob   = SimpleNamespace(clob=_Clob({t: 0.01 for t in tokens}))
+
+            await monitor.check(clob, [_bet(db, positions, t) for t in tokens[:-1]])
+            assert not monitor.stopped
+            await monitor.check(clob, [_bet(db, positions, tokens[-1])])
+            assert monitor.stopped, "연속 패배 후 미중단"
+        finally:
+            db.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(tmp))
+
+
+def test_market_resolved():
+    async def run(tmp: str):
+        db = DB(f"{tmp}/positions.db")
+        try:
+            monitor, positions, calls = _monitor(db)
+            yes, no, other = (_bet(db, positions, t) for t in ("m1-yes", "m1-no", "m2-yes"))
+            clob  = _Clob({})
+            event = {"event_type": "market_resolved", "market": "0xm1",
+                     "assets_ids": ["m1-yes", "m1-no"], "winning_asset_id": "m1-yes"}
+
+            await monitor.on_market_resolved(event)
+            assert calls == [], "run() 전 (http 없음) 정산"
+            monitor._http = SimpleNamespace(clob=clob)    # run() 시작 시 설정
+
+            await monitor.on_market_resolved({**event, "winning_asset_id": None})
+            assert calls == [], "승자 없는 이벤트로 정산"
+            await monitor.on_market_resolved(event)
+            assert calls == [[(yes["id"], "win", 10.0), (no["id"], "loss", -10.0)]], calls
+            assert clob.posts == [] and clob.gets == [], "오더북 조회 발생"
+            assert positions.tokens() == {"m2-yes"} and [b["id"] for b in db.get_pending_bets()] == [other["id"]]
+
+            await monitor.on_market_resolved(event)    # 재연결 후 재수신
+            assert len(calls) == 1, calls
+            stats = db.get_stats()
+            assert (stats["wins"], stats["losses"], stats["pending"]) == (1, 1, 1), stats
+        finally:
+            db.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(tmp))
+
+
+def test_resolved_while_waiting():
+    async def run(tmp: str):
+        db = DB(f"{tmp}/positions.db")
+        try:
+            monitor, positions, calls = _monitor(db)
+            start = datetime.now(timezone.utc) - timedelta(minutes=30)    # 진행 중 → 예상 종료까지 대기
+            bet   = _bet(db, positions, "m1-yes", start.isoformat())
+            clob  = _Clob({"m1-yes": 0.99})
+            task  = asyncio.create_task(monitor.run(SimpleNamespace(clob=clob)))
+            try:
+                await asyncio.sleep(0.05)
+                await monitor.on_market_resolved({"assets_ids": ["m1-yes"], "winning_asset_id": "m1-yes"})
+                monitor.wake()    # 같은 경기의 sports 종료 이벤트
+                await asyncio.sleep(0.1)
+                assert calls == [[(bet["id"], "win", 10.0)]], calls
+                assert clob.posts == [], "정산된 포지션 재점검"
+            finally:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        finally:
+            db.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(tmp))
+
+
+def test_next_check_sport():
+    start = datetime(2026, 3, 2, tzinfo=timezone.utc)
+    bet   = {"commence_time": start.isoformat()}
+    for sport in ("basketball_nba", "baseball_mlb", "icehockey_nhl", None):
+        minutes = GAME_LENGTH_MIN.get(sport or ODDS_SPORT, DEFAULT_GAME_LENGTH_MIN)
+        assert _next_check({**bet, "sport": sport}, start.timestamp()) == start.timestamp() + minutes * 60, sport
+    assert GAME_LENGTH_MIN["baseball_mlb"] != GAME_LENGTH_MIN[ODDS_SPORT]
+
+    with tempfile.TemporaryDirectory() as tmp:    # 기록한 종목이 조회 / 점검 시각까지 이어짐
+        db = DB(f"{tmp}/positions.db")
+        try:
+            saved = _bet(db, PositionBook(db), "mlb", start.isoformat(), "baseball_mlb")
+            assert _next_check(saved, start.timestamp()) == start.timestamp() + GAME_LENGTH_MIN["baseball_mlb"] * 60
+        finally:
+            db.close()
+
+
+TESTS = [
+    test_batch_settle,
+    test_fallback_each,
+    test_loss_streak,
+    test_market_resolved,
+    test_resolved_while_waiting,
+    test_next_check_sport,
+]
+
+
+def main() -> None:
+    header("core/monitor.py — 포지션 모니터링 / 정산 테스트")
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            ok(test.__name__)
+        except Exception as e:
+            failed += 1
+            fail(f"{test.__name__}: {type(e).__name__} {e}")
+    print(f"\n  {len(TESTS) - failed}/{len(TESTS)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
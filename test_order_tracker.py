@@ -0,0 +1,205 @@
+"""
+test_order_tracker.py - core/order_tracker.py user 채널 체결 추적 테스트
+
+임시 DB + sim/ user 채널 대역으로 검증 (외부 연결 / 자격증명 없음).
+  - prepare(): 새 마켓을 주문 제출 전에 구독 → 제출 직후 MATCHED 도 유실 없음
+  - track() 전에 도착한 trade / order 이벤트 보관 후 재생 (미체결 CANCELLATION → 무효)
+  - MATCHED → CONFIRMED (체결가 / 수량 기록, 추적 종료), MATCHED → FAILED (베팅 무효)
+
+사용법:
+  python test_order_tracker.py
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+
+import aiohttp
+
+import core.order_tracker as order_tracker
+from core.db import DB
+from core.order_tracker import OrderTracker
+from core.transport import Transport
+from sim.servers import HUB, build_app, start
+from sim.world import World
+
+SEP  = "=" * 65
+AUTH = ("POLY_API_KEY", "POLY_SECRET", "POLY_PASSPHRASE")
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def fail(msg: str) -> None: print(f"  ❌ {msg}")
+
+
+def _bet(db: DB, order_id: str, condition_id: str = "0xc", fill_status: str | None = None) -> int:
+    return db.insert_bet(
+        game_id="g1", event_title="Heat vs. Knicks", token_id="tok", buy_label="YES",
+        favorite_team="Heat", pinnacle_odds=1.35, pinnacle_prob=0.741, poly_price=0.55,
+        gap_size=0.19, bet_usdc=10, order_id=order_id, commence_time="2026-03-02T00:00:00+00:00",
+        condition_id=condition_id, fill_status=fill_status,
+    )
+
+
+def _row(path: str, bet_id: int) -> dict:
+    with sqlite3.connect(path) as conn:
+        conn.row_factory = sqlite3.Row
+        return dict(conn.execute("SELECT * FROM bets WHERE id=?", (bet_id,)).fetchone())
+
+
+def _trade(order_id: str, status: str, trade_id: str = "t1", price: float = 0.55, size: float = 18) -> dict:
+    return {"event_type": "trade", "id": trade_id, "taker_order_id": order_id, "market": "0xc",
+            "status": status, "price": str(price), "size": str(size), "maker_orders": []}
+
+
+async def _until(cond, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not cond():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("시간 초과")
+        await asyncio.sleep(0.01)
+
+
+# ── 테스트 ───────────────────────────────────────────────────
+
+def test_prepare_subscribes_first():
+    world = World(markets=3, confirm_delay=0.05)
+    held, new = world.games[0], world.games[1]
+
+    async def run(tmp: str):
+        app = build_app(world, None, tick_sec=0)
+        runner, url = await start(app, port=0)
+        hub   = app[HUB]
+        db    = DB(f"{tmp}/positions.db")
+        saved = order_tracker.CLOB_WS_USER, {k: os.environ.get(k) for k in AUTH}
+        order_tracker.CLOB_WS_USER = f"{url.replace('http', 'ws', 1)}/clob/ws/user"
+        os.environ.update({k: "sim" for k in AUTH})
+        try:
+            _bet(db, "0xheld", held.condition_id, "matched")    # 재시작 복원 → held 마켓만 구독
+            statuses: list[str] = []
+            record = db.record_fill
+            db.record_fill = lambda bet_id, status, *a: (statuses.append(status), record(bet_id, status, *a))
+
+            async with Transport(bases={"clob": f"{url}/clob"}) as http, aiohttp.ClientSession() as session:
+                tracker = OrderTracker(db)
+                task    = asyncio.create_task(tracker.run(http))
+                try:
+                    await _until(lambda: list(hub.user.values()) == [{held.condition_id}])
+
+                    await tracker.prepare(new.condition_id)
+                    await _until(lambda: new.condition_id in next(iter(hub.user.values())))
+
+                    order = {"order": {"tokenId": new.yes_token, "side": "BUY", "makerAmount": "5000000",
+                                       "takerAmount": str(int(5 / 0.99 * 1e6))}, "orderType": "FOK"}
+                    async with session.post(f"{url}/clob/order", json=order) as r:
+                        resp = await r.json()
+                    assert resp["success"], resp
+                    await asyncio.sleep(0.02)    # MATCHED 가 track() 보다 먼저 도착
+                    bet_id = _bet(db, resp["orderID"], new.condition_id)
+                    await tracker.track(resp["orderID"], bet_id, new.condition_id)
+
+                    await _until(lambda: _row(f"{tmp}/positions.db", bet_id)["fill_status"] == "confirmed")
+                    assert statuses == ["matched", "confirmed"], statuses
+                    assert _row(f"{tmp}/positions.db", bet_id)["fill_price"] is not None
+                finally:
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+        finally:
+            order_tracker.CLOB_WS_USER = saved[0]
+            for k, v in saved[1].items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+            db.close()
+            await runner.cleanup()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(tmp))
+
+
+def test_early_events():
+    async def run(tmp: str):
+        db = DB(f"{tmp}/positions.db")
+        try:
+            tracker = OrderTracker(db)
+            await tracker.handle({"event_type": "order", "id": "0xkill", "type": "CANCELLATION",
+                                  "size_matched": "0"})
+            await tracker.handle(_trade("0xfill", "MATCHED"))
+
+            killed = _bet(db, "0xkill")
+            await tracker.track("0xkill", killed, "0xc")
+            row = _row(f"{tmp}/positions.db", killed)
+            assert (row["outcome"], row["fill_status"]) == ("void", "cancelled"), row
+
+            filled = _bet(db, "0xfill")
+            await tracker.track("0xfill", filled, "0xc")
+            row = _row(f"{tmp}/positions.db", filled)
+            assert (row["fill_status"], row["fill_price"], row["fill_size"]) == ("matched", 0.55, 18), row
+            assert not tracker._early and len(tracker) == 1
+        finally:
+            db.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(tmp))
+
+
+def test_transitions():
+    async def run(tmp: str):
+        path = f"{tmp}/positions.db"
+        db   = DB(path)
+        try:
+            tracker = OrderTracker(db)
+            good, bad = _bet(db, "0xgood"), _bet(db, "0xbad")
+            await tracker.track("0xgood", good, "0xc")
+            await tracker.track("0xbad", bad, "0xc")
+
+            await tracker.handle(_trade("0xgood", "MATCHED", "t1", 0.50, 10))
+            await tracker.handle(_trade("0xgood", "MATCHED", "t2", 0.60, 10))
+            assert _row(path, good)["fill_status"] == "matched"
+            await tracker.handle(_trade("0xgood", "CONFIRMED", "t1", 0.50, 10))
+            assert _row(path, good)["fill_status"] == "matched", "trade 1건만 확정"
+            await tracker.handle(_trade("0xgood", "CONFIRMED", "t2", 0.60, 10))
+            row = _row(path, good)
+            assert (row["fill_status"], row["fill_price"], row["fill_size"]) == ("confirmed", 0.55, 20), row
+
+            await tracker.handle(_trade("0xbad", "MATCHED", "t3"))
+            await tracker.handle(_trade("0xbad", "FAILED", "t3"))
+            row = _row(path, bad)
+            assert (row["outcome"], row["fill_status"]) == ("void", "failed"), row
+            assert len(tracker) == 0, "종료 상태 주문 추적 유지"
+        finally:
+            db.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(tmp))
+
+
+TESTS = [
+    test_prepare_subscribes_first,
+    test_early_events,
+    test_transitions,
+]
+
+
+def main() -> None:
+    header("core/order_tracker.py — user 채널 체결 추적 테스트")
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            ok(test.__name__)
+        except Exception as e:
+            failed += 1
+            fail(f"{test.__name__}: {type(e).__name__} {e}")
+    print(f"\n  {len(TESTS) - failed}/{len(TESTS)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+test_outbox.py - core/outbox.py 텔레그램 알림 아웃박스 테스트
+
+임시 DB + 가짜 post_message 로 검증 (외부 연결 없음).
+  - 합치기: OUTBOX_COALESCE_SEC 안에 몰린 알림 → OUTBOX_MAX_CHARS 단위 메시지, 전송 후 행 삭제
+  - 속도: TokenBucket — capacity 만큼 즉시, 이후 초당 rate 개
+  - 재시도: 일시 오류 / 429 → 재전송 (attempts 증가), OUTBOX_MAX_ATTEMPTS 초과 시 폐기
+  - 재시작 복구: 전송 전 종료된 알림은 다음 run() 에서 1회만 전송
+  - 큐 상한: 폐기된 알림은 전송하지 않고 저장 행도 삭제
+
+사용법:
+  python test_outbox.py
+"""
+
+import asyncio
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+import core.outbox as outbox_mod
+from core.db import DB
+from core.outbox import Outbox, TokenBucket
+
+SEP = "=" * 65
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def fail(msg: str) -> None: print(f"  ❌ {msg}")
+
+
+@contextmanager
+def _patched(replies: list[float | None] | None = None, **overrides):
+    """core.outbox 전역 교체 + post_message 대역. 전송한 본문 목록을 넘겨줌.
+
+    replies: post_message 반환값 순서 (소진 후 None = 성공).
+    """
+    sent: list[str] = []
+    replies = list(replies or [])
+
+    async def post_message(http, text: str) -> float | None:
+        sent.append(text)
+        return replies.pop(0) if replies else None
+
+    overrides = {"post_message": post_message, "OUTBOX_COALESCE_SEC": 0.05,
+                 "MIN_INTERVAL": 0.0, "BACKOFF_BASE": 0.01, **overrides}
+    saved = {k: getattr(outbox_mod, k) for k in overrides}
+    for k, v in overrides.items():
+        setattr(outbox_mod, k, v)
+    try:
+        yield sent
+    finally:
+        for k, v in saved.items():
+            setattr(outbox_mod, k, v)
+
+
+def _rows(path: str) -> list[tuple]:
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT text, attempts FROM outbox ORDER BY id").fetchall()
+
+
+async def _drain(box: Outbox, sent: list[str], count: int, timeout: float = 2.0) -> None:
+    """run() 을 돌려 전송 count 건이 될 때까지 대기 후 종료."""
+    task = asyncio.create_task(box.run(None))
+    try:
+        deadline = time.monotonic() + timeout
+        while len(sent) < count or len(box):
+            if time.monotonic() > deadline:
+                raise AssertionError(f"시간 초과: {sent}")
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)    # 삭제 반영
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+# ── 테스트 ───────────────────────────────────────────────────
+
+def test_coalesce():
+    async def run(path: str):
+        db = DB(path)
+        try:
+            with _patched(OUTBOX_MAX_CHARS=14) as sent:
+                box = Outbox(db, label="#")
+                for text in ("a1", "b2", "c3", "0123456789"):
+                    box.put(text)
+                assert len(box) == 4
+                await _drain(box, sent, 2)
+                assert sent == ["#a1\n\n#b2\n\n#c3", "#0123456789"], sent
+                assert _rows(path) == [], _rows(path)
+        finally:
+            db.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(f"{tmp}/positions.db"))
+
+
+def test_token_bucket():
+    async def run() -> float:
+        bucket = TokenBucket(rate=20, capacity=2)
+        start = time.monotonic()
+        for _ in range(2):
+            await bucket.acquire()
+        assert time.monotonic() - start < 0.02, "capacity 내 대기"
+        for _ in range(2):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(run())
+    assert 0.09 <= elapsed < 0.5, elapsed    # 초과 2건 × 1/20초
+
+
+def test_retry():
+    async def run(path: str):
+        db = DB(path)
+        try:
+            with _patched([0.0, 0.01]) as sent:    # 5xx → 429 (retry_after) → 성공
+                box = Outbox(db)
+                box.put("retry")
+                await _drain(box, sent, 3)
+                assert sent == ["retry"] * 3 and _rows(path) == [], _rows(path)
+
+            with _patched([0.0] * 10, OUTBOX_MAX_ATTEMPTS=3) as sent:
+                box = Outbox(db)
+                box.put("give up")
+                await _drain(box, sent, 3)
+                assert sent == ["give up"] * 3, sent
+                assert _rows(path) == [], "포기한 알림 행 유지"
+        finally:
+            db.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(f"{tmp}/positions.db"))
+
+
+def test_restart_recovery():
+    async def crashed(path: str):
+        db = DB(path)
+        try:
+            with _patched([0.0], BACKOFF_BASE=10.0) as sent:    # 재시도 대기 중 종료
+                box = Outbox(db)
+                box.put("first")
+                box.put("second")
+                task = asyncio.create_task(box.run(None))
+                await asyncio.sleep(0.3)
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                assert sent == ["first\n\nsecond"], sent
+        finally:
+            db.close()
+
+    async def restarted(path: str):
+        db = DB(path)
+        try:
+            assert _rows(path) == [("first", 1), ("second", 1)], _rows(path)
+            with _patched() as sent:
+                box = Outbox(db)
+                box.put("third")
+                await _drain(box, sent, 3)
+                assert sent == ["first", "second", "third"], sent
+                assert _rows(path) == []
+        finally:
+            db.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(crashed(f"{tmp}/positions.db"))
+        asyncio.run(restarted(f"{tmp}/positions.db"))
+
+
+def test_evicted():
+    async def run(path: str):
+        db = DB(path)
+        try:
+            with _patched(OUTBOX_QUEUE_SIZE=2) as sent:
+                box = Outbox(db)
+                for text in ("m0", "m1", "m2"):
+                    box.put(text)
+                assert len(box) == 2
+                await _drain(box, sent, 1)
+                assert sent == ["m1\n\nm2"], sent
+                assert _rows(path) == [], _rows(path)
+        finally:
+            db.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(f"{tmp}/positions.db"))
+
+
+TESTS = [
+    test_coalesce,
+    test_token_bucket,
+    test_retry,
+    test_restart_recovery,
+    test_evicted,
+]
+
+
+def main() -> None:
+    header("core/outbox.py — 텔레그램 알림 아웃박스 테스트")
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            ok(test.__name__)
+        except Exception as e:
+            failed += 1
+            fail(f"{test.__name__}: {type(e).__name__} {e}")
+    print(f"\n  {len(TESTS) - failed}/{len(TESTS)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+test_paper.py - core/paper.py 모의 거래 테스트
+
+임시 DB 로 검증 (외부 연결 / SDK / 자격증명 없음).
+  - FOK 시뮬레이션: worst-price 이하 ask 만 소진, 전액 못 채우면 취소, VWAP
+  - PaperExecutor: 체결가 / 수량 확정 기록, 미체결은 기록 없음, 일반 Monitor 로 정산
+  - 재생: 기록 스냅샷 → 기회 감지 → 모의 체결 → 정산 (경기 시작 시각 이동)
+
+사용법:
+  python test_paper.py
+"""
+
+import asyncio
+import json
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+from core.checkpoint import encode
+from core.db import DB
+from core.matcher import MatchedGame, PolymarketMarket
+from core.monitor import Monitor
+from core.odds_fetcher import PinnacleGame
+from core.paper import PaperExecutor, replay, simulate_fok
+from core.scanner import ArbitrageOpportunity
+
+SEP = "=" * 65
+T0  = 1_760_000_040    # 기록 시작 (분 단위 epoch)
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def fail(msg: str) -> None: print(f"  ❌ {msg}")
+
+
+def _book(*asks: tuple[float, float], bid: float = 0.30) -> dict:
+    """REST /book 정렬 (asks 내림차순)."""
+    return {
+        "bids": [{"price": str(bid), "size": "100"}],
+        "asks": [{"price": str(p), "size": str(s)} for p, s in sorted(asks, reverse=True)],
+    }
+
+
+def _matched(game_id: str, start: datetime, home_odds: float = 1.4) -> MatchedGame:
+    game = PinnacleGame(game_id, "Miami Heat", "Boston Celtics", start, home_odds, 3.2)
+    poly = PolymarketMarket(f"cond-{game_id}", "Heat vs. Celtics", start, "Heat", "Celtics",
+                            f"yes-{game_id}", f"no-{game_id}")
+    return MatchedGame(game, poly)
+
+
+def _opp(book: dict, bet_usdc: float = 20.0, price: float = 0.45) -> ArbitrageOpportunity:
+    m = _matched("g1", datetime.now(timezone.utc) + timedelta(hours=3))
+    return ArbitrageOpportunity(
+        matched=m, poly_price=price, pinnacle_prob=0.714, gap_size=0.714 - price,
+        liquidity_shares=100, bet_usdc=bet_usdc, book=book,
+    )
+
+
+# ── 테스트 ───────────────────────────────────────────────────
+
+def test_simulate_fok():
+    book = _book((0.44, 10), (0.45, 40), (0.47, 500))
+    price, shares = simulate_fok(book, 20.0, 0.45)
+    assert abs(shares - (10 + (20 - 4.4) / 0.45)) < 1e-6, shares
+    assert 0.44 < price < 0.45 and abs(price * shares - 20.0) < 1e-6, price
+    assert simulate_fok(book, 30.0, 0.45) is None, "worst-price 초과 호가로 체결"
+    assert simulate_fok(book, 30.0, 0.47) is not None
+    assert simulate_fok({"asks": []}, 5.0, 0.5) is None
+
+
+def test_paper_executor_settles():
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DB(f"{tmp}/paper.db")
+            try:
+                executor = PaperExecutor(db)
+                await executor.initialize()
+
+                thin = await executor.execute(_opp(_book((0.45, 20)), bet_usdc=20.0))
+                assert not thin.success and thin.status == "fok_cancelled", thin
+                assert db.get_pending_bets() == []
+
+                result = await executor.execute(_opp(_book((0.45, 100))))
+                assert result.success and result.order_id.startswith("paper-"), result
+                bet = db.get_pending_bets()[0]
+                assert bet["fill_status"] == "confirmed" and abs(bet["fill_size"] - 20 / 0.45) < 1e-6, bet
+                assert executor.has_position(bet["token_id"])
+
+                settled = {"yes-g1": {"bids": [{"price": "0.97", "size": "10"}], "asks": []}}
+
+                class _Books:
+                    def get(self, token_id, watch=True):
+                        return settled.get(token_id)
+
+                await Monitor(executor, db, books=_Books()).check(None, [bet])
+                stats = db.get_stats()
+                assert stats["wins"] == 1 and abs(stats["total_pnl"] - round(20 / 0.45 - 20, 2)) < 0.01, stats
+                assert not executor.has_position(bet["token_id"])
+            finally:
+                db.close()
+
+    asyncio.run(run())
+
+
+def test_replay():
+    start = datetime.fromtimestamp(T0, timezone.utc) + timedelta(hours=3)
+    games = [_matched("g1", start), _matched("g2", start, home_odds=1.3)]
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            source = DB(f"{tmp}/source.db")
+            paper  = DB(f"{tmp}/paper.db")
+            try:
+                source.insert_snapshots(
+                    odds=[(m.pinnacle.game_id, T0, m.pinnacle.home_odds, m.pinnacle.away_odds) for m in games],
+                    books=[
+                        ("yes-g1", T0, 0.30, 0.45, 100, 100),            # 갭 0.26 → $20, 체결
+                        ("yes-g2", T0, 0.30, 0.40, 100, 40),             # 갭 0.37 → $30, 깊이 $16 → 취소
+                        ("yes-g1", T0 + 4 * 3600, 0.97, 0.99, 100, 100),  # 경기 종료 → 승리
+                    ],
+                    matches=[
+                        (m.pinnacle.game_id, m.poly.condition_id, T0,
+                         json.dumps(encode(m.pinnacle)), json.dumps(encode(m.poly)))
+                        for m in games
+                    ],
+                )
+                report = await replay(source, paper)
+                assert report.ticks == 2 and report.span_sec == 4 * 3600, report
+                assert report.opportunities == 2, report
+                assert report.orders == {"matched": 1, "fok_cancelled": 1}, report.orders
+                assert report.stats["total"] == 1 and report.stats["wins"] == 1, report.stats
+                assert report.stats["pending"] == 0 and report.stats["total_pnl"] > 0, report.stats
+            finally:
+                source.close()
+                paper.close()
+
+    asyncio.run(run())
+
+
+TESTS = [
+    test_simulate_fok,
+    test_paper_executor_settles,
+    test_replay,
+]
+
+
+def main() -> None:
+    header("core/paper.py — 모의 거래 테스트")
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            ok(test.__name__)
+        except Exception as e:
+            failed += 1
+            fail(f"{test.__name__}: {type(e).__name__} {e}")
+    print(f"\n  {len(TESTS) - failed}/{len(TESTS)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+test_pipeline.py - core/pipeline.py 폴링 사이클 파이프라인 테스트
+
+수집 / 매핑 / 스캔 / 알림 함수를 대역으로 바꿔 검증 (외부 연결 없음).
+  - 단계: Odds API ∥ Gamma 동시 조회, 기회만 실행 단계로, 실행은 직렬 + 보유 토큰 건너뜀
+  - backpressure: 실행이 막히면 스캔도 PIPELINE_QUEUE_SIZE 만큼만 앞서 나감
+  - 취소: 한 단계가 예외를 내면 나머지 단계 태스크 취소 후 예외 전파
+
+사용법:
+  python test_pipeline.py
+"""
+
+import asyncio
+import sys
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import core.pipeline as pipeline_mod
+from core.pipeline import Pipeline
+
+SEP = "=" * 65
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def fail(msg: str) -> None: print(f"  ❌ {msg}")
+
+
+async def _noop(*args, **kwargs) -> None:
+    return None
+
+
+@contextmanager
+def _patched(games: int = 10, check_game=None, fetch_delay: float = 0.0, **overrides):
+    """core.pipeline 전역 교체. games 개 경기가 모두 매핑된 것으로 취급."""
+    async def fetch_games(http, sport):
+        await asyncio.sleep(fetch_delay)
+        return [f"g{i}" for i in range(games)]
+
+    async def fetch_markets(http, tag):
+        await asyncio.sleep(fetch_delay)
+        return [f"m{i}" for i in range(games)]
+
+    def match_games(games, markets, mapping):
+        return [SimpleNamespace(buy_token_id=f"tok{i}", pinnacle=g) for i, g in enumerate(games)]
+
+    overrides = {
+        "fetch_nba_games": fetch_games, "fetch_nba_poly_markets": fetch_markets, "match_games": match_games,
+        "check_game": check_game, "notify_opportunity": _noop, "notify_executed": _noop, "notify_failed": _noop,
+        **overrides,
+    }
+    saved = {k: getattr(pipeline_mod, k) for k in overrides}
+    for k, v in overrides.items():
+        setattr(pipeline_mod, k, v)
+    try:
+        yield
+    finally:
+        for k, v in saved.items():
+            setattr(pipeline_mod, k, v)
+
+
+class _Executor:
+    """Executor 대역 — 실행 순서 / 동시 실행 수 기록. gate 가 설정될 때까지 실행 대기."""
+
+    def __init__(self, held: set[str] = frozenset()):
+        self.stager   = SimpleNamespace(stage=None)
+        self.held     = set(held)
+        self.executed: list[str] = []
+        self.active   = 0
+        self.peak     = 0
+        self.gate     = asyncio.Event()
+        self.gate.set()
+
+    def has_position(self, token_id: str) -> bool:
+        return token_id in self.held
+
+    async def execute(self, opp):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await self.gate.wait()
+            await asyncio.sleep(0.001)
+            self.executed.append(opp.token_id)
+            self.held.add(opp.token_id)
+            return SimpleNamespace(success=True, status="matched")
+        finally:
+            self.active -= 1
+
+
+def _opp(m) -> SimpleNamespace:
+    return SimpleNamespace(game_id=m.pinnacle, token_id=m.buy_token_id, event_title=m.pinnacle)
+
+
+# ── 테스트 ───────────────────────────────────────────────────
+
+def test_stages():
+    async def check_game(http, m, stage, record, books):
+        await asyncio.sleep(0.001)
+        return _opp(m) if int(m.buy_token_id[3:]) % 2 == 0 else None
+
+    async def run():
+        executor = _Executor(held={"tok4"})
+        with _patched(check_game=check_game, fetch_delay=0.1):
+            start  = time.perf_counter()
+            report = await Pipeline(executor, {}).run_cycle(None)
+            assert time.perf_counter() - start < 0.18, "Odds API / Gamma 순차 조회"
+        assert (report.pinnacle_games, report.poly_markets, report.matched) == (10, 10, 10), report
+        assert (report.opportunities, report.executed) == (5, 4), report
+        assert sorted(executor.executed) == ["tok0", "tok2", "tok6", "tok8"], executor.executed
+        assert executor.peak == 1, "실행 단계 동시 실행"
+        assert {"odds", "gamma", "match", "scan", "execute", "total"} <= report.timings.keys(), report.timings
+
+    asyncio.run(run())
+
+
+def test_backpressure():
+    scanned: list[str] = []
+
+    async def check_game(http, m, stage, record, books):
+        scanned.append(m.buy_token_id)
+        return _opp(m)
+
+    async def run():
+        executor = _Executor()
+        executor.gate.clear()
+        with _patched(games=20, check_game=check_game, PIPELINE_SCAN_WORKERS=1, PIPELINE_QUEUE_SIZE=2):
+            task = asyncio.create_task(Pipeline(executor, {}).run_cycle(None))
+            await asyncio.sleep(0.1)
+            # 실행 중 1 + 기회 큐 2 + 큐에 넣으려고 대기 중인 워커 1
+            assert len(scanned) == 4, scanned
+            executor.gate.set()
+            report = await asyncio.wait_for(task, 2)
+        assert report.executed == 20 and len(scanned) == 20, report
+
+    asyncio.run(run())
+
+
+def test_cancel_on_error():
+    cancelled: list[str] = []
+
+    async def check_game(http, m, stage, record, books):
+        if m.buy_token_id == "tok3":
+            raise RuntimeError("scan 실패")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(m.buy_token_id)
+            raise
+
+    async def failing_odds(http, sport):
+        raise RuntimeError("odds 실패")
+
+    async def slow_gamma(http, tag):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("gamma")
+            raise
+
+    async def run(**overrides) -> tuple[str, list[str]]:
+        """(예외 메시지, 예외 전파 시점까지 취소된 작업) — 취소는 전파 전에 끝나야 함."""
+        cancelled.clear()
+        with _patched(check_game=check_game, PIPELINE_SCAN_WORKERS=4, **overrides):
+            try:
+                await asyncio.wait_for(Pipeline(_Executor(), {}).run_cycle(None), 2)
+            except RuntimeError as e:
+                return str(e), sorted(cancelled)
+        raise AssertionError("예외 미전파")
+
+    # 다른 워커들의 진행 중 스캔
+    assert asyncio.run(run()) == ("scan 실패", ["tok0", "tok1", "tok2"])
+    assert asyncio.run(run(fetch_nba_games=failing_odds, fetch_nba_poly_markets=slow_gamma)) == ("odds 실패", ["gamma"])
+
+
+TESTS = [
+    test_stages,
+    test_backpressure,
+    test_cancel_on_error,
+]
+
+
+def main() -> None:
+    header("core/pipeline.py — 폴링 사이클 파이프라인 테스트")
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            ok(test.__name__)
+        except Exception as e:
+            failed += 1
+            fail(f"{test.__name__}: {type(e).__name__} {e}")
+    print(f"\n  {len(TESTS) - failed}/{len(TESTS)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
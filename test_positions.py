@@ -0,0 +1,140 @@
+"""
+test_positions.py - core/positions.py 메모리 포지션 북 테스트
+
+임시 DB 로 검증 (외부 연결 없음).
+  - reserve(): 여러 스레드가 동시에 예약해도 한도 / 같은 토큰 중복 없이 정확히 배정
+  - write-through: insert / settle / void 후 북과 DB pending 일치
+  - verify(): DB 와 어긋나면 False + DB 기준 재동기화
+
+사용법:
+  python test_positions.py
+"""
+
+import sys
+import tempfile
+import threading
+
+from core.db import DB
+from core.positions import PositionBook
+
+SEP     = "=" * 65
+THREADS = 16
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def fail(msg: str) -> None: print(f"  ❌ {msg}")
+
+
+def _bet(token_id: str) -> dict:
+    return dict(
+        game_id="g1", event_title="Heat vs. Knicks", token_id=token_id, buy_label="YES",
+        favorite_team="Heat", pinnacle_odds=1.35, pinnacle_prob=0.741, poly_price=0.55,
+        gap_size=0.19, bet_usdc=10, order_id=f"0x{token_id}", commence_time="2026-03-02T00:00:00+00:00",
+    )
+
+
+def _race(book: PositionBook, tokens: list[str], limit: int) -> list[str | None]:
+    """스레드마다 reserve(tokens[i]) 를 동시에 호출 → 결과 목록."""
+    barrier = threading.Barrier(len(tokens))
+    results: list[str | None] = [None] * len(tokens)
+
+    def worker(i: int) -> None:
+        barrier.wait()
+        results[i] = book.reserve(tokens[i], limit)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(tokens))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+# ── 테스트 ───────────────────────────────────────────────────
+
+def test_reserve_race():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DB(f"{tmp}/positions.db")
+        try:
+            book = PositionBook(db)
+            book.insert_bet(**_bet("held"))
+
+            results = _race(book, [f"tok{i}" for i in range(THREADS)], limit=5)
+            assert results.count(None) == 4, results    # 보유 1 + 예약 4 = 한도 5
+            assert results.count("limit") == THREADS - 4, results
+
+            for i, r in enumerate(results):
+                if r is None:
+                    book.release(f"tok{i}")
+            results = _race(book, ["same"] * THREADS, limit=THREADS)
+            assert results.count(None) == 1 and results.count("held") == THREADS - 1, results
+            assert book.reserve("held", THREADS) == "held"
+
+            book.release("same")
+            assert book.reserve("same", THREADS) is None, "release 후 재예약 불가"
+        finally:
+            db.close()
+
+
+def test_write_through():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DB(f"{tmp}/positions.db")
+        try:
+            book = PositionBook(db)
+            a1, a2, b = (book.insert_bet(**_bet(t)) for t in ("a", "a", "b"))
+            assert book.count() == 3 and book.tokens() == {"a", "b"}
+
+            book.settle_many([(a1, "win", 8.0), (b, "loss", -10.0)])
+            assert book.count() == 1 and "a" in book and "b" not in book
+            book.void_bet(a2)
+            assert book.count() == 0 and not book.has("a")
+            assert db.get_pending_bets() == []
+            assert PositionBook(db).count() == 0, "재로드 결과 불일치"
+        finally:
+            db.close()
+
+
+def test_verify_resync():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DB(f"{tmp}/positions.db")
+        try:
+            book = PositionBook(db)
+            kept, gone = book.insert_bet(**_bet("a")), book.insert_bet(**_bet("b"))
+            assert book.verify()
+
+            db.void_bet(gone)          # 북을 거치지 않은 변경
+            extra = db.insert_bet(**_bet("c"))
+            assert not book.verify(), "불일치 미검출"
+            assert book.tokens() == {"a", "c"}, book.tokens()
+            assert book.verify({kept, extra})
+        finally:
+            db.close()
+
+
+TESTS = [
+    test_reserve_race,
+    test_write_through,
+    test_verify_resync,
+]
+
+
+def main() -> None:
+    header("core/positions.py — 메모리 포지션 북 테스트")
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            ok(test.__name__)
+        except Exception as e:
+            failed += 1
+            fail(f"{test.__name__}: {type(e).__name__} {e}")
+    print(f"\n  {len(TESTS) - failed}/{len(TESTS)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
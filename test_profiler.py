@@ -0,0 +1,138 @@
+"""
+test_profiler.py - core/profiler.py 런타임 사이클 프로파일러 테스트
+
+임시 디렉터리에 제어 파일 / 결과를 두고 검증 (외부 연결 없음).
+  - 예약 없으면 측정 안 함, arm(N) 후 N 사이클만 기록 (.pstats / .txt / .tracemalloc)
+  - 제어 파일: 시작 전부터 있던 파일 무시, 수정 시 내용("monitor 1")대로 예약
+  - SIGUSR1 → 예약
+
+사용법:
+  python test_profiler.py
+"""
+
+import asyncio
+import os
+import pstats
+import signal
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from core.profiler import CycleProfiler
+
+SEP = "=" * 65
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def fail(msg: str) -> None: print(f"  ❌ {msg}")
+
+
+def _work() -> list[bytes]:
+    return [bytes(1024) for _ in range(200)]
+
+
+def _profiler(tmp: str) -> CycleProfiler:
+    return CycleProfiler(control_path=f"{tmp}/profile", out_dir=f"{tmp}/logs")
+
+
+def _outputs(tmp: str, suffix: str) -> list[Path]:
+    out = Path(tmp, "logs")
+    return sorted(out.glob(f"*{suffix}")) if out.exists() else []
+
+
+# ── 테스트 ───────────────────────────────────────────────────
+
+def test_arm_cycles():
+    with tempfile.TemporaryDirectory() as tmp:
+        prof = _profiler(tmp)
+        with prof.cycle("poll", 1):
+            _work()
+        assert not _outputs(tmp, ".txt"), "예약 없이 측정"
+
+        prof.arm(2)
+        keep = []
+        for i in (2, 3, 4):
+            with prof.cycle("poll", i):
+                keep.append(_work())
+        prof.flush()
+        txts = _outputs(tmp, ".txt")
+        assert [p.name.split("-")[2] for p in txts] == ["2", "3"], txts
+        assert len(_outputs(tmp, ".pstats")) == 2 and len(_outputs(tmp, ".tracemalloc")) == 2
+        stats = pstats.Stats(str(_outputs(tmp, ".pstats")[0]))
+        assert any(fn[2] == "_work" for fn in stats.stats), "사이클 함수 미기록"
+        text = txts[0].read_text(encoding="utf-8")
+        assert "poll 사이클 #2" in text and "메모리 증가" in text, text[:200]
+        assert not tracemalloc.is_tracing(), "측정 종료 후 tracemalloc 유지"
+
+
+def test_control_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        control = Path(tmp, "profile")
+        control.write_text("3")
+        prof = _profiler(tmp)
+        with prof.cycle("poll"):
+            pass
+        assert not prof.armed, "시작 전부터 있던 제어 파일로 예약"
+
+        control.write_text("monitor 1")
+        os.utime(control, (time.time() + 5, time.time() + 5))
+        with prof.cycle("poll"):
+            pass
+        assert prof.armed and not _outputs(tmp, ".txt"), "다른 종류 사이클 측정"
+        with prof.cycle("monitor"):
+            _work()
+        prof.flush()
+        names = [p.name for p in _outputs(tmp, ".txt")]
+        assert len(names) == 1 and names[0].startswith("profile-monitor-1-"), names
+        assert not prof.armed
+
+
+def test_signal():
+    with tempfile.TemporaryDirectory() as tmp:
+        prof = _profiler(tmp)
+
+        async def run():
+            prof.install_signal()
+            try:
+                os.kill(os.getpid(), signal.SIGUSR1)
+                await asyncio.sleep(0.05)
+                with prof.cycle("poll", 7):
+                    await asyncio.sleep(0.01)
+            finally:
+                asyncio.get_running_loop().remove_signal_handler(signal.SIGUSR1)
+
+        asyncio.run(run())
+        prof.flush()
+        names = [p.name for p in _outputs(tmp, ".txt")]
+        assert len(names) == 1 and names[0].startswith("profile-poll-7-"), names
+
+
+TESTS = [
+    test_arm_cycles,
+    test_control_file,
+    test_signal,
+]
+
+
+def main() -> None:
+    header("core/profiler.py — 런타임 사이클 프로파일러 테스트")
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            ok(test.__name__)
+        except Exception as e:
+            failed += 1
+            fail(f"{test.__name__}: {type(e).__name__} {e}")
+    print(f"\n  {len(TESTS) - failed}/{len(TESTS)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+test_shared.py - core/shared.py 멀티 프로세스 공유 상태 테스트
+
+임시 DB 를 소유한 공유 프로세스(SharedManager)를 띄워 검증 (외부 연결 없음).
+  - 워커 연결 여러 개가 같은 포지션 북 / DB / 중단 플래그 / 구독 요청을 공유
+  - reserve(): 여러 연결 동시 예약에도 한도 합산 정확
+  - RemoteDB: 프록시 메서드 + db.aio (이벤트 루프 비차단)
+  - QueueOutbox / RemoteTracker → drain(): 순서 유지, 동기 / 비동기 handle, 처리 실패 후에도 계속
+
+사용법:
+  python test_shared.py
+"""
+
+import asyncio
+import multiprocessing
+import sys
+import tempfile
+import threading
+
+import core.shared as shared
+from core.db import DB
+from core.shared import QueueOutbox, RemoteDB, RemoteTracker, SharedManager, connect, drain
+
+SEP     = "=" * 65
+AUTHKEY = b"test-shared"
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def fail(msg: str) -> None: print(f"  ❌ {msg}")
+
+
+def _init(path: str) -> None:
+    """공유 프로세스 초기화 — 기본 경로(data/positions.db) 대신 임시 DB."""
+    shared._objects["db"] = DB(path)
+
+
+def _bet(token_id: str) -> dict:
+    return dict(
+        game_id="g1", event_title="Heat vs. Knicks", token_id=token_id, buy_label="YES",
+        favorite_team="Heat", pinnacle_odds=1.35, pinnacle_prob=0.741, poly_price=0.55,
+        gap_size=0.19, bet_usdc=10, order_id=f"0x{token_id}", commence_time="2026-03-02T00:00:00+00:00",
+    )
+
+
+# ── 테스트 ───────────────────────────────────────────────────
+
+def test_shared_manager():
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SharedManager(authkey=AUTHKEY)
+        manager.start(_init, (f"{tmp}/positions.db",))
+        try:
+            workers = [connect(manager.address, AUTHKEY) for _ in range(4)]
+            books   = [w.positions() for w in workers]
+
+            books[0].insert_bet(**_bet("held"))
+            assert books[1].has("held") and books[2].count() == 1, "다른 워커에 포지션 미반영"
+
+            results: list[str | None] = []
+            barrier = threading.Barrier(8)
+
+            def worker(i: int) -> None:
+                book = workers[i % 4].positions()
+                barrier.wait()
+                results.append(book.reserve(f"tok{i}", 3))
+
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert results.count(None) == 2 and results.count("limit") == 6, results    # 보유 1 + 예약 2
+
+            control = workers[3].control()
+            workers[0].control().stop("연속 3패")
+            workers[1].control().stop("다른 사유")
+            assert control.stopped() and control.reason() == "연속 3패", control.reason()
+
+            workers[2].watch().add("tok-watch")
+            assert "tok-watch" in workers[3].watch().tokens()
+        finally:
+            manager.db().close()
+            manager.shutdown()
+
+
+def test_remote_db():
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SharedManager(authkey=AUTHKEY)
+        manager.start(_init, (f"{tmp}/positions.db",))
+        try:
+            db = RemoteDB(connect(manager.address, AUTHKEY).db())
+            bet_id = db.insert_bet(**_bet("a"))
+
+            async def run() -> tuple[list, dict]:
+                ticks = 0
+
+                async def ticker() -> None:
+                    nonlocal ticks
+                    while True:
+                        await asyncio.sleep(0)
+                        ticks += 1
+
+                task = asyncio.create_task(ticker())
+                try:
+                    return await asyncio.gather(db.aio.get_pending_bets(), db.aio.get_stats())
+                finally:
+                    task.cancel()
+                    assert ticks > 0, "db.aio 호출 중 이벤트 루프 정지"
+
+            pending, stats = asyncio.run(run())
+            assert [b["id"] for b in pending] == [bet_id], pending
+            assert stats["total"] == stats["pending"] == 1, stats
+            db.settle_bet(bet_id, "win", 8.0)
+            assert manager.db().get_stats()["wins"] == 1, "공유 프로세스 DB 미반영"
+        finally:
+            manager.db().close()
+            manager.shutdown()
+
+
+def test_drain():
+    q = multiprocessing.get_context("spawn").Queue()
+    outbox, tracker = QueueOutbox(q), RemoteTracker(q)
+    handled: list = []
+
+    async def handle(item) -> None:
+        if item == "boom":
+            raise RuntimeError("처리 실패")
+        await asyncio.sleep(0)
+        handled.append(item)
+
+    async def run() -> None:
+        outbox.put("알림 1")
+        await tracker.prepare("0xc")
+        outbox.put("boom")
+        await tracker.track("0xorder", 7, "0xc")
+        outbox.put("알림 2")
+
+        task = asyncio.create_task(drain(q, handle))
+        try:
+            for _ in range(200):
+                if len(handled) == 4:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    saved, shared.QUEUE_POLL_SEC = shared.QUEUE_POLL_SEC, 0.05
+    try:
+        asyncio.run(run())
+    finally:
+        shared.QUEUE_POLL_SEC = saved
+    assert handled == ["알림 1", ("prepare", ("0xc",)), ("track", ("0xorder", 7, "0xc")), "알림 2"], handled
+
+    sync: list = []
+    q.put("동기")
+
+    async def run_sync() -> None:
+        task = asyncio.create_task(drain(q, sync.append))
+        for _ in range(200):
+            if sync:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run_sync())
+    assert sync == ["동기"], sync
+
+
+TESTS = [
+    test_shared_manager,
+    test_remote_db,
+    test_drain,
+]
+
+
+def main() -> None:
+    header("core/shared.py — 멀티 프로세스 공유 상태 테스트")
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            ok(test.__name__)
+        except Exception as e:
+            failed += 1
+            fail(f"{test.__name__}: {type(e).__name__} {e}")
+    print(f"\n  {len(TESTS) - failed}/{len(TESTS)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
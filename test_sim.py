@@ -0,0 +1,241 @@
+"""
+test_sim.py - sim/ 로컬 API 시뮬레이터 테스트
+
+빈 포트(port=0)에 시뮬레이터를 띄워 봇 코드 경로로 검증 (외부 연결 / 자격증명 없음).
+  - Gamma 페이지 조회 (GAMMA_PAGE_SIZE 초과) → Odds API 파싱 → match_games 매핑
+  - Gamma 가 offset 을 무시해도 (같은 페이지 반복) 페이지 조회 종료
+  - Odds API 크레딧 헤더 차감 / 키 누락 401
+  - CLOB /book + FOK 주문 체결 / 취소, user 채널 trade 이벤트
+  - market 채널 구독 스냅샷 + 경기 종료 시 market_resolved
+  - 장애 주입: 503 / 429 + Retry-After (telegram 은 retry_after) / 실행 중 변경
+
+사용법:
+  python test_sim.py
+"""
+
+import asyncio
+import json
+import sys
+
+import aiohttp
+
+from config import GAMMA_MAX_PAGES, GAMMA_PAGE_SIZE
+from core.matcher import fetch_nba_poly_markets, match_games
+from core.odds_fetcher import _parse
+from core.transport import Transport
+from sim.faults import Faults
+from sim.servers import HUB, build_app, start
+from sim.world import World
+
+SEP = "=" * 65
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def fail(msg: str) -> None: print(f"  ❌ {msg}")
+
+
+def _serve(world: World, test, faults: dict[str, Faults] | None = None) -> None:
+    """시뮬레이터 기동 → test(url, session, app) → 종료. 틱 태스크 없음 (결정적)."""
+    async def run():
+        app = build_app(world, faults, tick_sec=0)
+        runner, url = await start(app, port=0)
+        try:
+            async with aiohttp.ClientSession() as session:
+                await test(url, session, app)
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(run())
+
+
+def _order(token_id: str, usdc: float, price: float) -> dict:
+    """py-clob-client post_order 형식 FOK 매수."""
+    return {"order": {
+        "tokenId":     token_id,
+        "side":        "BUY",
+        "makerAmount": str(int(usdc * 1e6)),
+        "takerAmount": str(int(usdc / price * 1e6)),
+    }, "orderType": "FOK"}
+
+
+# ── 테스트 ───────────────────────────────────────────────────
+
+def test_pages_and_matching():
+    world = World(markets=GAMMA_PAGE_SIZE + 50, seed=1)
+
+    async def test(url, session, app):
+        bases = {"gamma": f"{url}/gamma", "clob": f"{url}/clob", "odds": f"{url}/odds/v4"}
+        async with Transport(bases=bases) as http:
+            markets = await fetch_nba_poly_markets(http)
+        assert len(markets) == GAMMA_PAGE_SIZE + 50, len(markets)
+        assert world.stats["gamma_requests"] == 2, world.stats
+
+        async with session.get(f"{url}/odds/v4/sports/basketball_nba/odds", params={"apiKey": "sim"}) as r:
+            games = _parse(await r.json())
+        matched = match_games(games, markets, {})
+        assert len(matched) == len(world.games), len(matched)
+        assert all(m.pinnacle.home_team in m.poly.question for m in matched)
+
+    _serve(world, test)
+
+
+def test_gamma_repeated_page():
+    world = World(markets=GAMMA_PAGE_SIZE + 50, seed=1)
+
+    class _IgnoreOffset:
+        """offset 을 빼고 전달 — 매번 첫 페이지."""
+        def __init__(self, gamma):
+            self._gamma = gamma
+            self.calls  = 0
+
+        async def get_json(self, path, params):
+            self.calls += 1
+            return await self._gamma.get_json(path, params={k: v for k, v in params.items() if k != "offset"})
+
+    async def test(url, session, app):
+        async with Transport(bases={"gamma": f"{url}/gamma"}) as http:
+            http.gamma = gamma = _IgnoreOffset(http.gamma)
+            markets = await fetch_nba_poly_markets(http)
+        assert len(markets) == GAMMA_PAGE_SIZE, len(markets)
+        assert gamma.calls == 2 < GAMMA_MAX_PAGES, gamma.calls
+
+    _serve(world, test)
+
+
+def test_odds_credits():
+    world = World(markets=5, credits=2)
+
+    async def test(url, session, app):
+        path = f"{url}/odds/v4/sports/basketball_nba/odds"
+        async with session.get(path) as r:
+            assert r.status == 401
+        remaining = []
+        for _ in range(3):
+            async with session.get(path, params={"apiKey": "sim"}) as r:
+                remaining.append((r.status, r.headers.get("x-requests-remaining")))
+        assert remaining == [(200, "1"), (200, "0"), (401, "0")], remaining
+
+    _serve(world, test)
+
+
+def test_order_fill_and_kill():
+    world = World(markets=3, confirm_delay=0.05)
+    game  = world.games[0]
+
+    async def test(url, session, app):
+        async with session.get(f"{url}/clob/book", params={"token_id": game.yes_token}) as r:
+            book = await r.json()
+        best = min(float(a["price"]) for a in book["asks"])
+        depth = sum(float(a["size"]) * float(a["price"]) for a in book["asks"])
+
+        async with session.ws_connect(f"{url}/clob/ws/user") as ws:
+            await ws.send_str(json.dumps({"type": "user", "markets": [game.condition_id]}))
+            await asyncio.sleep(0.05)
+
+            async with session.post(f"{url}/clob/order", json=_order(game.yes_token, depth * 2, 0.99)) as r:
+                killed = await r.json()
+            assert not killed["success"] and killed["status"] == "unmatched", killed
+
+            async with session.post(f"{url}/clob/order", json=_order(game.yes_token, 5.0, best)) as r:
+                filled = await r.json()
+            assert filled["success"] and filled["status"] == "matched", filled
+
+            statuses = []
+            for _ in range(2):
+                event = json.loads((await ws.receive(timeout=2)).data)
+                assert event["taker_order_id"] == filled["orderID"], event
+                statuses.append(event["status"])
+            assert statuses == ["MATCHED", "CONFIRMED"], statuses
+
+        assert world.stats["fills"] == 1 and world.stats["killed"] == 1, world.stats
+
+    _serve(world, test)
+
+
+def test_market_channel():
+    world = World(markets=3)
+    game  = world.games[1]
+
+    async def test(url, session, app):
+        async with session.ws_connect(f"{url}/clob/ws/market") as ws:
+            await ws.send_str("PING")
+            assert (await ws.receive(timeout=2)).data == "PONG"
+
+            await ws.send_str(json.dumps({"type": "market", "assets_ids": [game.yes_token]}))
+            snapshot = json.loads((await ws.receive(timeout=2)).data)
+            assert [e["event_type"] for e in snapshot] == ["book"], snapshot
+            assert snapshot[0]["asset_id"] == game.yes_token
+
+            await app[HUB].dispatch(world.resolve(game, home_wins=True))
+            events = json.loads((await ws.receive(timeout=2)).data)
+            kinds  = [e["event_type"] for e in events]
+            assert kinds == ["book", "market_resolved"], kinds
+            assert events[1]["winning_asset_id"] == game.yes_token
+            assert events[0]["bids"][-1]["price"] == "0.99", events[0]
+
+    _serve(world, test)
+
+
+def test_faults():
+    world  = World(markets=3)
+    faults = {"gamma": Faults(error_rate=1.0), "telegram": Faults(rate_limit=1)}
+
+    async def test(url, session, app):
+        async with session.get(f"{url}/gamma/events") as r:
+            assert r.status == 503
+        async with session.get(f"{url}/clob/book", params={"token_id": world.games[0].yes_token}) as r:
+            assert r.status == 200
+
+        send = f"{url}/telegram/botsim/sendMessage"
+        async with session.post(send, json={"chat_id": 1, "text": "a"}) as r:
+            assert r.status == 200
+        async with session.post(send, json={"chat_id": 1, "text": "b"}) as r:
+            body = await r.json()
+            assert r.status == 429 and r.headers["Retry-After"] == "1", r.status
+            assert body["parameters"]["retry_after"] == 1, body
+        assert [m["text"] for m in world.messages] == ["a"], world.messages
+
+        async with session.post(f"{url}/sim/faults", json={"gamma": {"error_rate": 0}}) as r:
+            assert (await r.json())["gamma"]["error_rate"] == 0
+        async with session.get(f"{url}/gamma/events") as r:
+            assert r.status == 200 and len(await r.json()) == 3
+        async with session.post(f"{url}/sim/faults", json={"gamma": {"nope": 1}}) as r:
+            assert r.status == 400
+
+        async with session.get(f"{url}/sim/stats") as r:
+            stats = await r.json()
+        assert stats["gamma_errors"] == 1 and stats["telegram_limited"] == 1, stats
+
+    _serve(world, test, faults)
+
+
+TESTS = [
+    test_pages_and_matching,
+    test_gamma_repeated_page,
+    test_odds_credits,
+    test_order_fill_and_kill,
+    test_market_channel,
+    test_faults,
+]
+
+
+def main() -> None:
+    header("sim/ — 로컬 API 시뮬레이터 테스트")
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            ok(test.__name__)
+        except Exception as e:
+            failed += 1
+            fail(f"{test.__name__}: {type(e).__name__} {e}")
+    print(f"\n  {len(TESTS) - failed}/{len(TESTS)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+test_staging.py - core/staging.py 사전 서명 후보 갱신 테스트
+
+오프라인 클라이언트로 검증 (주문 옵션 고정, 서명 = 호출 기록 — 네트워크 / 자격증명 없음).
+  - 금액: 갭이 임계값을 넘었을 때 제출할 티어 금액으로 서명 → take() 일치
+  - market 채널 price_change → 가격 / 금액 재계산 재서명, 마진 밖이면 후보 해제
+  - tick_size_change → 기존 주문 무효화 후 재서명
+  - refresh: 진입 마감 후보 해제, 공유 캐시 best ask 반영
+
+사용법:
+  python test_staging.py
+"""
+
+import asyncio
+import sys
+import time
+
+from core.bookcache import BookCache
+from core.feeds import MarketFeed
+from core.scanner import calc_bet
+from core.staging import OrderStager
+
+SEP   = "=" * 65
+TOKEN = "1" * 77
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def fail(msg: str) -> None: print(f"  ❌ {msg}")
+
+
+class _Offline:
+    """CLOB 클라이언트 대역 — 서명 요청을 (금액, 가격, tick) 으로 기록."""
+
+    def __init__(self, tick_size: str = "0.01"):
+        self.tick_size = tick_size
+        self.signed: list[tuple[float, float, str]] = []
+
+    def get_tick_size(self, token_id: str) -> str:
+        return self.tick_size
+
+    def get_neg_risk(self, token_id: str) -> bool:
+        return False
+
+    def create_market_order(self, args, options):
+        self.signed.append((args.amount, args.price, options.tick_size))
+        return self.signed[-1]
+
+
+class _Positions:
+    def tokens(self) -> set[str]:
+        return set()
+
+
+def _stager(client: _Offline) -> OrderStager:
+    stager = OrderStager()
+    stager.bind(client)
+    return stager
+
+
+async def _settle(stager: OrderStager) -> None:
+    await stager.wait(TOKEN)
+
+
+def _price_change(token_id: str, price: float, size: float) -> dict:
+    return {"event_type": "price_change", "market": "0xc", "price_changes": [
+        {"asset_id": token_id, "price": str(price), "size": str(size), "side": "SELL"},
+    ]}
+
+
+# ── 테스트 ───────────────────────────────────────────────────
+
+def test_stage_amount():
+    async def run():
+        client = _Offline()
+        stager = _stager(client)
+        until  = time.time() + 3600
+
+        stager.stage(TOKEN, 0.60, 0.47, until)    # 갭 0.13 → 근접 후보, 첫 티어 금액
+        await _settle(stager)
+        assert client.signed == [(calc_bet(0.15), 0.47, "0.01")], client.signed
+
+        stager.stage(TOKEN, 0.60, 0.47, until)    # 동일 조건 → 재서명 없음
+        await _settle(stager)
+        assert len(client.signed) == 1
+
+        stager.stage(TOKEN, 0.60, 0.35, until)    # 갭 0.25 → 실제 제출 티어
+        await _settle(stager)
+        assert client.signed[-1] == (calc_bet(0.25), 0.35, "0.01"), client.signed
+        assert stager.take(TOKEN, calc_bet(0.25), 0.35, "0.01") is not None
+        assert stager.tokens() == set(), "take 후 후보 유지"
+
+        stager.stage(TOKEN, 0.60, 0.50, until)    # 갭 0.10 → 후보 아님
+        assert stager.tokens() == set() and len(stager) == 0
+
+    asyncio.run(run())
+
+
+def test_feed_events():
+    async def run():
+        client = _Offline()
+        stager = _stager(client)
+        books  = BookCache.create(slots=4, depth=5)
+        feed   = MarketFeed(_Positions(), None, books, stager=stager)
+        try:
+            books.heartbeat()
+            stager.stage(TOKEN, 0.62, 0.48, time.time() + 3600)
+            await _settle(stager)
+            assert TOKEN in feed._wanted(), "후보 토큰 미구독"
+
+            book = {"event_type": "book", "asset_id": TOKEN, "bids": [{"price": "0.40", "size": "50"}],
+                    "asks": [{"price": "0.48", "size": "100"}, {"price": "0.46", "size": "10"}]}
+            books.apply(book)
+            feed._restage("book", book)
+            await _settle(stager)
+            assert client.signed[-1][1] == 0.46, client.signed
+
+            event = _price_change(TOKEN, 0.46, 0)    # 0.46 소진 → best ask 0.48
+            books.apply(event)
+            feed._restage("price_change", event)
+            await _settle(stager)
+            assert client.signed[-1][1] == 0.48, client.signed
+
+            feed._restage("tick_size_change", {"event_type": "tick_size_change", "asset_id": TOKEN,
+                                               "old_tick_size": "0.01", "new_tick_size": "0.001"})
+            client.tick_size = "0.001"
+            await _settle(stager)
+            assert client.signed[-1] == (calc_bet(0.15), 0.48, "0.001"), client.signed
+            assert stager.take(TOKEN, calc_bet(0.15), 0.48, "0.001") is not None
+
+            stager.stage(TOKEN, 0.62, 0.48, time.time() + 3600)
+            event = _price_change(TOKEN, 0.55, 100)    # best ask 그대로 → 재서명 없음
+            books.apply(event)
+            n = len(client.signed)
+            feed._restage("price_change", event)
+            assert len(client.signed) == n
+            books.apply(_price_change(TOKEN, 0.48, 0))   # 0.48 소진 → 0.55 (≥ 0.50, 후보 해제)
+            feed._restage("price_change", _price_change(TOKEN, 0.48, 0))
+            assert stager.tokens() == set(), stager.tokens()
+        finally:
+            books.close()
+
+    asyncio.run(run())
+
+
+def test_refresh():
+    async def run():
+        client = _Offline()
+        stager = _stager(client)
+        books  = BookCache.create(slots=4, depth=5)
+        try:
+            books.heartbeat()
+            stager.stage("2" * 77, 0.60, 0.47, time.time() - 1)    # 진입 마감 지남
+            stager.stage(TOKEN, 0.60, 0.47, time.time() + 3600)
+            await stager.wait("2" * 77)
+            await _settle(stager)
+            books.apply({"event_type": "book", "asset_id": TOKEN, "bids": [],
+                         "asks": [{"price": "0.44", "size": "100"}]})
+            stager.refresh(books)
+            await _settle(stager)
+            assert stager.tokens() == {TOKEN}, stager.tokens()
+            assert client.signed[-1] == (calc_bet(0.16), 0.44, "0.01"), client.signed
+        finally:
+            books.close()
+
+    asyncio.run(run())
+
+
+TESTS = [
+    test_stage_amount,
+    test_feed_events,
+    test_refresh,
+]
+
+
+def main() -> None:
+    header("core/staging.py — 사전 서명 후보 갱신 테스트")
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            ok(test.__name__)
+        except Exception as e:
+            failed += 1
+            fail(f"{test.__name__}: {type(e).__name__} {e}")
+    print(f"\n  {len(TESTS) - failed}/{len(TESTS)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
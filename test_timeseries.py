@@ -0,0 +1,175 @@
+"""
+test_timeseries.py - core/timeseries.py 시계열 스냅샷 기록 테스트
+
+임시 DB 로 검증 (외부 연결 없음).
+  - 버퍼: 같은 (키, 분) 반복 관측은 마지막 값 1행, 분이 바뀌면 새 행
+  - flush: SNAPSHOT_FLUSH_ROWS 도달 시 즉시 일괄 기록 (이벤트 루프 밖이면 버퍼 유지)
+  - compact: 다운샘플 구간 → 시간 단위 평균 1행, 보존기간 초과 삭제, 최근 행 유지
+  - book_summary: 정렬 방향과 무관한 최우선 호가 / 상위 3호가 깊이
+
+사용법:
+  python test_timeseries.py
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import core.timeseries as timeseries
+from core.db import DB
+from core.odds_fetcher import PinnacleGame
+from core.timeseries import SnapshotRecorder, book_summary
+
+SEP = "=" * 65
+T0  = 1_772_000_000 // 3600 * 3600    # 정시 기준 시각
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def fail(msg: str) -> None: print(f"  ❌ {msg}")
+
+
+def _book(bid: float, ask: float) -> dict:
+    return {"bids": [{"price": str(bid), "size": "10"}], "asks": [{"price": str(ask), "size": "20"}]}
+
+
+class _Clock:
+    """core.timeseries 의 time 모듈 대역 — time() 만 고정값."""
+
+    def __init__(self, now: float):
+        self.now   = now
+        self._real = timeseries.time
+
+    def __enter__(self) -> "_Clock":
+        timeseries.time = SimpleNamespace(time=lambda: self.now, monotonic=time.monotonic)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        timeseries.time = self._real
+
+
+# ── 테스트 ───────────────────────────────────────────────────
+
+def test_buffer_dedupe():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DB(f"{tmp}/positions.db")
+        try:
+            rec = SnapshotRecorder(db)
+            game = PinnacleGame("g1", "Miami Heat", "New York Knicks",
+                                datetime(2026, 3, 2, tzinfo=timezone.utc), 1.35, 3.2)
+            with _Clock(T0 + 5) as clock:
+                rec.record_book("tok", _book(0.50, 0.55))
+                rec.record_book("tok", _book(0.52, 0.56))    # 같은 분 → 덮어씀
+                rec.record_odds(game)
+                rec.record_odds(game)
+                assert len(rec) == 2, len(rec)
+                clock.now = T0 + 65
+                rec.record_book("tok", _book(0.53, 0.57))
+                assert len(rec) == 3, len(rec)
+
+            assert asyncio.run(rec.flush()) == 3 and len(rec) == 0
+            snaps = db.get_snapshots()
+            assert snaps["books"] == [("tok", T0, 0.52, 0.56, 10, 20), ("tok", T0 + 60, 0.53, 0.57, 10, 20)], \
+                snaps["books"]
+            assert snaps["odds"] == [("g1", T0, 1.35, 3.2)], snaps["odds"]
+            assert asyncio.run(rec.flush()) == 0, "빈 버퍼 flush"
+        finally:
+            db.close()
+
+
+def test_flush_threshold():
+    saved = timeseries.SNAPSHOT_FLUSH_ROWS
+    timeseries.SNAPSHOT_FLUSH_ROWS = 5
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DB(f"{tmp}/positions.db")
+        try:
+            rec = SnapshotRecorder(db)
+            for i in range(6):
+                rec.record_book(f"tok{i}", _book(0.5, 0.6))    # 루프 밖 → 기록 없이 버퍼 유지
+            assert len(rec) == 6 and db.get_snapshots()["books"] == []
+
+            async def run() -> None:
+                rec.record_book("tok6", _book(0.5, 0.6))
+                task = rec._flush_task
+                assert task is not None, "임계값 도달 후 flush 미예약"
+                rec.record_book("tok7", _book(0.5, 0.6))
+                assert rec._flush_task is task, "flush 중복 예약"
+                await task    # 예약 후 들어온 tok7 까지 함께 기록
+                assert len(db.get_snapshots()["books"]) == 8 and len(rec) == 0
+
+            asyncio.run(run())
+        finally:
+            timeseries.SNAPSHOT_FLUSH_ROWS = saved
+            db.close()
+
+
+def test_compact():
+    now        = T0 + 1800
+    downsample = T0 - timeseries.SNAPSHOT_DOWNSAMPLE_DAYS * 86400 - 3 * 3600    # 다운샘플 대상 시간대
+    expired    = T0 - timeseries.SNAPSHOT_RETENTION_DAYS * 86400 - 3600
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DB(f"{tmp}/positions.db")
+        try:
+            db.insert_snapshots(
+                [("g1", downsample + 60 * i, 1.3 + 0.1 * i, 3.0) for i in range(3)],
+                [("tok", downsample + 60 * i, 0.4 + 0.1 * i, 0.5 + 0.1 * i, 10 * i, 20) for i in range(3)]
+                + [("tok", expired, 0.1, 0.2, 1, 1), ("tok", T0, 0.6, 0.7, 5, 5), ("tok", T0 + 60, 0.6, 0.7, 5, 5)],
+            )
+            rec = SnapshotRecorder(db)
+            with _Clock(now):
+                asyncio.run(rec.compact())
+
+            snaps = db.get_snapshots()
+            books = [(ts, round(bid, 4), round(ask, 4), depth) for _, ts, bid, ask, depth, _ in snaps["books"]]
+            assert books == [(downsample, 0.5, 0.6, 10), (T0, 0.6, 0.7, 5), (T0 + 60, 0.6, 0.7, 5)], books
+            assert [(ts, round(h, 4)) for _, ts, h, _ in snaps["odds"]] == [(downsample, 1.4)], snaps["odds"]
+            assert rec._compacted_until > downsample
+
+            db.insert_snapshots([], [("tok", downsample + 120, 0.9, 0.9, 0, 0)])    # 정리 완료 구간
+            with _Clock(now):
+                asyncio.run(rec.compact())
+            assert len(db.get_snapshots()["books"]) == 4, "완료 구간 재압축"
+        finally:
+            db.close()
+
+
+def test_book_summary():
+    book = {
+        "bids": [{"price": "0.40", "size": "5"}, {"price": "0.45", "size": "3"},
+                 {"price": "0.30", "size": "7"}, {"price": "0.20", "size": "100"}],
+        "asks": [{"price": "0.60", "size": "4"}, {"price": "0.55", "size": "2"}, {"price": None}],
+    }
+    assert book_summary(book) == (0.45, 0.55, 15, 6), book_summary(book)
+    assert book_summary({}) == (None, None, 0.0, 0.0)
+
+
+TESTS = [
+    test_buffer_dedupe,
+    test_flush_threshold,
+    test_compact,
+    test_book_summary,
+]
+
+
+def main() -> None:
+    header("core/timeseries.py — 시계열 스냅샷 기록 테스트")
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            ok(test.__name__)
+        except Exception as e:
+            failed += 1
+            fail(f"{test.__name__}: {type(e).__name__} {e}")
+    print(f"\n  {len(TESTS) - failed}/{len(TESTS)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
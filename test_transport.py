@@ -0,0 +1,350 @@
+"""
+test_transport.py - core/transport.py 재시도 / 타임아웃 / 연결 재사용 + core/governor.py 속도 제한 테스트
+
+로컬 aiohttp.web 대역 서버로 검증 (외부 API 호출 없음, 크레딧 0).
+  - 5xx / 429(Retry-After) 재시도 후 성공
+  - 비멱등 POST 는 재시도 안 함, idempotent=True 면 재시도
+  - 4xx 는 즉시 실패
+  - 시도당 타임아웃 + 총 예산
+  - 연결 재사용 / 지연 카운터
+  - hedge: p95 지연 초과 시 중복 요청, 먼저 온 응답 사용
+  - 차단기: 연속 실패 시 즉시 실패 → 시험 요청으로 복구
+  - Governor: 버킷 속도 준수, 거래 우선순위, 대기 지표, Gamma 목록 합산 한도
+
+사용법:
+  python test_transport.py
+"""
+
+import asyncio
+import sys
+import time
+
+import aiohttp
+from aiohttp import web
+
+from core.governor import DATA, TRADING, Governor
+from core.transport import CircuitBreaker, CircuitOpenError, HttpClient, Transport
+
+SEP = "=" * 65
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def fail(msg: str) -> None: print(f"  ❌ {msg}")
+
+
+# ── 대역 서버 ────────────────────────────────────────────────
+
+def _app(hits: dict[str, int]) -> web.Application:
+    def count(name: str) -> int:
+        hits[name] = hits.get(name, 0) + 1
+        return hits[name]
+
+    async def flaky(request: web.Request) -> web.Response:
+        if count("flaky") < 3:
+            return web.json_response({"error": "busy"}, status=503)
+        return web.json_response({"ok": True})
+
+    async def limited(request: web.Request) -> web.Response:
+        if count("limited") == 1:
+            return web.json_response({"error": "rate"}, status=429, headers={"Retry-After": "0.2"})
+        return web.json_response({"ok": True})
+
+    async def post_flaky(request: web.Request) -> web.Response:
+        if count("post") == 1:
+            return web.json_response({"error": "busy"}, status=502)
+        return web.json_response(await request.json())
+
+    async def missing(request: web.Request) -> web.Response:
+        count("missing")
+        return web.json_response({"error": "not found"}, status=404)
+
+    async def slow(request: web.Request) -> web.Response:
+        count("slow")
+        await asyncio.sleep(1.0)
+        return web.json_response({"ok": True})
+
+    async def book(request: web.Request) -> web.Response:
+        count("book")
+        return web.json_response({"asset_id": request.query.get("token_id"), "bids": [], "asks": []})
+
+    async def tail(request: web.Request) -> web.Response:
+        # 31번째 요청만 1초 지연 (꼬리 지연 재현)
+        if count("tail") == 31:
+            await asyncio.sleep(1.0)
+        return web.json_response({"n": hits["tail"]})
+
+    async def down(request: web.Request) -> web.Response:
+        count("down")
+        return web.json_response({"error": "down"}, status=503)
+
+    app = web.Application()
+    app.router.add_get("/tail", tail)
+    app.router.add_get("/down", down)
+    app.router.add_get("/flaky", flaky)
+    app.router.add_get("/limited", limited)
+    app.router.add_post("/post", post_flaky)
+    app.router.add_get("/missing", missing)
+    app.router.add_get("/slow", slow)
+    app.router.add_get("/book", book)
+    return app
+
+
+async def _run(check, **client_kwargs) -> None:
+    """대역 서버 + HttpClient 준비 후 check(client, hits) 실행."""
+    hits: dict[str, int] = {}
+    runner = web.AppRunner(_app(hits))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    opts = {"name": "test", "limit": 4, "timeout": 2.0, "budget": 5.0, "retries": 2}
+    opts.update(client_kwargs)
+    client = HttpClient(base_url=f"http://127.0.0.1:{port}", **opts)
+    await client.start()
+    try:
+        await check(client, hits)
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+# ── 테스트 ───────────────────────────────────────────────────
+
+def test_retry_5xx():
+    async def check(client: HttpClient, hits):
+        data = await client.get_json("/flaky")
+        assert data == {"ok": True}, data
+        assert hits["flaky"] == 3, hits
+        assert client.stats.retries == 2, client.stats
+
+    asyncio.run(_run(check))
+
+
+def test_retry_after_429():
+    async def check(client: HttpClient, hits):
+        t0 = time.perf_counter()
+        assert await client.get_json("/limited") == {"ok": True}
+        assert time.perf_counter() - t0 >= 0.2, "Retry-After 미준수"
+        assert hits["limited"] == 2, hits
+
+    asyncio.run(_run(check))
+
+
+def test_post_not_retried():
+    async def check(client: HttpClient, hits):
+        try:
+            await client.post_json("/post", {"a": 1})
+            raise AssertionError("비멱등 POST 가 성공함")
+        except aiohttp.ClientResponseError as e:
+            assert e.status == 502, e
+        assert hits["post"] == 1, hits
+
+    asyncio.run(_run(check))
+
+
+def test_post_idempotent_retried():
+    async def check(client: HttpClient, hits):
+        assert await client.post_json("/post", [{"token_id": "1"}], idempotent=True) == [{"token_id": "1"}]
+        assert hits["post"] == 2, hits
+
+    asyncio.run(_run(check))
+
+
+def test_4xx_no_retry():
+    async def check(client: HttpClient, hits):
+        try:
+            await client.get_json("/missing")
+            raise AssertionError("404 가 성공함")
+        except aiohttp.ClientResponseError as e:
+            assert e.status == 404, e
+        assert hits["missing"] == 1, hits
+        resp = await client.request("GET", "/missing", raise_for_status=False)
+        assert resp.status == 404 and resp.data == {"error": "not found"}, resp
+
+    asyncio.run(_run(check))
+
+
+def test_timeout_budget():
+    async def check(client: HttpClient, hits):
+        t0 = time.perf_counter()
+        try:
+            await client.get_json("/slow")
+            raise AssertionError("타임아웃 미발생")
+        except asyncio.TimeoutError:
+            pass
+        elapsed = time.perf_counter() - t0
+        assert elapsed < 0.8, f"예산 초과: {elapsed:.2f}s"
+        assert 1 <= hits["slow"] <= 3, hits
+
+    asyncio.run(_run(check, timeout=0.2, budget=0.7))
+
+
+def test_connection_reuse():
+    async def check(client: HttpClient, hits):
+        for i in range(10):
+            await client.get_json("/book", params={"token_id": str(i)})
+        snap = client.stats.snapshot()
+        assert snap["new_conns"] == 1, snap
+        assert snap["reused_conns"] == 9, snap
+        assert snap["p50_ms"] is not None and snap["p95_ms"] >= snap["p50_ms"], snap
+
+    asyncio.run(_run(check))
+
+
+def test_connection_refused():
+    async def check(client: HttpClient, hits):
+        try:
+            await client.get_json("/book")
+            raise AssertionError("연결 실패가 성공함")
+        except aiohttp.ClientConnectionError:
+            pass
+        assert client.stats.retries == 2, client.stats
+
+    async def run():
+        client = HttpClient("dead", "http://127.0.0.1:9", limit=1, timeout=1.0, budget=5.0, retries=2)
+        await client.start()
+        try:
+            await check(client, {})
+        finally:
+            await client.close()
+
+    asyncio.run(run())
+
+
+def test_transport_routing():
+    async def run():
+        hits: dict[str, int] = {}
+        runner = web.AppRunner(_app(hits))
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        base = f"http://127.0.0.1:{runner.addresses[0][1]}"
+        try:
+            async with Transport(bases={"clob": base}) as http:
+                book = await http.clob.get_json("/book", params={"token_id": "42"})
+                assert book["asset_id"] == "42", book
+                stats = http.stats()
+                assert stats["clob"]["requests"] == 1, stats
+                assert stats["gamma"]["requests"] == 0, stats
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(run())
+
+
+def test_hedge_tail_latency():
+    async def check(client: HttpClient, hits):
+        for _ in range(30):
+            await client.get_json("/tail", hedge=True)
+        assert client.stats.hedges == 0, client.stats
+        t0 = time.perf_counter()
+        data = await client.get_json("/tail", hedge=True)    # 원 요청 1초 지연 → hedge 응답
+        elapsed = time.perf_counter() - t0
+        assert elapsed < 0.5, f"hedge 미동작: {elapsed:.2f}s"
+        assert data["n"] == 32, data
+        assert client.stats.hedges == 1 and client.stats.hedge_wins == 1, client.stats
+
+    asyncio.run(_run(check))
+
+
+def test_circuit_breaker():
+    async def check(client: HttpClient, hits):
+        client.breaker = CircuitBreaker("test", failures=3, cooldown=0.3)
+        for _ in range(3):
+            try:
+                await client.get_json("/down")
+            except aiohttp.ClientResponseError:
+                pass
+        assert client.breaker.state == "open", client.breaker.state
+        try:
+            await client.get_json("/book")
+            raise AssertionError("차단기 열림 상태에서 요청이 나감")
+        except CircuitOpenError:
+            pass
+        assert hits.get("book", 0) == 0 and client.stats.rejected == 1, hits
+
+        await asyncio.sleep(0.35)
+        assert await client.get_json("/book", params={"token_id": "1"}), "시험 요청 실패"
+        assert client.breaker.state == "closed", client.breaker.state
+
+    asyncio.run(_run(check, retries=0))
+
+
+def test_governor_rate():
+    # 10/s × headroom 0.8 = 8/s, 최대 보유 4개 → 12건 중 8건은 충전 대기 (~1초)
+    async def check(client: HttpClient, hits):
+        t0 = time.perf_counter()
+        await asyncio.gather(*(client.get_json("/book", params={"token_id": str(i)}) for i in range(12)))
+        elapsed = time.perf_counter() - t0
+        assert 0.8 <= elapsed <= 1.6, f"{elapsed:.2f}s"
+        stats = gov.stats()["clob_book"]
+        assert stats["calls"] == 12 and stats["throttled"] >= 8, stats
+
+    gov = Governor({"clob": [(100, 1)], "clob_book": [(10, 1)]})
+    asyncio.run(_run(check, governor=gov, name="clob"))
+
+
+def test_governor_trading_priority():
+    async def run():
+        gov = Governor({"clob": [(10, 1)]})      # 보유 4개, 거래 전용 몫 0.8개
+        for _ in range(3):
+            assert await gov.acquire("clob", DATA) == 0.0
+        assert await gov.acquire("clob", TRADING) == 0.0, "거래 요청이 대기함"
+        assert await gov.acquire("clob", DATA) > 0.0, "시세 조회가 거래 몫을 사용함"
+        stats = gov.stats()["clob"]
+        assert stats["calls"] == 5 and stats["throttled"] == 1 and stats["max_wait_ms"] > 0, stats
+
+    asyncio.run(run())
+
+
+def test_governor_listing_group():
+    async def run():
+        # /events · /markets 각자 한도는 넉넉하지만 합산(listing) 보유 4개 → 5번째는 대기
+        gov = Governor({"gamma_events": [(100, 1)], "gamma_markets": [(100, 1)], "gamma_listing": [(10, 1)]})
+        for endpoint in ("gamma_events", "gamma_markets", "gamma_events", "gamma_markets"):
+            assert await gov.acquire(endpoint) == 0.0
+        assert await gov.acquire("gamma_events") > 0.0, "합산 한도 미적용"
+        assert await gov.acquire("gamma") == 0.0, "목록 외 Gamma 요청까지 대기"
+
+    asyncio.run(run())
+
+
+TESTS = [
+    test_retry_5xx,
+    test_retry_after_429,
+    test_post_not_retried,
+    test_post_idempotent_retried,
+    test_4xx_no_retry,
+    test_timeout_budget,
+    test_connection_reuse,
+    test_connection_refused,
+    test_transport_routing,
+    test_hedge_tail_latency,
+    test_circuit_breaker,
+    test_governor_rate,
+    test_governor_trading_priority,
+    test_governor_listing_group,
+]
+
+
+def main() -> None:
+    header("core/transport.py — 로컬 대역 서버 테스트")
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            ok(test.__name__)
+        except Exception as e:
+            failed += 1
+            fail(f"{test.__name__}: {type(e).__name__} {e}")
+    print(f"\n  {len(TESTS) - failed}/{len(TESTS)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
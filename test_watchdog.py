@@ -0,0 +1,101 @@
+"""
+test_watchdog.py - core/watchdog.py 이벤트 루프 정지 감시 테스트
+
+이벤트 루프에서 일부러 동기 sleep 을 실행해 검증 (외부 연결 없음).
+  - 정지 시간 / 정지 횟수 지표, 막은 함수가 스택에 기록됨
+  - 정상 await 만 있으면 정지로 보지 않음
+
+사용법:
+  python test_watchdog.py
+"""
+
+import asyncio
+import sys
+import time
+
+from core.metrics import LOOP_LAG, LOOP_STALLS
+from core.watchdog import LoopWatchdog
+
+SEP = "=" * 65
+
+
+def header(title: str) -> None:
+    print(f"\n{SEP}\n  {title}\n{SEP}")
+
+
+def ok(msg: str)   -> None: print(f"  ✅ {msg}")
+def fail(msg: str) -> None: print(f"  ❌ {msg}")
+
+
+def _blocking_db_call() -> None:
+    time.sleep(0.4)
+
+
+async def _with_watchdog(body) -> LoopWatchdog:
+    dog  = LoopWatchdog(interval=0.02, threshold=0.1)
+    task = asyncio.create_task(dog.run(), name="watchdog")
+    try:
+        await asyncio.sleep(0.05)
+        await body()
+        await asyncio.sleep(0.1)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    return dog
+
+
+# ── 테스트 ───────────────────────────────────────────────────
+
+def test_stall_captured():
+    stalls = LOOP_STALLS.value()
+
+    async def body():
+        await asyncio.create_task(_stalling(), name="poll-cycle")
+
+    async def _stalling():
+        _blocking_db_call()
+
+    dog = asyncio.run(_with_watchdog(body))
+    assert LOOP_STALLS.value() == stalls + 1, LOOP_STALLS.value()
+    lag, task, stack = dog.last_stall
+    assert 0.3 <= lag < 1.0, lag
+    assert task == "poll-cycle", task
+    assert "_blocking_db_call" in stack, stack
+
+
+def test_no_stall():
+    stalls  = LOOP_STALLS.value()
+    samples = LOOP_LAG.count()
+
+    async def body():
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+
+    dog = asyncio.run(_with_watchdog(body))
+    assert dog.last_stall is None, dog.last_stall
+    assert LOOP_STALLS.value() == stalls
+    assert LOOP_LAG.count() > samples, "루프 지연 미기록"
+
+
+TESTS = [
+    test_stall_captured,
+    test_no_stall,
+]
+
+
+def main() -> None:
+    header("core/watchdog.py — 이벤트 루프 정지 감시 테스트")
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            ok(test.__name__)
+        except Exception as e:
+            failed += 1
+            fail(f"{test.__name__}: {type(e).__name__} {e}")
+    print(f"\n  {len(TESTS) - failed}/{len(TESTS)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()